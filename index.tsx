@@ -9,7 +9,7 @@ import { AvailableTimesPage } from '@/src/pages/AvailableTimesPage';
 import { ManageAppointmentPage } from '@/src/pages/ManageAppointmentPage';
 
 // Proactively remove any existing service workers to avoid stale caches in preview/dev
-if ('serviceWorker' in navigator) {
+if ('serviceWorker' in navigator && !import.meta.env.PROD) {
   navigator.serviceWorker.getRegistrations().then(registrations => {
     registrations.forEach(r => r.unregister());
   }).catch(() => {});
@@ -1,9 +1,18 @@
-import re
+"""Layout de gaveta (arrastar para fechar) no HotelRegistrationForm do App.tsx.
 
-with open('App.tsx', 'r', encoding='utf-8') as f:
-    content = f.read()
+Spec do scripts.codemod: sem --write só mostra o relatório e o diff.
+
+    python replace_hotel_form.py [--write]
+    python -m scripts.codemod replace_hotel_form.py [--write]
+"""
+import sys
+
+from scripts.codemod import Patch
 
 # 1. Add states and functions inside HotelRegistrationForm
+old_states = """    const formRef = useRef<HTMLFormElement | null>(null);
+    const [isSuccess, setIsSuccess] = useState(false);"""
+
 states_to_add = """    const formRef = useRef<HTMLFormElement | null>(null);
     const [isSuccess, setIsSuccess] = useState(false);
 
@@ -50,9 +59,6 @@ states_to_add = """    const formRef = useRef<HTMLFormElement | null>(null);
     };
     // -----------------------------------"""
 
-content = content.replace("""    const formRef = useRef<HTMLFormElement | null>(null);
-    const [isSuccess, setIsSuccess] = useState(false);""", states_to_add)
-
 
 # 2. Replace the formContent structure
 old_form_content_start = """    const formContent = (
@@ -98,8 +104,6 @@ new_form_content_start = """    const formContent = (
 
             <form ref={formRef} onSubmit={handleSubmit} className="p-6 sm:p-10 space-y-12">"""
 
-content = content.replace(old_form_content_start, new_form_content_start)
-
 # 3. Replace the end of formContent structure
 old_end_of_form = """                        </div>
                     </div>
@@ -115,10 +119,16 @@ new_end_of_form = """                        </div>
         </main>
     );"""
 
-content = content.replace(old_end_of_form, new_end_of_form)
-
+COMPONENT = "HotelRegistrationForm"
 
-with open('App.tsx', 'w', encoding='utf-8') as f:
-    f.write(content)
+PATCHES = {
+    "App.tsx": [
+        Patch("estados e handlers de arrastar", old_states, states_to_add, component=COMPONENT),
+        Patch("abertura do <main> com cabeçalho", old_form_content_start, new_form_content_start, component=COMPONENT),
+        Patch("fechamento do <main>", old_end_of_form, new_end_of_form, component=COMPONENT),
+    ],
+}
 
-print("Done replacing.")
+if __name__ == "__main__":
+    from scripts.codemod.__main__ import main
+    sys.exit(main([__file__, *sys.argv[1:]]))
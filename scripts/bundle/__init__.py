@@ -0,0 +1,20 @@
+"""Tamanho e custo de parse do build do Vite por componente, com histórico por commit e orçamento.
+
+Lê os chunks ``.js`` e os source maps de um build e atribui cada byte à
+declaração de topo de onde veio (``App.tsx:AdminDashboard``,
+``src/components/FinancialDashboardView.tsx:FinancialDashboardView``) ou ao
+pacote (``react-dom``). Separa o que a página do cliente baixa na entrada
+(chunk de entrada e imports estáticos) do que vem sob demanda (``React.lazy``).
+
+    python -m scripts.bundle --build                      # vite build com source maps e manifesto, e relatório
+    python -m scripts.bundle dist                         # relatório de um build já feito (precisa dos .map)
+    python -m scripts.bundle --build --record --budget-kb 250 --budget-ms 900
+
+``--record`` grava o retrato do commit em ``scripts/bundle/history.json`` e
+mostra o que mais mudou desde o commit anterior registrado. ``--budget-kb``
+(gzip) e ``--budget-ms`` (parse estimado) são o orçamento da entrada: acima
+deles o comando sai com código 1, para travar o CI.
+
+``--build`` não muda o ``vite.config.ts``: passa ``--sourcemap hidden
+--manifest`` e grava em ``.cache/bundle/dist``, fora do deploy.
+"""
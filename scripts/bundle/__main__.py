@@ -0,0 +1,92 @@
+import argparse
+import subprocess
+import sys
+
+from scripts.codemod.tsx import ROOT
+
+from . import history
+from .chunks import PARSE_MS_PER_KB
+from .report import Report
+
+BUILD_DIR = ROOT / ".cache" / "bundle" / "dist"
+TOP = 25
+
+
+def build(out=BUILD_DIR):
+    command = ["npx", "vite", "build", "--sourcemap", "hidden", "--manifest", "--outDir", str(out), "--emptyOutDir"]
+    print(" ".join(command), file=sys.stderr)
+    subprocess.run(command, cwd=ROOT, check=True)
+    return out
+
+
+def _kb(size):
+    return f"{size / 1024:8.1f}"
+
+
+def show(report, top=TOP, out=sys.stdout):
+    entry, total = report.totals(initial_only=True), report.totals()
+    print(f"Entrada: {entry['chunks']} chunks, {_kb(entry['bytes']).strip()} KB "
+          f"({_kb(entry['gzip']).strip()} KB gzip), ~{entry['parse_ms']:.0f} ms de parse/compilação", file=out)
+    print(f"Total:   {total['chunks']} chunks, {_kb(total['bytes']).strip()} KB "
+          f"({_kb(total['gzip']).strip()} KB gzip)", file=out)
+    print(f"\n{'KB':>8} {'gzip':>8} {'ms':>6}  chunk", file=out)
+    for chunk in sorted(report.chunks.values(), key=lambda c: (not c.initial, -c.bytes)):
+        mark = "entrada" if chunk.initial else "lazy"
+        print(f"{_kb(chunk.bytes)} {_kb(chunk.gzip)} {chunk.parse_ms(report.ms_per_kb):6.0f}  {chunk.name} ({mark})",
+              file=out)
+    for title, initial in (("na entrada", True), ("no total", False)):
+        print(f"\nComponentes {title} (top {top}):", file=out)
+        print(f"{'KB':>8} {'gzip~':>8} {'ms':>6}  componente", file=out)
+        for component in report.ranked(initial_only=initial)[:top]:
+            size = component.initial_bytes if initial else component.bytes
+            share = size / component.bytes if component.bytes else 0
+            print(f"{_kb(size)} {_kb(component.gzip * share)} {size / 1024 * report.ms_per_kb:6.0f}  "
+                  f"{component.label}", file=out)
+
+
+def show_changes(old, new, out=sys.stdout):
+    print(f"\nDesde {old.get('commit')}: entrada {_kb(old['entry']['gzip']).strip()} -> "
+          f"{_kb(new['entry']['gzip']).strip()} KB gzip", file=out)
+    for label, before, after in history.changes(old, new):
+        print(f"  {(after - before) / 1024:+8.1f} KB  {label}", file=out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m scripts.bundle",
+                                     description="Tamanho e custo de parse do build do Vite por componente.")
+    parser.add_argument("dist", nargs="?", help=f"diretório do build (padrão: dist, ou {BUILD_DIR} com --build)")
+    parser.add_argument("--build", action="store_true", help="roda vite build com source maps e manifesto antes")
+    parser.add_argument("--top", type=int, default=TOP, help="componentes listados (padrão: %(default)s)")
+    parser.add_argument("--ms-per-kb", type=float, default=PARSE_MS_PER_KB,
+                        help="custo estimado de parse/compilação por KB minificado (padrão: %(default)s)")
+    parser.add_argument("--record", action="store_true", help=f"grava o retrato do commit em {history.HISTORY.name}")
+    parser.add_argument("--history", default=history.HISTORY, help="arquivo do histórico")
+    parser.add_argument("--budget-kb", type=float, help="orçamento da entrada em KB gzip")
+    parser.add_argument("--budget-ms", type=float, help="orçamento da entrada em ms de parse estimado")
+    args = parser.parse_args(argv)
+    dist = build() if args.build else args.dist or ROOT / "dist"
+    report = Report(dist, ROOT, args.ms_per_kb)
+    if not report.chunks:
+        parser.error(f"nenhum .js em {dist}")
+    show(report, args.top)
+    commit, dirty = history.git_commit(ROOT)
+    snapshot = report.snapshot(commit, dirty)
+    old = history.previous(history.load(args.history), commit)
+    if old:
+        show_changes(old, snapshot)
+    if args.record:
+        history.record(snapshot, args.history)
+        print(f"\nRegistrado {commit}{' (com alterações)' if dirty else ''} em {args.history}", file=sys.stderr)
+    entry, over = snapshot["entry"], []
+    if args.budget_kb is not None and entry["gzip"] / 1024 > args.budget_kb:
+        over.append(f"{entry['gzip'] / 1024:.1f} KB gzip > {args.budget_kb:g} KB")
+    if args.budget_ms is not None and entry["parse_ms"] > args.budget_ms:
+        over.append(f"~{entry['parse_ms']:.0f} ms > {args.budget_ms:g} ms")
+    if over:
+        print(f"\nEntrada acima do orçamento: {'; '.join(over)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""Chunks JS de um build do Vite e quais deles a página do cliente baixa na entrada.
+
+Com ``build.manifest`` (``dist/.vite/manifest.json``) a entrada é o chunk
+``isEntry`` mais o fecho dos seus ``imports`` estáticos; ``dynamicImports``
+(os ``React.lazy``) ficam de fora. Sem manifesto, a entrada sai das tags
+``<script type="module">``/``modulepreload`` do ``index.html`` e dos
+``import`` estáticos entre os chunks.
+
+O custo de parse/compilação é uma estimativa linear sobre os bytes
+minificados: ``PARSE_MS_PER_KB`` ms por KB num celular intermediário, a
+ordem de grandeza medida pelo time do V8 para JS minificado. Serve para
+comparar commits e componentes, não como tempo absoluto.
+"""
+import gzip
+import json
+import pathlib
+import re
+
+PARSE_MS_PER_KB = 1.0
+MANIFESTS = (".vite/manifest.json", "manifest.json")
+
+_HASH_RE = re.compile(r"-[\w-]{8}(?=\.js$)")
+_HTML_RE = re.compile(r"""<(?:script[^>]*type=["']module["'][^>]*src|link[^>]*rel=["']modulepreload["'][^>]*href)=["']([^"']+\.js)["']""")
+_STATIC_IMPORT_RE = re.compile(r"""(?:\bimport|\bfrom)\s*["']([^"']+\.js)["']""")
+
+
+def stable_name(file):
+    """Nome do chunk sem o hash do conteúdo, para comparar builds (``assets/index-Bx1.js`` -> ``assets/index.js``)."""
+    return _HASH_RE.sub("", file)
+
+
+class Chunk:
+    def __init__(self, file, path, name=None):
+        self.file = file  # relativo ao diretório do build
+        self.path = path
+        self.name = name or stable_name(file)
+        with open(path, "rb") as f:
+            data = f.read()
+        self.bytes = len(data)
+        self.gzip = len(gzip.compress(data, compresslevel=9))
+        self.initial = False
+
+    def parse_ms(self, ms_per_kb=PARSE_MS_PER_KB):
+        return self.bytes / 1024 * ms_per_kb
+
+
+def read_manifest(dist):
+    """Manifesto do Vite do build, ou ``None`` se foi gerado sem ``--manifest``."""
+    for name in MANIFESTS:
+        path = dist / name
+        if path.exists():
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if all(isinstance(v, dict) and "file" in v for v in data.values()):
+                return data
+    return None
+
+
+def entry_keys(manifest):
+    """Chaves do manifesto que a entrada carrega: os ``isEntry`` e o fecho dos ``imports`` estáticos."""
+    todo = [key for key, entry in manifest.items() if entry.get("isEntry")]
+    seen = []
+    while todo:
+        key = todo.pop(0)
+        if key not in seen and key in manifest:
+            seen.append(key)
+            todo.extend(manifest[key].get("imports", []))
+    return seen
+
+
+def load(dist):
+    """``{arquivo: Chunk}`` dos ``.js`` do build, com ``initial`` marcado nos da entrada."""
+    dist = pathlib.Path(dist)
+    chunks = {path.relative_to(dist).as_posix(): None for path in sorted(dist.rglob("*.js"))}
+    manifest = read_manifest(dist)
+    names = {}
+    if manifest:
+        names = {entry["file"]: key for key, entry in manifest.items() if entry["file"].endswith(".js")}
+    for file in chunks:
+        chunks[file] = Chunk(file, dist / file, names.get(file))
+    if manifest:
+        for key in entry_keys(manifest):
+            file = manifest[key]["file"]
+            if file in chunks:
+                chunks[file].initial = True
+    else:
+        html = dist / "index.html"
+        todo = [src.lstrip("/") for src in _HTML_RE.findall(html.read_text(encoding="utf-8"))] if html.exists() else []
+        while todo:
+            file = todo.pop()
+            if file not in chunks or chunks[file].initial:
+                continue
+            chunks[file].initial = True
+            base = pathlib.PurePosixPath(file).parent
+            code = (dist / file).read_text(encoding="utf-8", errors="ignore")
+            todo.extend((base / spec).as_posix() for spec in _STATIC_IMPORT_RE.findall(code) if spec.startswith("./"))
+    return chunks
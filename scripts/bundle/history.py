@@ -0,0 +1,52 @@
+"""Histórico dos retratos do bundle por commit (``scripts/bundle/history.json``, versionado).
+
+Um retrato por commit: rodar de novo no mesmo commit substitui o anterior.
+Árvore com alterações fica marcada ``dirty``.
+"""
+import json
+import pathlib
+import subprocess
+
+HISTORY = pathlib.Path(__file__).with_name("history.json")
+MAX_ENTRIES = 200
+
+
+def git_commit(root):
+    """``(commit curto, árvore suja)``; ``(None, False)`` fora de um repositório git."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=root, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=root,
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None, False
+    return commit, bool(status.strip())
+
+
+def load(path=HISTORY):
+    path = pathlib.Path(path)
+    return json.loads(path.read_text(encoding="utf-8")) if path.exists() else []
+
+
+def previous(entries, commit):
+    """Último retrato de outro commit, para comparar."""
+    for entry in reversed(entries):
+        if entry.get("commit") != commit:
+            return entry
+    return None
+
+
+def record(snapshot, path=HISTORY):
+    entries = [e for e in load(path) if e.get("commit") != snapshot["commit"] or snapshot["commit"] is None]
+    entries = (entries + [snapshot])[-MAX_ENTRIES:]
+    pathlib.Path(path).write_text(json.dumps(entries, indent=1, ensure_ascii=False) + "\n", encoding="utf-8")
+    return entries
+
+
+def changes(old, new, top=10):
+    """Maiores variações de bytes por componente: ``[(rótulo, antes, depois)]``."""
+    before, after = old.get("components", {}), new.get("components", {})
+    labels = set(before) | set(after)
+    rows = [(label, before.get(label, {}).get("bytes", 0), after.get(label, {}).get("bytes", 0)) for label in labels]
+    rows = [row for row in rows if row[1] != row[2]]
+    return sorted(rows, key=lambda row: abs(row[2] - row[1]), reverse=True)[:top]
@@ -0,0 +1,77 @@
+"""Junta chunks e source maps num relatório por componente e num retrato gravável no histórico."""
+import collections
+import datetime
+
+from . import chunks as chunks_mod
+from .sourcemap import Attribution
+
+# Componentes menores que isso entram só somados em ``<outros>`` no histórico.
+KEEP_COMPONENT_BYTES = 512
+OTHERS = "<outros>"
+
+
+class Component:
+    def __init__(self, label):
+        self.label = label
+        self.bytes = 0
+        self.initial_bytes = 0
+        self.gzip = 0.0
+        self.chunks = []
+
+    def parse_ms(self, ms_per_kb=chunks_mod.PARSE_MS_PER_KB):
+        return self.bytes / 1024 * ms_per_kb
+
+
+class Report:
+    def __init__(self, dist, root, ms_per_kb=chunks_mod.PARSE_MS_PER_KB):
+        self.dist = dist
+        self.ms_per_kb = ms_per_kb
+        self.chunks = chunks_mod.load(dist)
+        attribution = Attribution(root)
+        self.components = {}
+        for chunk in self.chunks.values():
+            sizes = attribution.chunk(chunk.path)
+            mapped = sum(sizes.values()) or 1
+            for label, size in sizes.items():
+                component = self.components.setdefault(label, Component(label))
+                component.bytes += size
+                component.gzip += chunk.gzip * size / mapped  # gzip não se divide: rateio pelo tamanho
+                if chunk.initial:
+                    component.initial_bytes += size
+                component.chunks.append(chunk.name)
+
+    def totals(self, initial_only=False):
+        selected = [c for c in self.chunks.values() if c.initial or not initial_only]
+        size = sum(c.bytes for c in selected)
+        return {
+            "chunks": len(selected),
+            "bytes": size,
+            "gzip": sum(c.gzip for c in selected),
+            "parse_ms": round(size / 1024 * self.ms_per_kb, 1),
+        }
+
+    def ranked(self, initial_only=False):
+        key = (lambda c: c.initial_bytes) if initial_only else (lambda c: c.bytes)
+        return sorted((c for c in self.components.values() if key(c)), key=key, reverse=True)
+
+    def snapshot(self, commit=None, dirty=False):
+        components, others = {}, collections.Counter()
+        for component in self.ranked():
+            if component.bytes >= KEEP_COMPONENT_BYTES:
+                components[component.label] = {"bytes": component.bytes, "initial_bytes": component.initial_bytes}
+            else:
+                others["bytes"] += component.bytes
+                others["initial_bytes"] += component.initial_bytes
+        if others:
+            components[OTHERS] = dict(others)
+        return {
+            "commit": commit,
+            "dirty": dirty,
+            "date": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "ms_per_kb": self.ms_per_kb,
+            "entry": self.totals(initial_only=True),
+            "total": self.totals(),
+            "chunks": {c.name: {"bytes": c.bytes, "gzip": c.gzip, "initial": c.initial}
+                       for c in sorted(self.chunks.values(), key=lambda c: c.name)},
+            "components": components,
+        }
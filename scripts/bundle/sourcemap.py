@@ -0,0 +1,153 @@
+"""Bytes de cada chunk atribuídos, pelo source map, à declaração de topo de origem.
+
+Cada segmento de ``mappings`` cobre o trecho do código gerado da sua coluna
+até o próximo segmento da linha. Esses bytes vão para a (fonte, linha
+original) do segmento e, pelo índice de ``scripts.codemod.tsx``, para a
+declaração de topo que contém a linha: ``App.tsx:AdminDashboard``,
+``src/components/FinancialDashboardView.tsx:FinancialDashboardView``.
+Dependências ficam agrupadas por pacote (``react-dom``). Sem fonte
+(helpers do bundler) conta como ``UNMAPPED``.
+
+As colunas do source map são unidades UTF-16; linhas só ASCII (quase todas
+num bundle minificado) são fatiadas direto, as outras passam por UTF-16.
+"""
+import bisect
+import collections
+import json
+import os
+import pathlib
+import posixpath
+
+from scripts.codemod.tsx import ROOT, Index, TokenizeError
+
+UNMAPPED = "<sem mapa>"
+TOP_LEVEL = "<topo>"
+INDEXED = (".ts", ".tsx", ".js", ".jsx", ".mjs")
+
+_BASE64 = {c: i for i, c in enumerate("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/")}
+
+
+def decode(segment):
+    """Valores VLQ de um segmento (``"AAgBC"`` -> ``[0, 0, 16, 1]``)."""
+    values, value, shift = [], 0, 0
+    for char in segment:
+        digit = _BASE64[char]
+        value += (digit & 31) << shift
+        if digit & 32:
+            shift += 5
+        else:
+            values.append(-(value >> 1) if value & 1 else value >> 1)
+            value, shift = 0, 0
+    return values
+
+
+def line_bytes(code, mappings):
+    """``{(fonte, linha original): bytes}`` de um chunk; fonte ``None`` = sem mapa."""
+    sizes = collections.Counter()
+    source = original = 0
+    lines = code.split("\n")
+    groups_by_line = mappings.split(";")
+    for number, line in enumerate(lines):
+        groups = groups_by_line[number] if number < len(groups_by_line) else ""
+        ascii_only = line.isascii()
+        encoded = None if ascii_only else line.encode("utf-16-le")
+        width = len(line) if ascii_only else len(encoded) // 2
+        column, previous, key = 0, 0, (None, None)
+        for segment in groups.split(","):
+            if not segment:
+                continue
+            values = decode(segment)
+            column += values[0]
+            if column > previous:
+                sizes[key] += _size(line, encoded, previous, column)
+            previous = column
+            if len(values) >= 4:
+                source += values[1]
+                original += values[2]
+                key = (source, original)
+            else:
+                key = (None, None)
+        if width > previous:
+            sizes[key] += _size(line, encoded, previous, width)
+        if number < len(lines) - 1:
+            sizes[None, None] += 1  # a quebra de linha
+    return sizes
+
+
+def _size(line, encoded, start, end):
+    if encoded is None:
+        return end - start
+    return len(encoded[start * 2:end * 2].decode("utf-16-le", errors="ignore").encode("utf-8"))
+
+
+def package_name(path):
+    """``node_modules/@scope/pkg/x.js`` -> ``@scope/pkg``; ``None`` fora de node_modules."""
+    parts = path.split("node_modules/")[-1].split("/") if "node_modules/" in path else None
+    if not parts:
+        return None
+    return "/".join(parts[:2]) if parts[0].startswith("@") else parts[0]
+
+
+class Attribution:
+    """Nomes de declaração por fonte de um source map, com índice por conteúdo (cache de ``tsx``)."""
+
+    def __init__(self, root=ROOT):
+        self.root = pathlib.Path(root)
+        self.labels = {}
+
+    def source_path(self, map_path, source_root, source):
+        """Caminho da fonte relativo à raiz do repositório (barra normal)."""
+        if source.startswith("\0") or ":" in source.split("/")[0]:
+            return source.lstrip("\0")
+        base = pathlib.Path(map_path).resolve().parent
+        absolute = os.path.normpath(base / (source_root or "") / source)
+        return pathlib.PurePath(os.path.relpath(absolute, self.root)).as_posix()
+
+    def labeler(self, path, content=None):
+        """Função linha original (0-based) -> rótulo ``arquivo:declaração``."""
+        if path in self.labels:
+            return self.labels[path]
+        package = package_name(path)
+        if package or path.startswith("..") or not path.endswith(INDEXED):
+            label = package or (path if not path.startswith("..") else f"<fora do repo> {posixpath.basename(path)}")
+            self.labels[path] = lambda line, label=label: label
+            return self.labels[path]
+        if content is None:
+            try:
+                with open(self.root / path, encoding="utf-8", newline="") as f:
+                    content = f.read()
+            except OSError:
+                content = ""
+        try:
+            items = Index.of(content).items if content else []
+        except TokenizeError:
+            items = []
+        starts = [item.line - 1 for item in items]
+        names = [item.name or TOP_LEVEL for item in items]
+        ends = [item.end_line - 1 for item in items]
+
+        def label(line):
+            pos = bisect.bisect_right(starts, line) - 1
+            if pos >= 0 and line <= ends[pos]:
+                return f"{path}:{names[pos]}"
+            return f"{path}:{TOP_LEVEL}"
+
+        self.labels[path] = label
+        return label
+
+    def chunk(self, code_path, map_path=None):
+        """``{rótulo: bytes}`` de um chunk ``.js`` com o ``.map`` ao lado."""
+        map_path = pathlib.Path(map_path or f"{code_path}.map")
+        code = pathlib.Path(code_path).read_text(encoding="utf-8")
+        if not map_path.exists():
+            return {UNMAPPED: len(code.encode("utf-8"))}
+        data = json.loads(map_path.read_text(encoding="utf-8"))
+        contents = data.get("sourcesContent") or []
+        labelers = []
+        for i, source in enumerate(data.get("sources", [])):
+            path = self.source_path(map_path, data.get("sourceRoot"), source)
+            labelers.append(self.labeler(path, contents[i] if i < len(contents) else None))
+        sizes = collections.Counter()
+        for (source, line), size in line_bytes(code, data.get("mappings", "")).items():
+            sizes[UNMAPPED if source is None else labelers[source](line)] += size
+        return dict(sizes)
@@ -0,0 +1,30 @@
+"""Codemods declarativos para o App.tsx e os componentes (generaliza o antigo ``replace_hotel_form.py``).
+
+Um spec é um arquivo Python com ``PATCHES = {caminho: [Patch(...), ...]}``,
+caminhos relativos à raiz do repositório. Cada arquivo é lido uma vez e
+todas as âncoras dele viram um único regex combinado: uma varredura aplica
+todos os patches (``engine.apply``). Cada patch diz quantas vezes a âncora
+deve casar (``count``, 1 por padrão). Se algum não bater, nada é gravado e o
+comando sai com código 1, em vez de não fazer nada em silêncio como os
+``content.replace()`` encadeados.
+
+    python -m scripts.codemod replace_hotel_form.py           # relatório + diff, sem gravar
+    python -m scripts.codemod replace_hotel_form.py --write   # grava se todos os patches casaram
+
+Patch cuja âncora sumiu e cujo texto novo já está no arquivo conta como já
+aplicado e é pulado: rodar o mesmo spec duas vezes não duplica nada.
+Remoções (texto novo vazio) não têm esse atalho: rodadas de novo, falham.
+
+``Patch(..., component="HotelRegistrationForm")`` limita a âncora ao trecho
+daquele componente de topo, achado pelo tokenizador de ``tsx`` (índice em
+cache por hash do conteúdo): um ``</div>`` repetido em outro componente não
+casa por engano, e a busca custa o tamanho do componente, não do arquivo.
+
+``python -m scripts.codemod.split`` usa o mesmo índice para tirar cada
+componente do App.tsx para ``src/app/`` e carregar sob demanda as telas que
+não são do agendamento.
+"""
+from .engine import Patch, PatchError, apply
+from .tsx import Index, TokenizeError
+
+__all__ = ["Index", "Patch", "PatchError", "TokenizeError", "apply"]
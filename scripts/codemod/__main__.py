@@ -0,0 +1,64 @@
+import argparse
+import pathlib
+import runpy
+import sys
+import time
+
+from .engine import FAILED, Patch, apply
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+
+
+def load_spec(path):
+    patches = runpy.run_path(str(path)).get("PATCHES")
+    if not isinstance(patches, dict) or not all(isinstance(p, Patch) for ps in patches.values() for p in ps):
+        raise SystemExit(f"{path}: defina PATCHES = {{caminho: [Patch(...), ...]}}")
+    return patches
+
+
+def run(spec, write=False, show_diff=True, root=ROOT, out=sys.stdout):
+    """Aplica o spec; grava só se todos os patches de todos os arquivos casaram. Devolve o código de saída."""
+    results = []
+    for relative, patches in load_spec(spec).items():
+        path = pathlib.Path(root) / relative
+        started = time.perf_counter()
+        with open(path, encoding="utf-8", newline="") as f:
+            text = f.read()
+        result = apply(text, patches, relative)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"{relative}: {len(patches)} patches, {len(text) // 1024} KB em {elapsed:.0f} ms", file=out)
+        for name, scope in result.scopes.items():
+            where = f"linhas {scope.line}-{scope.end_line}" if scope else "não encontrado no arquivo"
+            print(f"  [{name}] {where}", file=out)
+        for patch, found, status in result.report:
+            expected = f" (esperado {'>= 1' if patch.count is None else patch.count})" if status == FAILED else ""
+            scope = f" [{patch.component}]" if patch.component else ""
+            print(f"  {status:12} {found:>4}x  {patch.name}{scope}{expected}", file=out)
+        if show_diff and result.changed:
+            out.write(result.diff())
+        results.append((path, result))
+    if not all(result.ok for _, result in results):
+        print("Nada gravado: há patches que não casaram.", file=out)
+        return 1
+    if write:
+        for path, result in results:
+            if result.changed:
+                with open(path, "w", encoding="utf-8", newline="") as f:
+                    f.write(result.new)
+                print(f"Gravado: {result.path}", file=out)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m scripts.codemod",
+                                     description="Aplica um spec de patches ancorados numa varredura por arquivo.")
+    parser.add_argument("spec", help="arquivo Python com PATCHES = {caminho: [Patch(...)]}")
+    parser.add_argument("--write", action="store_true", help="grava os arquivos (padrão: só relatório e diff)")
+    parser.add_argument("--quiet", action="store_true", help="sem o diff unificado")
+    parser.add_argument("--root", default=ROOT, help="raiz dos caminhos do spec (padrão: raiz do repositório)")
+    args = parser.parse_args(argv)
+    return run(args.spec, args.write, not args.quiet, args.root)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
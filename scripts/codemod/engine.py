@@ -0,0 +1,142 @@
+"""Patches ancorados aplicados numa só varredura por arquivo."""
+import difflib
+import re
+
+from .tsx import Index
+
+APPLIED, OK, FAILED = "já aplicado", "ok", "FALHOU"
+
+
+class PatchError(Exception):
+    pass
+
+
+class Patch:
+    """Troca ``anchor`` por ``replacement``.
+
+    ``count``: quantas vezes a âncora deve casar (``None`` = pelo menos uma).
+    ``regex``: a âncora é uma expressão regular; aí ``replacement`` pode usar
+    grupos nomeados (``\\g<nome>``) ou ser uma função do match. Os nomes dos
+    grupos precisam ser únicos entre os patches do arquivo.
+    ``component``: nome de uma declaração de topo (``HotelRegistrationForm``);
+    a âncora só é procurada dentro dela (``tsx.Index``) e ``count`` conta só ali.
+    """
+
+    def __init__(self, name, anchor, replacement, count=1, regex=False, component=None):
+        if not anchor:
+            raise PatchError(f"{name}: âncora vazia")
+        self.name = name
+        self.anchor = anchor
+        self.replacement = replacement
+        self.count = count
+        self.regex = regex
+        self.component = component
+
+    def pattern(self):
+        return self.anchor if self.regex else re.escape(self.anchor)
+
+    def applied_in(self, text):
+        """O patch rodou antes: o texto novo literal está no arquivo e a âncora não sobra fora dele.
+
+        Remoções (``replacement`` vazio) nunca contam como aplicadas. Se o
+        texto novo contém a âncora (inserção ao lado dela), a âncora só conta
+        fora das ocorrências do texto novo; se está contido na âncora
+        (``foo`` -> ``fo``), a âncora precisa ter sumido do arquivo.
+        """
+        if self.regex or not isinstance(self.replacement, str) or not self.replacement:
+            return False
+        if self.replacement not in text:
+            return False
+        rest = text.replace(self.replacement, "") if self.anchor in self.replacement else text
+        return self.anchor not in rest
+
+    def expected(self, found):
+        return found >= 1 if self.count is None else found == self.count
+
+    def with_newline(self, newline):
+        if newline == "\n" or self.regex:
+            return self
+        replacement = self.replacement
+        if isinstance(replacement, str):
+            replacement = replacement.replace("\n", newline)
+        return Patch(self.name, self.anchor.replace("\n", newline), replacement, self.count, regex=self.regex,
+                     component=self.component)
+
+
+class Result:
+    def __init__(self, path, old, new, report, scopes=None):
+        self.path = path
+        self.old = old
+        self.new = new
+        self.report = report  # [(patch, casamentos, status)]
+        self.scopes = scopes or {}  # componente -> tsx.Declaration (None se não existe no arquivo)
+
+    @property
+    def ok(self):
+        return all(status != FAILED for _, _, status in self.report)
+
+    @property
+    def changed(self):
+        return self.old != self.new
+
+    def diff(self, context=3):
+        return "".join(difflib.unified_diff(self.old.splitlines(keepends=True), self.new.splitlines(keepends=True),
+                                            f"a/{self.path}", f"b/{self.path}", n=context))
+
+
+def _sweep(text, patches, counts):
+    """Uma varredura de ``text`` com um regex combinado dos ``patches`` ``[(índice, patch)]``."""
+    if not patches:
+        return text
+    combined = re.compile("|".join(f"(?P<p{i}>{patch.pattern()})" for i, patch in patches))
+    by_index = dict(patches)
+
+    def replace(match):
+        i = int(match.lastgroup[1:])
+        counts[i] += 1
+        patch = by_index[i]
+        if callable(patch.replacement):
+            return patch.replacement(match)
+        return match.expand(patch.replacement) if patch.regex else patch.replacement
+
+    return combined.sub(replace, text)
+
+
+def apply(text, patches, path="<texto>", index=None):
+    """Aplica ``patches`` a ``text``: um regex com uma alternativa nomeada por patch, uma varredura por trecho.
+
+    Patches com ``component`` rodam primeiro, cada grupo só no trecho do seu
+    componente (``index``: ``tsx.Index`` do texto, montado/lido do cache se
+    faltar); os demais depois, no arquivo inteiro. Em casamentos sobrepostos
+    vale o que começa antes; na mesma posição, o patch listado primeiro. O
+    texto só muda se todos os patches casarem o número esperado de vezes.
+    """
+    newline = "\r\n" if "\r\n" in text else "\n"
+    patches = [p.with_newline(newline) for p in patches]
+    scopes = {}
+    if any(p.component for p in patches):
+        if index is None:
+            index = Index.of(text)
+        scopes = {p.component: index.get(p.component) for p in patches if p.component}
+    status = {}
+    for i, patch in enumerate(patches):
+        if patch.component and scopes[patch.component] is None:
+            status[i] = FAILED
+        else:
+            scope = scopes.get(patch.component)
+            if patch.applied_in(text[scope.start:scope.end] if scope else text):
+                status[i] = APPLIED
+    counts = [0] * len(patches)
+    new = text
+    for name, scope in sorted(((n, s) for n, s in scopes.items() if s), key=lambda item: -item[1].start):
+        pending = [(i, p) for i, p in enumerate(patches) if p.component == name and i not in status]
+        new = new[:scope.start] + _sweep(new[scope.start:scope.end], pending, counts) + new[scope.end:]
+    new = _sweep(new, [(i, p) for i, p in enumerate(patches) if not p.component and i not in status], counts)
+    report = []
+    for i, patch in enumerate(patches):
+        found = counts[i]
+        report.append((patch, found, status.get(i) or (OK if patch.expected(found) else FAILED)))
+    result = Result(path, text, new, report, scopes)
+    if not result.ok:
+        result.new = text
+    return result
@@ -0,0 +1,458 @@
+"""Divide o App.tsx em um módulo por componente, com o que não é da página de agendamento em ``React.lazy``.
+
+O App.tsx define todas as telas (agendamento, formulários de hotel e
+creche, o painel admin inteiro) num módulo só: quem abre a página de
+agendamento no celular baixa e interpreta o admin junto. Sobre o índice de
+``tsx``, este comando:
+
+- move cada componente de topo para ``src/app/<Nome>.tsx``
+  (``export const`` + ``export default``), com os comentários logo acima;
+- junta o resto (helpers, tipos, constantes) em ``src/app/shared.tsx``;
+- dá a cada módulo só os imports que ele usa, com os caminhos relativos
+  recalculados, e faz os módulos importarem uns dos outros o que usam;
+- deixa no App.tsx só o ``App``. Os componentes que ele usa fora do fecho de
+  ``EAGER`` (o agendamento) viram ``lazyView(() => import(...))``, um
+  ``React.lazy`` com ``Suspense`` próprio: os pontos de uso não mudam e cada
+  tela (admin, formulários, diário) vira um chunk do Vite baixado na hora.
+  Modais (``*Modal``, ``*Dialog``) carregam sem spinner (``fallback`` nulo) e,
+  se o App os monta sempre (só com ``isOpen`` falso), ficam estáticos: o
+  chunk seria baixado na primeira renderização de qualquer jeito.
+
+Sem ``--write`` só mostra o plano: módulos, o que fica lazy e quantas
+linhas o carregamento inicial ainda interpreta. Antes de gravar, ``--write``
+roda o ``tsc --noEmit`` do projeto numa cópia da árvore com os arquivos
+gerados e só grava se não houver mais erros que na árvore atual.
+
+    python -m scripts.codemod.split                 # plano
+    python -m scripts.codemod.split --typecheck     # plano + tsc na cópia, sem gravar
+    python -m scripts.codemod.split --write         # tsc na cópia, grava src/app/ e reescreve o App.tsx
+"""
+import argparse
+import pathlib
+import posixpath
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from .tsx import ROOT, Index, identifiers, statements
+
+ENTRY = "App"
+OUT = "src/app"
+SHARED = "shared"
+LAZY_HELPER = "lazyView"
+# Componentes da primeira tela pública: eles e tudo que importam ficam no chunk inicial.
+EAGER = ("Scheduler", "SplashScreen", "ScheduleClosedPage")
+# Componente menor que isso (somando o que só ele traz) não compensa uma ida à rede: fica estático.
+MIN_LAZY_LINES = 20
+# Componentes que abrem por cima da tela: carregam sem spinner no lugar.
+MODAL_SUFFIXES = ("Modal", "Dialog")
+TSC = "node_modules/.bin/tsc"
+
+_IMPORT_RE = re.compile(r"""
+    import\s+(?P<type>type\s+)?
+    (?:(?P<default>[\w$]+)\s*,?\s*)?
+    (?:\*\s*as\s+(?P<namespace>[\w$]+)\s*)?
+    (?:\{(?P<named>[^}]*)\}\s*)?
+    (?:from\s*)?(?P<quote>['"])(?P<module>[^'"]+)(?P=quote)
+""", re.S | re.X)
+
+LAZY_VIEW_SOURCE = """import React, { Suspense, lazy } from 'react';
+
+// Gerado por scripts/codemod/split.py: tela em chunk próprio, baixada na primeira vez que aparece.
+const ViewFallback = () => (
+    <div className="flex items-center justify-center min-h-[40vh]">
+        <div className="animate-spin rounded-full h-12 w-12 border-b-2 border-pink-600"></div>
+    </div>
+);
+
+export function lazyView<P extends object>(
+    load: () => Promise<{ default: React.ComponentType<P> }>,
+    fallback: React.ReactNode = <ViewFallback />,
+) {
+    const View = lazy(load);
+    const LazyView = (props: P) => (
+        <Suspense fallback={fallback}>
+            <View {...props} />
+        </Suspense>
+    );
+    return LazyView;
+}
+"""
+
+
+_JSX_GUARD_RE = re.compile(r"(?:&&|\?|:)\s*\(?\s*$")
+
+
+class SplitError(Exception):
+    pass
+
+
+def is_modal(name):
+    return name.endswith(MODAL_SUFFIXES)
+
+
+def always_mounted(body, name):
+    """Algum ``<Name`` de ``body`` sem ``cond &&`` ou ternário logo antes: montado em toda renderização."""
+    for match in re.finditer(rf"<{re.escape(name)}\b", body):
+        if not _JSX_GUARD_RE.search(body[max(0, match.start() - 80):match.start()]):
+            return True
+    return False
+
+
+class Import:
+    """Um ``import`` do arquivo original, para ser refeito só com os nomes que cada módulo usa."""
+
+    def __init__(self, module, type_only=False, default=None, namespace=None, named=()):
+        self.module = module
+        self.type_only = type_only
+        self.default = default
+        self.namespace = namespace
+        self.named = list(named)  # [(especificador como escrito, nome local)]
+
+    @classmethod
+    def parse(cls, statement):
+        match = _IMPORT_RE.match(statement.strip())
+        if not match:
+            raise SplitError(f"import não reconhecido: {statement.strip()[:80]}")
+        named = []
+        for spec in (match.group("named") or "").split(","):
+            spec = " ".join(spec.split())
+            if spec:
+                named.append((spec, spec.split(" as ")[-1].replace("type ", "", 1).strip()))
+        return cls(match.group("module"), bool(match.group("type")), match.group("default"),
+                   match.group("namespace"), named)
+
+    @property
+    def names(self):
+        return {name for name in (self.default, self.namespace) if name} | {local for _, local in self.named}
+
+    @property
+    def side_effect(self):
+        return not self.names
+
+    def render(self, used, module=None):
+        """O import com só os nomes de ``used``; ``None`` se nenhum serve."""
+        named = [spec for spec, local in self.named if local in used]
+        head = [self.default] if self.default in used else []
+        if self.namespace in used:
+            head.append(f"* as {self.namespace}")
+        if named:
+            head.append("{ " + ", ".join(named) + " }")
+        if not head:
+            return None
+        return f"import {'type ' if self.type_only else ''}{', '.join(head)} from '{module or self.module}';"
+
+
+def relocate(module, target_dir, source_dir="."):
+    """Caminho relativo de import visto de ``target_dir`` (pacotes e ``@/`` não mudam)."""
+    if not module.startswith("."):
+        return module
+    relative = posixpath.relpath(posixpath.normpath(posixpath.join(source_dir, module)), target_dir)
+    return relative if relative.startswith(".") else f"./{relative}"
+
+
+class Unit:
+    """Uma declaração de topo com os comentários logo acima dela."""
+
+    def __init__(self, declaration, comment, body, refs):
+        self.declaration = declaration
+        self.name = declaration.name
+        self.comment = comment
+        self.body = body
+        self.refs = refs
+
+    def exported(self):
+        body = self.body if self.body.startswith("export ") else f"export {self.body}"
+        return f"{self.comment}\n{body}" if self.comment else body
+
+
+class Plan:
+    def __init__(self, text, path="App.tsx", out=OUT, eager=EAGER, index=None, root=None):
+        self.text = text
+        self.path = path
+        self.out = out
+        self.root = pathlib.Path(root) if root else None  # para medir os componentes importados
+        self.source_dir = posixpath.dirname(path) or "."
+        self.newline = "\r\n" if "\r\n" in text else "\n"
+        index = index or Index.of(text)
+        by_start = {item.start: item for item in index.items}
+        self.imports, self.units, self.leftover = [], {}, []
+        parsed, seen, prev_end = [], set(), 0
+        for start, end, _ in statements(text):
+            comment = text[prev_end:start].strip()
+            prev_end = end
+            declaration = by_start.get(start)
+            if declaration and declaration.kind == "import":
+                self.imports.append(Import.parse(text[start:end]))
+            elif declaration and declaration.name:
+                if declaration.name in seen:
+                    raise SplitError(f"{declaration.name} declarado duas vezes")
+                seen.add(declaration.name)
+                parsed.append((declaration, comment, text[start:end]))
+            else:
+                self.leftover.append(f"{comment}\n{text[start:end]}" if comment else text[start:end])
+        if ENTRY not in {d.name for d, _, _ in parsed}:
+            raise SplitError(f"{path} não declara {ENTRY}: nada a dividir")
+        self.imported = {name: imp for imp in self.imports for name in imp.names}
+        known = {d.name for d, _, _ in parsed} | set(self.imported)
+        for declaration, comment, body in parsed:
+            refs = identifiers(body) & known - {declaration.name}
+            self.units[declaration.name] = Unit(declaration, comment, body, refs)
+        self.module_of = {name: None if name == ENTRY else name if unit.declaration.is_component else SHARED
+                          for name, unit in self.units.items()}
+        self.modules = {}
+        for name, module in self.module_of.items():
+            if module:
+                self.modules.setdefault(module, []).append(name)
+        self._plan_lazy(eager)
+
+    def refs(self, module):
+        names = self.modules[module] if module else [ENTRY]
+        return set().union(*(self.units[name].refs for name in names))
+
+    def deps(self, module):
+        return {self.module_of[r] for r in self.refs(module) if r in self.units} - {module, None}
+
+    def reachable(self, modules):
+        seen, todo = set(), list(modules)
+        while todo:
+            module = todo.pop()
+            if module not in seen:
+                seen.add(module)
+                todo.extend(self.deps(module))
+        return seen
+
+    def _plan_lazy(self, eager):
+        app_refs = self.units[ENTRY].refs
+        app_body = self.units[ENTRY].body
+        eager_modules = self.reachable({self.module_of[n] for n in eager if n in self.units}
+                                       | ({SHARED} if SHARED in self.deps(None) else set()))
+        eager_refs = set().union(*(self.refs(m) for m in eager_modules)) if eager_modules else set()
+        self.lazy = []
+        for name in sorted(app_refs, key=lambda n: (self.units[n].declaration.start if n in self.units else -1, n)):
+            if is_modal(name) and always_mounted(app_body, name):
+                continue
+            if name in self.units:
+                module = self.module_of[name]
+                if (self.units[name].declaration.is_component and module not in eager_modules
+                        and sum(self.lines(m) for m in self.reachable({module}) - eager_modules) >= MIN_LAZY_LINES):
+                    self.lazy.append(name)
+            elif (self._lazy_import(name) and name not in eager_refs
+                  and self._import_lines(name) >= MIN_LAZY_LINES):
+                self.lazy.append(name)
+        self.initial = self.reachable(self.deps(None) - set(self.lazy))
+        cycles = [m for m in self.deps(SHARED) if SHARED in self.reachable({m})] if SHARED in self.modules else []
+        self.cycles = sorted(cycles)
+
+    def _lazy_import(self, name):
+        imp = self.imported[name]
+        return (imp.module.startswith(".") and not imp.type_only and name[0].isupper()
+                and (name == imp.default or any(local == name for _, local in imp.named)))
+
+    def _import_lines(self, name):
+        """Linhas do arquivo de onde ``name`` é importado; sem ``root`` (ou sem o arquivo), conta como grande."""
+        if self.root is None:
+            return MIN_LAZY_LINES
+        base = self.root / posixpath.normpath(posixpath.join(self.source_dir, self.imported[name].module))
+        for candidate in (base, *(base.with_name(base.name + ext) for ext in (".tsx", ".ts", ".jsx", ".js"))):
+            if candidate.is_file():
+                with open(candidate, encoding="utf-8") as f:
+                    return sum(1 for _ in f)
+        return MIN_LAZY_LINES
+
+    def module_path(self, module):
+        return posixpath.join(self.out, f"{module}.tsx")
+
+    def _root_path(self, module):
+        """Módulo gerado como import relativo à raiz (sem extensão), para ``relocate``."""
+        return f"./{posixpath.join(self.out, module)}"
+
+    def _internal_imports(self, refs, module_dir):
+        targets = {}
+        for name in sorted(refs):
+            if name in self.units and self.module_of[name]:
+                targets.setdefault(self.module_of[name], []).append(name)
+        return [f"import {{ {', '.join(names)} }} from '{relocate(self._root_path(target), module_dir)}';"
+                for target, names in sorted(targets.items(), key=lambda item: (item[0] != SHARED, item[0]))]
+
+    def render(self, module):
+        """Texto de ``src/app/<module>.tsx``."""
+        refs = self.refs(module) - set(self.modules[module])
+        lines = [imp.render(refs, relocate(imp.module, self.out, self.source_dir)) for imp in self.imports]
+        lines = [line for line in lines if line] + self._internal_imports(refs, self.out)
+        parts = ["\n".join(lines), *(self.units[name].exported() for name in self.modules[module])]
+        if module != SHARED:
+            parts.append(f"export default {module};")
+        return self._finish(parts)
+
+    def render_entry(self):
+        """O App.tsx que sobra: imports, telas lazy, reexports e o ``App``."""
+        refs = self.units[ENTRY].refs
+        static = refs - set(self.lazy)
+        entry_dir = self.source_dir
+        lines = []
+        for imp in self.imports:
+            line = f"import '{imp.module}';" if imp.side_effect else imp.render(static)
+            if line:
+                lines.append(line)
+        if self.lazy:
+            lines.append(f"import {{ {LAZY_HELPER} }} from '{relocate(self._root_path(LAZY_HELPER), entry_dir)}';")
+        lines += self._internal_imports(static, entry_dir)
+        exported = sorted(name for name in self.modules.get(SHARED, ())
+                          if self.units[name].body.startswith("export "))
+        if exported:
+            lines.append(f"export {{ {', '.join(exported)} }} from '{relocate(self._root_path(SHARED), entry_dir)}';")
+        parts = ["\n".join(lines)]
+        if self.lazy:
+            lazy = ["// Fora da tela de agendamento: cada uma vira um chunk, baixado na primeira vez que aparece."]
+            for name in self.lazy:
+                fallback = ", null" if is_modal(name) else ""
+                lazy.append(f"const {name} = {LAZY_HELPER}(() => {self._lazy_loader(name, entry_dir)}{fallback});")
+            parts.append("\n".join(lazy))
+        unit = self.units[ENTRY]
+        parts.append(f"{unit.comment}\n{unit.body}" if unit.comment else unit.body)
+        parts += self.leftover
+        return self._finish(parts)
+
+    def _lazy_loader(self, name, entry_dir):
+        if name in self.units:
+            return f"import('{relocate(self._root_path(name), entry_dir)}')"
+        imp = self.imported[name]
+        if name == imp.default:
+            return f"import('{imp.module}')"
+        imported = next(spec for spec, local in imp.named if local == name).split(" as ")[0]
+        return f"import('{imp.module}').then((m) => ({{ default: m.{imported} }}))"
+
+    def _finish(self, parts):
+        text = "\n\n".join(part.strip("\n") for part in parts if part.strip()) + "\n"
+        return text.replace("\n", self.newline) if self.newline != "\n" else text
+
+    def files(self):
+        """``{caminho relativo à raiz: conteúdo}`` de tudo que ``--write`` grava."""
+        files = {self.module_path(module): self.render(module) for module in self.modules}
+        if self.lazy:
+            files[self.module_path(LAZY_HELPER)] = self._finish([LAZY_VIEW_SOURCE])
+        files[self.path] = self.render_entry()
+        return files
+
+    def lines(self, module):
+        return sum(self.units[name].declaration.end_line - self.units[name].declaration.line + 1
+                   for name in (self.modules[module] if module else [ENTRY]))
+
+
+def report(plan, out=sys.stdout):
+    total = plan.text.count("\n") + 1
+    initial = plan.lines(None) + sum(plan.lines(m) for m in plan.initial)
+    print(f"{plan.path}: {total} linhas -> {len(plan.modules)} módulos em {plan.out}/", file=out)
+    print(f"  {SHARED}.tsx: {len(plan.modules.get(SHARED, ()))} declarações, {plan.lines(SHARED)} linhas"
+          if SHARED in plan.modules else f"  sem {SHARED}.tsx", file=out)
+    print(f"  carregamento inicial: {ENTRY} + {len(plan.initial)} módulos, ~{initial} linhas "
+          f"({initial * 100 // total}% do App.tsx)", file=out)
+    print(f"  lazy ({len(plan.lazy)}):", file=out)
+    for name in plan.lazy:
+        if name in plan.units:
+            size = sum(plan.lines(m) for m in plan.reachable({name}) - plan.initial)
+            print(f"    {name:32} ~{size} linhas no chunk", file=out)
+        else:
+            print(f"    {name:32} {plan.imported[name].module}", file=out)
+    if plan.cycles:
+        print(f"  aviso: {SHARED}.tsx e {', '.join(plan.cycles)} se importam (ciclo; funciona porque só "
+              "há uso dentro de funções)", file=out)
+
+
+def _tsc_errors(tsc, tree):
+    result = subprocess.run([tsc, "--noEmit", "-p", str(tree)], cwd=tree, capture_output=True, text=True)
+    return [line for line in result.stdout.splitlines() if ": error TS" in line]
+
+
+def typecheck(plan, root=ROOT, out=sys.stdout):
+    """``tsc --noEmit`` numa cópia da árvore, antes e depois dos arquivos do plano; devolve os erros novos.
+
+    O App.tsx atual pode já ter erros de tipo: conta como regressão só o que
+    passar do número da árvore sem a divisão.
+    """
+    root = pathlib.Path(root)
+    tsc = root / TSC
+    if not tsc.exists():
+        raise SplitError(f"sem {TSC}: rode npm install (ou passe --no-typecheck)")
+    with tempfile.TemporaryDirectory(prefix="split-") as tmp:
+        tree = pathlib.Path(tmp) / "tree"
+        shutil.copytree(root, tree, ignore=shutil.ignore_patterns(".git", "node_modules", "dist", ".cache"))
+        (tree / "node_modules").symlink_to(root / "node_modules", target_is_directory=True)
+        before = _tsc_errors(str(tsc), tree)
+        for relative, content in plan.files().items():
+            target = tree / relative
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with open(target, "w", encoding="utf-8", newline="") as f:
+                f.write(content)
+        after = _tsc_errors(str(tsc), tree)
+    print(f"tsc --noEmit: {len(before)} erros na árvore atual, {len(after)} com a divisão", file=out)
+    if len(after) <= len(before):
+        return []
+    known = {line.split(": error ", 1)[1] for line in before}
+    return [line for line in after if line.split(": error ", 1)[1] not in known] or after[len(before):]
+
+
+def write(plan, root=ROOT, force=False, check_types=True, out=sys.stdout):
+    files = plan.files()
+    for relative, content in files.items():
+        try:
+            Index.of(content, None)
+        except Exception as exc:
+            raise SplitError(f"{relative} gerado não tokeniza: {exc}") from exc
+    existing = [r for r in files if r != plan.path and (pathlib.Path(root) / r).exists()]
+    if existing and not force:
+        raise SplitError(f"já existem ({', '.join(existing[:5])}...): use --force para sobrescrever")
+    if check_types:
+        errors = typecheck(plan, root, out)
+        if errors:
+            print("\n".join(errors[:20]), file=out)
+            raise SplitError(f"a divisão traz {len(errors)} erros de tipo novos; nada gravado")
+    for relative, content in sorted(files.items(), key=lambda item: item[0] == plan.path):
+        target = pathlib.Path(root) / relative
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with open(target, "w", encoding="utf-8", newline="") as f:
+            f.write(content)
+    print(f"Gravados {len(files)} arquivos.", file=out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m scripts.codemod.split",
+                                     description="Divide o App.tsx em módulos por componente, com telas lazy.")
+    parser.add_argument("path", nargs="?", default="App.tsx", help="arquivo, relativo à raiz (padrão: App.tsx)")
+    parser.add_argument("--out", default=OUT, help=f"diretório dos módulos (padrão: {OUT})")
+    parser.add_argument("--eager", default=",".join(EAGER),
+                        help=f"componentes da primeira tela, fora do lazy (padrão: {','.join(EAGER)})")
+    parser.add_argument("--write", action="store_true", help="grava os módulos e reescreve o arquivo")
+    parser.add_argument("--force", action="store_true", help="sobrescreve módulos que já existem")
+    parser.add_argument("--typecheck", action="store_true",
+                        help="roda o tsc --noEmit numa cópia da árvore com a divisão, sem gravar")
+    parser.add_argument("--no-typecheck", action="store_true", help="--write sem o tsc antes (não recomendado)")
+    parser.add_argument("--root", default=ROOT, help="raiz do repositório")
+    args = parser.parse_args(argv)
+    started = time.perf_counter()
+    with open(pathlib.Path(args.root) / args.path, encoding="utf-8", newline="") as f:
+        text = f.read()
+    try:
+        plan = Plan(text, args.path, args.out, tuple(n.strip() for n in args.eager.split(",") if n.strip()),
+                    root=args.root)
+        report(plan)
+        if args.write:
+            write(plan, args.root, args.force, check_types=not args.no_typecheck)
+        elif args.typecheck:
+            errors = typecheck(plan, args.root)
+            if errors:
+                print("\n".join(errors[:20]))
+                raise SplitError(f"a divisão traz {len(errors)} erros de tipo novos")
+    except SplitError as exc:
+        print(f"Erro: {exc}", file=sys.stderr)
+        return 1
+    print(f"({(time.perf_counter() - started) * 1000:.0f} ms)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
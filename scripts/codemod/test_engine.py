@@ -0,0 +1,46 @@
+"""Casos do ``engine.apply``: ``python -m unittest scripts.codemod.test_engine``."""
+import unittest
+
+from .engine import APPLIED, FAILED, OK, Patch, apply
+
+
+class ApplyTest(unittest.TestCase):
+    def statuses(self, result):
+        return [status for _, _, status in result.report]
+
+    def test_removal_is_not_reported_as_applied(self):
+        result = apply("a();\nconsole.log(1);\nb();\n", [Patch("drop", "console.log(1);\n", "")])
+        self.assertEqual(self.statuses(result), [OK])
+        self.assertEqual(result.new, "a();\nb();\n")
+
+    def test_replacement_inside_anchor_still_applies(self):
+        result = apply("const foo = 1;", [Patch("rename", "foo", "fo")])
+        self.assertEqual(self.statuses(result), [OK])
+        self.assertEqual(result.new, "const fo = 1;")
+
+    def test_second_run_is_applied(self):
+        patch = Patch("swap", "old()", "novo()")
+        first = apply("old();", [patch])
+        second = apply(first.new, [patch])
+        self.assertEqual(self.statuses(second), [APPLIED])
+        self.assertFalse(second.changed)
+
+    def test_second_run_of_insertion_is_applied(self):
+        patch = Patch("insert", "a();\n", "a();\nb();\n")
+        first = apply("a();\n", [patch])
+        second = apply(first.new, [patch])
+        self.assertEqual(self.statuses(second), [APPLIED])
+        self.assertEqual(second.new, "a();\nb();\n")
+
+    def test_second_run_of_removal_fails(self):
+        result = apply("a();\n", [Patch("drop", "console.log(1);\n", "")])
+        self.assertEqual(self.statuses(result), [FAILED])
+
+    def test_crlf_with_callable_replacement(self):
+        result = apply("a\r\nb\r\n", [Patch("upper", "a\nb", lambda match: match.group().upper())])
+        self.assertEqual(self.statuses(result), [OK])
+        self.assertEqual(result.new, "A\r\nB\r\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
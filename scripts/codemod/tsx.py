@@ -0,0 +1,335 @@
+"""Tokenizador leve de TSX e índice das declarações de topo (componentes) de um arquivo.
+
+Não é um parser: só o bastante para saber onde cada declaração de topo
+(``const HotelRegistrationForm: React.FC<...> = ... };``, ``function``,
+``interface``...) começa e termina sem se enganar com chaves, ``</div>`` ou
+``//`` dentro de strings, template literals, regex, comentários e texto JSX.
+O lexer mantém uma pilha de modos (código, template, tag JSX, filhos JSX);
+``<`` e ``/`` só abrem JSX/regex em posição de expressão (depois de
+operador, ``(``, ``return``...), o resto é genérico/comparação/divisão.
+
+Tokenizar o App.tsx inteiro leva uns 300 ms; o índice fica em disco em
+``.cache/codemod/<sha256>.json`` e o mesmo conteúdo não é tokenizado de novo.
+
+    python -m scripts.codemod.tsx App.tsx       # lista as declarações de topo
+"""
+import bisect
+import hashlib
+import json
+import pathlib
+import re
+import sys
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+CACHE = ROOT / ".cache" / "codemod"
+CACHE_KEEP = 32
+# Muda quando o formato do índice ou as regras do lexer mudam: invalida o cache.
+VERSION = 1
+
+CODE, TEMPLATE, TAG, CHILDREN = "code", "template", "tag", "children"
+
+_CODE_RE = re.compile(r"""
+    (?P<ws>\s+)
+  | (?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))
+  | (?P<string>'(?:[^'\\\n]|\\.)*'|"(?:[^"\\\n]|\\.)*")
+  | (?P<template>`)
+  | (?P<name>[A-Za-z_$][\w$]*)
+  | (?P<number>\d[\w.]*|\.\d\w*)
+  | (?P<open>[({\[])
+  | (?P<close>[)}\]])
+  | (?P<punct>=>|\.\.\.|\?\?=?|\?\.|[=!]==?|&&=?|\|\|=?|\+\+|--|<<=?|>>>?=?|[-+*/%&|^<>]=?|[~?:;,.@#])
+  | (?P<other>.)
+""", re.S | re.X)
+_REGEX_RE = re.compile(r"/(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*")
+_TEMPLATE_RE = re.compile(r"(?:[^`\\$]|\\.|\$(?!\{))*", re.S)
+_TAG_NAME_RE = re.compile(r"<\s*(/?)\s*([\w$.:-]*)")
+_TAG_RE = re.compile(r"""
+    (?P<ws>\s+)
+  | (?P<string>"[^"]*"|'[^']*')
+  | (?P<open>\{)
+  | (?P<end>/?>)
+  | (?P<attr>[^\s{}"'/>]+|/)
+""", re.X)
+_TEXT_RE = re.compile(r"[^{<]+")
+
+# Depois destas palavras vem uma expressão: ``<`` abre JSX e ``/`` abre regex.
+_EXPRESSION_KEYWORDS = {"return", "yield", "await", "typeof", "case", "default", "in", "of", "new", "delete",
+                        "void", "throw", "else", "do", "instanceof"}
+_MODIFIERS = {"export", "default", "declare", "async", "abstract"}
+_DECLARATIONS = {"const", "let", "var", "function", "class", "interface", "type", "enum", "import"}
+
+
+class TokenizeError(Exception):
+    pass
+
+
+def _expression_allowed(prev):
+    if prev is None:
+        return True
+    kind, value = prev
+    if kind in ("open", "punct"):
+        return True
+    return kind == "name" and value in _EXPRESSION_KEYWORDS
+
+
+def tokens(text, nested=False):
+    """Tokens de código no nível de topo: ``(tipo, início, fim)``; tipos do ``_CODE_RE`` mais ``regex``.
+
+    Chaves/parênteses/colchetes que abrem e fecham o nível de topo vêm como
+    ``open``/``close``; tudo dentro deles (e dentro de templates e JSX) é
+    consumido sem sair, a não ser com ``nested=True``: aí saem os tokens de
+    código de qualquer nível e os nomes de tag JSX (``tag``). Também devolve,
+    no fim, o offset do último caractere de código visto em qualquer nível:
+    ``("eof", fim_do_código, len(text))``.
+    """
+    stack = [[CODE, 0, None]]  # [modo, profundidade de ()[]{} ou de elementos JSX, token anterior]
+    pos, size, code_end = 0, len(text), 0
+    while pos < size:
+        frame = stack[-1]
+        mode = frame[0]
+        if mode == CODE:
+            char = text[pos]
+            if char == "<" and _expression_allowed(frame[2]) and re.match(r"<\s*[\w$>]", text[pos:pos + 64]):
+                stack.append([TAG, 0, None])
+                continue
+            if char == "/" and text[pos + 1:pos + 2] not in ("/", "*") and _expression_allowed(frame[2]):
+                match = _REGEX_RE.match(text, pos)
+                if match:
+                    frame[2] = ("regex", None)
+                    if nested or len(stack) == 1 and frame[1] == 0:
+                        yield "regex", pos, match.end()
+                    pos = code_end = match.end()
+                    continue
+            match = _CODE_RE.match(text, pos)
+            kind, start, pos = match.lastgroup, pos, match.end()
+            if kind in ("ws", "comment"):
+                continue
+            code_end = pos
+            top = len(stack) == 1
+            if kind == "template":
+                frame[2] = ("string", None)
+                stack.append([TEMPLATE, 0, start])
+                continue
+            if kind == "open":
+                if nested or top and frame[1] == 0:
+                    yield kind, start, pos
+                frame[1] += 1
+            elif kind == "close":
+                if frame[1] == 0:
+                    if top:
+                        raise TokenizeError(f"'{text[start]}' sem abertura no offset {start}")
+                    stack.pop()  # fim de ``${...}`` ou de ``{...}`` em JSX
+                    continue
+                frame[1] -= 1
+                if nested or top and frame[1] == 0:
+                    yield kind, start, pos
+            elif nested or top and frame[1] == 0:
+                yield kind, start, pos
+            frame[2] = (kind, match.group())
+        elif mode == TEMPLATE:
+            pos = _TEMPLATE_RE.match(text, pos).end()
+            if text.startswith("${", pos):
+                stack.append([CODE, 0, None])
+                pos += 2
+            elif pos < size:
+                stack.pop()
+                pos += 1
+                if nested or len(stack) == 1 and stack[0][1] == 0:
+                    yield "string", frame[2], pos
+            code_end = pos
+        elif mode == TAG:
+            if frame[2] is None:
+                match = _TAG_NAME_RE.match(text, pos)
+                frame[2] = "close" if match.group(1) else "open"
+                if nested and match.group(2):
+                    yield "tag", match.start(2), match.end(2)
+                pos = match.end()
+                continue
+            match = _TAG_RE.match(text, pos)
+            if not match:
+                raise TokenizeError(f"tag JSX inesperada no offset {pos}")
+            kind, pos = match.lastgroup, match.end()
+            if kind == "open":
+                stack.append([CODE, 0, None])
+            elif kind == "end":
+                code_end = pos
+                closing = frame[2] == "close"
+                stack.pop()
+                parent = stack[-1]
+                if match.group() == "/>":
+                    pass
+                elif parent[0] == CHILDREN:
+                    parent[1] += -1 if closing else 1
+                    if parent[1] == 0:
+                        stack.pop()
+                elif not closing:
+                    stack.append([CHILDREN, 1, None])
+                if stack[-1][0] == CODE:
+                    stack[-1][2] = ("close", ">")
+        else:  # CHILDREN
+            char = text[pos]
+            if char == "{":
+                stack.append([CODE, 0, None])
+                pos += 1
+            elif char == "<":
+                stack.append([TAG, 0, None])
+            else:
+                pos = _TEXT_RE.match(text, pos).end()
+    if len(stack) > 1 or stack[0][1]:
+        raise TokenizeError(f"fim do arquivo dentro de {stack[-1][0]} (profundidade {stack[-1][1]})")
+    yield "eof", code_end, size
+
+
+class Declaration:
+    """Declaração de topo: ``[start, end)`` vai do primeiro modificador ao último caractere de código."""
+
+    def __init__(self, name, kind, start, end, line, end_line):
+        self.name = name
+        self.kind = kind
+        self.start = start
+        self.end = end
+        self.line = line
+        self.end_line = end_line
+
+    @property
+    def is_component(self):
+        """Declaração de valor com nome em PascalCase (``POPULAR_BREEDS`` e afins não contam)."""
+        return (self.kind in ("const", "let", "var", "function", "class") and bool(self.name)
+                and self.name[0].isupper() and not self.name.isupper())
+
+    def as_list(self):
+        return [self.name, self.kind, self.start, self.end, self.line, self.end_line]
+
+    def __repr__(self):
+        return f"<{self.kind} {self.name} l.{self.line}-{self.end_line}>"
+
+
+def statements(text):
+    """Agrupa os tokens de topo em instruções: ``[(início, fim, [(tipo, valor), ...]), ...]``."""
+    statements, current, prev, prev_end = [], None, None, 0
+    for kind, start, end in tokens(text):
+        if kind == "eof":
+            end = start
+            break
+        value = text[start:end]
+        new_line = "\n" in text[prev_end:start]
+        starts = prev is None or prev[1] == ";" or (
+            new_line and kind == "name" and value in _DECLARATIONS | _MODIFIERS
+            and prev[0] in ("close", "name", "number", "string", "regex") and prev[1] not in _MODIFIERS)
+        if starts:
+            if current:
+                current[1] = prev_end
+            current = [start, None, []]
+            statements.append(current)
+        current[2].append((kind, value))
+        prev, prev_end = (kind, value), end
+    if current:
+        current[1] = max(prev_end, end)
+    return statements
+
+
+def identifiers(text):
+    """Nomes referenciados em ``text`` (qualquer nível, tags JSX inclusive), sem os acessados por ``.``/``?.``."""
+    found, prev = set(), None
+    for kind, start, end in tokens(text, nested=True):
+        if kind in ("name", "tag") and prev not in (".", "?."):
+            found.add(text[start:end].split(".")[0])
+        prev = text[start:end] if kind == "punct" else None
+    return found
+
+
+def declarations(text):
+    newlines = [m.start() for m in re.finditer("\n", text)]
+    found = []
+    for start, end, words in statements(text):
+        names = [value for kind, value in words if kind == "name"]
+        while names and names[0] in _MODIFIERS:
+            names.pop(0)
+        if not names or names[0] not in _DECLARATIONS:
+            continue
+        kind = names[0]
+        name = names[1] if len(names) > 1 and kind != "import" else None
+        found.append(Declaration(name, kind, start, end, bisect.bisect_left(newlines, start) + 1,
+                                 bisect.bisect_left(newlines, end) + 1))
+    return found
+
+
+class Index:
+    """Declarações de topo de um texto, tokenizado uma vez por conteúdo (cache em disco pelo sha256)."""
+
+    def __init__(self, items, digest=None, cached=False):
+        self.items = items
+        self.digest = digest
+        self.cached = cached
+        self.by_name = {}
+        for item in items:
+            if item.name:
+                self.by_name.setdefault(item.name, item)
+
+    @staticmethod
+    def digest_of(text):
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def of(cls, text, cache=CACHE):
+        """Índice de ``text``; ``cache=None`` desliga o disco."""
+        digest = cls.digest_of(text)
+        path = pathlib.Path(cache) / f"{digest}.json" if cache else None
+        if path and path.exists():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+                if data.get("version") == VERSION:
+                    return cls([Declaration(*item) for item in data["declarations"]], digest, cached=True)
+            except (ValueError, KeyError, TypeError):
+                pass
+        index = cls(declarations(text), digest)
+        if path:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"version": VERSION, "declarations": [d.as_list() for d in index.items]}),
+                           encoding="utf-8")
+            tmp.replace(path)
+            _prune(path.parent)
+        return index
+
+    @classmethod
+    def of_path(cls, path, cache=CACHE):
+        with open(path, encoding="utf-8", newline="") as f:
+            return cls.of(f.read(), cache)
+
+    def get(self, name):
+        return self.by_name.get(name)
+
+    def components(self):
+        return [item for item in self.items if item.is_component]
+
+
+def _prune(directory, keep=CACHE_KEEP):
+    files = sorted(directory.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for old in files[keep:]:
+        old.unlink(missing_ok=True)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m scripts.codemod.tsx",
+                                     description="Lista as declarações de topo de um arquivo TSX.")
+    parser.add_argument("path")
+    parser.add_argument("--components", action="store_true", help="só componentes (nome com inicial maiúscula)")
+    parser.add_argument("--no-cache", action="store_true", help="tokeniza de novo, sem ler nem gravar o cache")
+    args = parser.parse_args(argv)
+    started = time.perf_counter()
+    index = Index.of_path(args.path, None if args.no_cache else CACHE)
+    elapsed = (time.perf_counter() - started) * 1000
+    items = index.components() if args.components else index.items
+    for item in items:
+        print(f"{item.line:>6}-{item.end_line:<6} {item.kind:9} {item.name or ''}")
+    print(f"{len(items)} declarações em {elapsed:.0f} ms ({'cache' if index.cached else 'tokenizado'})",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+"""Geração dos agendamentos recorrentes dos mensalistas (substitui ``scratch/gen_sql.py``).
+
+Lê os ``monthly_clients`` ativos e os agendamentos já gravados, expande as
+recorrências do horizonte pedido em NumPy (``recurrence``), descarta as que já
+existem e escreve só o que falta (``output``):
+
+    python -m scripts.mensalistas --until 2026-12-31 -o generate_appointments.sql
+    python -m scripts.mensalistas --from-json dump.json --start 2026-01-01 --until 2026-12-31
+
+A série já sai do calendário de funcionamento (``agenda``): sem feriados
+(tabela ``feriados`` e os calculados de São Paulo) nem ``disabled_dates``, e
+só nas horas válidas de cada agenda, sem o almoço, dentro da
+``appointments_valid_hours_ck``.
+
+Para rodar toda noite, ``--incremental`` gera cada cliente só depois da sua
+marca d'água (``monthly_client_watermarks``, gravada junto com os
+agendamentos), de hoje até ``--horizon-days``; quem teve a regra alterada no
+``EditMonthlyClientModal`` tem só a cauda futura refeita (``watermark``).
+Ele e o ``--apply`` precisam da service role key em ``SUPABASE_KEY``: a
+anon key não enxerga as marcas por causa do RLS.
+
+    SUPABASE_KEY=<service role key> python -m scripts.mensalistas --incremental --horizon-days 90
+
+Cada ocorrência nova é conferida contra a ocupação de toda a agenda no
+horizonte (``slots``: durações de ``SERVICES`` e ``MAX_CAPACITY_PER_SLOT`` do
+``constants.ts``); ``--on-conflict`` escolhe entre descartar (padrão),
+remanejar para a hora livre mais próxima do dia ou gravar assim mesmo.
+
+Com dezenas de milhares de linhas o SQL runner do dashboard estoura o tempo;
+``--format csv`` (ou ``binary``) grava um fluxo COPY único para as três
+tabelas e um ``merge.sql`` que o carrega numa tabela temporária e insere
+tudo no servidor, numa conexão só:
+
+    python -m scripts.mensalistas --format csv -o mensalistas_copy
+    psql "$DATABASE_URL" -f mensalistas_copy/merge.sql < mensalistas_copy/agendamentos.csv
+
+``--apply`` grava direto pelo PostgREST (``writer``), com até
+``--concurrency`` requisições no ar e nova tentativa em falha transitória;
+``--workers N`` expande as recorrências em N processos.
+
+Precisa de ``pip install numpy``.
+"""
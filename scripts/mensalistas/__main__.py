@@ -0,0 +1,97 @@
+import argparse
+import asyncio
+import datetime
+import json
+import pathlib
+import sys
+
+from . import output, plan, writer
+from .source import JsonSource, PostgrestSource
+
+SHOW_CONFLICTS = 50
+HORIZON_DAYS = 90
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m scripts.mensalistas",
+                                     description="Gera os agendamentos que faltam para os mensalistas ativos.")
+    parser.add_argument("--start", type=datetime.date.fromisoformat, default=datetime.date.today(),
+                        help="primeiro dia do horizonte (padrão: hoje)")
+    parser.add_argument("--until", type=datetime.date.fromisoformat,
+                        help="último dia do horizonte (padrão: 31/12 do ano de --start)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="gera cada cliente só depois da sua marca d'água (monthly_client_watermarks), "
+                             "de hoje até --horizon-days, e refaz a cauda de quem teve a regra alterada")
+    parser.add_argument("--horizon-days", type=int, default=HORIZON_DAYS,
+                        help="horizonte móvel do modo incremental, em dias a partir de hoje (padrão: %(default)s)")
+    parser.add_argument("--from-json", help="dump {tabela: [linhas]} no lugar do Supabase")
+    parser.add_argument("--on-conflict", choices=plan.ON_CONFLICT, default=plan.REJECT,
+                        help="ocorrência em horário lotado (MAX_CAPACITY_PER_SLOT): descartar, remanejar para a "
+                             "hora livre mais próxima do dia ou gravar assim mesmo (padrão: %(default)s)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processos para expandir as recorrências (padrão: %(default)s)")
+    parser.add_argument("--apply", action="store_true",
+                        help="grava direto pelo PostgREST em vez de escrever arquivo (sem transação)")
+    parser.add_argument("--concurrency", type=int, default=writer.CONCURRENCY,
+                        help="requisições simultâneas do --apply (padrão: %(default)s)")
+    parser.add_argument("--format", choices=("sql", *output.COPY_FILES), default="sql",
+                        help="sql: INSERTs em lote; csv/binary: fluxo COPY + merge.sql (padrão: %(default)s)")
+    parser.add_argument("-o", "--output",
+                        help="arquivo SQL (padrão: generate_appointments.sql) ou, com --format csv/binary, "
+                             "diretório do fluxo e do merge.sql (padrão: mensalistas_copy)")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.apply and args.from_json:
+        parser.error("--apply grava no Supabase; não combina com --from-json")
+    if args.incremental:
+        until = args.until or args.start + datetime.timedelta(days=args.horizon_days)
+    else:
+        until = args.until or datetime.date(args.start.year, 12, 31)
+    if args.from_json:
+        source = JsonSource(args.from_json)
+    else:
+        source = PostgrestSource()
+        if args.incremental or args.apply:
+            source.require_service_role("--incremental" if args.incremental else "--apply")
+    result = plan.build(source, args.start, until, today=args.start if args.incremental else None,
+                        on_conflict=args.on_conflict, incremental=args.incremental, workers=args.workers)
+    print(json.dumps(result.stats, ensure_ascii=False))
+    for c in result.conflicts[:SHOW_CONFLICTS]:
+        moved = f" -> {c['placed']}" if c["outcome"] == "rescheduled" else ""
+        print(f"  {c['outcome']:11} {c['table']:22} {c['wanted']}{moved}  {c['pet_name']} ({c['monthly_client_id']})")
+    if len(result.conflicts) > SHOW_CONFLICTS:
+        print(f"  ... mais {len(result.conflicts) - SHOW_CONFLICTS} conflitos")
+    if args.apply:
+        print(json.dumps(asyncio.run(writer.apply(result, source, args.concurrency)), ensure_ascii=False))
+        return 0
+    if args.format == "sql":
+        target = args.output or "generate_appointments.sql"
+        with open(target, "w", encoding="utf-8") as f:
+            output.write_sql(result, f)
+        print(f"{len(result)} agendamentos em {target}")
+        return 0
+    write_copy(result, pathlib.Path(args.output or "mensalistas_copy"), args.format)
+    return 0
+
+
+def write_copy(result, directory, fmt):
+    directory.mkdir(parents=True, exist_ok=True)
+    data = directory / output.COPY_FILES[fmt]
+    if fmt == "csv":
+        with open(data, "w", encoding="utf-8", newline="") as f:
+            output.write_csv(result, f)
+    else:
+        with open(data, "wb") as f:
+            output.write_binary(result, f)
+    with open(directory / "merge.sql", "w", encoding="utf-8") as f:
+        output.write_merge(result, f, fmt)
+    print(f"{len(result)} agendamentos em {data}")
+    print(f"Carga: psql \"$DATABASE_URL\" -f {directory / 'merge.sql'} < {data}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""Calendário de funcionamento consultado pela expansão: dias fechados e horas válidas por agenda.
+
+Montado uma vez por execução para o horizonte inteiro:
+
+- dias fechados: feriados (tabela ``feriados`` mais os nacionais, o estadual
+  e os municipais de São Paulo calculados para os anos que a tabela ainda
+  não cobre) e ``disabled_dates`` do admin (``BATH_GROOM`` fecha a agenda
+  fixa, ``PET_MOVEL`` o Pet Móvel);
+- horas válidas: ``BATH_GROOMING_HOURS`` em ``agendamento_banhotosa``,
+  ``VISIT_WORKING_HOURS`` para visitas, ``WORKING_HOURS`` no resto, sempre
+  sem ``LUNCH_HOUR``; em ``appointments``, só as que a
+  ``appointments_valid_hours_ck`` aceita
+  (``scripts/add_appointments_valid_hours_check.sql``).
+
+Cada ocorrência vira (agenda, dia, hora) e é conferida por indexação em
+arrays: dia fechado sai da série; hora inválida (13h, 18h...) vai para a
+válida mais próxima, a anterior no empate. Assim nenhuma linha gerada cai no
+CHECK nem precisa de limpeza depois.
+"""
+import datetime
+import pathlib
+import re
+
+import numpy as np
+
+from . import constants, recurrence
+
+VALID_HOURS_CK = pathlib.Path(__file__).resolve().parents[1] / "add_appointments_valid_hours_check.sql"
+
+BANHO_TOSA, LOJA, VISITA, MOVEL = "banho_tosa", "loja", "visita", "movel"
+# Agenda -> serviço de ``disabled_dates`` que a fecha (o mesmo agrupamento do loadDisabledDates do app).
+DISABLED_SERVICE = {BANHO_TOSA: "BATH_GROOM", LOJA: "BATH_GROOM", MOVEL: "PET_MOVEL"}
+
+# Feriados de data fixa: nacionais, estadual (9 de julho) e municipais de São Paulo.
+FIXED_HOLIDAYS = {
+    (1, 1): "Confraternização Universal", (1, 25): "Aniversário da Cidade de São Paulo", (4, 21): "Tiradentes",
+    (5, 1): "Dia do Trabalhador", (7, 9): "Revolução Constitucionalista de 1932 (SP)",
+    (9, 7): "Independência do Brasil", (10, 12): "Nossa Senhora Aparecida", (11, 2): "Finados",
+    (11, 15): "Proclamação da República", (11, 20): "Dia da Consciência Negra", (12, 25): "Natal",
+}
+# Feriados móveis, em dias a partir da Páscoa (a segunda de Carnaval não fecha, como na tabela feriados).
+EASTER_HOLIDAYS = {-47: "Carnaval", -46: "Quarta-feira de Cinzas", -2: "Sexta-feira Santa", 60: "Corpus Christi"}
+
+_CK_RE = re.compile(r"service IN \(([^)]*)\)\s*THEN.*?\bIN \(([\d,\s]+)\).*?ELSE.*?\bIN \(([\d,\s]+)\)", re.S)
+
+
+def easter(year):
+    """Domingo de Páscoa (algoritmo de Meeus/Jones/Butcher)."""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return datetime.date(year, month, day + 1)
+
+
+def holidays(year):
+    """Feriados do ano em São Paulo: ``{data: nome}``."""
+    days = {datetime.date(year, month, day): name for (month, day), name in FIXED_HOLIDAYS.items()}
+    sunday = easter(year)
+    days.update({sunday + datetime.timedelta(days=offset): name for offset, name in EASTER_HOLIDAYS.items()})
+    return days
+
+
+def check_hours(path=VALID_HOURS_CK):
+    """Horas aceitas pela ``appointments_valid_hours_ck``: ``(serviços de visita, horas deles, horas do resto)``."""
+    match = _CK_RE.search(pathlib.Path(path).read_text(encoding="utf-8"))
+    services = tuple(s.strip().strip("'") for s in match.group(1).split(","))
+    return services, {int(h) for h in match.group(2).split(",")}, {int(h) for h in match.group(3).split(",")}
+
+
+def is_visit(service):
+    text = str(service or "").upper()
+    return any(word in text for word in ("VISIT", "CRECHE", "HOTEL"))
+
+
+def category(table, service):
+    if table == "agendamento_banhotosa":
+        return BANHO_TOSA
+    if table == "pet_movel_appointments":
+        return MOVEL
+    return VISITA if is_visit(service) else LOJA
+
+
+def valid_hours():
+    """Horas válidas de cada agenda."""
+    lunch = constants.get("LUNCH_HOUR")
+    _, ck_visit, ck_other = check_hours()
+    hours = {
+        BANHO_TOSA: set(constants.get("BATH_GROOMING_HOURS")),
+        LOJA: set(constants.get("WORKING_HOURS")) & ck_other,
+        VISITA: set(constants.get("VISIT_WORKING_HOURS")) & ck_visit,
+        MOVEL: set(constants.get("WORKING_HOURS")),
+    }
+    return {name: sorted(h - {lunch}) for name, h in hours.items()}
+
+
+class Calendar:
+    """Dias abertos (matriz agenda × dia do horizonte) e hora válida mais próxima (agenda × 24)."""
+
+    CATEGORIES = (BANHO_TOSA, LOJA, VISITA, MOVEL)
+
+    def __init__(self, start, end, closed, hours):
+        self.start = np.datetime64(start, "D")
+        days = int((np.datetime64(end, "D") - self.start).astype(np.int64)) + 1
+        self.hours = hours
+        self.open = np.ones((len(self.CATEGORIES), max(days, 0)), dtype=bool)
+        self.nearest = np.zeros((len(self.CATEGORIES), 24), dtype=np.int64)
+        for row, name in enumerate(self.CATEGORIES):
+            offsets = (np.asarray(sorted(closed.get(name, ())), dtype="datetime64[D]") - self.start).astype(np.int64)
+            self.open[row, offsets[(offsets >= 0) & (offsets < days)]] = False
+            valid = np.asarray(hours[name])
+            self.nearest[row] = valid[np.argmin(np.abs(np.arange(24)[:, None] - valid[None, :]), axis=1)]
+
+    @classmethod
+    def load(cls, source, start, end):
+        """Feriados e ``disabled_dates`` do banco somados aos feriados calculados do horizonte."""
+        closed_all = {str(day) for year in range(start.year, end.year + 1) for day in holidays(year)}
+        closed_all |= {str(row["data"])[:10] for row in source.holidays() if row.get("data")}
+        closed = {name: set(closed_all) for name in cls.CATEGORIES}
+        for row in source.disabled_dates():
+            day = str(row.get("date") or "")[:10]
+            service = str(row.get("service") or "ALL").upper()
+            for name, disabled_by in DISABLED_SERVICE.items():
+                if day and service in (disabled_by, "ALL"):
+                    closed[name].add(day)
+        return cls(start, end, closed, valid_hours())
+
+    def index(self, name):
+        return self.CATEGORIES.index(name)
+
+    def apply(self, rows, times):
+        """``rows``: agenda (linha da matriz) de cada ocorrência. Devolve ``(aberto, horários ajustados)``."""
+        local = recurrence.local_dates(times)
+        offset = (local - self.start).astype(np.int64)
+        inside = (offset >= 0) & (offset < self.open.shape[1])
+        is_open = np.ones(len(times), dtype=bool)
+        is_open[inside] = self.open[rows[inside], offset[inside]]
+        hour = ((times.astype("datetime64[s]") - recurrence.SP_OFFSET).astype("datetime64[h]")
+                - local.astype("datetime64[h]")).astype(np.int64)
+        shift = (self.nearest[rows, hour] - hour).astype("timedelta64[h]")
+        return is_open, times + shift
@@ -0,0 +1,44 @@
+"""Horários, durações e capacidade lidos do ``constants.ts`` do app.
+
+Só o que a geração usa: ``SERVICES`` (rótulo e duração em horas por
+``ServiceType``), os arrays de horas (``WORKING_HOURS`` etc.) e os números
+soltos (``LUNCH_HOUR``, ``MAX_CAPACITY_PER_SLOT``). Ler o arquivo mantém o
+gerador com a mesma agenda do front a cada ajuste.
+
+A leitura é por expressão regular, só para esses formatos. Se o arquivo mudar
+e algum deles deixar de ser reconhecido (``REQUIRED``), ``load`` para com
+erro na hora, em vez de o gerador seguir sem capacidade ou horas.
+"""
+import functools
+import pathlib
+import re
+
+CONSTANTS_FILE = pathlib.Path(__file__).resolve().parents[2] / "constants.ts"
+
+_COMMENT_RE = re.compile(r"//[^\n]*|/\*.*?\*/", re.S)
+_NUMBER_RE = re.compile(r"export\s+const\s+(\w+)\s*(?::[^=]+)?=\s*(\d+(?:\.\d+)?)\s*;")
+_HOURS_RE = re.compile(r"export\s+const\s+(\w+)\s*(?::[^=]+)?=\s*\[([\d,\s]*)\]")
+_SERVICES_RE = re.compile(r"export\s+const\s+SERVICES\s*=\s*\{(.*?)\n\};", re.S)
+_SERVICE_RE = re.compile(r"\[ServiceType\.(\w+)\]\s*:\s*\{\s*label:\s*'([^']*)',\s*duration:\s*(\d+(?:\.\d+)?)")
+# O que agenda.py e slots.py leem; todos têm de sair não vazios do arquivo.
+REQUIRED = ("SERVICES", "MAX_CAPACITY_PER_SLOT", "LUNCH_HOUR", "WORKING_HOURS", "VISIT_WORKING_HOURS",
+            "BATH_GROOMING_HOURS")
+
+
+@functools.lru_cache(maxsize=None)
+def load(path=CONSTANTS_FILE):
+    text = _COMMENT_RE.sub("", pathlib.Path(path).read_text(encoding="utf-8"))
+    values = {name: float(v) if "." in v else int(v) for name, v in _NUMBER_RE.findall(text)}
+    values.update({name: [int(h) for h in hours.split(",") if h.strip()] for name, hours in _HOURS_RE.findall(text)})
+    block = _SERVICES_RE.search(text)
+    values["SERVICES"] = {key: {"label": label, "duration": float(duration)}
+                          for key, label, duration in _SERVICE_RE.findall(block.group(1) if block else "")}
+    absent = [name for name in REQUIRED if values.get(name) in (None, [], {})]
+    if absent or "UNKNOWN" not in values["SERVICES"]:
+        raise SystemExit(f"{path}: não foi possível ler {', '.join(absent) or 'SERVICES[UNKNOWN]'}; "
+                         "ajuste as expressões de scripts/mensalistas/constants.py ao formato novo")
+    return values
+
+
+def get(name):
+    return load()[name]
@@ -0,0 +1,160 @@
+"""Saída do plano: INSERTs em lote por tabela ou fluxo COPY (CSV/binário) com script de merge."""
+import datetime
+import json
+import struct
+import uuid
+
+from . import watermark
+
+BATCH_ROWS = 500
+COLUMNS = ("monthly_client_id", "appointment_time", "pet_name", "pet_breed", "owner_name", "owner_address",
+           "whatsapp", "service", "weight", "price", "status", "condominium", "extra_services")
+
+
+def sql_literal(value):
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, (dict, list)):
+        return sql_literal(json.dumps(value, ensure_ascii=False)) + "::jsonb"
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def write_sql(plan, f, batch_rows=BATCH_ROWS):
+    """Um ``INSERT ... VALUES`` a cada ``batch_rows`` linhas, numa transação."""
+    f.write("-- Agendamentos de mensalistas que faltam (scripts/mensalistas)\n")
+    # As linhas do arquivo: ``stats['missing']`` é antes da checagem de capacidade.
+    f.write(f"-- {len(plan)} linhas de {plan.stats['generated']} ocorrências; "
+            f"{plan.stats['clients']} mensalistas ativos\n")
+    f.write("BEGIN;\n")
+    write_stale(plan, f)
+    for table, rows in sorted(plan.rows.items()):
+        for i in range(0, len(rows), batch_rows):
+            f.write(f"\nINSERT INTO {table} ({', '.join(COLUMNS)}) VALUES\n")
+            f.write(",\n".join("  (" + ", ".join(sql_literal(row.get(c)) for c in COLUMNS) + ")"
+                               for row in rows[i:i + batch_rows]))
+            f.write(";\n")
+    write_watermarks(plan, f)
+    f.write("\nCOMMIT;\n")
+
+
+def write_stale(plan, f):
+    """Apaga a cauda futura dos mensalistas com a regra alterada (modo incremental)."""
+    for table, ids in sorted(plan.stale.items()):
+        f.write(f"\nDELETE FROM {table} WHERE id IN ({', '.join(sql_literal(i) for i in ids)});\n")
+
+
+def write_watermarks(plan, f):
+    """Grava as marcas d'água na mesma transação dos agendamentos (modo incremental)."""
+    if not plan.watermarks:
+        return
+    columns = tuple(plan.watermarks[0])
+    f.write(f"\nINSERT INTO {watermark.TABLE} ({', '.join(columns)}) VALUES\n")
+    f.write(",\n".join("  (" + ", ".join(sql_literal(row[c]) for c in columns) + ")" for row in plan.watermarks))
+    f.write("\nON CONFLICT (monthly_client_id) DO UPDATE SET "
+            + ", ".join(f"{c} = EXCLUDED.{c}" for c in columns if c != "monthly_client_id") + ";\n")
+
+
+# --- COPY -------------------------------------------------------------------
+#
+# Um só fluxo para as três tabelas, com a tabela de destino na primeira coluna:
+# ``\copy`` para uma tabela temporária e três ``INSERT ... SELECT`` no servidor
+# (``merge.sql``). Roda pelo psql, fora do SQL runner do dashboard:
+#
+#     psql "$DATABASE_URL" -f merge.sql < agendamentos.csv
+
+STAGING_TABLE = "mensalistas_staging"
+# Tipos da tabela temporária; o INSERT final converte para os da tabela de destino
+# (price entra como float8 para o formato binário não precisar codificar numeric).
+STAGING_TYPES = {
+    "target_table": "text", "monthly_client_id": "uuid", "appointment_time": "timestamptz", "price": "float8",
+    "extra_services": "jsonb",
+}
+STAGING_COLUMNS = ("target_table", *COLUMNS)
+COPY_FILES = {"csv": "agendamentos.csv", "binary": "agendamentos.bin"}
+_PG_EPOCH = datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def _staging_rows(plan):
+    for table, rows in sorted(plan.rows.items()):
+        for row in rows:
+            yield (table, *(row.get(c) for c in COLUMNS))
+
+
+def _text(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+def _csv_field(value):
+    # Sempre entre aspas: no CSV do COPY só o campo vazio sem aspas é NULL.
+    return "" if value is None else '"' + _text(value).replace('"', '""') + '"'
+
+
+def write_csv(plan, f):
+    """``COPY ... WITH (FORMAT csv, HEADER true)``; ``f`` em modo texto, ``newline=""``."""
+    f.write(",".join(STAGING_COLUMNS) + "\n")
+    for values in _staging_rows(plan):
+        f.write(",".join(_csv_field(v) for v in values) + "\n")
+
+
+def _binary_field(column, value):
+    kind = STAGING_TYPES.get(column, "text")
+    if kind == "uuid":
+        return uuid.UUID(str(value)).bytes
+    if kind == "timestamptz":
+        when = datetime.datetime.fromisoformat(str(value).replace(" ", "T").replace("+00", "+00:00"))
+        return struct.pack("!q", (when - _PG_EPOCH) // datetime.timedelta(microseconds=1))
+    if kind == "float8":
+        return struct.pack("!d", float(value))
+    if kind == "jsonb":
+        return b"\x01" + _text(value).encode()  # versão 1 do formato jsonb
+    return _text(value).encode()
+
+
+def write_binary(plan, f):
+    """``COPY ... WITH (FORMAT binary)``; ``f`` em modo binário."""
+    f.write(b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0))
+    count = struct.pack("!h", len(STAGING_COLUMNS))
+    for values in _staging_rows(plan):
+        f.write(count)
+        for column, value in zip(STAGING_COLUMNS, values):
+            if value is None:
+                f.write(struct.pack("!i", -1))
+                continue
+            data = _binary_field(column, value)
+            f.write(struct.pack("!i", len(data)) + data)
+    f.write(struct.pack("!h", -1))
+
+
+def write_merge(plan, f, fmt, tolerance_s=3600):  # recurrence.TOLERANCE
+    """Script psql: carrega o fluxo do stdin na tabela temporária e insere o que falta.
+
+    O ``NOT EXISTS`` com a mesma tolerância do plano fica como guarda: rodar o
+    script duas vezes, ou depois de alguém agendar à mão, não duplica nada.
+    """
+    options = "FORMAT csv, HEADER true" if fmt == "csv" else "FORMAT binary"
+    columns = ", ".join(COLUMNS)
+    f.write("-- Agendamentos de mensalistas que faltam (scripts/mensalistas), via COPY\n")
+    f.write(f"-- psql \"$DATABASE_URL\" -f merge.sql < {COPY_FILES[fmt]}\n")
+    f.write(f"-- {len(plan)} linhas: {json.dumps(plan.stats['per_table'], ensure_ascii=False)}\n")
+    f.write("\\set ON_ERROR_STOP on\nBEGIN;\n")
+    write_stale(plan, f)
+    f.write("\n")
+    f.write(f"CREATE TEMP TABLE {STAGING_TABLE} (\n")
+    f.write(",\n".join(f"  {c} {STAGING_TYPES.get(c, 'text')}" for c in STAGING_COLUMNS))
+    f.write("\n) ON COMMIT DROP;\n\n")
+    f.write(f"\\copy {STAGING_TABLE} FROM pstdin WITH ({options})\n")
+    f.write(f"ANALYZE {STAGING_TABLE};\n")
+    for table in sorted(plan.rows):
+        f.write(f"\nINSERT INTO {table} ({columns})\nSELECT {', '.join('s.' + c for c in COLUMNS)}\n"
+                f"FROM {STAGING_TABLE} s\nWHERE s.target_table = '{table}'\n  AND NOT EXISTS (\n"
+                f"    SELECT 1 FROM {table} a\n    WHERE a.monthly_client_id = s.monthly_client_id\n"
+                f"      AND a.appointment_time > s.appointment_time - interval '{tolerance_s} seconds'\n"
+                f"      AND a.appointment_time < s.appointment_time + interval '{tolerance_s} seconds'\n  );\n")
+    write_watermarks(plan, f)
+    f.write("\nCOMMIT;\n")
@@ -0,0 +1,278 @@
+"""Do estado atual (mensalistas ativos + agendamentos) às linhas que faltam, por tabela."""
+import collections
+import concurrent.futures
+import datetime
+import time
+
+import numpy as np
+
+from . import agenda, recurrence, slots, watermark
+from .source import APPOINTMENT_TABLES
+
+# Condomínios que o AddMonthlyClientView manda para a agenda fixa de Banho & Tosa.
+BANHO_TOSA_FIXO = ("Banho & Tosa Fixo", "Nenhum Condomínio")
+# Agendamentos por mês de cada recorrência, para dividir o preço do pacote (robust_backfill_2026.ts).
+VISITS_PER_MONTH = {recurrence.WEEKLY: 4, recurrence.BIWEEKLY: 2, recurrence.MONTHLY: 1}
+# Colunas copiadas do mensalista para cada agendamento gerado (as mesmas do gen_sql.py).
+CLIENT_COLUMNS = ("pet_name", "pet_breed", "owner_name", "owner_address", "whatsapp", "weight", "condominium",
+                  "extra_services")
+# O que fazer com ocorrência em horário lotado: descartar, mover para a hora livre mais próxima do dia
+# (entre as horas válidas da agenda, ``agenda.valid_hours``) ou gravar assim mesmo (comportamento do gen_sql.py).
+REJECT, RESCHEDULE, IGNORE = "reject", "reschedule", "ignore"
+ON_CONFLICT = (REJECT, RESCHEDULE, IGNORE)
+
+
+def parse_time(value):
+    """``appointment_time`` do PostgREST -> ``datetime64[s]`` UTC (sem offset = UTC, como o app)."""
+    when = datetime.datetime.fromisoformat(str(value).replace("Z", "+00:00").replace(" ", "T"))
+    if when.tzinfo is not None:
+        when = when.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return np.datetime64(when, "s")
+
+
+def format_time(value):
+    return f"{np.datetime_as_string(value, unit='s').replace('T', ' ')}+00"
+
+
+def target_table(client, latest_table=None):
+    """Tabela dos agendamentos do cliente: a que já usa, ou a regra do AddMonthlyClientView."""
+    if latest_table:
+        return latest_table
+    if client.get("condominium") in BANHO_TOSA_FIXO:
+        return "agendamento_banhotosa"
+    service = str(client.get("service") or "").lower()
+    if "móvel" in service or "movel" in service:
+        return "pet_movel_appointments"
+    return "appointments"
+
+
+def per_table(fetch, tables=APPOINTMENT_TABLES):
+    """``fetch(tabela)`` das tabelas em paralelo (uma consulta paginada por tabela), na ordem de ``tables``."""
+    with concurrent.futures.ThreadPoolExecutor(len(tables)) as pool:
+        return list(pool.map(fetch, tables))
+
+
+class Existing:
+    """Agendamentos dos mensalistas em arrays: dono (índice em ``Rules``), horário e tabela."""
+
+    def __init__(self, owners, times, tables, rows):
+        self.owners = owners
+        self.times = times
+        self.tables = tables
+        self.rows = rows
+
+    @classmethod
+    def load(cls, source, codes, tables=APPOINTMENT_TABLES, since=None):
+        """``since``: ``datetime64`` UTC; sem ele, todo o histórico."""
+        owners, times, names, rows = [], [], [], []
+        fetched = per_table(lambda table: source.appointments(table, since=None if since is None else f"{since}Z"),
+                            tables)
+        for table, table_rows in zip(tables, fetched):
+            for row in table_rows:
+                code = codes.get(row.get("monthly_client_id"))
+                if code is None or not row.get("appointment_time"):
+                    continue  # mensalista inativo ou linha sem horário
+                when = parse_time(row["appointment_time"])
+                if since is not None and when < since:
+                    continue
+                owners.append(code)
+                times.append(when)
+                names.append(table)
+                rows.append(row)
+        return cls(np.asarray(owners, dtype=np.int64), np.asarray(times, dtype="datetime64[s]"),
+                   np.asarray(names, dtype=object), rows)
+
+    def latest(self):
+        """Índice do cliente -> posição do seu agendamento mais recente."""
+        if not len(self.owners):
+            return {}
+        order = np.lexsort((self.times, self.owners))
+        last = order[np.r_[self.owners[order][1:] != self.owners[order][:-1], True]]
+        return dict(zip(self.owners[last].tolist(), last.tolist()))
+
+    def without(self, positions):
+        keep = np.ones(len(self.owners), dtype=bool)
+        keep[positions] = False
+        return Existing(self.owners[keep], self.times[keep], self.tables[keep],
+                        [row for row, ok in zip(self.rows, keep.tolist()) if ok])
+
+
+class Plan:
+    def __init__(self, rows, stats, conflicts=(), stale=None, watermarks=()):
+        self.rows = rows  # tabela -> [linha]
+        self.stats = stats
+        self.conflicts = list(conflicts)
+        self.stale = stale or {}  # tabela -> [id] a apagar antes dos INSERTs (cauda de regra alterada)
+        self.watermarks = list(watermarks)  # linhas de monthly_client_watermarks a gravar (modo incremental)
+
+    def __len__(self):
+        return sum(len(rows) for rows in self.rows.values())
+
+
+def build(source, start, end, today=None, tolerance=recurrence.TOLERANCE, on_conflict=REJECT, incremental=False,
+          workers=1):
+    """Linhas que faltam entre ``start`` e ``end`` (datas locais, inclusive) para cada mensalista ativo.
+
+    A série já sai do calendário de funcionamento (``agenda.Calendar``): sem
+    feriados nem ``disabled_dates``, e só em horas que o app e a
+    ``appointments_valid_hours_ck`` aceitam. Com ``on_conflict`` diferente de
+    ``IGNORE``, cada linha é conferida contra a ocupação de toda a agenda no
+    horizonte (``slots.SlotIndex``).
+
+    ``incremental``: cada cliente começa depois da sua marca d'água
+    (``watermark``), nunca antes de hoje, e só os agendamentos a partir do
+    primeiro dia a gerar são lidos; ``Plan.watermarks`` traz as marcas a
+    regravar. Clientes com a regra alterada têm a cauda
+    refeita: os futuros em aberto que a regra nova não produz vão para
+    ``Plan.stale``.
+
+    ``workers`` > 1 expande as regras em processos (``recurrence.expand_parallel``).
+    """
+    started = time.perf_counter()
+    today = np.datetime64(today or datetime.date.today(), "D")
+    clients = source.active_clients()
+    codes = {c["id"]: i for i, c in enumerate(clients)}
+    since = marks = None
+    if incremental:
+        marks = watermark.load(source, clients)
+        starts, changed = watermark.windows(clients, marks, today)
+        start = min([*starts.tolist(), np.datetime64(end, "D").item()]) if len(starts) else start
+        since = np.datetime64(start, "D").astype("datetime64[s]") + recurrence.SP_OFFSET
+    existing = Existing.load(source, codes, since=since)
+    loaded = time.perf_counter()
+
+    latest = existing.latest()
+    anchors = {clients[code]["id"]: recurrence.local_dates(existing.times[pos])
+               for code, pos in latest.items()}
+    if incremental:
+        anchors.update(watermark.anchors(clients, marks))
+    rules = recurrence.Rules.from_clients(clients, anchors)
+    templates = [_template(client, rules.kind[code], existing, latest.get(code))
+                 for code, client in enumerate(clients)]
+    calendar = agenda.Calendar.load(source, np.datetime64(start, "D").item(), np.datetime64(end, "D").item())
+    categories = [agenda.category(table, template["service"]) for table, template in templates]
+    owners, times = recurrence.expand_parallel(rules, start, end, workers)
+    if incremental:
+        inside = recurrence.local_dates(times) >= starts[owners]
+        owners, times = owners[inside], times[inside]
+    rows_of = np.asarray([calendar.index(c) for c in categories], dtype=np.int64)
+    is_open, adjusted = calendar.apply(rows_of[owners], times)
+    calendar_stats = {"closed": int((~is_open).sum()), "hour_moved": int((adjusted != times)[is_open].sum())}
+    owners, raw, times = owners[is_open], times[is_open], adjusted[is_open]
+    # Um agendamento já gravado na hora da regra, antes do ajuste para hora válida (13h -> 12h),
+    # também é a ocorrência: o diff olha as duas horas.
+    produced_owners, produced_times = np.concatenate([owners, owners]), np.concatenate([times, raw])
+    stale = np.zeros(0, dtype=np.int64)
+    if incremental:
+        stale = watermark.stale(existing, changed, produced_owners, produced_times, today, tolerance)
+    current = existing.without(stale)
+    keep = (recurrence.missing(owners, times, current.owners, current.times, tolerance)
+            & recurrence.missing(owners, raw, current.owners, current.times, tolerance))
+    expanded = time.perf_counter()
+
+    new_owners, new_times = owners[keep], times[keep]
+    conflicts = []
+    if on_conflict != IGNORE:
+        index = occupancy(source, start, end, codes, skip={existing.rows[i]["id"] for i in stale.tolist()})
+        hours = [calendar.hours[c] for c in categories] if on_conflict == RESCHEDULE else None
+        new_owners, new_times, conflicts = _fit(index, new_owners, new_times, clients, templates, hours)
+    checked = time.perf_counter()
+    past = recurrence.local_dates(new_times) < today
+    rows = {}
+    for code, when, done in zip(new_owners.tolist(), new_times, past.tolist()):
+        table, template = templates[code]
+        rows.setdefault(table, []).append({
+            **template,
+            "appointment_time": format_time(when),
+            "status": "CONCLUÍDO" if done else "AGENDADO",
+        })
+    removed = {}
+    for i in stale.tolist():
+        removed.setdefault(existing.tables[i], []).append(existing.rows[i]["id"])
+    marks = watermark.rows(clients, marks, owners, times) if incremental else ()
+    stats = {
+        "clients": len(clients),
+        "existing": len(existing.owners),
+        "generated": int(len(keep)),
+        "missing": int(keep.sum()),
+        "per_table": {table: len(r) for table, r in sorted(rows.items())},
+        "load_s": round(loaded - started, 3),
+        "expand_s": round(expanded - loaded, 3),
+        "calendar": calendar_stats,
+        "conflicts": dict(collections.Counter(c["outcome"] for c in conflicts)),
+        "check_s": round(checked - expanded, 3),
+    }
+    if incremental:
+        stats["incremental"] = {"changed": int(changed.sum()), "stale": len(stale),
+                                "up_to_date": int((starts > np.datetime64(end, "D")).sum())}
+    return Plan(rows, stats, conflicts, removed, marks)
+
+
+def occupancy(source, start, end, codes, skip=()):
+    """Índice de ocupação com todos os agendamentos do horizonte, de mensalistas ativos e avulsos.
+
+    ``skip``: ids que o plano vai apagar e não devem ocupar horário.
+    """
+    lo = np.datetime64(start, "D").astype("datetime64[s]") + recurrence.SP_OFFSET
+    hi = (np.datetime64(end, "D") + 1).astype("datetime64[s]") + recurrence.SP_OFFSET
+    rows, times = [], []
+    for table_rows in per_table(lambda table: source.booked(table, f"{lo}Z", f"{hi}Z"), APPOINTMENT_TABLES):
+        for row in table_rows:
+            if not row.get("appointment_time"):
+                continue
+            if row.get("monthly_client_id") and row["monthly_client_id"] not in codes:
+                continue  # o app também ignora os de mensalistas desativados
+            if row.get("id") in skip:
+                continue
+            rows.append(row)
+            times.append(parse_time(row["appointment_time"]))
+    times = np.asarray(times, dtype="datetime64[s]")
+    inside = (times >= lo) & (times < hi)
+    return slots.SlotIndex([row for row, ok in zip(rows, inside.tolist()) if ok], times[inside])
+
+
+def _fit(index, owners, times, clients, templates, hours=None):
+    """Reserva cada ocorrência no índice, em ordem cronológica; descarta as que não cabem.
+
+    Com ``hours`` (horas válidas de cada cliente), remaneja para a mais próxima livre no mesmo dia.
+    """
+    keys = slots.slot_keys(times).tolist()
+    keep = np.ones(len(owners), dtype=bool)
+    times = times.copy()
+    conflicts = []
+    for i in np.argsort(times, kind="stable").tolist():
+        table, template = templates[owners[i]]
+        calendar = slots.calendar(template)
+        if calendar is None:
+            continue
+        placed = index.place(calendar, keys[i], slots.span(template, calendar), hours[owners[i]] if hours else ())
+        if placed == keys[i]:
+            continue
+        conflict = {"monthly_client_id": clients[owners[i]]["id"], "pet_name": template.get("pet_name"),
+                    "table": table, "wanted": _local_slot(keys[i])}
+        if placed is None:
+            keep[i] = False
+            conflict["outcome"] = "rejected"
+        else:
+            times[i] = slots.slot_time(placed)
+            conflict.update(outcome="rescheduled", placed=_local_slot(placed))
+        conflicts.append(conflict)
+    return owners[keep], times[keep], conflicts
+
+
+def _local_slot(key):
+    return f"{np.datetime_as_string(np.datetime64(key, 'h')).replace('T', ' ')}:00"
+
+
+def _template(client, kind, existing, latest_pos):
+    """Tabela e colunas fixas dos agendamentos gerados para um cliente."""
+    row = {"monthly_client_id": client["id"], **{c: client.get(c) for c in CLIENT_COLUMNS}}
+    if latest_pos is not None:
+        # Serviço e preço unitário do último agendamento: o pacote do mensalista não os tem prontos.
+        last = existing.rows[latest_pos]
+        row["service"] = last.get("service") or client["service"]
+        row["price"] = last.get("price") if last.get("price") is not None else client.get("price")
+        return existing.tables[latest_pos], row
+    row["service"] = str(client["service"]).split(",")[0].strip()
+    row["price"] = round(float(client.get("price") or 0) / VISITS_PER_MONTH[int(kind)], 2)
+    return target_table(client), row
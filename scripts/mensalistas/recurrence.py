@@ -0,0 +1,161 @@
+"""Expansão vetorizada das recorrências dos mensalistas e diff com a agenda existente.
+
+Todas as regras ativas viram arrays NumPy (uma posição por cliente) e são
+expandidas de uma vez, sem laço por cliente nem por data:
+
+- semanal/quinzenal: primeira ocorrência >= início alinhada à fase do
+  cliente, depois ``first + passo * k`` com ``np.repeat``;
+- mensal: grade cliente × mês por broadcast, com o dia travado no último dia
+  do mês (31 vira 30/28), como ``AddMonthlyClientView`` faz.
+
+Datas são ``datetime64[D]`` no calendário de São Paulo; horários gravados são
+``datetime64[s]`` em UTC (São Paulo é UTC-3 fixo desde 2019, o mesmo
+``toSaoPauloUTC`` do app).
+
+Com muitos clientes, ``expand_parallel`` divide as regras em faixas e
+expande cada uma num processo.
+
+``missing`` troca o ``WHERE NOT EXISTS (... ABS(EXTRACT(EPOCH ...)) < 3600)``
+do antigo ``scratch/gen_sql.py`` por um merge ordenado: as chaves
+``(cliente, horário)`` existentes são ordenadas uma vez e cada gerada acha a
+vizinha com ``np.searchsorted``.
+"""
+import concurrent.futures
+import itertools
+
+import numpy as np
+
+WEEKLY, BIWEEKLY, MONTHLY = 0, 1, 2
+RECURRENCE_CODES = {"weekly": WEEKLY, "bi-weekly": BIWEEKLY, "biweekly": BIWEEKLY, "monthly": MONTHLY}
+STEP_DAYS = {WEEKLY: 7, BIWEEKLY: 14}
+SP_OFFSET = np.timedelta64(3, "h")
+# Ocorrência a menos de 1 h de um agendamento do cliente já existe (tolerância do gen_sql.py).
+TOLERANCE = np.timedelta64(3600, "s")
+# Chave composta cliente * _CLIENT_SPAN + segundos: bem maior que qualquer intervalo de datas.
+_CLIENT_SPAN = np.int64(1) << 40
+
+
+class Rules:
+    """Regras de recorrência em arrays paralelos, uma posição por cliente.
+
+    ``anchor`` é uma data em que o cliente teve (ou teria) atendimento; fixa a
+    fase das quinzenais e é ignorada nas mensais. ``NaT`` = sem histórico: a
+    fase começa na primeira data válida a partir do início do horizonte.
+    """
+
+    def __init__(self, ids, kind, day, hour, anchor=None):
+        self.ids = np.asarray(ids, dtype=object)
+        self.kind = np.asarray(kind, dtype=np.int8)
+        self.day = np.asarray(day, dtype=np.int64)
+        self.hour = np.asarray(hour, dtype=np.int64)
+        self.anchor = (np.full(len(self.ids), np.datetime64("NaT"), "datetime64[D]") if anchor is None
+                       else np.asarray(anchor, dtype="datetime64[D]"))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def take(self, positions):
+        return Rules(self.ids[positions], self.kind[positions], self.day[positions], self.hour[positions],
+                     self.anchor[positions])
+
+    @classmethod
+    def from_clients(cls, clients, anchors=None):
+        """A partir das linhas de ``monthly_clients``; ``anchors``: id -> data local da última ocorrência."""
+        anchors = anchors or {}
+        return cls(
+            [c["id"] for c in clients],
+            [RECURRENCE_CODES[str(c["recurrence_type"]).strip().lower()] for c in clients],
+            [int(c["recurrence_day"]) for c in clients],
+            [int(c["recurrence_time"]) for c in clients],
+            [anchors.get(c["id"], "NaT") for c in clients],
+        )
+
+
+def weekday(dates):
+    """Dia da semana como o app grava em ``recurrence_day``: 1 = segunda ... 7 = domingo."""
+    # 1970-01-01 foi uma quinta-feira.
+    return (dates.astype("datetime64[D]").astype(np.int64) + 3) % 7 + 1
+
+
+def _expand_weekly(rules, idx, start, end):
+    step = np.where(rules.kind[idx] == WEEKLY, STEP_DAYS[WEEKLY], STEP_DAYS[BIWEEKLY]).astype(np.int64)
+    # Sem âncora: primeiro dia da semana certo a partir do início.
+    first_free = start + ((rules.day[idx] - weekday(start)) % 7).astype("timedelta64[D]")
+    anchor = rules.anchor[idx]
+    # Âncora fora do dia da regra (dia mudou na edição): mesma semana, dia novo.
+    anchor = anchor + ((rules.day[idx] - weekday(anchor)) % 7).astype("timedelta64[D]")
+    anchor = np.where(np.isnat(anchor), first_free, anchor)
+    # Próxima ocorrência >= início na fase da âncora (divisão inteira arredonda para baixo).
+    lag = (start - anchor).astype(np.int64)
+    first = anchor + (-(-lag // step) * step).astype("timedelta64[D]")
+    count = np.where(first <= end, (end - first).astype(np.int64) // step + 1, 0)
+    owners = np.repeat(idx, count)
+    offsets = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+    return owners, np.repeat(first, count) + (offsets * np.repeat(step, count)).astype("timedelta64[D]")
+
+
+def _expand_monthly(rules, idx, start, end):
+    months = np.arange(start.astype("datetime64[M]"), end.astype("datetime64[M]") + 1)
+    month_start = months.astype("datetime64[D]")
+    month_len = ((months + 1).astype("datetime64[D]") - month_start).astype(np.int64)
+    day = np.minimum(rules.day[idx][:, None], month_len[None, :])
+    dates = month_start[None, :] + (day - 1).astype("timedelta64[D]")
+    keep = (dates >= start) & (dates <= end)
+    owners = np.broadcast_to(idx[:, None], dates.shape)[keep]
+    return owners, dates[keep]
+
+
+def expand(rules, start, end):
+    """Todas as ocorrências em ``[start, end]`` (datas locais): ``(índice do cliente, horário UTC)``.
+
+    O resultado sai ordenado por cliente e horário.
+    """
+    start, end = np.datetime64(start, "D"), np.datetime64(end, "D")
+    weekly = np.flatnonzero(rules.kind != MONTHLY)
+    monthly = np.flatnonzero(rules.kind == MONTHLY)
+    owners_w, dates_w = _expand_weekly(rules, weekly, start, end)
+    owners_m, dates_m = _expand_monthly(rules, monthly, start, end)
+    owners = np.concatenate([owners_w, owners_m]).astype(np.int64)
+    dates = np.concatenate([dates_w, dates_m])
+    times = (dates.astype("datetime64[s]") + rules.hour[owners].astype("timedelta64[h]") + SP_OFFSET)
+    order = np.lexsort((times, owners))
+    return owners[order], times[order]
+
+
+def expand_parallel(rules, start, end, workers):
+    """``expand`` com os clientes em ``workers`` faixas contíguas, uma por processo; mesmo resultado.
+
+    A expansão de cada faixa é independente; como as faixas são contíguas e
+    cada uma sai ordenada, basta somar o início da faixa aos índices e
+    concatenar.
+    """
+    if workers <= 1 or len(rules) < 2 * workers:
+        return expand(rules, start, end)
+    bounds = np.linspace(0, len(rules), workers + 1).astype(np.int64)
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        parts = list(pool.map(expand, [rules.take(slice(a, b)) for a, b in zip(bounds[:-1], bounds[1:])],
+                              itertools.repeat(start), itertools.repeat(end)))
+    return (np.concatenate([owners + first for (owners, _), first in zip(parts, bounds[:-1])]),
+            np.concatenate([times for _, times in parts]))
+
+
+def _keys(owners, times):
+    return owners.astype(np.int64) * _CLIENT_SPAN + times.astype("datetime64[s]").astype(np.int64)
+
+
+def missing(owners, times, existing_owners, existing_times, tolerance=TOLERANCE):
+    """Máscara das ocorrências geradas sem agendamento do mesmo cliente a menos de ``tolerance``."""
+    if not len(existing_owners):
+        return np.ones(len(owners), dtype=bool)
+    existing = np.sort(_keys(existing_owners, existing_times))
+    wanted = _keys(owners, times)
+    pos = np.searchsorted(existing, wanted)
+    after = existing[np.minimum(pos, len(existing) - 1)]
+    before = existing[np.maximum(pos - 1, 0)]
+    gap = np.minimum(np.abs(after - wanted), np.abs(wanted - before))
+    return gap >= tolerance.astype("timedelta64[s]").astype(np.int64)
+
+
+def local_dates(times):
+    """Data em São Paulo de horários UTC ``datetime64``."""
+    return (times.astype("datetime64[s]") - SP_OFFSET).astype("datetime64[D]")
@@ -0,0 +1,106 @@
+"""Ocupação dos horários por hora local de São Paulo, para a geração não lotar a agenda.
+
+Como no app, Pet Móvel e agenda fixa são agendas separadas, e visitas
+(Creche/Hotel) e cancelados não ocupam horário. Cada agendamento ocupa
+``ceil(duração)`` horas a partir do horário marcado, com a duração de
+``SERVICES`` no ``constants.ts``. Um horário está cheio com
+``MAX_CAPACITY_PER_SLOT`` agendamentos.
+
+A ocupação existente fica em listas ordenadas de chaves (horas desde 1970 no
+relógio local), montadas uma vez com ``np.unique``; cada consulta é uma busca
+binária, O(log n). As linhas aceitas durante a geração entram num contador à
+parte, para duas recorrências novas também não caírem no mesmo horário.
+"""
+import bisect
+import collections
+import math
+
+import numpy as np
+
+from . import constants, recurrence
+
+FIXED, MOBILE = "fixo", "movel"
+
+
+def calendar(row):
+    """Agenda que a linha ocupa, ou ``None`` (visita/cancelado); ``isMobileAppointment``/``isVisitAppointment``."""
+    if str(row.get("status") or "").upper() == "CANCELADO":
+        return None
+    service = str(row.get("service") or "").upper()
+    if any(word in service for word in ("VISIT", "CRECHE", "HOTEL")):
+        return None
+    condo = str(row.get("condominium") or row.get("condo") or "").upper()
+    has_condo = condo not in ("", "UNDEFINED", "NULL") and "NENHUM" not in condo and "FIXO" not in condo
+    if has_condo or any(word in service for word in ("PET_MOBILE", "MÓVEL", "MOVEL", "MOBILE")):
+        return MOBILE
+    return FIXED
+
+
+def service_type(service, agenda):
+    """Chave de ``SERVICES`` para o texto gravado em ``service`` (rótulo, chave ou texto livre do mensalista)."""
+    text = str(service or "").strip()
+    for key, info in constants.get("SERVICES").items():
+        if text == key or text.lower() == info["label"].lower():
+            return key
+    upper = text.upper()
+    bath = "BANHO" in upper or "BATH" in upper
+    grooming = "TOSA" in upper or "GROOM" in upper
+    if not bath and not grooming:
+        return "UNKNOWN"
+    base = "BATH_AND_GROOMING" if bath and grooming else "GROOMING_ONLY" if grooming else "BATH"
+    return f"PET_MOBILE_{base}" if agenda == MOBILE else base
+
+
+def span(row, agenda):
+    """Horas cheias que a linha ocupa."""
+    return max(1, math.ceil(constants.get("SERVICES")[service_type(row.get("service"), agenda)]["duration"]))
+
+
+def slot_keys(times):
+    """Horários UTC ``datetime64`` -> hora local de São Paulo como inteiro (horas desde 1970)."""
+    return (times.astype("datetime64[s]") - recurrence.SP_OFFSET).astype("datetime64[h]").astype(np.int64)
+
+
+def slot_time(key):
+    """Inverso de ``slot_keys`` para uma chave."""
+    return np.datetime64(int(key), "h").astype("datetime64[s]") + recurrence.SP_OFFSET
+
+
+class SlotIndex:
+    def __init__(self, rows, times, capacity=None):
+        self.capacity = constants.get("MAX_CAPACITY_PER_SLOT") if capacity is None else capacity
+        keys = {FIXED: [], MOBILE: []}
+        for row, key in zip(rows, slot_keys(times).tolist()):
+            agenda = calendar(row)
+            if agenda:
+                keys[agenda].extend(range(key, key + span(row, agenda)))
+        self.occupied = {}
+        for agenda, values in keys.items():
+            unique, counts = np.unique(np.asarray(values, dtype=np.int64), return_counts=True)
+            self.occupied[agenda] = (unique.tolist(), counts.tolist())
+        self.added = collections.Counter()
+
+    def count(self, agenda, key):
+        keys, counts = self.occupied[agenda]
+        pos = bisect.bisect_left(keys, key)
+        existing = counts[pos] if pos < len(keys) and keys[pos] == key else 0
+        return existing + self.added[agenda, key]
+
+    def fits(self, agenda, key, hours):
+        return all(self.count(agenda, k) < self.capacity for k in range(key, key + hours))
+
+    def book(self, agenda, key, hours):
+        for k in range(key, key + hours):
+            self.added[agenda, k] += 1
+
+    def place(self, agenda, key, hours, candidates=()):
+        """Chave aceita para a linha: a pedida, senão a hora livre mais próxima entre ``candidates`` no mesmo dia.
+
+        ``None`` se nada couber. ``candidates`` vazio = só a hora pedida.
+        """
+        day, hour = divmod(key, 24)
+        for h in [hour, *sorted((h for h in candidates if h != hour), key=lambda h: (abs(h - hour), h))]:
+            if self.fits(agenda, day * 24 + h, hours):
+                self.book(agenda, day * 24 + h, hours)
+                return day * 24 + h
+        return None
@@ -0,0 +1,193 @@
+"""Leitura de ``monthly_clients`` e dos agendamentos de mensalistas.
+
+Pelo PostgREST do Supabase (``SUPABASE_URL``/``SUPABASE_KEY``, ou as
+``VITE_SUPABASE_*`` do app), paginando de ``PAGE_SIZE`` em ``PAGE_SIZE`` por
+causa do limite de linhas da API; ou de um dump JSON ``{tabela: [linhas]}``
+para rodar sem rede.
+
+A anon key do app só serve para gerar arquivo. Com ela o RLS de
+``monthly_client_watermarks`` devolve ``[]`` sem erro (o ``--incremental``
+veria todos os clientes sem marca) e recusa o upsert das marcas depois dos
+inserts (``--apply``): esses modos exigem a service role key
+(``require_service_role``).
+
+Uma consulta por tabela para todos os clientes: a primeira página traz o
+total (``Prefer: count=exact``) e as demais saem em paralelo, até
+``FETCH_CONCURRENCY`` de cada vez. Falhas transitórias (rede, 5xx, 429) são
+repetidas com espera exponencial. ``POST`` sem upsert não é idempotente: se
+a requisição chegou ao servidor, um timeout ou 502 não diz se o lote entrou,
+e repetir duplicaria os agendamentos; ele só é repetido em 429 e em conexão
+recusada, quando nada foi processado.
+"""
+import base64
+import concurrent.futures
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+APPOINTMENT_TABLES = ("appointments", "pet_movel_appointments", "agendamento_banhotosa")
+# Colunas lidas dos agendamentos: o bastante para o diff, a fase e a cópia de serviço/preço.
+APPOINTMENT_COLUMNS = "id,monthly_client_id,appointment_time,service,price,status,created_at"
+# Colunas da ocupação da agenda (mensalistas e avulsos), para o índice de horários.
+BOOKED_COLUMNS = "id,monthly_client_id,appointment_time,service,condominium,status"
+PAGE_SIZE = 1000
+FETCH_CONCURRENCY = 4
+RETRIES = 4
+RETRY_STATUS = (408, 429, 500, 502, 503, 504)
+# Respostas em que o servidor não processou a requisição: repetíveis até num POST sem upsert.
+NOT_PROCESSED_STATUS = (429,)
+
+
+def credentials():
+    url = os.environ.get("SUPABASE_URL") or os.environ.get("VITE_SUPABASE_URL")
+    key = os.environ.get("SUPABASE_KEY") or os.environ.get("VITE_SUPABASE_ANON_KEY")
+    if not url or not key:
+        raise SystemExit("defina SUPABASE_URL e SUPABASE_KEY (ou VITE_SUPABASE_URL/VITE_SUPABASE_ANON_KEY)")
+    return url.rstrip("/"), key
+
+
+def key_role(key):
+    """Papel de uma chave do Supabase (``service_role``, ``anon``); ``None`` se o formato é desconhecido."""
+    if key.startswith("sb_secret_"):
+        return "service_role"
+    if key.startswith("sb_publishable_"):
+        return "anon"
+    try:
+        payload = key.split(".")[1]
+        return json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4))).get("role")
+    except (IndexError, ValueError, AttributeError):
+        return None
+
+
+class PostgrestSource:
+    def __init__(self, url=None, key=None):
+        if url is None or key is None:
+            url, key = credentials()
+        self.url = url
+        self.role = key_role(key)
+        self.headers = {"apikey": key, "Authorization": f"Bearer {key}", "Accept": "application/json"}
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    def open(self, method, table, params=None, body=None, prefer=None):
+        """Uma requisição ao PostgREST, repetida em falha transitória: ``(corpo JSON ou None, cabeçalhos)``.
+
+        ``POST`` sem ``resolution=`` no ``prefer`` (insert puro) só é repetido
+        quando a requisição certamente não foi processada.
+        """
+        idempotent = method != "POST" or "resolution=" in (prefer or "")
+        query = urllib.parse.urlencode(params or {})
+        headers = dict(self.headers)
+        data = None
+        if body is not None:
+            data = json.dumps(body, ensure_ascii=False).encode()
+            headers["Content-Type"] = "application/json"
+        if prefer:
+            headers["Prefer"] = prefer
+        for attempt in range(RETRIES + 1):
+            request = urllib.request.Request(f"{self.url}/rest/v1/{table}?{query}", data=data, headers=headers,
+                                             method=method)
+            try:
+                with urllib.request.urlopen(request, timeout=60) as response:
+                    raw = response.read()
+                    return (json.loads(raw) if raw else None), response.headers
+            except urllib.error.HTTPError as e:
+                if e.code not in (RETRY_STATUS if idempotent else NOT_PROCESSED_STATUS) or attempt == RETRIES:
+                    raise
+            except urllib.error.URLError as e:
+                refused = isinstance(e.reason, ConnectionRefusedError)
+                if not (idempotent or refused) or attempt == RETRIES:
+                    raise
+            except TimeoutError:
+                if not idempotent or attempt == RETRIES:
+                    raise
+            with self._lock:
+                self.retries += 1
+            time.sleep(0.5 * 2 ** attempt)
+
+    def require_service_role(self, mode):
+        """Sai com erro se a chave não é a service role: ``mode`` precisa ler e gravar as marcas d'água."""
+        if self.role != "service_role":
+            raise SystemExit(f"{mode} precisa da service role key em SUPABASE_KEY (a chave é "
+                             f"{self.role or 'de formato desconhecido'}): com a anon key o RLS de "
+                             "monthly_client_watermarks esconde as marcas e recusa gravá-las")
+
+    def select(self, table, params):
+        """Todas as linhas da consulta, em páginas ordenadas por ``id``."""
+        params = {**params, "order": "id"}
+        first, headers = self.open("GET", table, {**params, "limit": PAGE_SIZE, "offset": 0}, prefer="count=exact")
+        total = (headers.get("Content-Range") or "*/*").rpartition("/")[2]
+        # A API pode limitar a página abaixo de PAGE_SIZE (max-rows do projeto): o passo é o que veio.
+        step = len(first) or PAGE_SIZE
+        if not total.isdigit():  # sem contagem: página a página até vir uma curta
+            rows = list(first)
+            while len(rows) % step == 0 and rows:
+                page = self.open("GET", table, {**params, "limit": step, "offset": len(rows)})[0]
+                if not page:
+                    break
+                rows.extend(page)
+            return rows
+        offsets = range(step, int(total), step)
+        with concurrent.futures.ThreadPoolExecutor(FETCH_CONCURRENCY) as pool:
+            pages = pool.map(lambda offset: self.open("GET", table, {**params, "limit": step, "offset": offset})[0],
+                             offsets)
+            return [*first, *(row for page in pages for row in page)]
+
+    def active_clients(self):
+        return self.select("monthly_clients", {"select": "*", "is_active": "eq.true"})
+
+    def appointments(self, table, since=None):
+        params = {"select": APPOINTMENT_COLUMNS, "monthly_client_id": "not.is.null"}
+        if since is not None:
+            params["appointment_time"] = f"gte.{since}"
+        return self.select(table, params)
+
+    def watermarks(self):
+        try:
+            return self.select("monthly_client_watermarks", {"select": "*"})
+        except urllib.error.HTTPError as e:
+            raise SystemExit(f"monthly_client_watermarks indisponível ({e.code}): aplique "
+                             "supabase/migrations/202610170900_create_monthly_client_watermarks.sql") from e
+
+    def holidays(self):
+        return self.select("feriados", {"select": "data,nome"})
+
+    def disabled_dates(self):
+        return self.select("disabled_dates", {"select": "date,service"})
+
+    def booked(self, table, start, end):
+        """Todos os agendamentos da tabela com horário UTC em ``[start, end)`` (ISO 8601)."""
+        return self.select(table, {"select": BOOKED_COLUMNS,
+                                   "and": f"(appointment_time.gte.{start},appointment_time.lt.{end})"})
+
+
+class JsonSource:
+    """Dump ``{"monthly_clients": [...], "appointments": [...], ...}``."""
+
+    def __init__(self, path):
+        with open(path, encoding="utf-8") as f:
+            self.tables = json.load(f)
+
+    def active_clients(self):
+        return [c for c in self.tables.get("monthly_clients", []) if c.get("is_active", True)]
+
+    def appointments(self, table, since=None):
+        # ``since`` é só uma otimização da consulta; quem chama recorta o intervalo.
+        return [r for r in self.tables.get(table, []) if r.get("monthly_client_id")]
+
+    def watermarks(self):
+        return list(self.tables.get("monthly_client_watermarks", []))
+
+    def holidays(self):
+        return list(self.tables.get("feriados", []))
+
+    def disabled_dates(self):
+        return list(self.tables.get("disabled_dates", []))
+
+    def booked(self, table, start, end):
+        # Sem filtro por horário: quem chama já recorta o intervalo.
+        return list(self.tables.get(table, []))
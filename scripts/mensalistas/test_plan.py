@@ -0,0 +1,142 @@
+"""Casos da expansão, do diff e do ``plan.build``: ``python -m unittest scripts.mensalistas.test_plan``."""
+import io
+import json
+import pathlib
+import tempfile
+import unittest
+
+import numpy as np
+
+from . import constants, output, plan, recurrence
+from .recurrence import BIWEEKLY, MONTHLY, WEEKLY, Rules
+from .source import JsonSource
+
+
+def utc(*values):
+    return np.asarray(values, dtype="datetime64[s]")
+
+
+def client(id, day, hour, kind="weekly", service="Banho", condominium="Nenhum Condomínio"):
+    return {"id": id, "is_active": True, "pet_name": id, "owner_name": id, "service": service, "price": 100,
+            "condominium": condominium, "recurrence_type": kind, "recurrence_day": day, "recurrence_time": hour}
+
+
+class ExpandTest(unittest.TestCase):
+    def test_weekly(self):
+        owners, times = recurrence.expand(Rules(["a"], [WEEKLY], [1], [10]), "2026-10-19", "2026-11-09")
+        self.assertEqual(owners.tolist(), [0, 0, 0, 0])
+        # Segundas, 10h em São Paulo = 13h UTC.
+        np.testing.assert_array_equal(times, utc("2026-10-19T13:00", "2026-10-26T13:00", "2026-11-02T13:00",
+                                                 "2026-11-09T13:00"))
+
+    def test_biweekly_follows_anchor_phase(self):
+        rules = Rules(["a", "b"], [BIWEEKLY, BIWEEKLY], [1, 1], [10, 10], ["2026-10-12", "NaT"])
+        owners, times = recurrence.expand(rules, "2026-10-19", "2026-11-16")
+        self.assertEqual(recurrence.local_dates(times[owners == 0]).astype(str).tolist(),
+                         ["2026-10-26", "2026-11-09"])
+        self.assertEqual(recurrence.local_dates(times[owners == 1]).astype(str).tolist(),
+                         ["2026-10-19", "2026-11-02", "2026-11-16"])
+
+    def test_monthly_clamps_to_last_day(self):
+        owners, times = recurrence.expand(Rules(["a"], [MONTHLY], [31], [10]), "2026-11-01", "2027-02-28")
+        self.assertEqual(recurrence.local_dates(times).astype(str).tolist(),
+                         ["2026-11-30", "2026-12-31", "2027-01-31", "2027-02-28"])
+
+    def test_parallel_matches_serial(self):
+        rules = Rules(list("abcdef"), [WEEKLY, BIWEEKLY, MONTHLY] * 2, [1, 3, 15, 5, 2, 31], [9, 10, 11, 12, 14, 15])
+        serial = recurrence.expand(rules, "2026-10-01", "2026-12-31")
+        parallel = recurrence.expand_parallel(rules, "2026-10-01", "2026-12-31", 2)
+        np.testing.assert_array_equal(serial[0], parallel[0])
+        np.testing.assert_array_equal(serial[1], parallel[1])
+
+
+class MissingTest(unittest.TestCase):
+    def test_against_existing_rows(self):
+        owners = np.asarray([0, 0, 0, 1])
+        times = utc("2026-10-19T13:00", "2026-10-26T13:00", "2026-11-02T13:00", "2026-10-19T13:00")
+        existing_owners = np.asarray([0, 0, 0])
+        # A 30 min da gerada: já existe. A exatamente 1 h: não. A do cliente 0 não cobre o cliente 1.
+        existing_times = utc("2026-10-19T13:30", "2026-10-26T14:00", "2026-11-02T12:01")
+        mask = recurrence.missing(owners, times, existing_owners, existing_times)
+        self.assertEqual(mask.tolist(), [False, True, False, True])
+
+    def test_without_existing_rows(self):
+        mask = recurrence.missing(np.asarray([0]), utc("2026-10-19T13:00"), np.zeros(0, dtype=np.int64),
+                                  utc())
+        self.assertEqual(mask.tolist(), [True])
+
+
+class BuildTest(unittest.TestCase):
+    def build(self, tables, **kwargs):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = pathlib.Path(tmp) / "dump.json"
+            path.write_text(json.dumps(tables), encoding="utf-8")
+            return plan.build(JsonSource(path), "2026-10-19", "2026-11-09", today="2026-10-17", **kwargs)
+
+    def times(self, result, table):
+        return [row["appointment_time"] for row in result.rows.get(table, [])]
+
+    def test_calendar_closes_holidays_and_shifts_hour(self):
+        # 13h não é hora válida (almoço): vai para 12h. 2026-11-02 é Finados. O de 19/10 já foi gravado
+        # na hora da regra, antes do ajuste, e conta como a ocorrência.
+        tables = {"monthly_clients": [client("a", 1, 13)],
+                  "appointments": [{"id": "r1", "monthly_client_id": "a",
+                                    "appointment_time": "2026-10-19T16:00:00+00:00", "service": "Banho",
+                                    "price": 100, "status": "AGENDADO"}]}
+        result = self.build(tables, on_conflict=plan.IGNORE)
+        self.assertEqual(self.times(result, "appointments"), ["2026-10-26 15:00:00+00", "2026-11-09 15:00:00+00"])
+        self.assertEqual(result.stats["calendar"], {"closed": 1, "hour_moved": 3})
+        self.assertEqual(result.stats["missing"], 2)
+
+    def test_capacity_rejects_second_client(self):
+        tables = {"monthly_clients": [client("a", 1, 10), client("b", 1, 10)]}
+        result = self.build(tables, on_conflict=plan.REJECT)
+        self.assertEqual(len(result), 3)
+        self.assertEqual(result.stats["conflicts"], {"rejected": 3})
+
+    def test_capacity_reschedules_to_nearest_free_hour(self):
+        tables = {"monthly_clients": [client("a", 1, 10), client("b", 1, 10)]}
+        result = self.build(tables, on_conflict=plan.RESCHEDULE)
+        # Banho & Tosa Fixo abre às 10h: a hora livre mais próxima é 11h.
+        self.assertEqual(sorted(self.times(result, "agendamento_banhotosa")),
+                         ["2026-10-19 13:00:00+00", "2026-10-19 14:00:00+00", "2026-10-26 13:00:00+00",
+                          "2026-10-26 14:00:00+00", "2026-11-09 13:00:00+00", "2026-11-09 14:00:00+00"])
+        self.assertEqual(result.stats["conflicts"], {"rescheduled": 3})
+
+    def test_capacity_counts_existing_bookings(self):
+        tables = {"monthly_clients": [client("a", 1, 10)],
+                  "agendamento_banhotosa": [{"id": "x", "appointment_time": "2026-10-26T13:00:00+00:00",
+                                             "service": "Banho", "condominium": "Nenhum Condomínio",
+                                             "status": "AGENDADO"}]}
+        result = self.build(tables, on_conflict=plan.REJECT)
+        self.assertEqual(self.times(result, "agendamento_banhotosa"),
+                         ["2026-10-19 13:00:00+00", "2026-11-09 13:00:00+00"])
+
+
+class OutputTest(unittest.TestCase):
+    def test_sql_header_counts_written_rows(self):
+        rows = {"agendamento_banhotosa": [{"monthly_client_id": "a", "appointment_time": "2026-10-19 13:00:00+00"}]}
+        stats = {"clients": 2, "generated": 6, "missing": 6}
+        f = io.StringIO()
+        output.write_sql(plan.Plan(rows, stats), f)
+        self.assertIn("-- 1 linhas de 6 ocorrências", f.getvalue())
+        self.assertEqual(f.getvalue().count("'2026-10-19 13:00:00+00'"), 1)
+
+
+class ConstantsTest(unittest.TestCase):
+    def test_missing_names_fail_loudly(self):
+        text = constants.CONSTANTS_FILE.read_text(encoding="utf-8").replace("MAX_CAPACITY_PER_SLOT", "MAX_PER_SLOT")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = pathlib.Path(tmp) / "constants.ts"
+            path.write_text(text, encoding="utf-8")
+            with self.assertRaisesRegex(SystemExit, "MAX_CAPACITY_PER_SLOT"):
+                constants.load(path)
+
+    def test_app_constants_are_read(self):
+        values = constants.load()
+        self.assertEqual(values["SERVICES"]["BATH_AND_GROOMING"]["duration"], 2.0)
+        self.assertTrue(values["BATH_GROOMING_HOURS"])
+
+
+if __name__ == "__main__":
+    unittest.main()
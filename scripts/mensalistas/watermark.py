@@ -0,0 +1,81 @@
+"""Marca d'água por mensalista para a geração incremental (``monthly_client_watermarks``).
+
+Cada execução incremental grava, na mesma transação dos INSERTs, a última
+ocorrência já gerada de cada cliente (que também fixa a fase das quinzenais)
+e a regra usada. Só as marcas que mudaram são regravadas: numa noite comum,
+os clientes com uma ocorrência nova entrando no horizonte. Na execução
+seguinte:
+
+- regra igual: gera só de ``generated_until + 1`` até o fim do horizonte;
+- regra diferente (editada no ``EditMonthlyClientModal``, que só atualiza
+  ``monthly_clients`` e os dados dos agendamentos futuros, não os horários):
+  refaz a cauda a partir de hoje, apagando os futuros ainda não atendidos
+  que a regra nova não produz;
+- sem marca (cliente novo ou primeira execução): gera a partir de hoje.
+"""
+import datetime
+
+import numpy as np
+
+from . import recurrence
+
+TABLE = "monthly_client_watermarks"
+# Status de agendamento futuro que pode ser apagado quando a regra muda.
+OPEN_STATUSES = ("", "AGENDADO", "PENDING")
+
+
+def signature(row):
+    return (str(row["recurrence_type"]).strip().lower(), int(row["recurrence_day"]), int(row["recurrence_time"]))
+
+
+def load(source, clients):
+    """Marca de cada cliente, na ordem de ``clients`` (``None`` = sem marca)."""
+    by_client = {row["monthly_client_id"]: row for row in source.watermarks()}
+    return [by_client.get(c["id"]) for c in clients]
+
+
+def windows(clients, marks, today):
+    """Primeiro dia a gerar de cada cliente e a máscara dos que tiveram a regra alterada."""
+    today = np.datetime64(today, "D")
+    starts, changed = [], []
+    for client, mark in zip(clients, marks):
+        edited = mark is not None and signature(mark) != signature(client)
+        start = today if mark is None or edited else np.datetime64(mark["generated_until"], "D") + 1
+        starts.append(max(start, today))
+        changed.append(edited)
+    return np.asarray(starts, dtype="datetime64[D]"), np.asarray(changed, dtype=bool)
+
+
+def anchors(clients, marks):
+    """Última ocorrência gravada na marca, por id do cliente."""
+    return {c["id"]: mark["generated_until"] for c, mark in zip(clients, marks) if mark}
+
+
+def stale(existing, changed, owners, times, today, tolerance=recurrence.TOLERANCE):
+    """Posições em ``existing`` de agendamentos futuros em aberto que a regra nova dos alterados não produz."""
+    if not len(existing.owners):
+        return np.zeros(0, dtype=np.int64)
+    status = np.asarray([str(row.get("status") or "").upper() in OPEN_STATUSES for row in existing.rows])
+    tail = np.flatnonzero(changed[existing.owners] & status
+                          & (recurrence.local_dates(existing.times) >= np.datetime64(today, "D")))
+    return tail[recurrence.missing(existing.owners[tail], existing.times[tail], owners, times, tolerance)]
+
+
+def rows(clients, marks, owners, times):
+    """Marcas a regravar: ``owners``/``times`` são as ocorrências da regra no horizonte, ordenadas."""
+    last = {}
+    if len(owners):
+        ends = np.r_[owners[1:] != owners[:-1], True]
+        last = dict(zip(owners[ends].tolist(), recurrence.local_dates(times[ends]).tolist()))
+    now = datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")
+    updated = []
+    for code, (client, mark) in enumerate(zip(clients, marks)):
+        until = str(last[code]) if code in last else mark and str(mark["generated_until"])
+        if until is None:
+            continue  # nenhuma ocorrência ainda: a próxima execução começa de hoje de novo
+        if mark is not None and str(mark["generated_until"]) == until and signature(mark) == signature(client):
+            continue
+        kind, day, hour = signature(client)
+        updated.append({"monthly_client_id": client["id"], "generated_until": until, "recurrence_type": kind,
+                        "recurrence_day": day, "recurrence_time": hour, "updated_at": now})
+    return updated
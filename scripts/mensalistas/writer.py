@@ -0,0 +1,59 @@
+"""Gravação do plano direto pelo PostgREST, em lotes concorrentes e limitados.
+
+Alternativa ao SQL/COPY quando não há psql à mão. No máximo ``concurrency``
+requisições ficam no ar ao mesmo tempo. DELETE e o upsert das marcas são
+repetidos em falha transitória (``PostgrestSource.open``); os inserts dos
+agendamentos só em 429 ou conexão recusada, porque as tabelas não têm chave
+única que barre um lote gravado duas vezes. O tempo total acompanha o número
+de lotes, não o de clientes.
+
+Não há transação. A ordem é: apaga a cauda obsoleta, insere os lotes e só
+então grava as marcas d'água. Se algo falhar no meio, a marca não avança e a
+próxima execução refaz o diff, que já ignora o que entrou.
+"""
+import asyncio
+import time
+
+from . import watermark
+from .output import BATCH_ROWS, COLUMNS
+
+CONCURRENCY = 4
+# Ids por DELETE: o filtro ``id=in.(...)`` vai na URL.
+DELETE_IDS = 200
+
+
+def _chunks(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+async def apply(plan, source, concurrency=CONCURRENCY, batch_rows=BATCH_ROWS):
+    """Grava ``plan`` por ``source`` (``PostgrestSource``); devolve contagens e tempos."""
+    started = time.perf_counter()
+    semaphore = asyncio.Semaphore(concurrency)
+    requests = 0
+
+    async def send(method, table, params=None, body=None, prefer=None):
+        nonlocal requests
+        async with semaphore:
+            requests += 1
+            await asyncio.to_thread(source.open, method, table, params, body, prefer)
+
+    await asyncio.gather(*(send("DELETE", table, {"id": f"in.({','.join(ids)})"})
+                           for table, table_ids in sorted(plan.stale.items())
+                           for ids in _chunks(table_ids, DELETE_IDS)))
+    await asyncio.gather(*(send("POST", table, body=[{c: row.get(c) for c in COLUMNS} for row in batch],
+                                prefer="return=minimal")
+                           for table, rows in sorted(plan.rows.items())
+                           for batch in _chunks(rows, batch_rows)))
+    if plan.watermarks:
+        await asyncio.gather(*(send("POST", watermark.TABLE, {"on_conflict": "monthly_client_id"}, batch,
+                                    prefer="resolution=merge-duplicates,return=minimal")
+                               for batch in _chunks(plan.watermarks, batch_rows)))
+    return {
+        "deleted": sum(len(ids) for ids in plan.stale.values()),
+        "inserted": len(plan),
+        "watermarks": len(plan.watermarks),
+        "requests": requests,
+        "retries": source.retries,
+        "write_s": round(time.perf_counter() - started, 3),
+    }
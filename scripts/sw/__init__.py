@@ -0,0 +1,27 @@
+"""Gera o ``dist/sw.js`` do build a partir do manifesto do Vite (o ``sw.js`` da raiz é o modelo).
+
+O ``sw.js`` antigo pré-carregava caminhos de fonte (``/App.tsx``,
+``/constants.ts``) que não existem no deploy, com um nome de cache fixo que
+nunca invalidava. Depois do ``vite build`` (``build.manifest`` ligado no
+``vite.config.ts``), este comando preenche o ``BUILD`` do modelo com:
+
+- ``precache``: ``index.html`` e o que a entrada carrega (chunk de entrada,
+  imports estáticos, CSS e assets deles), cada um com a revisão: o hash do
+  nome para os arquivos em ``assets/`` (``null``) e o sha256 do conteúdo para
+  o resto. No ``install`` o worker monta o precache do build num cache
+  próprio (``sandypetshop-precache-<version>``), copia dos builds anteriores
+  o que não mudou de revisão e baixa só o resto; o worker antigo segue
+  servindo o dele até o ``activate`` trocar um pelo outro;
+- ``assets``: todos os arquivos com hash deste build. No ``activate`` o que
+  sobrar nos caches de outro build é apagado, aos poucos, deploy a deploy;
+- ``warm``: scripts e folhas de estilo de CDN do ``index.html``, guardados
+  já no ``install``.
+
+Com isso, a visita repetida no celular abre sem ida à rede: o ``index.html``
+e os chunks da entrada vêm do precache (o worker novo entra no lugar do
+velho na próxima visita). Imagens usam stale-while-revalidate, JS/CSS com
+hash cache-first, e Supabase e webhooks só rede.
+
+    vite build && python3 -m scripts.sw          # o que o npm run build faz
+    python3 -m scripts.sw dist --check           # só confere o manifesto e lista o precache
+"""
@@ -0,0 +1,82 @@
+import argparse
+import hashlib
+import json
+import pathlib
+import re
+import sys
+
+from scripts.bundle.chunks import entry_keys, read_manifest
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+TEMPLATE = ROOT / "sw.js"
+HASHED_DIR = "assets/"
+
+_BUILD_RE = re.compile(r"^const BUILD = .*;$", re.M)
+_WARM_RE = re.compile(r"""<script[^>]*\ssrc=["'](https://[^"']+)["']|<link[^>]*rel=["']stylesheet["'][^>]*href=["'](https://[^"']+)["']|@import\s+url\(["']?(https://[^"')]+)""")
+
+
+def revision(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest()[:16]
+
+
+def entry_files(manifest):
+    """Arquivos que a entrada carrega, na ordem do manifesto, sem repetição."""
+    files = []
+    for key in entry_keys(manifest):
+        entry = manifest[key]
+        for file in [entry["file"], *entry.get("css", []), *entry.get("assets", [])]:
+            if file not in files:
+                files.append(file)
+    return files
+
+
+def build_data(dist):
+    dist = pathlib.Path(dist)
+    manifest = read_manifest(dist)
+    if not manifest:
+        raise SystemExit(f"{dist}: sem manifesto do Vite (build.manifest no vite.config.ts)")
+    precache = [{"url": "/index.html", "revision": revision(dist / "index.html")}]
+    for file in entry_files(manifest):
+        hashed = file.startswith(HASHED_DIR)
+        precache.append({"url": f"/{file}", "revision": None if hashed else revision(dist / file)})
+    assets = sorted({f"/{file}" for entry in manifest.values()
+                     for file in [entry["file"], *entry.get("css", []), *entry.get("assets", [])]})
+    html = (dist / "index.html").read_text(encoding="utf-8")
+    warm = list(dict.fromkeys(url for groups in _WARM_RE.findall(html) for url in groups if url))
+    data = {"precache": precache, "assets": assets, "warm": warm}
+    data["version"] = hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()[:12]
+    return data
+
+
+def render(data, template=TEMPLATE):
+    text = pathlib.Path(template).read_text(encoding="utf-8")
+    ordered = {"version": data["version"], "precache": data["precache"], "assets": data["assets"],
+               "warm": data["warm"]}
+    text, found = _BUILD_RE.subn(lambda m: f"const BUILD = {json.dumps(ordered, indent=2)};", text, count=1)
+    if not found:
+        raise SystemExit(f"{template}: linha 'const BUILD = ...;' não encontrada")
+    return text
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m scripts.sw",
+                                     description="Gera o sw.js do build com precache versionado pelo manifesto do Vite.")
+    parser.add_argument("dist", nargs="?", default=str(ROOT / "dist"), help="diretório do build (padrão: dist)")
+    parser.add_argument("--template", default=str(TEMPLATE), help="modelo do service worker (padrão: sw.js)")
+    parser.add_argument("--check", action="store_true", help="não grava; só mostra o precache")
+    args = parser.parse_args(argv)
+    data = build_data(args.dist)
+    size = sum((pathlib.Path(args.dist) / entry["url"].lstrip("/")).stat().st_size for entry in data["precache"])
+    print(f"sw {data['version']}: {len(data['precache'])} no precache ({size / 1024:.0f} KB), "
+          f"{len(data['assets'])} assets com hash, {len(data['warm'])} de CDN")
+    for entry in data["precache"]:
+        print(f"  {entry['url']}  {entry['revision'] or '(hash no nome)'}")
+    if not args.check:
+        out = pathlib.Path(args.dist) / "sw.js"
+        out.write_text(render(data, args.template), encoding="utf-8")
+        print(f"Gravado {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
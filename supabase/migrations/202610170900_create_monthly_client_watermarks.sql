@@ -0,0 +1,23 @@
+-- Marca d'água da geração incremental de agendamentos dos mensalistas (python -m scripts.mensalistas --incremental)
+CREATE TABLE IF NOT EXISTS public.monthly_client_watermarks (
+    monthly_client_id uuid NOT NULL REFERENCES public.monthly_clients(id) ON DELETE CASCADE,
+    generated_until date NOT NULL, -- última ocorrência já gerada (data em São Paulo); fixa a fase das quinzenais
+
+    -- Regra usada na geração: se o EditMonthlyClientModal mudar qualquer uma, a cauda futura é refeita
+    recurrence_type text NOT NULL,
+    recurrence_day integer NOT NULL,
+    recurrence_time integer NOT NULL,
+
+    updated_at timestamp with time zone NOT NULL DEFAULT now(),
+
+    CONSTRAINT monthly_client_watermarks_pkey PRIMARY KEY (monthly_client_id)
+);
+
+-- Habilitar RLS (Row Level Security)
+ALTER TABLE public.monthly_client_watermarks ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Admins can do everything on monthly_client_watermarks"
+ON public.monthly_client_watermarks
+FOR ALL
+TO authenticated
+USING (true);
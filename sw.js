@@ -1,93 +1,170 @@
-// Service Worker for Caching Application Shell
-
-const CACHE_NAME = 'sandypetshop-cache-v1';
-const urlsToCache = [
-  '/',
-  '/index.html',
-  '/manifest.json',
-  '/index.tsx',
-  '/App.tsx',
-  '/constants.ts',
-  '/types.ts',
-  '/supabaseClient.ts',
-  'https://i.imgur.com/M3Gt3OA.png',
-  'https://cdn.tailwindcss.com',
-  'https://cdn.jsdelivr.net/npm/@supabase/supabase-js@2',
-  'https://fonts.googleapis.com/css2?family=Poppins:wght@400;500;600;700&family=Rochester&display=swap',
-  'https://static.thenounproject.com/png/pet-icon-6939415-512.png',
-  'https://static.thenounproject.com/png/profile-icon-709597-512.png',
-  'https://static.thenounproject.com/png/whatsapp-icon-6592278-512.png',
-  'https://static.thenounproject.com/png/pet-icon-7326432-512.png',
-  'https://static.thenounproject.com/png/location-icon-7979305-512.png'
-];
-
-// Install event: cache the application assets
+// Service Worker: precache generated at build time from the Vite manifest (python -m scripts.sw).
+// This file is the template; `npm run build` writes dist/sw.js with BUILD filled in. Served as-is
+// in dev the precache is empty (and index.tsx only registers the worker in production).
+
+const BUILD = { version: 'dev', precache: [], assets: [], warm: [] };
+
+const PREFIX = 'sandypetshop';
+// One precache per build: a new worker fills its own while the old one keeps serving the current one.
+const PRECACHE_PREFIX = `${PREFIX}-precache-`;
+const PRECACHE = `${PRECACHE_PREFIX}${BUILD.version}`;
+const ASSETS = `${PREFIX}-assets`;
+const IMAGES = `${PREFIX}-images`;
+const CDN = `${PREFIX}-cdn`;
+const CACHE_NAMES = [PRECACHE, ASSETS, IMAGES, CDN];
+// Revision of each precached URL, written once the precache of a build is complete.
+const REVISIONS_KEY = '/__precache-revisions__';
+const MAX_IMAGES = 150;
+
+// Supabase, edge functions and webhooks are never cached.
+const NETWORK_ONLY = [/\.supabase\.co\//, /\/functions\/v1\//, /webhook/i, /\/api\//];
+const CDN_SWR_HOSTS = ['cdn.tailwindcss.com', 'cdn.jsdelivr.net', 'fonts.googleapis.com'];
+const CDN_IMMUTABLE_HOSTS = ['fonts.gstatic.com'];
+const IMAGE_RE = /\.(png|jpe?g|gif|webp|avif|svg|ico)$/i;
+
+const absolute = (url) => new URL(url, self.location.origin).href;
+
+const cacheable = (response) => response && (response.ok || response.type === 'opaque');
+
+async function readRevisions(cache) {
+  const response = await cache.match(REVISIONS_KEY);
+  return response ? response.json() : {};
+}
+
+// Install: stage this build's precache, copying unchanged entries from earlier builds and
+// downloading only the rest. The active worker keeps serving its own precache until activate.
 self.addEventListener('install', (event) => {
-  event.waitUntil(
-    caches.open(CACHE_NAME)
-      .then((cache) => {
-        console.log('Opened cache');
-        return cache.addAll(urlsToCache);
-      })
-  );
+  event.waitUntil((async () => {
+    try {
+      await stagePrecache();
+    } catch (error) {
+      await caches.delete(PRECACHE);
+      throw error;
+    }
+    const cdn = await caches.open(CDN);
+    await Promise.all(BUILD.warm.map(async (url) => {
+      if (await cdn.match(url)) {
+        return;
+      }
+      try {
+        await cdn.put(url, await fetch(url, { mode: 'no-cors' }));
+      } catch (error) {
+        // Cached on first use instead.
+      }
+    }));
+  })());
 });
 
-// Fetch event: serve from cache, falling back to network
+async function stagePrecache() {
+  const staged = await caches.open(PRECACHE);
+  // Only complete precaches (revisions written) are copied from.
+  const sources = [];
+  for (const name of await caches.keys()) {
+    if (name.startsWith(PRECACHE_PREFIX) && name !== PRECACHE) {
+      const cache = await caches.open(name);
+      sources.push({ cache, revisions: await readRevisions(cache) });
+    }
+  }
+  await Promise.all(BUILD.precache.map(async ({ url, revision }) => {
+    if (await staged.match(url)) {
+      return;
+    }
+    for (const { cache, revisions } of sources) {
+      const cached = url in revisions && revisions[url] === revision ? await cache.match(url) : undefined;
+      if (cached) {
+        await staged.put(url, cached);
+        return;
+      }
+    }
+    const response = await fetch(url, { cache: 'no-cache' });
+    if (!response.ok) {
+      throw new Error(`precache ${url}: ${response.status}`);
+    }
+    await staged.put(url, response);
+  }));
+  const revisions = Object.fromEntries(BUILD.precache.map(({ url, revision }) => [url, revision]));
+  await staged.put(REVISIONS_KEY, new Response(JSON.stringify(revisions), {
+    headers: { 'Content-Type': 'application/json' },
+  }));
+}
+
+// Activate: this build's precache takes over; earlier precaches, legacy caches and hashed files
+// of other builds are dropped.
+self.addEventListener('activate', (event) => {
+  event.waitUntil((async () => {
+    const names = await caches.keys();
+    await Promise.all(names.filter((name) => !CACHE_NAMES.includes(name)).map((name) => caches.delete(name)));
+
+    const built = new Set(BUILD.assets.map(absolute));
+    const assets = await caches.open(ASSETS);
+    for (const request of await assets.keys()) {
+      if (!built.has(request.url)) {
+        await assets.delete(request);
+      }
+    }
+    await trim(IMAGES, MAX_IMAGES);
+  })());
+});
+
+async function trim(name, max) {
+  const cache = await caches.open(name);
+  const keys = await cache.keys();
+  await Promise.all(keys.slice(0, Math.max(0, keys.length - max)).map((request) => cache.delete(request)));
+}
+
+// Hashed files never change: cache first, network only on a miss.
+async function cacheFirst(name, request) {
+  const cached = await caches.match(request);
+  if (cached) {
+    return cached;
+  }
+  const response = await fetch(request);
+  if (cacheable(response)) {
+    const cache = await caches.open(name);
+    await cache.put(request, response.clone());
+  }
+  return response;
+}
+
+async function staleWhileRevalidate(name, request, event) {
+  const cache = await caches.open(name);
+  const cached = await cache.match(request);
+  const network = fetch(request).then((response) => {
+    if (cacheable(response)) {
+      cache.put(request, response.clone());
+    }
+    return response;
+  });
+  if (cached) {
+    event.waitUntil(network.catch(() => undefined));
+    return cached;
+  }
+  return network;
+}
+
+// SPA navigations get this build's index.html; a new one arrives with the next worker.
+async function appShell(request) {
+  const cached = await caches.match('/index.html', { cacheName: PRECACHE });
+  return cached || fetch(request);
+}
+
 self.addEventListener('fetch', (event) => {
-  // Evitar fazer cache ou interceptar chamadas da API do Supabase e Webhooks
-  if (event.request.url.includes('supabase.co') || event.request.url.includes('webhook')) {
+  const { request } = event;
+  if (request.method !== 'GET' || NETWORK_ONLY.some((pattern) => pattern.test(request.url))) {
     return;
   }
+  const url = new URL(request.url);
+  const sameOrigin = url.origin === self.location.origin;
 
-  // We only want to cache GET requests for our assets.
-  if (event.request.method !== 'GET') {
-    return;
+  if (request.mode === 'navigate' && sameOrigin && !/\.\w+$/.test(url.pathname)) {
+    event.respondWith(appShell(request));
+  } else if (sameOrigin && url.pathname.startsWith('/assets/')) {
+    event.respondWith(cacheFirst(ASSETS, request));
+  } else if (request.destination === 'image' || IMAGE_RE.test(url.pathname)) {
+    event.respondWith(staleWhileRevalidate(IMAGES, request, event));
+  } else if (CDN_IMMUTABLE_HOSTS.includes(url.hostname)) {
+    event.respondWith(cacheFirst(CDN, request));
+  } else if (CDN_SWR_HOSTS.includes(url.hostname)) {
+    event.respondWith(staleWhileRevalidate(CDN, request, event));
   }
-  
-  event.respondWith(
-    caches.match(event.request)
-      .then((response) => {
-        // Cache hit - return response from cache
-        if (response) {
-          return response;
-        }
-
-        // Not in cache - fetch from network
-        const fetchRequest = event.request.clone();
-
-        return fetch(fetchRequest).then(
-          (response) => {
-            // Check if we received a valid response to cache
-            // Don't cache Supabase API requests, only our app shell assets.
-            if (!response || response.status !== 200 || (response.type !== 'basic' && response.type !== 'cors')) {
-              return response;
-            }
-
-            const responseToCache = response.clone();
-            caches.open(CACHE_NAME)
-              .then((cache) => {
-                cache.put(event.request, responseToCache);
-              });
-
-            return response;
-          }
-        );
-      })
-  );
 });
-
-// Activate event: clean up old caches
-self.addEventListener('activate', (event) => {
-  const cacheWhitelist = [CACHE_NAME];
-  event.waitUntil(
-    caches.keys().then((cacheNames) => {
-      return Promise.all(
-        cacheNames.map((cacheName) => {
-          if (cacheWhitelist.indexOf(cacheName) === -1) {
-            return caches.delete(cacheName);
-          }
-        })
-      );
-    })
-  );
-});
\ No newline at end of file
@@ -0,0 +1,104 @@
+"""Benchmark: abertura do Financeiro e do Insights IA com histórico grande.
+
+Complementa TC011/TC012. Para cada tamanho, sobe o backend local com o seed
+normal mais N linhas sintéticas (``harness.backend.synthetic``) e mede,
+numa viewport de tablet e com a CPU desacelerada, quanto cada dashboard
+leva para ficar interativo, o tempo de script e o pico de heap.
+
+    python testsprite_tests/BENCH001_Admin_dashboards_render_with_large_history.py
+    python testsprite_tests/BENCH001_Admin_dashboards_render_with_large_history.py --sizes 10000 --cpu-throttle 1
+
+Não entra no run_suite.py (o padrão é TC*.py): cada tamanho leva minutos.
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import sys
+
+from harness import bench, config, steps
+from harness.backend import LocalSupabase, stack, synthetic
+from harness.backend.store import Store
+from harness.pool import BrowserPool
+
+SIZES = (10_000, 100_000, 500_000)
+# Tablet da loja em paisagem: largura suficiente para o menu lateral fixo do admin.
+TABLET_VIEWPORT = {"width": 1280, "height": 800}
+CPU_THROTTLE = 4
+FINANCIAL_PASSWORD = "172702"
+
+
+async def open_financial(page):
+    await page.locator("button:visible", has_text="Financeiro").first.click()
+    await page.locator("input[type=password][placeholder=Senha]").fill(FINANCIAL_PASSWORD)
+    await page.get_by_role("button", name="Entrar").click()
+
+
+async def open_insights(page):
+    await page.locator("button:visible", has_text="Insights IA").first.click()
+
+
+DASHBOARDS = {
+    "FinancialDashboardView": open_financial,
+    "InsightsDashboard": open_insights,
+}
+
+
+async def measure_dashboards(pool, cpu_throttle):
+    results = {}
+    async with pool.admin_context() as context:
+        for name, open_dashboard in DASHBOARDS.items():
+            # Página nova por dashboard: cada medição começa do painel recém-aberto.
+            page = await context.new_page()
+            await bench.throttle_cpu(page, cpu_throttle)
+            await page.goto(config.BASE_URL, wait_until="domcontentloaded")
+            await steps.ready(page, label="painel admin", timeout_ms=bench.SETTLE_TIMEOUT_MS)
+            results[name] = await bench.measure(page, lambda: open_dashboard(page), label=name)
+            await page.close()
+    return results
+
+
+async def run_benchmark(sizes=SIZES, cpu_throttle=CPU_THROTTLE, max_rows=None, port=config.BACKEND_PORT):
+    stack.isolate_cache()
+    vite = stack.start_vite(f"http://127.0.0.1:{port}")
+    rows = []
+    try:
+        async with BrowserPool(size=1, context_options={"viewport": TABLET_VIEWPORT}) as pool:
+            for size in sizes:
+                store = synthetic.seed_store(Store.from_seed(), size)
+                with LocalSupabase(port=port, store=store, max_rows=max_rows):
+                    for dashboard, metrics in (await measure_dashboards(pool, cpu_throttle)).items():
+                        rows.append({"rows": size, "dashboard": dashboard, **metrics})
+                        print(f"{size:>8} {dashboard:24} tti {metrics['tti_ms']:>9.0f} ms  "
+                              f"script {metrics['scripting_ms']:>9.0f} ms  "
+                              f"heap {metrics['peak_heap_bytes'] / 2**20:>7.1f} MB"
+                              + ("  (timeout)" if metrics["timed_out"] else ""))
+    finally:
+        stack.stop_vite(vite)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dos dashboards admin com histórico grande.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="linhas sintéticas por rodada")
+    parser.add_argument("--cpu-throttle", type=float, default=CPU_THROTTLE,
+                        help="fator de desaceleração da CPU (padrão: %(default)s, aproxima um tablet)")
+    parser.add_argument("--max-rows", type=int, help="limite de linhas por resposta, como o 'Max rows' do Supabase")
+    parser.add_argument("--port", type=int, default=config.BACKEND_PORT)
+    parser.add_argument("--output", help="JSON de saída (padrão: .cache/local/bench/dashboards-<data>.json)")
+    args = parser.parse_args(argv)
+
+    rows = asyncio.run(run_benchmark(args.sizes, args.cpu_throttle, args.max_rows, args.port))
+    output = args.output
+    if output is None:
+        (config.CACHE_DIR / "bench").mkdir(parents=True, exist_ok=True)
+        stamp = datetime.datetime.now().strftime("%Y%m%dT%H%M%S")
+        output = config.CACHE_DIR / "bench" / f"dashboards-{stamp}.json"
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(rows, f, ensure_ascii=False, indent=2)
+    print(f"Resultados: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
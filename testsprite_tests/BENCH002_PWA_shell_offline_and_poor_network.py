@@ -0,0 +1,92 @@
+"""Benchmark: shell do app com o service worker em 3G, Wi-Fi instável e sem rede.
+
+Complementa TC007/TC011, que navegam com a rede ligada. Para cada perfil de
+``harness.offline.PROFILES`` mede a primeira visita (sem cache), a recarga
+com o ``sw.js`` instalado e a recarga offline: tempo até o shell aparecer,
+razão de acertos nos caches do service worker (``offline.CACHE_NAMES``) e
+bytes vindos do cache e da rede.
+
+    python testsprite_tests/BENCH002_PWA_shell_offline_and_poor_network.py
+    python testsprite_tests/BENCH002_PWA_shell_offline_and_poor_network.py --profiles 3g offline --repeat 3
+    python testsprite_tests/BENCH002_PWA_shell_offline_and_poor_network.py --local-backend
+
+Roda contra o build de produção: ``npm run build`` (``vite build`` + o
+``sw.js`` gerado por ``scripts.sw``) servido por ``vite preview`` no
+BASE_URL. Com ``--no-build``, mede o que já estiver no BASE_URL, que
+precisa ser um build de produção: no ``vite`` de desenvolvimento o
+precache do ``sw.js`` é vazio e tudo dá 0 acertos.
+
+Não entra no run_suite.py (o padrão é TC*.py).
+"""
+import argparse
+import asyncio
+import contextlib
+import datetime
+import json
+import sys
+
+from harness import config, offline
+from harness.backend import stack
+from harness.pool import BrowserPool
+
+LOADS = ("cold", "warm", "offline")
+
+
+def _fmt_ms(value):
+    return f"{value:>8.0f} ms" if value is not None else f"{'—':>11}"
+
+
+def print_row(result):
+    print(f"{result['profile']:14} sw={result['sw_state']:<15} "
+          f"cache {result['cached_entries']} entradas / {result['cached_bytes'] / 1024:.0f} KB")
+    for load in LOADS:
+        m = result[load]
+        ratio = f"{m['cache_hit_ratio']:.0%}" if m["cache_hit_ratio"] is not None else "—"
+        print(f"  {load:8} shell {_fmt_ms(m['shell_ms'])}  dcl {_fmt_ms(m['dcl_ms'])}  "
+              f"acertos {m['cache_hits']:>3}/{m['assets']:<3} ({ratio:>4})  "
+              f"cache {m['cache_bytes'] / 1024:>7.0f} KB  rede {m['network_bytes'] / 1024:>7.0f} KB"
+              + (f"  erro: {m['error']}" if m["error"] else ""))
+
+
+async def run_benchmark(profiles, repeat=1):
+    rows = []
+    async with BrowserPool(size=1) as pool:
+        for profile in profiles:
+            for run in range(repeat):
+                result = {"run": run, **await offline.measure_profile(pool, profile, seed=run)}
+                print_row(result)
+                rows.append(result)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shell do app com service worker em rede ruim e offline.")
+    parser.add_argument("--profiles", nargs="+", choices=list(offline.PROFILES), default=list(offline.PROFILES))
+    parser.add_argument("--repeat", type=int, default=1, help="rodadas por perfil (contexto novo em cada)")
+    parser.add_argument("--local-backend", action="store_true",
+                        help="sobe o stand-in local do Supabase e builda o app apontando para ele")
+    parser.add_argument("--no-build", action="store_true",
+                        help="não builda nem sobe o vite preview; usa o build de produção já servido no BASE_URL")
+    parser.add_argument("--backend-port", type=int, default=config.BACKEND_PORT)
+    parser.add_argument("--output", help="JSON de saída (padrão: .cache/bench/pwa-<data>.json)")
+    args = parser.parse_args(argv)
+
+    if args.local_backend:
+        server = stack.local_stack(args.backend_port, with_vite=not args.no_build, preview=True)
+    else:
+        server = contextlib.nullcontext() if args.no_build else stack.preview_server()
+    with server:
+        rows = asyncio.run(run_benchmark(args.profiles, args.repeat))
+    output = args.output
+    if output is None:
+        (config.CACHE_DIR / "bench").mkdir(parents=True, exist_ok=True)
+        stamp = datetime.datetime.now().strftime("%Y%m%dT%H%M%S")
+        output = config.CACHE_DIR / "bench" / f"pwa-{stamp}.json"
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(rows, f, ensure_ascii=False, indent=2)
+    print(f"Resultados: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""Carga: clientes agendando ao mesmo tempo nos formulários públicos.
+
+Para cada nível de ``--concurrency`` sobe um backend local limpo e dispara
+``--customers`` clientes (Banho & Tosa, Pet Móvel, Creche e Hotel, na
+proporção de ``--mix``) disputando ``--slots`` horários. A maioria refaz as
+chamadas da API por HTTP (``harness.load``); com ``--browsers N``, N deles
+agendam Banho & Tosa pela interface, com o Vite apontando para o backend.
+
+    python testsprite_tests/LOAD001_Concurrent_booking_slot_contention.py
+    python testsprite_tests/LOAD001_Concurrent_booking_slot_contention.py --concurrency 1 10 50 200 --customers 500
+    python testsprite_tests/LOAD001_Concurrent_booking_slot_contention.py --rate 20 --browsers 4
+
+Relata vazão, percentis de latência por chamada e os horários com mais
+agendamentos que ``MAX_CAPACITY_PER_SLOT``; sai com código 1 se houver
+algum. Não entra no run_suite.py (o padrão é TC*.py).
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import sys
+
+from playwright import async_api
+
+from harness import config, load
+from harness.backend import LocalSupabase, stack
+from harness.pool import BrowserPool
+
+CONCURRENCY = (1, 10, 50)
+CUSTOMERS = 200
+SLOTS = 3
+MIX = {"banho_tosa": 0.5, "pet_movel": 0.3, "creche": 0.1, "hotel": 0.1}
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        flow, _, weight = part.partition("=")
+        if flow not in load.FLOWS:
+            raise argparse.ArgumentTypeError(f"fluxo desconhecido: {flow} (use {', '.join(load.FLOWS)})")
+        mix[flow] = float(weight or 1)
+    return mix
+
+
+def print_level(concurrency, report):
+    booking = report["booking_ms"]
+    print(f"concorrência {concurrency:>4}: {report['customers']} clientes em {report['elapsed_s']:.1f} s, "
+          f"{report['bookings_per_s']} agend./s, {report['requests_per_s']} req./s, "
+          f"p50 {booking['p50']} ms p95 {booking['p95']} ms p99 {booking['p99']} ms  {report['outcomes']}")
+    for op, stats in report["ops_ms"].items():
+        print(f"    {op:18} n={stats['n']:<6} p50 {stats['p50']:>8} ms  p95 {stats['p95']:>8} ms  p99 {stats['p99']:>8} ms")
+    for v in report["violations"]:
+        print(f"    DUPLICADO {v['calendar']} {v['date']} {v['hour']}:00 -> {v['bookings']} agendamentos "
+              f"(capacidade {v['capacity']})")
+
+
+async def run_level(url, args, concurrency):
+    slots = load.hot_slots(args.slots)
+    async with async_api.async_playwright() as pw:
+        api = await pw.request.new_context(base_url=url, extra_http_headers={
+            "apikey": stack.LOCAL_ANON_KEY, "Authorization": f"Bearer {stack.LOCAL_ANON_KEY}",
+        })
+        try:
+            if not args.browsers:
+                return await load.run_load(api, args.customers, concurrency, slots, args.mix, args.rate, args.seed)
+            async with BrowserPool(size=args.browsers) as pool:
+                return await load.run_load(api, args.customers, concurrency, slots, args.mix, args.rate, args.seed,
+                                           browser_pool=pool, browsers=args.browsers)
+        finally:
+            await api.dispose()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Carga de agendamentos simultâneos contra o backend local.")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=list(CONCURRENCY),
+                        help="clientes simultâneos; um backend limpo por nível (padrão: %(default)s)")
+    parser.add_argument("--customers", type=int, default=CUSTOMERS, help="clientes por nível")
+    parser.add_argument("--slots", type=int, default=SLOTS, help="horários disputados (padrão: %(default)s)")
+    parser.add_argument("--mix", type=parse_mix, default=MIX,
+                        help="proporção dos fluxos, ex.: banho_tosa=5,pet_movel=3,creche=1,hotel=1")
+    parser.add_argument("--rate", type=float, help="chegadas por segundo (Poisson); sem isto, todos de uma vez")
+    parser.add_argument("--browsers", type=int, default=0, help="clientes que agendam pela interface")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--backend-port", type=int, default=config.BACKEND_PORT)
+    parser.add_argument("--output", help="JSON de saída (padrão: .cache/local/bench/load-<data>.json)")
+    args = parser.parse_args(argv)
+
+    stack.isolate_cache()
+    vite = stack.start_vite(f"http://127.0.0.1:{args.backend_port}") if args.browsers else None
+    levels = []
+    try:
+        for concurrency in args.concurrency:
+            with LocalSupabase(port=args.backend_port) as backend:
+                report = asyncio.run(run_level(backend.url, args, concurrency))
+            print_level(concurrency, report)
+            levels.append({"concurrency": concurrency, **report})
+    finally:
+        if vite:
+            stack.stop_vite(vite)
+
+    output = args.output
+    if output is None:
+        (config.CACHE_DIR / "bench").mkdir(parents=True, exist_ok=True)
+        stamp = datetime.datetime.now().strftime("%Y%m%dT%H%M%S")
+        output = config.CACHE_DIR / "bench" / f"load-{stamp}.json"
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(levels, f, ensure_ascii=False, indent=2)
+    print(f"Resultados: {output}")
+    return 1 if any(level["violations"] for level in levels) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
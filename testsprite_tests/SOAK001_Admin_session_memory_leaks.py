@@ -0,0 +1,114 @@
+"""Soak: painel admin aberto por horas, trocando de seção, à procura de vazamentos.
+
+Sobe o backend local e o Vite, abre o painel já logado e percorre Banho &
+Tosa, Pet Móvel, Creche, Hotel Pet, Clientes e Mensalistas em ciclo. A cada
+ciclo tira uma amostra de heap, nós do DOM, listeners e canais realtime
+(``harness.soak``). Enquanto isso, um agendamento é inserido e apagado no
+backend a cada ``--realtime-every`` segundos, para o ``admin_changes_realtime``
+entregar eventos como na recepção; o volume de dados não cresce.
+
+    python testsprite_tests/SOAK001_Admin_session_memory_leaks.py --hours 4
+    python testsprite_tests/SOAK001_Admin_session_memory_leaks.py --minutes 20 --heap-growth 0.5
+
+Sai com código 1 se algum crescimento passar do limite. Não entra no
+run_suite.py (o padrão é TC*.py).
+"""
+import argparse
+import asyncio
+import contextlib
+import datetime
+import json
+import random
+import sys
+import time
+
+from harness import config, soak, steps
+from harness.backend import stack, synthetic
+from harness.pool import BrowserPool
+
+REALTIME_EVERY_S = 60
+
+
+async def churn_realtime(backend, every_s, seed=0):
+    """Insere um agendamento e o apaga metade do período depois, para sempre."""
+    rng = random.Random(seed)
+    while True:
+        row = synthetic.booking(rng)
+        await asyncio.to_thread(backend.store.insert, "appointments", [row])
+        await asyncio.sleep(every_s / 2)
+        await asyncio.to_thread(backend.store.delete, "appointments", lambda r, id_=row["id"]: r["id"] == id_)
+        await asyncio.sleep(every_s / 2)
+
+
+async def run_soak(backend, duration_s, realtime_every_s=REALTIME_EVERY_S):
+    samples = []
+    churn = asyncio.create_task(churn_realtime(backend, realtime_every_s)) if realtime_every_s else None
+    try:
+        async with BrowserPool(size=1) as pool, pool.admin_context() as context:
+            page = await context.new_page()
+            channels = soak.ChannelTracker(page)
+            await page.goto(config.BASE_URL, wait_until="domcontentloaded")
+            await steps.ready(page, label="painel admin", timeout_ms=soak.SETTLE_TIMEOUT_MS)
+            cdp = await soak.open_session(page)
+            deadline = time.monotonic() + duration_s
+            while time.monotonic() < deadline:
+                timed_out = await soak.cycle(page)
+                samples.append({**await soak.sample(cdp, channels), "timed_out_steps": timed_out})
+                s = samples[-1]
+                print(f"{len(samples):>5} heap {s['heap_bytes'] / 2**20:>7.1f} MB  nós {s['dom_nodes']:>7}  "
+                      f"listeners {s['listeners']:>6}  canais {s['channels']} {s['channel_topics']}")
+    finally:
+        if churn:
+            churn.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await churn
+    return samples
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Soak do painel admin: heap, DOM e canais realtime.")
+    duration = parser.add_mutually_exclusive_group()
+    duration.add_argument("--hours", type=float, default=2.0)
+    duration.add_argument("--minutes", type=float)
+    parser.add_argument("--realtime-every", type=float, default=REALTIME_EVERY_S,
+                        help="segundos entre inserções via realtime (0 desliga; padrão: %(default)s)")
+    parser.add_argument("--heap-growth", type=float, default=soak.THRESHOLDS["heap_bytes"],
+                        help="crescimento relativo aceito do heap (padrão: %(default)s)")
+    parser.add_argument("--dom-growth", type=float, default=soak.THRESHOLDS["dom_nodes"])
+    parser.add_argument("--listener-growth", type=float, default=soak.THRESHOLDS["listeners"])
+    parser.add_argument("--backend-port", type=int, default=config.BACKEND_PORT)
+    parser.add_argument("--output", help="JSON de saída (padrão: .cache/local/bench/soak-<data>.json)")
+    args = parser.parse_args(argv)
+    duration_s = (args.minutes * 60) if args.minutes is not None else args.hours * 3600
+    thresholds = {"heap_bytes": args.heap_growth, "dom_nodes": args.dom_growth, "listeners": args.listener_growth}
+
+    with stack.local_stack(args.backend_port) as backend:
+        samples = asyncio.run(run_soak(backend, duration_s, args.realtime_every))
+
+    try:
+        violations = soak.check_growth(samples, thresholds)
+    except ValueError as exc:
+        print(f"Soak curto demais: {exc}")
+        violations = None
+    summary = soak.summarize(samples) if samples else {}
+    output = args.output
+    if output is None:
+        (config.CACHE_DIR / "bench").mkdir(parents=True, exist_ok=True)
+        stamp = datetime.datetime.now().strftime("%Y%m%dT%H%M%S")
+        output = config.CACHE_DIR / "bench" / f"soak-{stamp}.json"
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"summary": summary, "thresholds": thresholds, "violations": violations, "samples": samples},
+                  f, ensure_ascii=False, indent=2)
+    print(f"Resultados: {output}")
+
+    if summary.get("missing_topics"):
+        print(f"Aviso: canais realtime nunca abertos: {', '.join(summary['missing_topics'])}")
+    if violations is None:
+        return 2
+    for violation in violations:
+        print(f"VAZAMENTO {violation}")
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,32 +2,18 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+from harness import steps
+from harness.pages import SchedulerPage
+from harness.session import scenario_context
+
+async def run_test(context=None):
+    # Use the context handed out by run_suite.py, or launch a private browser when run standalone
+    async with scenario_context(context) as context:
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
         page = await context.new_page()
+        scheduler = SchedulerPage(page)
         
         # Navigate to your target URL and wait until the network request is committed
         await page.goto("http://localhost:5000", wait_until="commit", timeout=10000)
@@ -47,181 +33,143 @@ async def run_test():
         
         # Interact with the page elements to simulate user flow
         # -> Select service type Banho & Tosa
-        frame = context.pages[-1]
         # Click on Banho & Tosa service button
-        elem = frame.locator('xpath=html/body/div/div/section/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.service_card("Banho & Tosa")
+        await steps.ready(page, elem, 'Click on Banho & Tosa service button'); await elem.click(timeout=5000)
         
 
         # -> Fill in pet and owner details with valid data and proceed
-        frame = context.pages[-1]
         # Input pet name
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Rex')
+        elem = scheduler.pet_name
+        await steps.ready(page, elem, 'Input pet name'); await elem.fill('Rex')
         
 
-        frame = context.pages[-1]
         # Input pet breed
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Golden Retriever')
+        await scheduler.fill_breed('Golden Retriever', 'Input pet breed')
         
 
-        frame = context.pages[-1]
         # Input owner name
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[3]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('John Doe')
+        elem = scheduler.owner_name
+        await steps.ready(page, elem, 'Input owner name'); await elem.fill('John Doe')
         
 
-        frame = context.pages[-1]
         # Input owner address
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123 Pet Street')
+        elem = scheduler.owner_address
+        await steps.ready(page, elem, 'Input owner address'); await elem.fill('123 Pet Street')
         
 
-        frame = context.pages[-1]
         # Input owner WhatsApp number
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[5]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('(11) 91234-5678')
+        elem = scheduler.whatsapp
+        await steps.ready(page, elem, 'Input owner WhatsApp number'); await elem.fill('(11) 91234-5678')
         
 
-        frame = context.pages[-1]
         # Click Próximo to proceed to next step
-        elem = frame.locator('xpath=html/body/div/div/main/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.submit
+        await steps.ready(page, elem, 'Click Próximo to proceed to next step'); await elem.click(timeout=5000)
         
 
         # -> Click Banho & Tosa service button again to restart the scheduling flow
-        frame = context.pages[-1]
         # Click on Banho & Tosa service button to restart scheduling flow
-        elem = frame.locator('xpath=html/body/div/div/section/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click Banho & Tosa service button to start scheduling flow
-        frame = context.pages[-1]
-        # Click on Banho & Tosa service button
-        elem = frame.locator('xpath=html/body/div/div/section/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.service_card("Banho & Tosa")
+        await steps.ready(page, elem, 'Click on Banho & Tosa service button to restart scheduling flow'); await elem.click(timeout=5000)
         
 
         # -> Input valid pet and owner details and click Próximo to proceed
-        frame = context.pages[-1]
         # Input pet name
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Rex')
+        elem = scheduler.pet_name
+        await steps.ready(page, elem, 'Input pet name'); await elem.fill('Rex')
         
 
-        frame = context.pages[-1]
         # Input pet breed
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Golden Retriever')
+        await scheduler.fill_breed('Golden Retriever', 'Input pet breed')
         
 
-        frame = context.pages[-1]
         # Input owner name
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[3]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('John Doe')
+        elem = scheduler.owner_name
+        await steps.ready(page, elem, 'Input owner name'); await elem.fill('John Doe')
         
 
-        frame = context.pages[-1]
         # Input owner address
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123 Pet Street')
+        elem = scheduler.owner_address
+        await steps.ready(page, elem, 'Input owner address'); await elem.fill('123 Pet Street')
         
 
-        frame = context.pages[-1]
         # Input owner WhatsApp number
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[5]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('11912345678')
+        elem = scheduler.whatsapp
+        await steps.ready(page, elem, 'Input owner WhatsApp number'); await elem.fill('11912345678')
         
 
-        frame = context.pages[-1]
         # Click Próximo to proceed to next step
-        elem = frame.locator('xpath=html/body/div/div/main/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.submit
+        await steps.ready(page, elem, 'Click Próximo to proceed to next step'); await elem.click(timeout=5000)
         
 
         # -> Click Banho & Tosa service button to start scheduling flow
-        frame = context.pages[-1]
         # Click on Banho & Tosa service button
-        elem = frame.locator('xpath=html/body/div/div/section/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.service_card("Banho & Tosa")
+        await steps.ready(page, elem, 'Click on Banho & Tosa service button'); await elem.click(timeout=5000)
         
 
         # -> Input valid pet and owner details carefully to enable 'Próximo' button
-        frame = context.pages[-1]
         # Input pet name
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Rex')
+        elem = scheduler.pet_name
+        await steps.ready(page, elem, 'Input pet name'); await elem.fill('Rex')
         
 
-        frame = context.pages[-1]
         # Input pet breed
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Golden Retriever')
+        await scheduler.fill_breed('Golden Retriever', 'Input pet breed')
         
 
-        frame = context.pages[-1]
         # Input owner name
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[3]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('John Doe')
+        elem = scheduler.owner_name
+        await steps.ready(page, elem, 'Input owner name'); await elem.fill('John Doe')
         
 
-        frame = context.pages[-1]
         # Input owner address
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123 Pet Street')
+        elem = scheduler.owner_address
+        await steps.ready(page, elem, 'Input owner address'); await elem.fill('123 Pet Street')
         
 
-        frame = context.pages[-1]
         # Input owner WhatsApp number
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[5]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('11912345678')
+        elem = scheduler.whatsapp
+        await steps.ready(page, elem, 'Input owner WhatsApp number'); await elem.fill('11912345678')
         
 
         # -> Click Banho & Tosa service button to restart scheduling flow
-        frame = context.pages[-1]
         # Click on Banho & Tosa service button to restart scheduling flow
-        elem = frame.locator('xpath=html/body/div/div/section/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.service_card("Banho & Tosa")
+        await steps.ready(page, elem, 'Click on Banho & Tosa service button to restart scheduling flow'); await elem.click(timeout=5000)
         
 
         # -> Input valid pet and owner details carefully to enable 'Próximo' button
-        frame = context.pages[-1]
         # Input pet name
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Rex')
+        elem = scheduler.pet_name
+        await steps.ready(page, elem, 'Input pet name'); await elem.fill('Rex')
         
 
-        frame = context.pages[-1]
         # Input pet breed
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Golden Retriever')
+        await scheduler.fill_breed('Golden Retriever', 'Input pet breed')
         
 
-        frame = context.pages[-1]
         # Input owner name
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[3]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('John Doe')
+        elem = scheduler.owner_name
+        await steps.ready(page, elem, 'Input owner name'); await elem.fill('John Doe')
         
 
-        frame = context.pages[-1]
         # Input owner address
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123 Pet Street')
+        elem = scheduler.owner_address
+        await steps.ready(page, elem, 'Input owner address'); await elem.fill('123 Pet Street')
         
 
-        frame = context.pages[-1]
         # Input owner WhatsApp number
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[5]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('11912345678')
+        elem = scheduler.whatsapp
+        await steps.ready(page, elem, 'Input owner WhatsApp number'); await elem.fill('11912345678')
         
 
         # -> Click 'Próximo' button to proceed to service selection step
-        frame = context.pages[-1]
         # Click 'Próximo' button to proceed to service selection step
-        elem = frame.locator('xpath=html/body/div/div/footer/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.submit
+        await steps.ready(page, elem, "Click 'Próximo' button to proceed to service selection step"); await elem.click(timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -230,15 +178,6 @@ async def run_test():
             await expect(frame.locator('text=Appointment Successfully Scheduled').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: The appointment scheduling for Banho & Tosa did not complete successfully as per the test plan. The confirmation message 'Appointment Successfully Scheduled' was not found on the page.")
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
@@ -2,32 +2,18 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+from harness import steps
+from harness.pages import SchedulerPage
+from harness.session import scenario_context
+
+async def run_test(context=None):
+    # Use the context handed out by run_suite.py, or launch a private browser when run standalone
+    async with scenario_context(context) as context:
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
         page = await context.new_page()
+        scheduler = SchedulerPage(page)
         
         # Navigate to your target URL and wait until the network request is committed
         await page.goto("http://localhost:5000", wait_until="commit", timeout=10000)
@@ -52,58 +38,49 @@ async def run_test():
 
         # -> Try to reload the page to see if the scheduling form appears or check for any navigation elements.
         await page.goto('http://localhost:5000', timeout=10000)
-        await asyncio.sleep(3)
+        await steps.ready(page)
         
 
         # -> Fill pet and owner data with minimal valid data and click 'Próximo →' to proceed to service selection.
-        frame = context.pages[-1]
         # Input pet name
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestPet')
+        elem = scheduler.pet_name
+        await steps.ready(page, elem, 'Input pet name'); await elem.fill('TestPet')
         
 
-        frame = context.pages[-1]
         # Input pet breed
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestBreed')
+        await scheduler.fill_breed('TestBreed', 'Input pet breed')
         
 
-        frame = context.pages[-1]
         # Input owner name
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[3]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testeSprite')
+        elem = scheduler.owner_name
+        await steps.ready(page, elem, 'Input owner name'); await elem.fill('testeSprite')
         
 
-        frame = context.pages[-1]
         # Input owner address
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test Address')
+        elem = scheduler.owner_address
+        await steps.ready(page, elem, 'Input owner address'); await elem.fill('Test Address')
         
 
-        frame = context.pages[-1]
         # Input WhatsApp number
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[5]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('11999999999')
+        elem = scheduler.whatsapp
+        await steps.ready(page, elem, 'Input WhatsApp number'); await elem.fill('11999999999')
         
 
-        frame = context.pages[-1]
         # Click 'Próximo →' to proceed to next step
-        elem = frame.locator('xpath=html/body/div/div/main/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.submit
+        await steps.ready(page, elem, "Click 'Próximo →' to proceed to next step"); await elem.click(timeout=5000)
         
 
         # -> Select 'Banho & Tosa' service and click 'Próximo →' to proceed to scheduling step for time selection.
-        frame = context.pages[-1]
         # Select 'Banho & Tosa' service
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.service_option("Banho & Tosa")
+        await steps.ready(page, elem, "Select 'Banho & Tosa' service"); await elem.click(timeout=5000)
         
 
         # -> Click 'Próximo →' to proceed to the scheduling step and test scheduling before 9:00 AM.
-        frame = context.pages[-1]
         # Click 'Próximo →' to proceed to scheduling step
-        elem = frame.locator('xpath=html/body/div/div/main/form/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.submit
+        await steps.ready(page, elem, "Click 'Próximo →' to proceed to scheduling step"); await elem.click(timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -112,15 +89,6 @@ async def run_test():
             await expect(frame.locator('text=Appointment Scheduled Successfully').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test failed: The system did not allow scheduling appointments only during operational hours (9am-11am and 1pm-5pm) as required by the test plan.")
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
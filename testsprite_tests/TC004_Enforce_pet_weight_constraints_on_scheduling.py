@@ -2,32 +2,20 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+from harness import steps
+from harness.pages import AdminLoginPage, AdminSidebar, SchedulerPage
+from harness.session import scenario_context
+
+async def run_test(context=None):
+    # Use the context handed out by run_suite.py, or launch a private browser when run standalone
+    async with scenario_context(context) as context:
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
         page = await context.new_page()
+        scheduler = SchedulerPage(page)
+        login = AdminLoginPage(page)
+        admin = AdminSidebar(page)
         
         # Navigate to your target URL and wait until the network request is committed
         await page.goto("http://localhost:5000", wait_until="commit", timeout=10000)
@@ -47,256 +35,205 @@ async def run_test():
         
         # Interact with the page elements to simulate user flow
         # -> Select Banho & Tosa service
-        frame = context.pages[-1]
         # Select Banho & Tosa service button
-        elem = frame.locator('xpath=html/body/div/div/section/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.service_card("Banho & Tosa")
+        await steps.ready(page, elem, 'Select Banho & Tosa service button'); await elem.click(timeout=5000)
         
 
         # -> Fill required pet and owner information and proceed to next step to select service details
-        frame = context.pages[-1]
         # Enter pet name
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestPet')
+        elem = scheduler.pet_name
+        await steps.ready(page, elem, 'Enter pet name'); await elem.fill('TestPet')
         
 
-        frame = context.pages[-1]
         # Enter pet breed
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestBreed')
+        await scheduler.fill_breed('TestBreed', 'Enter pet breed')
         
 
-        frame = context.pages[-1]
         # Enter owner name
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[3]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test Owner')
+        elem = scheduler.owner_name
+        await steps.ready(page, elem, 'Enter owner name'); await elem.fill('Test Owner')
         
 
-        frame = context.pages[-1]
         # Enter owner address
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123 Test St')
+        elem = scheduler.owner_address
+        await steps.ready(page, elem, 'Enter owner address'); await elem.fill('123 Test St')
         
 
-        frame = context.pages[-1]
         # Enter WhatsApp number
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[5]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('11999999999')
+        elem = scheduler.whatsapp
+        await steps.ready(page, elem, 'Enter WhatsApp number'); await elem.fill('11999999999')
         
 
-        frame = context.pages[-1]
         # Click Próximo to proceed to next step
-        elem = frame.locator('xpath=html/body/div/div/main/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.submit
+        await steps.ready(page, elem, 'Click Próximo to proceed to next step'); await elem.click(timeout=5000)
         
 
         # -> Click 'Banho & Tosa' service button to restart the flow
-        frame = context.pages[-1]
         # Select Banho & Tosa service button to restart the flow
-        elem = frame.locator('xpath=html/body/div/div/section/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click on 'Banho & Tosa' service button to start the booking flow again
-        frame = context.pages[-1]
-        # Select Banho & Tosa service button
-        elem = frame.locator('xpath=html/body/div/div/section/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.service_card("Banho & Tosa")
+        await steps.ready(page, elem, 'Select Banho & Tosa service button to restart the flow'); await elem.click(timeout=5000)
         
 
         # -> Fill all required fields with valid data to enable 'Próximo' button and proceed to next step
-        frame = context.pages[-1]
         # Enter pet name
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestPet')
+        elem = scheduler.pet_name
+        await steps.ready(page, elem, 'Enter pet name'); await elem.fill('TestPet')
         
 
-        frame = context.pages[-1]
         # Enter pet breed
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestBreed')
+        await scheduler.fill_breed('TestBreed', 'Enter pet breed')
         
 
-        frame = context.pages[-1]
         # Enter owner name
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[3]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test Owner')
+        elem = scheduler.owner_name
+        await steps.ready(page, elem, 'Enter owner name'); await elem.fill('Test Owner')
         
 
-        frame = context.pages[-1]
         # Enter owner address
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123 Test St')
+        elem = scheduler.owner_address
+        await steps.ready(page, elem, 'Enter owner address'); await elem.fill('123 Test St')
         
 
-        frame = context.pages[-1]
         # Enter WhatsApp number
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[5]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('11999999999')
+        elem = scheduler.whatsapp
+        await steps.ready(page, elem, 'Enter WhatsApp number'); await elem.fill('11999999999')
         
 
-        frame = context.pages[-1]
         # Click 'Próximo' button to proceed to service selection
-        elem = frame.locator('xpath=html/body/div/div/main/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.submit
+        await steps.ready(page, elem, "Click 'Próximo' button to proceed to service selection"); await elem.click(timeout=5000)
         
 
         # -> Click on 'Banho & Tosa' service button to proceed to pet and owner information form
-        frame = context.pages[-1]
         # Select 'Banho & Tosa' service button
-        elem = frame.locator('xpath=html/body/div/div/section/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.service_card("Banho & Tosa")
+        await steps.ready(page, elem, "Select 'Banho & Tosa' service button"); await elem.click(timeout=5000)
         
 
         # -> Fill all required fields with valid data to enable 'Próximo' button and proceed to next step
-        frame = context.pages[-1]
         # Enter pet name
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestPet')
+        elem = scheduler.pet_name
+        await steps.ready(page, elem, 'Enter pet name'); await elem.fill('TestPet')
         
 
-        frame = context.pages[-1]
         # Enter pet breed
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestBreed')
+        await scheduler.fill_breed('TestBreed', 'Enter pet breed')
         
 
-        frame = context.pages[-1]
         # Enter owner name
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[3]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test Owner')
+        elem = scheduler.owner_name
+        await steps.ready(page, elem, 'Enter owner name'); await elem.fill('Test Owner')
         
 
-        frame = context.pages[-1]
         # Enter owner address
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123 Test St')
+        elem = scheduler.owner_address
+        await steps.ready(page, elem, 'Enter owner address'); await elem.fill('123 Test St')
         
 
-        frame = context.pages[-1]
         # Enter WhatsApp number
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[5]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('11999999999')
+        elem = scheduler.whatsapp
+        await steps.ready(page, elem, 'Enter WhatsApp number'); await elem.fill('11999999999')
         
 
-        frame = context.pages[-1]
         # Click 'Próximo' button to proceed to service selection
-        elem = frame.locator('xpath=html/body/div/div/main/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.submit
+        await steps.ready(page, elem, "Click 'Próximo' button to proceed to service selection"); await elem.click(timeout=5000)
         
 
         # -> Click on 'Banho & Tosa' service button to proceed to pet and owner information form
-        frame = context.pages[-1]
         # Select 'Banho & Tosa' service button
-        elem = frame.locator('xpath=html/body/div/div/section/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.service_card("Banho & Tosa")
+        await steps.ready(page, elem, "Select 'Banho & Tosa' service button"); await elem.click(timeout=5000)
         
 
         # -> Fill all required fields with valid data to enable 'Próximo' button and proceed to next step
-        frame = context.pages[-1]
         # Enter pet name
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestPet')
+        elem = scheduler.pet_name
+        await steps.ready(page, elem, 'Enter pet name'); await elem.fill('TestPet')
         
 
-        frame = context.pages[-1]
         # Enter pet breed
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestBreed')
+        await scheduler.fill_breed('TestBreed', 'Enter pet breed')
         
 
-        frame = context.pages[-1]
         # Enter owner name
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[3]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test Owner')
+        elem = scheduler.owner_name
+        await steps.ready(page, elem, 'Enter owner name'); await elem.fill('Test Owner')
         
 
-        frame = context.pages[-1]
         # Enter owner address
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123 Test St')
+        elem = scheduler.owner_address
+        await steps.ready(page, elem, 'Enter owner address'); await elem.fill('123 Test St')
         
 
-        frame = context.pages[-1]
         # Enter WhatsApp number
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[5]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('11999999999')
+        elem = scheduler.whatsapp
+        await steps.ready(page, elem, 'Enter WhatsApp number'); await elem.fill('11999999999')
         
 
-        frame = context.pages[-1]
         # Click 'Próximo' button to proceed to service selection
-        elem = frame.locator('xpath=html/body/div/div/main/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.submit
+        await steps.ready(page, elem, "Click 'Próximo' button to proceed to service selection"); await elem.click(timeout=5000)
         
 
         # -> Click on 'Banho & Tosa' service button to proceed to pet and owner information form
-        frame = context.pages[-1]
         # Select 'Banho & Tosa' service button
-        elem = frame.locator('xpath=html/body/div/div/section/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.service_card("Banho & Tosa")
+        await steps.ready(page, elem, "Select 'Banho & Tosa' service button"); await elem.click(timeout=5000)
         
 
         # -> Fill all required fields with valid data to enable 'Próximo' button and proceed to next step
-        frame = context.pages[-1]
         # Enter pet name
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestPet')
+        elem = scheduler.pet_name
+        await steps.ready(page, elem, 'Enter pet name'); await elem.fill('TestPet')
         
 
-        frame = context.pages[-1]
         # Enter pet breed
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestBreed')
+        await scheduler.fill_breed('TestBreed', 'Enter pet breed')
         
 
-        frame = context.pages[-1]
         # Enter owner name
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[3]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test Owner')
+        elem = scheduler.owner_name
+        await steps.ready(page, elem, 'Enter owner name'); await elem.fill('Test Owner')
         
 
-        frame = context.pages[-1]
         # Enter owner address
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123 Test St')
+        elem = scheduler.owner_address
+        await steps.ready(page, elem, 'Enter owner address'); await elem.fill('123 Test St')
         
 
-        frame = context.pages[-1]
         # Enter WhatsApp number
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[5]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('11999999999')
+        elem = scheduler.whatsapp
+        await steps.ready(page, elem, 'Enter WhatsApp number'); await elem.fill('11999999999')
         
 
-        frame = context.pages[-1]
         # Click 'Próximo' button to proceed to service selection
-        elem = frame.locator('xpath=html/body/div/div/footer/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.submit
+        await steps.ready(page, elem, "Click 'Próximo' button to proceed to service selection"); await elem.click(timeout=5000)
         
 
         # -> Input admin email and password, then click 'Entrar' to login
-        frame = context.pages[-1]
         # Input admin email
-        elem = frame.locator('xpath=html/body/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('login@sandypetshop.com')
+        elem = login.email
+        await steps.ready(page, elem, 'Input admin email'); await elem.fill('login@sandypetshop.com')
         
 
-        frame = context.pages[-1]
         # Input admin password
-        elem = frame.locator('xpath=html/body/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('1234')
+        elem = login.password
+        await steps.ready(page, elem, 'Input admin password'); await elem.fill('1234')
         
 
-        frame = context.pages[-1]
         # Click 'Entrar' button to login
-        elem = frame.locator('xpath=html/body/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = login.submit
+        await steps.ready(page, elem, "Click 'Entrar' button to login"); await elem.click(timeout=5000)
         
 
         # -> Click 'Adicionar Agendamento' button to start scheduling a new appointment
-        frame = context.pages[-1]
         # Click 'Adicionar Agendamento' button to start new appointment scheduling
-        elem = frame.locator('xpath=html/body/div/div/div/div/main/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = admin.button("Adicionar Agendamento")
+        await steps.ready(page, elem, "Click 'Adicionar Agendamento' button to start new appointment scheduling"); await elem.click(timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -305,15 +242,6 @@ async def run_test():
             await expect(frame.locator('text=Pet weight accepted').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError('Test plan failed: The system did not validate pet weight correctly and allowed invalid entries to schedule the appointment.')
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
@@ -2,28 +2,12 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+from harness import steps
+from harness.session import scenario_context
+
+async def run_test(context=None):
+    # Use the context handed out by run_suite.py, or launch a private browser when run standalone
+    async with scenario_context(context) as context:
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
@@ -52,7 +36,7 @@ async def run_test():
 
         # -> Try to reload the page or check for any hidden elements or alternative navigation to access the scheduling form.
         await page.goto('http://localhost:5000/', timeout=10000)
-        await asyncio.sleep(3)
+        await steps.ready(page)
         
 
         # --> Assertions to verify final state
@@ -60,15 +44,6 @@ async def run_test():
             await expect(page.locator('text=Pricing Error: Weight and Extras Mismatch').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError('Test case failed: Pricing did not adjust correctly according to the pet weight and selected optional services during scheduling as required by the test plan.')
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
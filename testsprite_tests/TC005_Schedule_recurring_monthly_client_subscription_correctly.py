@@ -2,32 +2,21 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+from harness import steps
+from harness.pages import AdminSidebar
+from harness.session import scenario_context
+
+# Start already signed in as admin: the storage state is cached once per run by harness.auth
+REQUIRES_ADMIN = True
+
+async def run_test(context=None):
+    # Use the context handed out by run_suite.py, or launch a private browser when run standalone
+    async with scenario_context(context, admin=REQUIRES_ADMIN) as context:
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
         page = await context.new_page()
+        admin = AdminSidebar(page)
         
         # Navigate to your target URL and wait until the network request is committed
         await page.goto("http://localhost:5000", wait_until="commit", timeout=10000)
@@ -46,72 +35,41 @@ async def run_test():
                 pass
         
         # Interact with the page elements to simulate user flow
-        # -> Click on 'Acesso Administrativo' to log in as customer.
-        frame = context.pages[-1]
-        # Click on 'Acesso Administrativo' to log in as customer
-        elem = frame.locator('xpath=html/body/div/div/footer/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input admin email and password, then click Entrar to log in.
-        frame = context.pages[-1]
-        # Input admin email
-        elem = frame.locator('xpath=html/body/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('login@sandypetshop.com')
-        
-
-        frame = context.pages[-1]
-        # Input admin password
-        elem = frame.locator('xpath=html/body/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('1234')
-        
-
-        frame = context.pages[-1]
-        # Click Entrar to log in as admin
-        elem = frame.locator('xpath=html/body/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
+        # -> Context already starts signed in as admin (REQUIRES_ADMIN), so the UI login is skipped
         # -> Click on 'Mensalistas' to access monthly clients subscription management.
-        frame = context.pages[-1]
         # Click on 'Mensalistas' to manage monthly clients
-        elem = frame.locator('xpath=html/body/div/div/div/div/aside/nav/button[6]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = admin.section("Mensalistas")
+        await steps.ready(page, elem, "Click on 'Mensalistas' to manage monthly clients"); await elem.click(timeout=5000)
         
 
         # -> Click on 'Adicionar Agendamento' to start creating a new subscription with recurrence options.
-        frame = context.pages[-1]
         # Click on 'Adicionar Agendamento' to add a new subscription appointment
-        elem = frame.locator('xpath=html/body/div/div/div/div/main/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = admin.button("Adicionar Agendamento")
+        await steps.ready(page, elem, "Click on 'Adicionar Agendamento' to add a new subscription appointment"); await elem.click(timeout=5000)
         
 
         # -> Fill in pet and tutor information fields and click 'Próximo' to proceed to the next step of subscription creation.
-        frame = context.pages[-1]
         # Input pet name
-        elem = frame.locator('xpath=html/body/div/div/div/div/main/div/div/div/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Buddy')
+        elem = admin.labeled("Nome do Pet")
+        await steps.ready(page, elem, 'Input pet name'); await elem.fill('Buddy')
         
 
         # -> Close or dismiss the unexpected element or popup to regain access to the subscription form and continue inputting required data.
-        frame = context.pages[-1]
         # Click 'Fechar Agenda' button to close unexpected popup or overlay blocking form input
-        elem = frame.locator('xpath=html/body/div/div/header/div/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = admin.header_button("Agenda")
+        await steps.ready(page, elem, "Click 'Fechar Agenda' button to close unexpected popup or overlay blocking form input"); await elem.click(timeout=5000)
         
 
         # -> Retry filling in pet and tutor information fields and proceed to next step.
-        frame = context.pages[-1]
         # Click 'Adicionar Agendamento' to open the subscription form again
-        elem = frame.locator('xpath=html/body/div/div/div/div/main/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = admin.button("Adicionar Agendamento")
+        await steps.ready(page, elem, "Click 'Adicionar Agendamento' to open the subscription form again"); await elem.click(timeout=5000)
         
 
         # -> Try to input tutor name using a different method or skip tutor name input and proceed if possible.
-        frame = context.pages[-1]
         # Click tutor name field to focus or activate input
-        elem = frame.locator('xpath=html/body/div/div/header/div/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = admin.logout
+        await steps.ready(page, elem, 'Click tutor name field to focus or activate input'); await elem.click(timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -120,15 +78,6 @@ async def run_test():
             await expect(frame.locator('text=Subscription Successful! Your monthly plan is active.').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: Monthly clients subscription with recurrence types did not complete successfully. Immediate appointment scheduling, future appointment generation, or payment tracking verification failed as per the test plan.")
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
@@ -2,32 +2,18 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+from harness import steps
+from harness.pages import SchedulerPage
+from harness.session import scenario_context
+
+async def run_test(context=None):
+    # Use the context handed out by run_suite.py, or launch a private browser when run standalone
+    async with scenario_context(context) as context:
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
         page = await context.new_page()
+        scheduler = SchedulerPage(page)
         
         # Navigate to your target URL and wait until the network request is committed
         await page.goto("http://localhost:5000", wait_until="commit", timeout=10000)
@@ -47,71 +33,61 @@ async def run_test():
         
         # Interact with the page elements to simulate user flow
         # -> Select Pet Móvel service type by clicking the corresponding button
-        frame = context.pages[-1]
         # Select Pet Móvel service type button
-        elem = frame.locator('xpath=html/body/div/div/section/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.service_card("Pet Móvel")
+        await steps.ready(page, elem, 'Select Pet Móvel service type button'); await elem.click(timeout=5000)
         
 
         # -> Attempt to schedule without providing condominium address by clicking 'Próximo →' button
-        frame = context.pages[-1]
         # Click 'Próximo →' button to attempt scheduling without condominium address
-        elem = frame.locator('xpath=html/body/div/div/main/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.submit
+        await steps.ready(page, elem, "Click 'Próximo →' button to attempt scheduling without condominium address"); await elem.click(timeout=5000)
         
 
         # -> Input invalid condominium address format into 'Seu Endereço' field
-        frame = context.pages[-1]
         # Input invalid condominium address format into 'Seu Endereço' field
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('InvalidAddress123!@#')
+        elem = scheduler.owner_address
+        await steps.ready(page, elem, "Input invalid condominium address format into 'Seu Endereço' field"); await elem.fill('InvalidAddress123!@#')
         
 
         # -> Click Pet Móvel service button to reopen the scheduling form
-        frame = context.pages[-1]
         # Select Pet Móvel service type button
-        elem = frame.locator('xpath=html/body/div/div/section/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.service_card("Pet Móvel")
+        await steps.ready(page, elem, 'Select Pet Móvel service type button'); await elem.click(timeout=5000)
         
 
         # -> Input invalid condominium address format into 'Seu Endereço' field (index 9)
-        frame = context.pages[-1]
         # Input invalid condominium address format into 'Seu Endereço' field
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('InvalidAddress123!@#')
+        elem = scheduler.owner_address
+        await steps.ready(page, elem, "Input invalid condominium address format into 'Seu Endereço' field"); await elem.fill('InvalidAddress123!@#')
         
 
         # -> Click Pet Móvel service button to open the scheduling form
-        frame = context.pages[-1]
         # Select Pet Móvel service type button
-        elem = frame.locator('xpath=html/body/div/div/section/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.service_card("Pet Móvel")
+        await steps.ready(page, elem, 'Select Pet Móvel service type button'); await elem.click(timeout=5000)
         
 
         # -> Input invalid condominium address format into 'Seu Endereço' field (index 9)
-        frame = context.pages[-1]
         # Input invalid condominium address format into 'Seu Endereço' field
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('InvalidAddress123!@#')
+        elem = scheduler.owner_address
+        await steps.ready(page, elem, "Input invalid condominium address format into 'Seu Endereço' field"); await elem.fill('InvalidAddress123!@#')
         
 
         # -> Clear the 'Seu Endereço' field and input a valid condominium address, then attempt to proceed by clicking the 'Próximo →' button
-        frame = context.pages[-1]
         # Clear the 'Seu Endereço' field to remove invalid address
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        elem = scheduler.owner_address
+        await steps.ready(page, elem, "Clear the 'Seu Endereço' field to remove invalid address"); await elem.fill('')
         
 
-        frame = context.pages[-1]
         # Input valid condominium address into 'Seu Endereço' field
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Rua das Flores, 123, Apt 45')
+        elem = scheduler.owner_address
+        await steps.ready(page, elem, "Input valid condominium address into 'Seu Endereço' field"); await elem.fill('Rua das Flores, 123, Apt 45')
         
 
-        frame = context.pages[-1]
         # Click 'Próximo →' button to proceed with valid address
-        elem = frame.locator('xpath=html/body/div/div/main/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.submit
+        await steps.ready(page, elem, "Click 'Próximo →' button to proceed with valid address"); await elem.click(timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -119,15 +95,6 @@ async def run_test():
         await expect(frame.locator('text=Display validation error requiring condominium address').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Display error for invalid address format').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Confirm appointment is successfully scheduled with correct address').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
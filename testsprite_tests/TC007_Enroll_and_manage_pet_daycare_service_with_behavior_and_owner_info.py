@@ -2,32 +2,19 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+from harness import steps
+from harness.pages import DaycareEnrollmentPage, SchedulerPage
+from harness.session import scenario_context
+
+async def run_test(context=None):
+    # Use the context handed out by run_suite.py, or launch a private browser when run standalone
+    async with scenario_context(context) as context:
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
         page = await context.new_page()
+        scheduler = SchedulerPage(page)
+        daycare = DaycareEnrollmentPage(page)
         
         # Navigate to your target URL and wait until the network request is committed
         await page.goto("http://localhost:5000", wait_until="commit", timeout=10000)
@@ -47,151 +34,110 @@ async def run_test():
         
         # Interact with the page elements to simulate user flow
         # -> Click on 'Creche Pet' button to navigate to daycare service enrollment form.
-        frame = context.pages[-1]
         # Click on 'Creche Pet' button to start daycare enrollment
-        elem = frame.locator('xpath=html/body/div/div/section/div/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.service_card("Creche Pet")
+        await steps.ready(page, elem, "Click on 'Creche Pet' button to start daycare enrollment"); await elem.click(timeout=5000)
         
 
         # -> Fill pet information fields: Nome do pet, Raça, Idade, Sexo, Castrado (a)
-        frame = context.pages[-1]
         # Input pet name 'Rex'
-        elem = frame.locator('xpath=html/body/div/div/main/form/div[2]/div/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Rex')
+        elem = daycare.field("pet_name")
+        await steps.ready(page, elem, "Input pet name 'Rex'"); await elem.fill('Rex')
         
 
-        frame = context.pages[-1]
         # Input pet breed 'Labrador'
-        elem = frame.locator('xpath=html/body/div/div/main/form/div[2]/div/div/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Labrador')
+        elem = daycare.field("pet_breed")
+        await steps.ready(page, elem, "Input pet breed 'Labrador'"); await elem.fill('Labrador')
         
 
-        frame = context.pages[-1]
         # Input pet age '5'
-        elem = frame.locator('xpath=html/body/div/div/main/form/div[2]/div/div/div/div/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('5')
+        elem = daycare.field("pet_age")
+        await steps.ready(page, elem, "Input pet age '5'"); await elem.fill('5')
         
 
-        frame = context.pages[-1]
         # Select pet sex 'M' (Male)
-        elem = frame.locator('xpath=html/body/div/div/main/form/div[2]/div/div/div/div/div[4]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = daycare.choice("pet_sex", "Macho")
+        await steps.ready(page, elem, "Select pet sex 'M' (Male)"); await elem.click(timeout=5000)
         
 
-        frame = context.pages[-1]
         # Select 'Sim' for Castrado (a) (Neutered)
-        elem = frame.locator('xpath=html/body/div/div/main/form/div[2]/div/div/div/div/div[5]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = daycare.choice("is_neutered", "Sim")
+        await steps.ready(page, elem, "Select 'Sim' for Castrado (a) (Neutered)"); await elem.click(timeout=5000)
         
 
-        frame = context.pages[-1]
         # Click 'Saúde e Comportamento' to fill behavior details
-        elem = frame.locator('xpath=html/body/div/div/main/form/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = daycare.section("Saúde e Comportamento")
+        await steps.ready(page, elem, "Click 'Saúde e Comportamento' to fill behavior details"); await elem.click(timeout=5000)
         
 
         # -> Click on 'Creche Pet' button again to navigate to daycare enrollment form and retry filling pet information and behavior details.
-        frame = context.pages[-1]
         # Click on 'Creche Pet' button to start daycare enrollment again
-        elem = frame.locator('xpath=html/body/div/div/section/div/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click on 'Creche Pet' button to navigate to daycare enrollment form again and try alternative input for pet age.
-        frame = context.pages[-1]
-        # Click on 'Creche Pet' button to start daycare enrollment
-        elem = frame.locator('xpath=html/body/div/div/section/div/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click on 'Creche Pet' button to navigate to daycare enrollment form again.
-        frame = context.pages[-1]
-        # Click on 'Creche Pet' button to start daycare enrollment
-        elem = frame.locator('xpath=html/body/div/div/section/div/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.service_card("Creche Pet")
+        await steps.ready(page, elem, "Click on 'Creche Pet' button to start daycare enrollment again"); await elem.click(timeout=5000)
         
 
         # -> Fill pet information fields: Nome do pet, Raça, Idade, Sexo, Castrado (a)
-        frame = context.pages[-1]
         # Input pet name 'Rex'
-        elem = frame.locator('xpath=html/body/div/div/main/form/div[2]/div/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Rex')
+        elem = daycare.field("pet_name")
+        await steps.ready(page, elem, "Input pet name 'Rex'"); await elem.fill('Rex')
         
 
-        frame = context.pages[-1]
         # Input pet breed 'Labrador'
-        elem = frame.locator('xpath=html/body/div/div/main/form/div[2]/div/div/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Labrador')
+        elem = daycare.field("pet_breed")
+        await steps.ready(page, elem, "Input pet breed 'Labrador'"); await elem.fill('Labrador')
         
 
-        frame = context.pages[-1]
         # Input pet age '5'
-        elem = frame.locator('xpath=html/body/div/div/main/form/div[2]/div/div/div/div/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('5')
+        elem = daycare.field("pet_age")
+        await steps.ready(page, elem, "Input pet age '5'"); await elem.fill('5')
         
 
-        frame = context.pages[-1]
         # Select pet sex 'M' (Male)
-        elem = frame.locator('xpath=html/body/div/div/main/form/div[2]/div/div/div/div/div[4]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = daycare.choice("pet_sex", "Macho")
+        await steps.ready(page, elem, "Select pet sex 'M' (Male)"); await elem.click(timeout=5000)
         
 
-        frame = context.pages[-1]
         # Select 'Sim' for Castrado (a) (Neutered)
-        elem = frame.locator('xpath=html/body/div/div/main/form/div[2]/div/div/div/div/div[5]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = daycare.choice("is_neutered", "Sim")
+        await steps.ready(page, elem, "Select 'Sim' for Castrado (a) (Neutered)"); await elem.click(timeout=5000)
         
 
         # -> Click on 'Creche Pet' button to navigate to daycare enrollment form again and try alternative input methods for tutor information.
-        frame = context.pages[-1]
-        # Click on 'Creche Pet' button to start daycare enrollment
-        elem = frame.locator('xpath=html/body/div/div/section/div/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click on 'Creche Pet' button to navigate to daycare enrollment form again.
-        frame = context.pages[-1]
         # Click on 'Creche Pet' button to start daycare enrollment
-        elem = frame.locator('xpath=html/body/div/div/section/div/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.service_card("Creche Pet")
+        await steps.ready(page, elem, "Click on 'Creche Pet' button to start daycare enrollment"); await elem.click(timeout=5000)
         
 
         # -> Fill pet information fields: Nome do pet, Raça, Idade, Sexo, Castrado (a)
-        frame = context.pages[-1]
         # Input pet name 'Rex'
-        elem = frame.locator('xpath=html/body/div/div/main/form/div[2]/div/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Rex')
+        elem = daycare.field("pet_name")
+        await steps.ready(page, elem, "Input pet name 'Rex'"); await elem.fill('Rex')
         
 
-        frame = context.pages[-1]
         # Input pet breed 'Labrador'
-        elem = frame.locator('xpath=html/body/div/div/main/form/div[2]/div/div/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Labrador')
+        elem = daycare.field("pet_breed")
+        await steps.ready(page, elem, "Input pet breed 'Labrador'"); await elem.fill('Labrador')
         
 
-        frame = context.pages[-1]
         # Input pet age '5'
-        elem = frame.locator('xpath=html/body/div/div/main/form/div[2]/div/div/div/div/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('5')
+        elem = daycare.field("pet_age")
+        await steps.ready(page, elem, "Input pet age '5'"); await elem.fill('5')
         
 
-        frame = context.pages[-1]
         # Select pet sex 'M' (Male)
-        elem = frame.locator('xpath=html/body/div/div/main/form/div[2]/div/div/div/div/div[4]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = daycare.choice("pet_sex", "Macho")
+        await steps.ready(page, elem, "Select pet sex 'M' (Male)"); await elem.click(timeout=5000)
         
 
-        frame = context.pages[-1]
         # Select 'Sim' for Castrado (a) (Neutered)
-        elem = frame.locator('xpath=html/body/div/div/main/form/div[2]/div/div/div/div/div[5]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = daycare.choice("is_neutered", "Sim")
+        await steps.ready(page, elem, "Select 'Sim' for Castrado (a) (Neutered)"); await elem.click(timeout=5000)
         
 
         # -> Click on 'Creche Pet' button to navigate to daycare enrollment form again.
-        frame = context.pages[-1]
         # Click on 'Creche Pet' button to start daycare enrollment
-        elem = frame.locator('xpath=html/body/div/div/section/div/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.service_card("Creche Pet")
+        await steps.ready(page, elem, "Click on 'Creche Pet' button to start daycare enrollment"); await elem.click(timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -200,15 +146,6 @@ async def run_test():
             await expect(frame.locator('text=Enrollment Successful! Your pet is now registered in daycare.').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: The daycare enrollment confirmation and data persistence verification did not succeed as per the test plan. Enrollment confirmation message not found on the page.")
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
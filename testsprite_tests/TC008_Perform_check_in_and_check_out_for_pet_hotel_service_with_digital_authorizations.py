@@ -2,32 +2,21 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+from harness import steps
+from harness.pages import AdminSidebar
+from harness.session import scenario_context
+
+# Start already signed in as admin: the storage state is cached once per run by harness.auth
+REQUIRES_ADMIN = True
+
+async def run_test(context=None):
+    # Use the context handed out by run_suite.py, or launch a private browser when run standalone
+    async with scenario_context(context, admin=REQUIRES_ADMIN) as context:
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
         page = await context.new_page()
+        admin = AdminSidebar(page)
         
         # Navigate to your target URL and wait until the network request is committed
         await page.goto("http://localhost:5000", wait_until="commit", timeout=10000)
@@ -46,37 +35,11 @@ async def run_test():
                 pass
         
         # Interact with the page elements to simulate user flow
-        # -> Click on 'Acesso Administrativo' button to access pet hotel service panel as administrator.
-        frame = context.pages[-1]
-        # Click on 'Acesso Administrativo' button to access admin panel
-        elem = frame.locator('xpath=html/body/div/div/footer/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input admin email and password, then click 'Entrar' to log in.
-        frame = context.pages[-1]
-        # Input admin email
-        elem = frame.locator('xpath=html/body/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('login@sandypetshop.com')
-        
-
-        frame = context.pages[-1]
-        # Input admin password
-        elem = frame.locator('xpath=html/body/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('1234')
-        
-
-        frame = context.pages[-1]
-        # Click 'Entrar' button to log in as admin
-        elem = frame.locator('xpath=html/body/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
+        # -> Context already starts signed in as admin (REQUIRES_ADMIN), so the UI login is skipped
         # -> Click on 'Hotel Pet' menu to access pet hotel service panel.
-        frame = context.pages[-1]
         # Click on 'Hotel Pet' menu to access pet hotel service panel
-        elem = frame.locator('xpath=html/body/div/div/div/div/aside/nav/button[4]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = admin.section("Hotel Pet")
+        await steps.ready(page, elem, "Click on 'Hotel Pet' menu to access pet hotel service panel"); await elem.click(timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -85,15 +48,6 @@ async def run_test():
             await expect(frame.locator('text=Booking Completed Successfully').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: The hotel pet service workflows including check-in/out, adding optional services, and capturing digital signatures for authorizations did not complete successfully as expected.")
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
@@ -2,32 +2,20 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+from harness import steps
+from harness.pages import AdminLoginPage, AdminSidebar, SchedulerPage
+from harness.session import scenario_context
+
+async def run_test(context=None):
+    # Use the context handed out by run_suite.py, or launch a private browser when run standalone
+    async with scenario_context(context) as context:
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
         page = await context.new_page()
+        scheduler = SchedulerPage(page)
+        login = AdminLoginPage(page)
+        admin = AdminSidebar(page)
         
         # Navigate to your target URL and wait until the network request is committed
         await page.goto("http://localhost:5000", wait_until="commit", timeout=10000)
@@ -47,93 +35,80 @@ async def run_test():
         
         # Interact with the page elements to simulate user flow
         # -> Click on 'Acesso Administrativo' button to open the login page for admin and other roles.
-        frame = context.pages[-1]
         # Click on 'Acesso Administrativo' button to open login page
-        elem = frame.locator('xpath=html/body/div/div/footer/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.admin_access
+        await steps.ready(page, elem, "Click on 'Acesso Administrativo' button to open login page"); await elem.click(timeout=5000)
         
 
         # -> Input valid customer credentials and click login button to test customer login.
-        frame = context.pages[-1]
         # Input valid customer email
-        elem = frame.locator('xpath=html/body/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('customer@example.com')
+        elem = login.email
+        await steps.ready(page, elem, 'Input valid customer email'); await elem.fill('customer@example.com')
         
 
-        frame = context.pages[-1]
         # Input valid customer password
-        elem = frame.locator('xpath=html/body/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('customerpassword')
+        elem = login.password
+        await steps.ready(page, elem, 'Input valid customer password'); await elem.fill('customerpassword')
         
 
-        frame = context.pages[-1]
         # Click login button to attempt login with valid customer credentials
-        elem = frame.locator('xpath=html/body/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = login.submit
+        await steps.ready(page, elem, 'Click login button to attempt login with valid customer credentials'); await elem.click(timeout=5000)
         
 
         # -> Click on 'Acesso Administrativo' button to open login page for admin login attempt.
-        frame = context.pages[-1]
         # Click on 'Acesso Administrativo' button to open admin login page
-        elem = frame.locator('xpath=html/body/div/div/footer/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.admin_access
+        await steps.ready(page, elem, "Click on 'Acesso Administrativo' button to open admin login page"); await elem.click(timeout=5000)
         
 
         # -> Input admin email and password, then click login button to attempt admin login.
-        frame = context.pages[-1]
         # Input admin email
-        elem = frame.locator('xpath=html/body/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('login@sandypetshop.com')
+        elem = login.email
+        await steps.ready(page, elem, 'Input admin email'); await elem.fill('login@sandypetshop.com')
         
 
-        frame = context.pages[-1]
         # Input admin password
-        elem = frame.locator('xpath=html/body/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('1234')
+        elem = login.password
+        await steps.ready(page, elem, 'Input admin password'); await elem.fill('1234')
         
 
-        frame = context.pages[-1]
         # Click login button to attempt admin login
-        elem = frame.locator('xpath=html/body/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = login.submit
+        await steps.ready(page, elem, 'Click login button to attempt admin login'); await elem.click(timeout=5000)
         
 
         # -> Attempt login with invalid credentials to verify rejection and error message.
-        frame = context.pages[-1]
         # Click 'Sair' button to log out from admin session and return to login page
-        elem = frame.locator('xpath=html/body/div/div/header/div/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = admin.logout
+        await steps.ready(page, elem, "Click 'Sair' button to log out from admin session and return to login page"); await elem.click(timeout=5000)
         
 
         # -> Click 'Acesso Administrativo' to open login page and attempt login with invalid credentials.
-        frame = context.pages[-1]
         # Click 'Acesso Administrativo' button to open login page for invalid login test
-        elem = frame.locator('xpath=html/body/div/div/footer/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.admin_access
+        await steps.ready(page, elem, "Click 'Acesso Administrativo' button to open login page for invalid login test"); await elem.click(timeout=5000)
         
 
         # -> Input invalid email and password, then click login button to verify rejection and error message.
-        frame = context.pages[-1]
         # Input invalid email
-        elem = frame.locator('xpath=html/body/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('invaliduser@example.com')
+        elem = login.email
+        await steps.ready(page, elem, 'Input invalid email'); await elem.fill('invaliduser@example.com')
         
 
-        frame = context.pages[-1]
         # Input invalid password
-        elem = frame.locator('xpath=html/body/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('wrongpassword')
+        elem = login.password
+        await steps.ready(page, elem, 'Input invalid password'); await elem.fill('wrongpassword')
         
 
-        frame = context.pages[-1]
         # Click login button to attempt login with invalid credentials
-        elem = frame.locator('xpath=html/body/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = login.submit
+        await steps.ready(page, elem, 'Click login button to attempt login with invalid credentials'); await elem.click(timeout=5000)
         
 
         # -> Verify restricted pages redirect unauthorized users by attempting to access an admin-only page without login.
         await page.goto('http://localhost:5000/admin/dashboard', timeout=10000)
-        await asyncio.sleep(3)
+        await steps.ready(page)
         
 
         # --> Assertions to verify final state
@@ -151,15 +126,6 @@ async def run_test():
         await expect(frame.locator('text=Creche Pet').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Hotel Pet').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Visita').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
@@ -2,32 +2,19 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+from harness import steps
+from harness.pages import DaycareEnrollmentPage, SchedulerPage
+from harness.session import scenario_context
+
+async def run_test(context=None):
+    # Use the context handed out by run_suite.py, or launch a private browser when run standalone
+    async with scenario_context(context) as context:
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
         page = await context.new_page()
+        scheduler = SchedulerPage(page)
+        daycare = DaycareEnrollmentPage(page)
         
         # Navigate to your target URL and wait until the network request is committed
         await page.goto("http://localhost:5000", wait_until="commit", timeout=10000)
@@ -47,51 +34,38 @@ async def run_test():
         
         # Interact with the page elements to simulate user flow
         # -> Click on 'Visita' button to start scheduling a visit and test date input validation.
-        frame = context.pages[-1]
         # Click on 'Visita' button to start scheduling a visit
-        elem = frame.locator('xpath=html/body/div/div/section/div/button[5]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.service_card("Visita")
+        await steps.ready(page, elem, "Click on 'Visita' button to start scheduling a visit"); await elem.click(timeout=5000)
         
 
         # -> Click on 'Creche Pet' button to open scheduling form and test date input validation.
-        frame = context.pages[-1]
         # Click on 'Creche Pet' button to open scheduling form
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.visit_option("Creche Pet")
+        await steps.ready(page, elem, "Click on 'Creche Pet' button to open scheduling form"); await elem.click(timeout=5000)
         
 
         # -> Submit the form with the date field empty to trigger frontend validation error for date format.
-        frame = context.pages[-1]
         # Click on 'Agendar' button to submit the form with empty date field to trigger validation error
-        elem = frame.locator('xpath=html/body/div/div/div/form/div[8]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.button("Agendar", exact=True)
+        await steps.ready(page, elem, "Click on 'Agendar' button to submit the form with empty date field to trigger validation error"); await elem.click(timeout=5000)
         
 
         # -> Click on 'Creche Pet' button to reopen scheduling form and retry validation testing.
-        frame = context.pages[-1]
         # Click on 'Creche Pet' button to reopen scheduling form
-        elem = frame.locator('xpath=html/body/div/div/section/div/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click on 'Creche Pet' button to navigate to the scheduling form and retry validation testing.
-        frame = context.pages[-1]
-        # Click on 'Creche Pet' button to open scheduling form
-        elem = frame.locator('xpath=html/body/div/div/section/div/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.service_card("Creche Pet")
+        await steps.ready(page, elem, "Click on 'Creche Pet' button to reopen scheduling form"); await elem.click(timeout=5000)
         
 
         # -> Enter invalid Brazilian phone number format '12345' in 'Telefone contato' field and submit the form to check validation error.
-        frame = context.pages[-1]
         # Enter invalid Brazilian phone number format in 'Telefone contato' field
-        elem = frame.locator('xpath=html/body/div/div/main/form/div[2]/div/div[2]/div/div/div[4]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('12345')
+        elem = daycare.field("contact_phone")
+        await steps.ready(page, elem, "Enter invalid Brazilian phone number format in 'Telefone contato' field"); await elem.fill('12345')
         
 
-        frame = context.pages[-1]
         # Click on 'Solicitar Matrícula' button to submit the form
-        elem = frame.locator('xpath=html/body/div/div/main/form/div[2]/div[7]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = daycare.submit
+        await steps.ready(page, elem, "Click on 'Solicitar Matrícula' button to submit the form"); await elem.click(timeout=5000)
         
 
         # -> Scroll down to check for any hidden validation error messages related to phone number input.
@@ -99,85 +73,70 @@ async def run_test():
         
 
         # -> Click on 'Banho & Tosa Fixo' button to navigate to payment page for currency validation test.
-        frame = context.pages[-1]
         # Click on 'Banho & Tosa Fixo' button to navigate to payment page for currency validation test
-        elem = frame.locator('xpath=html/body/div/div/section/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.service_card("Banho & Tosa")
+        await steps.ready(page, elem, "Click on 'Banho & Tosa Fixo' button to navigate to payment page for currency validation test"); await elem.click(timeout=5000)
         
 
         # -> Fill in all required fields with valid data to enable proceeding to the next step for currency input validation.
-        frame = context.pages[-1]
         # Enter valid pet name
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Rex')
+        elem = scheduler.pet_name
+        await steps.ready(page, elem, 'Enter valid pet name'); await elem.fill('Rex')
         
 
-        frame = context.pages[-1]
         # Enter valid pet breed
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Labrador')
+        await scheduler.fill_breed('Labrador', 'Enter valid pet breed')
         
 
-        frame = context.pages[-1]
         # Enter valid owner name
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[3]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('João Silva')
+        elem = scheduler.owner_name
+        await steps.ready(page, elem, 'Enter valid owner name'); await elem.fill('João Silva')
         
 
-        frame = context.pages[-1]
         # Enter valid owner address
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Rua das Flores, 123')
+        elem = scheduler.owner_address
+        await steps.ready(page, elem, 'Enter valid owner address'); await elem.fill('Rua das Flores, 123')
         
 
-        frame = context.pages[-1]
         # Enter valid Brazilian phone number in WhatsApp field
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[5]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('11987654321')
+        elem = scheduler.whatsapp
+        await steps.ready(page, elem, 'Enter valid Brazilian phone number in WhatsApp field'); await elem.fill('11987654321')
         
 
-        frame = context.pages[-1]
         # Click on 'Próximo →' button to proceed to next step
-        elem = frame.locator('xpath=html/body/div/div/main/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.submit
+        await steps.ready(page, elem, "Click on 'Próximo →' button to proceed to next step"); await elem.click(timeout=5000)
         
 
         # -> Click on 'Banho & Tosa Fixo' button to navigate to payment page for currency validation test.
-        frame = context.pages[-1]
         # Click on 'Banho & Tosa Fixo' button to navigate to payment page for currency validation test
-        elem = frame.locator('xpath=html/body/div/div/section/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.service_card("Banho & Tosa")
+        await steps.ready(page, elem, "Click on 'Banho & Tosa Fixo' button to navigate to payment page for currency validation test"); await elem.click(timeout=5000)
         
 
         # -> Enter valid data in all fields to enable proceeding to the next step for currency input validation.
-        frame = context.pages[-1]
         # Enter valid pet name
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Rex')
+        elem = scheduler.pet_name
+        await steps.ready(page, elem, 'Enter valid pet name'); await elem.fill('Rex')
         
 
-        frame = context.pages[-1]
         # Enter valid pet breed
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Labrador')
+        await scheduler.fill_breed('Labrador', 'Enter valid pet breed')
         
 
-        frame = context.pages[-1]
         # Enter valid owner name
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[3]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('João Silva')
+        elem = scheduler.owner_name
+        await steps.ready(page, elem, 'Enter valid owner name'); await elem.fill('João Silva')
         
 
-        frame = context.pages[-1]
         # Enter valid owner address
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Rua das Flores, 123')
+        elem = scheduler.owner_address
+        await steps.ready(page, elem, 'Enter valid owner address'); await elem.fill('Rua das Flores, 123')
         
 
-        frame = context.pages[-1]
         # Enter valid Brazilian phone number in WhatsApp field
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[5]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('11987654321')
+        elem = scheduler.whatsapp
+        await steps.ready(page, elem, 'Enter valid Brazilian phone number in WhatsApp field'); await elem.fill('11987654321')
         
 
         # --> Assertions to verify final state
@@ -186,15 +145,6 @@ async def run_test():
             await expect(frame.locator('text=Invalid Brazilian Date Format Detected').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: The test plan requires validation errors for invalid Brazilian date, phone number, and currency formats to be displayed, but no such validation error was found on the page.")
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
@@ -2,32 +2,22 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+from harness import steps
+from harness.pages import AdminSidebar, SchedulerPage
+from harness.session import scenario_context
+
+# Start already signed in as admin: the storage state is cached once per run by harness.auth
+REQUIRES_ADMIN = True
+
+async def run_test(context=None):
+    # Use the context handed out by run_suite.py, or launch a private browser when run standalone
+    async with scenario_context(context, admin=REQUIRES_ADMIN) as context:
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
         page = await context.new_page()
+        scheduler = SchedulerPage(page)
+        admin = AdminSidebar(page)
         
         # Navigate to your target URL and wait until the network request is committed
         await page.goto("http://localhost:5000", wait_until="commit", timeout=10000)
@@ -46,140 +36,96 @@ async def run_test():
                 pass
         
         # Interact with the page elements to simulate user flow
-        # -> Simulate going offline in the browser to test offline capabilities
-        frame = context.pages[-1]
-        # Click on 'Acesso Administrativo' to prepare for further navigation if needed
-        elem = frame.locator('xpath=html/body/div/div/footer/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input admin credentials and log in to access admin dashboard for further offline testing
-        frame = context.pages[-1]
-        # Input admin email
-        elem = frame.locator('xpath=html/body/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('login@sandypetshop.com')
-        
-
-        frame = context.pages[-1]
-        # Input admin password
-        elem = frame.locator('xpath=html/body/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('1234')
-        
-
-        frame = context.pages[-1]
-        # Click Entrar button to log in
-        elem = frame.locator('xpath=html/body/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
+        # -> Context already starts signed in as admin (REQUIRES_ADMIN), so the UI login is skipped
         # -> Simulate going offline in the browser to test offline capabilities and caching of key resources
-        frame = context.pages[-1]
         # Click 'Sair' button to log out and test offline mode on public app if needed
-        elem = frame.locator('xpath=html/body/div/div/header/div/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = admin.logout
+        await steps.ready(page, elem, "Click 'Sair' button to log out and test offline mode on public app if needed"); await elem.click(timeout=5000)
         
 
         # -> Simulate going offline in the browser to test offline capabilities and caching of key resources
-        frame = context.pages[-1]
         # Click 'Banho & Tosa' to open scheduling form and cache it
-        elem = frame.locator('xpath=html/body/div/div/section/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.service_card("Banho & Tosa")
+        await steps.ready(page, elem, "Click 'Banho & Tosa' to open scheduling form and cache it"); await elem.click(timeout=5000)
         
 
         # -> Navigate through other scheduling pages (Pet Móvel, Creche Pet, Hotel Pet) to verify cached content displays correctly offline
-        frame = context.pages[-1]
         # Click 'Pet Móvel' to open scheduling form and verify offline caching
-        elem = frame.locator('xpath=html/body/div/div/section/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.service_card("Pet Móvel")
+        await steps.ready(page, elem, "Click 'Pet Móvel' to open scheduling form and verify offline caching"); await elem.click(timeout=5000)
         
 
         # -> Attempt to fill out the scheduling form offline and proceed to next steps to verify offline scheduling operation or offline notification
-        frame = context.pages[-1]
         # Input pet name offline
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Rex')
+        elem = scheduler.pet_name
+        await steps.ready(page, elem, 'Input pet name offline'); await elem.fill('Rex')
         
 
-        frame = context.pages[-1]
         # Input pet breed offline
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Labrador')
+        await scheduler.fill_breed('Labrador', 'Input pet breed offline')
         
 
-        frame = context.pages[-1]
         # Input owner name offline
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[3]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('John Doe')
+        elem = scheduler.owner_name
+        await steps.ready(page, elem, 'Input owner name offline'); await elem.fill('John Doe')
         
 
-        frame = context.pages[-1]
         # Input owner address offline
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123 Main St')
+        elem = scheduler.owner_address
+        await steps.ready(page, elem, 'Input owner address offline'); await elem.fill('123 Main St')
         
 
-        frame = context.pages[-1]
         # Input WhatsApp number offline
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[5]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('(12) 34567-8901')
+        elem = scheduler.whatsapp
+        await steps.ready(page, elem, 'Input WhatsApp number offline'); await elem.fill('(12) 34567-8901')
         
 
-        frame = context.pages[-1]
         # Click 'Próximo →' button to proceed to next step in scheduling form offline
-        elem = frame.locator('xpath=html/body/div/div/main/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.submit
+        await steps.ready(page, elem, "Click 'Próximo →' button to proceed to next step in scheduling form offline"); await elem.click(timeout=5000)
         
 
         # -> Navigate to 'Creche Pet' scheduling page to verify offline cached content and continue offline testing
-        frame = context.pages[-1]
         # Click 'Creche Pet' to open scheduling form and verify offline caching
-        elem = frame.locator('xpath=html/body/div/div/section/div/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.service_card("Creche Pet")
+        await steps.ready(page, elem, "Click 'Creche Pet' to open scheduling form and verify offline caching"); await elem.click(timeout=5000)
         
 
         # -> Return to main page and navigate to 'Hotel Pet' scheduling page to verify offline cached content and continue offline testing
-        frame = context.pages[-1]
         # Click on main page logo or header to return to main service selection page
-        elem = frame.locator('xpath=html/body/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.logo
+        await steps.ready(page, elem, 'Click on main page logo or header to return to main service selection page'); await elem.click(timeout=5000)
         
 
         # -> Attempt to fill all required fields in the form to enable the 'Próximo →' button and proceed, or verify offline notification if submission is blocked.
-        frame = context.pages[-1]
         # Input pet name offline
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Rex')
+        elem = scheduler.pet_name
+        await steps.ready(page, elem, 'Input pet name offline'); await elem.fill('Rex')
         
 
-        frame = context.pages[-1]
         # Input pet breed offline
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Labrador')
+        await scheduler.fill_breed('Labrador', 'Input pet breed offline')
         
 
-        frame = context.pages[-1]
         # Input owner name offline
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[3]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('John Doe')
+        elem = scheduler.owner_name
+        await steps.ready(page, elem, 'Input owner name offline'); await elem.fill('John Doe')
         
 
-        frame = context.pages[-1]
         # Input owner address offline
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123 Main St')
+        elem = scheduler.owner_address
+        await steps.ready(page, elem, 'Input owner address offline'); await elem.fill('123 Main St')
         
 
-        frame = context.pages[-1]
         # Input WhatsApp number offline
-        elem = frame.locator('xpath=html/body/div/div/main/form/div/div[5]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('(12) 34567-8901')
+        elem = scheduler.whatsapp
+        await steps.ready(page, elem, 'Input WhatsApp number offline'); await elem.fill('(12) 34567-8901')
         
 
         # -> Check if the app install prompt is presented and verify the app is installable as a PWA
-        frame = context.pages[-1]
         # Click 'Acesso Administrativo' to check for app install prompt and PWA installability
-        elem = frame.locator('xpath=html/body/div/div/footer/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.admin_access
+        await steps.ready(page, elem, "Click 'Acesso Administrativo' to check for app install prompt and PWA installability"); await elem.click(timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -189,15 +135,6 @@ async def run_test():
         await expect(frame.locator('text=Email').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Senha').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Entrar').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
@@ -2,32 +2,21 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+from harness import steps
+from harness.pages import AdminSidebar
+from harness.session import scenario_context
+
+# Start already signed in as admin: the storage state is cached once per run by harness.auth
+REQUIRES_ADMIN = True
+
+async def run_test(context=None):
+    # Use the context handed out by run_suite.py, or launch a private browser when run standalone
+    async with scenario_context(context, admin=REQUIRES_ADMIN) as context:
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
         page = await context.new_page()
+        admin = AdminSidebar(page)
         
         # Navigate to your target URL and wait until the network request is committed
         await page.goto("http://localhost:5000", wait_until="commit", timeout=10000)
@@ -46,44 +35,17 @@ async def run_test():
                 pass
         
         # Interact with the page elements to simulate user flow
-        # -> Click on 'Acesso Administrativo' to open admin login
-        frame = context.pages[-1]
-        # Click on 'Acesso Administrativo' button to open admin login
-        elem = frame.locator('xpath=html/body/div/div/footer/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input admin email and password, then click Entrar to log in
-        frame = context.pages[-1]
-        # Input admin email
-        elem = frame.locator('xpath=html/body/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('login@sandypetshop.com')
-        
-
-        frame = context.pages[-1]
-        # Input admin password
-        elem = frame.locator('xpath=html/body/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('1234')
-        
-
-        frame = context.pages[-1]
-        # Click Entrar button to submit login form
-        elem = frame.locator('xpath=html/body/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
+        # -> Context already starts signed in as admin (REQUIRES_ADMIN), so the UI login is skipped
         # -> Click on 'Clientes' button to access client management panel and verify active and recurring clients
-        frame = context.pages[-1]
         # Click on 'Clientes' button to open client management panel
-        elem = frame.locator('xpath=html/body/div/div/div/div/aside/nav/button[5]/img').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = admin.section("Clientes")
+        await steps.ready(page, elem, "Click on 'Clientes' button to open client management panel"); await elem.click(timeout=5000)
         
 
         # -> Navigate to the reporting/statistics section to generate a monthly scheduling and revenue report for verification
-        frame = context.pages[-1]
         # Click on 'Estatísticas' button to open reporting/statistics section
-        elem = frame.locator('xpath=html/body/div/div/div/div/main/div/div[2]/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = admin.button("Estatísticas")
+        await steps.ready(page, elem, "Click on 'Estatísticas' button to open reporting/statistics section"); await elem.click(timeout=5000)
         
 
         # -> Capture full-page screenshot of the admin dashboard overview page as per testing instructions
@@ -91,54 +53,48 @@ async def run_test():
         
 
         # -> Capture full-page screenshot of the admin dashboard overview page as per testing instructions
-        frame = context.pages[-1]
         # Click on 'Banho & Tosa' tab to ensure dashboard overview is fully loaded
-        elem = frame.locator('xpath=html/body/div/div/div/div/aside/nav/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = admin.section("Banho & Tosa")
+        await steps.ready(page, elem, "Click on 'Banho & Tosa' tab to ensure dashboard overview is fully loaded"); await elem.click(timeout=5000)
         
 
         await page.mouse.wheel(0, await page.evaluate('() => window.innerHeight'))
         
 
         # -> Capture full-page screenshot of the client management panel as per testing instructions
-        frame = context.pages[-1]
         # Click on 'Clientes' button to open client management panel for screenshot capture
-        elem = frame.locator('xpath=html/body/div/div/div/div/aside/nav/button[5]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = admin.section("Clientes")
+        await steps.ready(page, elem, "Click on 'Clientes' button to open client management panel for screenshot capture"); await elem.click(timeout=5000)
         
 
         # -> Capture full-page screenshot of the reporting/statistics page as per testing instructions
-        frame = context.pages[-1]
         # Click on 'Estatísticas' button to open reporting/statistics page for screenshot capture
-        elem = frame.locator('xpath=html/body/div/div/div/div/main/div/div[3]/div/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = admin.button("Estatísticas")
+        await steps.ready(page, elem, "Click on 'Estatísticas' button to open reporting/statistics page for screenshot capture"); await elem.click(timeout=5000)
         
 
         # -> Close the 'Editar Cliente' modal and navigate to the reporting/statistics page to capture screenshots and verify report data
-        frame = context.pages[-1]
         # Click 'Cancelar' button to close 'Editar Cliente' modal
-        elem = frame.locator('xpath=html/body/div/div/div/div/main/div/div/div/form/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = admin.button("Cancelar", exact=True)
+        await steps.ready(page, elem, "Click 'Cancelar' button to close 'Editar Cliente' modal"); await elem.click(timeout=5000)
         
 
         # -> Click on 'Estatísticas' button to open reporting/statistics page for screenshot capture
-        frame = context.pages[-1]
         # Click on 'Mensalistas' button to open reporting/statistics page for screenshot capture
-        elem = frame.locator('xpath=html/body/div/div/div/div/aside/nav/button[6]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = admin.section("Mensalistas")
+        await steps.ready(page, elem, "Click on 'Mensalistas' button to open reporting/statistics page for screenshot capture"); await elem.click(timeout=5000)
         
 
         # -> Click on 'Estatísticas' button (index 18) to open reporting/statistics page for screenshot capture and verification
-        frame = context.pages[-1]
         # Click on 'Estatísticas' button to open reporting/statistics page for screenshot capture
-        elem = frame.locator('xpath=html/body/div/div/div/div/main/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = admin.button("Estatísticas")
+        await steps.ready(page, elem, "Click on 'Estatísticas' button to open reporting/statistics page for screenshot capture"); await elem.click(timeout=5000)
         
 
         # --> Assertions to verify final state
         frame = context.pages[-1]
         # Ensure main brand logo is visible
-        await expect(frame.locator('img[alt="Sandy\\'s Pet Shop"]').first).to_be_visible(timeout=30000)
+        await expect(frame.locator('img[alt="Sandy\'s Pet Shop"]').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Sandy\'s Pet Shop').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Painel Administrativo').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Banho & Tosa').first).to_be_visible(timeout=30000)
@@ -200,15 +156,6 @@ async def run_test():
         await expect(frame.locator('text=Eduarda').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Banho & Tosa').nth(1)).to_be_visible(timeout=30000)
         await expect(frame.locator('text=R$ 130,00').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
@@ -2,32 +2,20 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+from harness import steps
+from harness.pages import AdminLoginPage, AdminSidebar, SchedulerPage
+from harness.session import scenario_context
+
+async def run_test(context=None):
+    # Use the context handed out by run_suite.py, or launch a private browser when run standalone
+    async with scenario_context(context) as context:
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
         page = await context.new_page()
+        scheduler = SchedulerPage(page)
+        login = AdminLoginPage(page)
+        admin = AdminSidebar(page)
         
         # Navigate to your target URL and wait until the network request is committed
         await page.goto("http://localhost:5000", wait_until="commit", timeout=10000)
@@ -47,71 +35,61 @@ async def run_test():
         
         # Interact with the page elements to simulate user flow
         # -> Click the 'Agendar Visita' button to start the scheduling process.
-        frame = context.pages[-1]
         # Click the 'Visita' button to start the scheduling process.
-        elem = frame.locator('xpath=html/body/div/div/section/div/button[5]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.service_card("Visita")
+        await steps.ready(page, elem, "Click the 'Visita' button to start the scheduling process."); await elem.click(timeout=5000)
         
 
         # -> Click on 'Creche Pet' button to proceed with scheduling for Creche Pet.
-        frame = context.pages[-1]
         # Click the 'Creche Pet' button to proceed with scheduling.
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.visit_option("Creche Pet")
+        await steps.ready(page, elem, "Click the 'Creche Pet' button to proceed with scheduling."); await elem.click(timeout=5000)
         
 
         # -> Open the service selection modal or any confirmation dialog to verify it opens and closes correctly with full content visibility on desktop.
-        frame = context.pages[-1]
         # Click the '← Voltar' button to trigger navigation or modal to test UI component behavior.
-        elem = frame.locator('xpath=html/body/div/div/div/form/div[8]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.back
+        await steps.ready(page, elem, "Click the '← Voltar' button to trigger navigation or modal to test UI component behavior."); await elem.click(timeout=5000)
         
 
         # -> Click the 'Hotel Pet' button (index 8) again or another service selection button to test modal opening and closing on desktop.
-        frame = context.pages[-1]
         # Retry clicking the 'Hotel Pet' button to open the service selection modal.
-        elem = frame.locator('xpath=html/body/div/div/section/div/button[4]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.service_card("Hotel Pet")
+        await steps.ready(page, elem, "Retry clicking the 'Hotel Pet' button to open the service selection modal."); await elem.click(timeout=5000)
         
 
         # -> Open the 'Serviços Adicionais' section (index 33) to verify modal or expandable content behavior on desktop.
-        frame = context.pages[-1]
         # Click 'Mostrar opções' in 'Serviços Adicionais' to open additional services modal or section.
-        elem = frame.locator('xpath=html/body/div/div/form/div[5]/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.text("Mostrar opções")
+        await steps.ready(page, elem, "Click 'Mostrar opções' in 'Serviços Adicionais' to open additional services modal or section."); await elem.click(timeout=5000)
         
 
         # -> Click the 'Acesso Administrativo' button to open the admin login page.
-        frame = context.pages[-1]
         # Click the 'Acesso Administrativo' button to open admin login.
-        elem = frame.locator('xpath=html/body/div/div/footer/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = scheduler.admin_access
+        await steps.ready(page, elem, "Click the 'Acesso Administrativo' button to open admin login."); await elem.click(timeout=5000)
         
 
         # -> Input admin email and password, then click 'Entrar' to log in.
-        frame = context.pages[-1]
         # Input admin email
-        elem = frame.locator('xpath=html/body/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('login@sandypetshop.com')
+        elem = login.email
+        await steps.ready(page, elem, 'Input admin email'); await elem.fill('login@sandypetshop.com')
         
 
-        frame = context.pages[-1]
         # Input admin password
-        elem = frame.locator('xpath=html/body/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('1234')
+        elem = login.password
+        await steps.ready(page, elem, 'Input admin password'); await elem.fill('1234')
         
 
-        frame = context.pages[-1]
         # Click 'Entrar' button to log in as admin
-        elem = frame.locator('xpath=html/body/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = login.submit
+        await steps.ready(page, elem, "Click 'Entrar' button to log in as admin"); await elem.click(timeout=5000)
         
 
         # -> Click 'Adicionar Agendamento' button (index 17) to open the scheduling modal and verify its UI components.
-        frame = context.pages[-1]
         # Click 'Adicionar Agendamento' button to open scheduling modal.
-        elem = frame.locator('xpath=html/body/div/div/div/div/main/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = admin.button("Adicionar Agendamento")
+        await steps.ready(page, elem, "Click 'Adicionar Agendamento' button to open scheduling modal."); await elem.click(timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -120,15 +98,6 @@ async def run_test():
             await expect(frame.locator('text=UI Component Resize Failure').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test plan execution failed: The app's UI components, including service selection modals and confirmation dialogs, did not adapt correctly on various screen sizes and devices as required.")
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
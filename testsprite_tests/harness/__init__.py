@@ -0,0 +1,6 @@
+"""Infraestrutura compartilhada pelos cenários TC*.py do testsprite_tests.
+
+Cada cenário expõe ``run_test(context=None)``: quando executado pelo runner
+(``run_suite.py``) recebe um contexto de navegador já pronto; quando o arquivo
+é executado sozinho, abre o próprio Chromium como antes.
+"""
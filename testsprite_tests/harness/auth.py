@@ -0,0 +1,121 @@
+"""Login de admin feito uma vez por execução e reaproveitado via storage state.
+
+O app restaura a sessão do Supabase a partir do localStorage
+(``sb-<ref>-auth-token``) e abre direto o painel admin. Então basta logar
+uma vez pelo ``AdminLogin``, salvar o storage state do Playwright em disco
+e criar os contextos admin a partir dele.
+
+O cache é descartado alguns minutos antes de o access token expirar. Isso
+evita que vários contextos em paralelo tentem renovar a sessão com o mesmo
+refresh token, o que o Supabase trata como reuso e revoga.
+"""
+import asyncio
+import json
+import os
+import time
+
+from harness import config, har
+from harness.pages import AdminLoginPage
+
+EXPIRY_MARGIN_S = 300
+LOCK_STALE_S = 120
+
+
+def state_path():
+    # Lido a cada chamada: o runner troca config.CACHE_DIR ao usar o backend local.
+    return config.CACHE_DIR / "admin_state.json"
+
+
+def _lock_path():
+    return config.CACHE_DIR / "admin_state.lock"
+
+
+def _auth_tokens(state):
+    for origin in state.get("origins", []):
+        for item in origin.get("localStorage", []):
+            if item["name"].startswith("sb-") and item["name"].endswith("-auth-token"):
+                try:
+                    yield json.loads(item["value"])
+                except ValueError:
+                    continue
+
+
+def token_expiry(state):
+    """``expires_at`` (epoch, segundos) da sessão salva, ou None se não houver sessão."""
+    expiries = [t.get("expires_at") for t in _auth_tokens(state) if t.get("expires_at")]
+    return min(expiries) if expiries else None
+
+
+def cached_state_path(now=None):
+    """Caminho do storage state em cache, se ainda estiver válido."""
+    try:
+        with open(state_path(), encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    expiry = token_expiry(state)
+    now = time.time() if now is None else now
+    if expiry is None or expiry - EXPIRY_MARGIN_S <= now:
+        return None
+    return state_path()
+
+
+async def _acquire_lock():
+    # Lock por arquivo (O_EXCL) em vez de fcntl para funcionar também no Windows.
+    config.CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    while True:
+        try:
+            os.close(os.open(_lock_path(), os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(_lock_path()) > LOCK_STALE_S:
+                    os.remove(_lock_path())
+                    continue
+            except OSError:
+                continue
+            await asyncio.sleep(0.2)
+
+
+def _release_lock():
+    try:
+        os.remove(_lock_path())
+    except OSError:
+        pass
+
+
+async def login_via_ui(browser, har_mode=None):
+    """Percorre 'Acesso Administrativo' → e-mail → senha → 'Entrar' e salva o storage state.
+
+    ``har_mode``: grava ou responde o ``/auth/v1`` do login pelo HAR ``har.LOGIN``.
+    """
+    context = await browser.new_context()
+    try:
+        await har.attach(context, har.LOGIN, har_mode)
+        page = await context.new_page()
+        login = AdminLoginPage(page)
+        await login.open()
+        await login.login()
+        await page.wait_for_function(
+            "() => Object.keys(localStorage).some(k => k.startsWith('sb-') && k.endsWith('-auth-token'))"
+        )
+        path = state_path()
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        await context.storage_state(path=str(tmp_path))
+        os.replace(tmp_path, path)
+    finally:
+        await context.close()
+    return path
+
+
+async def admin_storage_state(browser, har_mode=None):
+    """Storage state de admin válido: do cache ou de um login novo (um por máquina)."""
+    path = cached_state_path()
+    if path:
+        return path
+    await _acquire_lock()
+    try:
+        # Outro worker pode ter logado enquanto esperávamos o lock.
+        return cached_state_path() or await login_via_ui(browser, har_mode)
+    finally:
+        _release_lock()
@@ -0,0 +1,11 @@
+"""Stand-in local do Supabase para execuções E2E herméticas.
+
+Sobe em ``127.0.0.1`` um servidor com o subconjunto de PostgREST, auth,
+storage e realtime que o app usa, semeado a partir de ``supabase_schema.json``
+e ``supabase/inserts_export.sql``. Os cenários deixam de depender da rede,
+do rate limit e dos dados de produção, e cada execução começa do mesmo estado.
+"""
+from harness.backend.server import LocalSupabase
+from harness.backend.stack import local_stack
+
+__all__ = ["LocalSupabase", "local_stack"]
@@ -0,0 +1,292 @@
+"""Subconjunto da sintaxe de URL do PostgREST usada pelo supabase-js no app.
+
+Cobre filtros (``eq``, ``neq``, ``gt(e)``, ``lt(e)``, ``like``, ``ilike``,
+``is``, ``in``, ``cs``, ``cd``, ``not.*``), ``or``/``and`` aninhados, caminhos
+JSON (``details->>month_key``), ``order``, ``limit``/``offset`` e ``select``
+com aliases e um nível de embedding por FK (``monthly_clients(pet_photo_url)``).
+"""
+import datetime
+import json
+import re
+
+from harness.backend.seed import parse_pg_array, split_top_level
+
+MODIFIERS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+
+
+# --- valores e comparação -------------------------------------------------
+
+def _as_datetime(value):
+    if not isinstance(value, str) or len(value) < 10 or value[4] != "-":
+        return None
+    try:
+        parsed = datetime.datetime.fromisoformat(value.replace(" ", "T", 1))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed
+
+
+def _coerce_pair(actual, expected):
+    """Converte o valor da URL (sempre texto) para o tipo do valor da linha."""
+    if isinstance(actual, bool):
+        return actual, expected.lower() in ("true", "t", "1")
+    if isinstance(actual, (int, float)):
+        try:
+            return actual, float(expected)
+        except ValueError:
+            return str(actual), expected
+    if isinstance(actual, str):
+        left, right = _as_datetime(actual), _as_datetime(expected)
+        if left and right:
+            return left, right
+        return actual, expected
+    if isinstance(actual, (dict, list)):
+        return json.dumps(actual, ensure_ascii=False), expected
+    return actual, expected
+
+
+def _like_regex(pattern, flags=0):
+    parts = []
+    for ch in pattern:
+        if ch in "%*":
+            parts.append(".*")
+        elif ch == "_":
+            parts.append(".")
+        else:
+            parts.append(re.escape(ch))
+    return re.compile("^" + "".join(parts) + "$", flags | re.S)
+
+
+def _parse_list(value):
+    inner = value.strip()
+    if inner.startswith("(") and inner.endswith(")"):
+        inner = inner[1:-1]
+    return [item.strip().strip('"') for item in split_top_level(inner)]
+
+
+def _contains(actual, expected):
+    if isinstance(actual, dict):
+        try:
+            wanted = json.loads(expected)
+        except ValueError:
+            return False
+        return isinstance(wanted, dict) and all(actual.get(k) == v for k, v in wanted.items())
+    if isinstance(actual, list):
+        wanted = parse_pg_array(expected) if expected.startswith("{") else json.loads(expected)
+        return all(str(w) in map(str, actual) for w in wanted)
+    return False
+
+
+def resolve(row, column):
+    """Valor da coluna, aceitando caminhos JSON ``a->b->>c``."""
+    parts = re.split(r"->>?", column)
+    value = row.get(parts[0].strip())
+    for key in parts[1:]:
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                return None
+        if isinstance(value, dict):
+            value = value.get(key.strip().strip("'"))
+        elif isinstance(value, list) and key.strip().isdigit():
+            index = int(key)
+            value = value[index] if index < len(value) else None
+        else:
+            return None
+    if "->>" in column and value is not None and not isinstance(value, str):
+        value = json.dumps(value) if isinstance(value, (dict, list)) else str(value).lower() if isinstance(value, bool) else str(value)
+    return value
+
+
+def compare(op, actual, expected):
+    if op == "is":
+        wanted = expected.lower()
+        if wanted == "null":
+            return actual is None
+        if wanted in ("true", "false"):
+            return actual is (wanted == "true")
+        return False
+    if op == "in":
+        options = _parse_list(expected)
+        return actual is not None and any(compare("eq", actual, o) for o in options)
+    if op in ("cs", "cd", "ov"):
+        if op == "cs":
+            return _contains(actual, expected)
+        if op == "cd":
+            return isinstance(actual, list) and all(str(a) in parse_pg_array(expected) for a in actual)
+        return isinstance(actual, list) and bool(set(map(str, actual)) & set(parse_pg_array(expected)))
+    if actual is None:
+        return False
+    if op in ("like", "ilike"):
+        return bool(_like_regex(expected, re.I if op == "ilike" else 0).match(str(actual)))
+    left, right = _coerce_pair(actual, expected)
+    try:
+        if op == "eq":
+            return left == right
+        if op == "neq":
+            return left != right
+        if op == "gt":
+            return left > right
+        if op == "gte":
+            return left >= right
+        if op == "lt":
+            return left < right
+        if op == "lte":
+            return left <= right
+    except TypeError:
+        return False
+    raise ValueError(f"operador não suportado: {op}")
+
+
+# --- filtros ---------------------------------------------------------------
+
+def _condition(column, expression):
+    negate = expression.startswith("not.")
+    if negate:
+        expression = expression[4:]
+    op, _, value = expression.partition(".")
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        value = value[1:-1]
+
+    def check(row):
+        return compare(op, resolve(row, column), value) != negate
+    return check
+
+
+def _logical(kind, body, negate=False):
+    checks = [_parse_logic_item(item) for item in split_top_level(body)]
+    combine = all if kind == "and" else any
+
+    def check(row):
+        return combine(c(row) for c in checks) != negate
+    return check
+
+
+def _parse_logic_item(item):
+    """Um item dentro de ``or=(...)``: ``col.op.valor`` ou ``and(...)``/``not.or(...)``."""
+    negate = item.startswith("not.") and re.match(r"not\.(and|or)\(", item)
+    body = item[4:] if negate else item
+    logic = re.match(r"(and|or)\((.*)\)$", body, re.S)
+    if logic:
+        return _logical(logic.group(1), logic.group(2), bool(negate))
+    column, _, expression = item.partition(".")
+    return _condition(column, expression)
+
+
+def build_predicate(params):
+    """Combina todos os filtros da query string num único predicado."""
+    checks = []
+    for key, value in params:
+        if key in ("or", "and", "not.or", "not.and"):
+            negate = key.startswith("not.")
+            checks.append(_logical(key.split(".")[-1], value.strip()[1:-1], negate))
+        elif key in MODIFIERS or "." in key:
+            continue  # modificadores e parâmetros de tabelas embutidas (ex.: pets.order)
+        else:
+            checks.append(_condition(key, value))
+    return lambda row: all(c(row) for c in checks)
+
+
+# --- ordenação e paginação ------------------------------------------------
+
+def _sort_key(value):
+    when = _as_datetime(value)
+    if when:
+        return (1, when.timestamp())
+    if isinstance(value, bool):
+        return (0, int(value))
+    if isinstance(value, (int, float)):
+        return (0, value)
+    return (2, str(value))
+
+
+def apply_order(rows, spec):
+    if not spec:
+        return rows
+    for term in reversed(split_top_level(spec)):
+        parts = term.split(".")
+        column = parts[0]
+        descending = "desc" in parts[1:]
+        # Padrão do Postgres: nulls por último em asc e primeiro em desc.
+        nulls_first = "nullsfirst" in parts[1:] or (descending and "nullslast" not in parts[1:])
+        present = [r for r in rows if resolve(r, column) is not None]
+        missing = [r for r in rows if resolve(r, column) is None]
+        present.sort(key=lambda r: _sort_key(resolve(r, column)), reverse=descending)
+        rows = missing + present if nulls_first else present + missing
+    return rows
+
+
+def apply_range(rows, params, range_header=None):
+    """Aplica ``limit``/``offset`` ou o header ``Range``; devolve (linhas, offset)."""
+    values = dict(params)
+    offset = int(values.get("offset", 0) or 0)
+    limit = values.get("limit")
+    if range_header and "-" in range_header:
+        start, _, end = range_header.partition("-")
+        offset = int(start or 0)
+        if end:
+            limit = int(end) - offset + 1
+    if limit is not None:
+        return rows[offset:offset + int(limit)], offset
+    return rows[offset:], offset
+
+
+# --- projeção (select) ----------------------------------------------------
+
+def parse_select(spec):
+    """``'id, pet:pet_name, monthly_clients(pet_photo_url)'`` -> lista de itens."""
+    items = []
+    for raw in split_top_level(spec or "*"):
+        alias, _, body = raw.partition(":") if re.match(r"^\w+:[^:]", raw) else ("", "", raw)
+        embed = re.match(r"^(\w+)(?:!\w+)?(?:!inner)?\((.*)\)$", body, re.S)
+        if embed:
+            items.append({"alias": alias or embed.group(1), "table": embed.group(1), "select": embed.group(2)})
+        else:
+            column = body.split("::")[0].strip()
+            items.append({"alias": alias or column.split("->")[-1].strip(">"), "column": column})
+    return items
+
+
+def project(store, table, rows, spec):
+    items = parse_select(spec)
+    plain = [i for i in items if "column" in i]
+    embeds = [i for i in items if "table" in i]
+    star = any(i["column"] == "*" for i in plain)
+    if star and not embeds and len(plain) == 1:
+        return rows
+
+    result = []
+    for row in rows:
+        out = dict(row) if star else {}
+        for item in plain:
+            if item["column"] != "*":
+                out[item["alias"]] = resolve(row, item["column"])
+        for item in embeds:
+            out[item["alias"]] = _embed(store, table, row, item)
+        result.append(out)
+    return result
+
+
+def _embed(store, table, row, item):
+    target = item["table"]
+    schema = store.schemas.get(table)
+    fks = schema.foreign_keys if schema else {}
+    # Muitos-para-um: esta linha aponta para a tabela alvo.
+    fk_column = next((c for c, t in fks.items() if t == target), None)
+    if fk_column is None and f"{target.rstrip('s')}_id" in row:
+        fk_column = f"{target.rstrip('s')}_id"
+    if fk_column is not None:
+        key = row.get(fk_column)
+        pk = store.primary_key(target)
+        match = store.select(target, lambda r: key is not None and r.get(pk) == key)
+        return project(store, target, match, item["select"])[0] if match else None
+    # Um-para-muitos: a tabela alvo aponta para esta.
+    target_schema = store.schemas.get(target)
+    back = next((c for c, t in (target_schema.foreign_keys if target_schema else {}).items() if t == table), None)
+    if back is None:
+        return []
+    key = row.get(store.primary_key(table))
+    return project(store, target, store.select(target, lambda r: r.get(back) == key), item["select"])
@@ -0,0 +1,211 @@
+"""Leitura do schema e dos dados de seed do stand-in local do Supabase.
+
+- ``supabase_schema.json`` (apesar da extensão, é o DDL exportado pelo
+  dashboard) e ``supabase/schema/*.sql`` dão colunas, tipos, defaults e FKs;
+- ``supabase/inserts_export.sql`` dá as linhas. O dump separa os comandos
+  com ``\\n`` literal e tem quebras de linha reais dentro dos textos, então é
+  lido com um tokenizador próprio em vez de ``split``.
+"""
+import json
+import re
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+SCHEMA_FILES = [REPO_ROOT / "supabase_schema.json", *sorted((REPO_ROOT / "supabase" / "schema").glob("*.sql"))]
+INSERTS_FILE = REPO_ROOT / "supabase" / "inserts_export.sql"
+
+_CREATE_RE = re.compile(r"create\s+table\s+(?:if\s+not\s+exists\s+)?(?:public\.)?(\w+)\s*\(", re.I)
+_FK_RE = re.compile(r"foreign\s+key\s*\((\w+)\)\s*references\s+(?:public\.)?(\w+)", re.I)
+_INLINE_REF_RE = re.compile(r"references\s+(?:public\.)?(\w+)", re.I)
+_DEFAULT_RE = re.compile(r"\bdefault\s+(.+?)(?:\s+(?:not\s+null|null|unique|primary\s+key|check|references)\b|$)", re.I)
+
+
+class Column:
+    def __init__(self, name, type_, default=None):
+        self.name = name
+        self.type = type_
+        self.default = default
+
+    @property
+    def is_json(self):
+        return self.type in ("jsonb", "json")
+
+    @property
+    def is_array(self):
+        return self.type == "array" or self.type.endswith("[]")
+
+
+class TableSchema:
+    def __init__(self, name):
+        self.name = name
+        self.columns = {}
+        self.primary_key = "id"
+        self.foreign_keys = {}  # coluna -> tabela referenciada
+
+
+def split_top_level(text, sep=","):
+    """Divide ``text`` em ``sep`` ignorando separadores entre parênteses ou aspas."""
+    parts, depth, quote, current = [], 0, None, []
+    for ch in text:
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in "'\"":
+            quote = ch
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == sep and depth == 0:
+            parts.append("".join(current))
+            current = []
+            continue
+        current.append(ch)
+    parts.append("".join(current))
+    return [p.strip() for p in parts if p.strip()]
+
+
+def _table_body(text, start):
+    depth = 1
+    for i in range(start, len(text)):
+        if text[i] == "(":
+            depth += 1
+        elif text[i] == ")":
+            depth -= 1
+            if depth == 0:
+                return text[start:i]
+    return text[start:]
+
+
+def _column_type(words):
+    type_ = words[1].lower().rstrip(",") if len(words) > 1 else "text"
+    if type_ in ("timestamp", "timestamptz"):
+        return "timestamptz" if "with time zone" in " ".join(words).lower() or type_ == "timestamptz" else "timestamp"
+    if type_ in ("int", "int4", "int8", "smallint"):
+        return "integer"
+    return type_
+
+
+def parse_schema(text, schemas=None):
+    schemas = {} if schemas is None else schemas
+    text = re.sub(r"--[^\n]*", "", text)
+    for match in _CREATE_RE.finditer(text):
+        table = schemas.setdefault(match.group(1), TableSchema(match.group(1)))
+        for item in split_top_level(_table_body(text, match.end())):
+            words = item.split()
+            head = words[0].lower()
+            if head in ("constraint", "primary", "unique", "foreign", "check"):
+                fk = _FK_RE.search(item)
+                if fk:
+                    table.foreign_keys[fk.group(1)] = fk.group(2)
+                pk = re.search(r"primary\s+key\s*\((\w+)\)", item, re.I)
+                if pk:
+                    table.primary_key = pk.group(1)
+                continue
+            default = _DEFAULT_RE.search(item)
+            table.columns[words[0]] = Column(words[0], _column_type(words), default.group(1).strip() if default else None)
+            if re.search(r"\bprimary\s+key\b", item, re.I):
+                table.primary_key = words[0]
+            ref = _INLINE_REF_RE.search(item)
+            if ref:
+                table.foreign_keys[words[0]] = ref.group(1)
+    return schemas
+
+
+def load_schemas(paths=SCHEMA_FILES):
+    schemas = {}
+    for path in paths:
+        if Path(path).exists():
+            parse_schema(Path(path).read_text(encoding="utf-8"), schemas)
+    return schemas
+
+
+# --- dump de INSERTs ------------------------------------------------------
+
+_INSERT_RE = re.compile(r'INSERT INTO (?:public\.)?"?(\w+)"? \(([^)]*)\) VALUES \(')
+_NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?")
+
+
+def _parse_values(text, pos):
+    """Lê a lista de valores a partir de ``pos`` (logo após o ``(``); devolve (valores, fim)."""
+    values = []
+    while True:
+        while text[pos] in " \t\r\n":
+            pos += 1
+        if text[pos] == "'":
+            chunks, pos = [], pos + 1
+            while True:
+                end = text.index("'", pos)
+                chunks.append(text[pos:end])
+                if text.startswith("''", end):
+                    chunks.append("'")
+                    pos = end + 2
+                    continue
+                pos = end + 1
+                break
+            values.append("".join(chunks))
+        elif text.startswith("NULL", pos):
+            values.append(None)
+            pos += 4
+        elif text.startswith("TRUE", pos):
+            values.append(True)
+            pos += 4
+        elif text.startswith("FALSE", pos):
+            values.append(False)
+            pos += 5
+        else:
+            number = _NUMBER_RE.match(text, pos)
+            raw = number.group(0)
+            values.append(float(raw) if any(c in raw for c in ".eE") else int(raw))
+            pos = number.end()
+        while text[pos] in " \t\r\n":
+            pos += 1
+        if text[pos] == ")":
+            return values, pos + 1
+        pos += 1  # vírgula
+
+
+def parse_pg_array(value):
+    """``'{a,"b c"}'`` -> ``['a', 'b c']`` (arrays de uma dimensão)."""
+    inner = value.strip()[1:-1]
+    if not inner:
+        return []
+    return [item.strip().strip('"') for item in split_top_level(inner)]
+
+
+def coerce(column, value):
+    if not isinstance(value, str) or column is None:
+        return value
+    if column.is_json:
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    if column.is_array and value.startswith("{"):
+        return parse_pg_array(value)
+    return value
+
+
+def parse_inserts(text, schemas):
+    """Gera ``(tabela, linha)`` para cada INSERT do dump."""
+    pos = 0
+    while True:
+        match = _INSERT_RE.search(text, pos)
+        if not match:
+            return
+        table = match.group(1)
+        columns = [c.strip().strip('"') for c in match.group(2).split(",")]
+        values, pos = _parse_values(text, match.end())
+        schema = schemas.get(table)
+        row = {}
+        for name, value in zip(columns, values):
+            row[name] = coerce(schema.columns.get(name) if schema else None, value)
+        yield table, row
+
+
+def load_rows(schemas, path=INSERTS_FILE):
+    rows = {}
+    if Path(path).exists():
+        for table, row in parse_inserts(Path(path).read_text(encoding="utf-8"), schemas):
+            rows.setdefault(table, []).append(row)
+    return rows
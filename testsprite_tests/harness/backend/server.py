@@ -0,0 +1,485 @@
+"""Servidor HTTP local que imita os endpoints do Supabase usados pelo app.
+
+- ``/rest/v1``: PostgREST (ver ``postgrest.py``) sobre o ``Store`` em memória;
+- ``/auth/v1``: login por senha, refresh, ``/user`` e logout, com JWT HS256
+  assinado localmente (o refresh token também é um JWT, então vale em
+  qualquer instância do servidor: o storage state de admin em cache
+  sobrevive de uma execução para a outra);
+- ``/storage/v1``: upload e download de objetos em memória;
+- ``/functions/v1``: responde ``{}`` (as edge functions ficam fora do teste);
+- ``/realtime/v1/websocket``: protocolo Phoenix mínimo para os canais
+  ``postgres_changes`` (``admin_changes_realtime``, ``disabled_dates_changes``).
+
+Só usa a biblioteca padrão, para rodar em qualquer máquina de CI.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+import struct
+import threading
+import time
+import urllib.parse
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from harness import config
+from harness.backend import postgrest
+from harness.backend.store import Store, now_iso
+
+JWT_SECRET = b"sandypetshop-local-stand-in"
+SESSION_TTL_S = 3600
+REFRESH_TTL_S = 30 * 24 * 3600
+OBJECT_JSON = "application/vnd.pgrst.object+json"
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+def _b64url(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def make_jwt(claims):
+    header = _b64url(json.dumps({"alg": "HS256", "typ": "JWT"}).encode())
+    payload = _b64url(json.dumps(claims).encode())
+    signature = hmac.new(JWT_SECRET, f"{header}.{payload}".encode(), hashlib.sha256).digest()
+    return f"{header}.{payload}.{_b64url(signature)}"
+
+
+def read_jwt(token):
+    try:
+        header, payload, signature = token.split(".")
+        expected = hmac.new(JWT_SECRET, f"{header}.{payload}".encode(), hashlib.sha256).digest()
+        if not hmac.compare_digest(_b64url(expected), signature):
+            return None
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    except ValueError:
+        return None
+    return claims if claims.get("exp", 0) > time.time() else None
+
+
+class LocalSupabase:
+    """Estado compartilhado do stand-in: dados, usuários, objetos e sockets realtime."""
+
+    def __init__(self, host="127.0.0.1", port=54321, store=None, max_rows=None):
+        self.host = host
+        self.port = port
+        # Equivale ao "Max rows" da API do Supabase; None devolve tudo.
+        self.max_rows = max_rows
+        self.store = store if store is not None else Store.from_seed()
+        self.store.listeners.append(self._broadcast)
+        self.users = {}
+        self.objects = {}
+        self.sockets = set()
+        self.sockets_lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+        self.add_user(config.ADMIN_EMAIL, config.ADMIN_PASSWORD)
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def add_user(self, email, password):
+        created = now_iso()
+        self.users[email] = {
+            "password": password,
+            "user": {
+                "id": str(uuid.uuid5(uuid.NAMESPACE_URL, email)),
+                "aud": "authenticated",
+                "role": "authenticated",
+                "email": email,
+                "email_confirmed_at": created,
+                "app_metadata": {"provider": "email", "providers": ["email"]},
+                "user_metadata": {},
+                "created_at": created,
+                "updated_at": created,
+            },
+        }
+
+    def new_session(self, email):
+        user = self.users[email]["user"]
+        issued = int(time.time())
+        refresh = make_jwt({"sub": user["id"], "email": email, "typ": "refresh",
+                            "exp": issued + REFRESH_TTL_S, "jti": secrets.token_hex(8)})
+        return {
+            "access_token": make_jwt({
+                "sub": user["id"], "email": email, "role": "authenticated", "aud": "authenticated",
+                "iat": issued, "exp": issued + SESSION_TTL_S, "session_id": str(uuid.uuid4()),
+            }),
+            "token_type": "bearer",
+            "expires_in": SESSION_TTL_S,
+            "expires_at": issued + SESSION_TTL_S,
+            "refresh_token": refresh,
+            "user": user,
+        }
+
+    def start(self):
+        self._httpd = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.app = self
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="local-supabase", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _broadcast(self, table, event, new, old):
+        with self.sockets_lock:
+            sockets = list(self.sockets)
+        for socket in sockets:
+            socket.notify(table, event, new, old)
+
+
+# --- realtime (Phoenix sobre WebSocket) -----------------------------------
+
+class _RealtimeSocket:
+    def __init__(self, handler):
+        self.handler = handler
+        self.send_lock = threading.Lock()
+        self.channels = {}  # topic -> (join_ref, bindings)
+        self.array_format = False
+        self._ids = iter(range(1, 1 << 30))
+
+    def send(self, topic, event, payload, ref=None, join_ref=None):
+        if self.array_format:
+            message = [join_ref, ref, topic, event, payload]
+        else:
+            message = {"topic": topic, "event": event, "payload": payload, "ref": ref, "join_ref": join_ref}
+        data = json.dumps(message, ensure_ascii=False, default=str).encode()
+        with self.send_lock:
+            _ws_write(self.handler.wfile, 0x1, data)
+
+    def handle(self, raw):
+        message = json.loads(raw)
+        if isinstance(message, list):
+            self.array_format = True
+            join_ref, ref, topic, event, payload = message
+        else:
+            join_ref, ref = message.get("join_ref"), message.get("ref")
+            topic, event, payload = message["topic"], message["event"], message.get("payload") or {}
+
+        response = {}
+        if event == "phx_join":
+            requested = (payload.get("config") or {}).get("postgres_changes") or []
+            bindings = [{**b, "id": next(self._ids)} for b in requested]
+            self.channels[topic] = (join_ref or ref, bindings)
+            response = {"postgres_changes": bindings}
+        elif event == "phx_leave":
+            self.channels.pop(topic, None)
+        self.send(topic, "phx_reply", {"status": "ok", "response": response}, ref, join_ref)
+        if event == "phx_join" and bindings:
+            self.send(topic, "system", {"extension": "postgres_changes", "status": "ok",
+                                        "message": "Subscribed to PostgreSQL", "channel": topic.split(":", 1)[-1]},
+                      None, join_ref or ref)
+
+    def notify(self, table, event, new, old):
+        for topic, (join_ref, bindings) in list(self.channels.items()):
+            ids = [b["id"] for b in bindings if self._matches(b, table, event, new or old)]
+            if not ids:
+                continue
+            self.send(topic, "postgres_changes", {
+                "ids": ids,
+                "data": {
+                    "schema": "public", "table": table, "commit_timestamp": now_iso(),
+                    "type": event, "eventType": event, "columns": [],
+                    "record": new, "old_record": old, "errors": None,
+                },
+            }, None, join_ref)
+
+    @staticmethod
+    def _matches(binding, table, event, row):
+        if binding.get("schema", "public") not in ("public", "*"):
+            return False
+        if binding.get("table") not in (None, "*", table):
+            return False
+        if binding.get("event", "*") not in ("*", event):
+            return False
+        if binding.get("filter"):
+            column, _, expression = binding["filter"].partition("=")
+            return postgrest.build_predicate([(column, expression)])(row)
+        return True
+
+
+def _ws_read(rfile):
+    head = rfile.read(2)
+    if len(head) < 2:
+        return None, None
+    opcode = head[0] & 0x0F
+    length = head[1] & 0x7F
+    if length == 126:
+        length = struct.unpack("!H", rfile.read(2))[0]
+    elif length == 127:
+        length = struct.unpack("!Q", rfile.read(8))[0]
+    mask = rfile.read(4) if head[1] & 0x80 else None
+    data = rfile.read(length)
+    if mask:
+        data = bytes(b ^ mask[i % 4] for i, b in enumerate(data))
+    return opcode, data
+
+
+def _ws_write(wfile, opcode, data):
+    header = bytes([0x80 | opcode])
+    if len(data) < 126:
+        header += bytes([len(data)])
+    elif len(data) < 1 << 16:
+        header += bytes([126]) + struct.pack("!H", len(data))
+    else:
+        header += bytes([127]) + struct.pack("!Q", len(data))
+    wfile.write(header + data)
+    wfile.flush()
+
+
+# --- HTTP ----------------------------------------------------------------
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    @property
+    def app(self):
+        return self.server.app
+
+    # respostas
+
+    def _cors(self):
+        self.send_header("Access-Control-Allow-Origin", self.headers.get("Origin") or "*")
+        self.send_header("Access-Control-Allow-Credentials", "true")
+        self.send_header("Access-Control-Expose-Headers", "Content-Range, X-Total-Count")
+
+    def _send(self, status, body=None, headers=None, raw=None, content_type="application/json"):
+        data = raw if raw is not None else (b"" if body is None else json.dumps(body, ensure_ascii=False, default=str).encode())
+        self.send_response(status)
+        self._cors()
+        if data or status not in (204,):
+            self.send_header("Content-Type", content_type)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(data)) if self.command != "HEAD" else "0")
+        self.end_headers()
+        if data and self.command != "HEAD":
+            self.wfile.write(data)
+
+    def _error(self, status, message, code="PGRST100", details=None):
+        self._send(status, {"code": code, "message": message, "details": details, "hint": None})
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _json_body(self):
+        raw = self._body()
+        return json.loads(raw) if raw else None
+
+    # roteamento
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self._cors()
+        self.send_header("Access-Control-Allow-Methods", "GET, HEAD, POST, PUT, PATCH, DELETE, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers", self.headers.get("Access-Control-Request-Headers") or "*")
+        self.send_header("Access-Control-Max-Age", "86400")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        self._route()
+
+    do_HEAD = do_POST = do_PUT = do_PATCH = do_DELETE = do_GET
+
+    def _route(self):
+        parsed = urllib.parse.urlsplit(self.path)
+        path = parsed.path
+        params = urllib.parse.parse_qsl(parsed.query, keep_blank_values=True)
+        try:
+            if path.startswith("/rest/v1/rpc/"):
+                self._body()
+                self._send(200, None, raw=b"null")
+            elif path.startswith("/rest/v1/"):
+                self._rest(urllib.parse.unquote(path[len("/rest/v1/"):]), params)
+            elif path.startswith("/auth/v1/"):
+                self._auth(path[len("/auth/v1/"):], dict(params))
+            elif path.startswith("/storage/v1/"):
+                self._storage(urllib.parse.unquote(path[len("/storage/v1/"):]))
+            elif path.startswith("/functions/v1/"):
+                self._body()
+                self._send(200, {})
+            elif path.startswith("/realtime/v1/websocket"):
+                self._realtime()
+            else:
+                self._error(404, f"rota desconhecida: {path}", code="PGRST000")
+        except (ValueError, KeyError, TypeError) as exc:
+            self._error(400, str(exc))
+
+    # /rest/v1
+
+    def _rest(self, table, params):
+        store = self.app.store
+        prefer = self.headers.get("Prefer") or ""
+        wants_object = OBJECT_JSON in (self.headers.get("Accept") or "")
+        select = dict(params).get("select", "*")
+        predicate = postgrest.build_predicate(params)
+
+        if self.command in ("GET", "HEAD"):
+            rows = postgrest.apply_order(store.select(table, predicate), dict(params).get("order"))
+            total = len(rows)
+            page, offset = postgrest.apply_range(rows, params, self.headers.get("Range"))
+            if self.app.max_rows is not None:
+                page = page[:self.app.max_rows]
+            return self._rows(200, table, page, select, wants_object, prefer, total, offset)
+
+        if self.command == "POST":
+            body = self._json_body()
+            rows = body if isinstance(body, list) else [body]
+            if "resolution=" in prefer:
+                result = self._upsert(table, rows, dict(params).get("on_conflict"), "ignore-duplicates" in prefer)
+            else:
+                result = store.insert(table, rows)
+            return self._rows(201, table, result, select, wants_object, prefer)
+
+        if self.command == "PATCH":
+            changes = self._json_body() or {}
+            return self._rows(200, table, store.update(table, predicate, changes), select, wants_object, prefer)
+
+        if self.command == "DELETE":
+            return self._rows(200, table, store.delete(table, predicate), select, wants_object, prefer)
+
+        self._error(405, f"método não suportado: {self.command}")
+
+    def _upsert(self, table, rows, on_conflict, ignore_duplicates):
+        store = self.app.store
+        keys = [k.strip() for k in (on_conflict or store.primary_key(table)).split(",")]
+        result = []
+        for row in rows:
+            match = lambda r, row=row: all(r.get(k) == row.get(k) for k in keys)
+            with store.lock:
+                exists = any(match(r) for r in store.table(table)) if all(row.get(k) is not None for k in keys) else False
+            if exists:
+                if not ignore_duplicates:
+                    result.extend(store.update(table, match, row))
+            else:
+                result.extend(store.insert(table, [row]))
+        return result
+
+    def _rows(self, status, table, rows, select, wants_object, prefer, total=None, offset=0):
+        headers = {}
+        count = "count=" in prefer
+        if self.command in ("GET", "HEAD"):
+            total = len(rows) if total is None else total
+            size = total if count else "*"
+            headers["Content-Range"] = f"{offset}-{offset + len(rows) - 1}/{size}" if rows else f"*/{size}"
+        if self.command not in ("GET", "HEAD") and "return=representation" not in prefer:
+            return self._send(204 if status != 201 else 201, None, headers)
+
+        body = postgrest.project(self.app.store, table, rows, select)
+        if wants_object:
+            if len(body) != 1:
+                return self._send(406, {
+                    "code": "PGRST116",
+                    "details": f"The result contains {len(body)} rows",
+                    "hint": None,
+                    "message": "JSON object requested, multiple (or no) rows returned",
+                })
+            body = body[0]
+        self._send(status, body, headers)
+
+    # /auth/v1
+
+    def _auth(self, route, params):
+        body = self._json_body() if self.command in ("POST", "PUT") else None
+        if route == "token" and params.get("grant_type") == "password":
+            account = self.app.users.get((body or {}).get("email"))
+            if not account or account["password"] != body.get("password"):
+                return self._send(400, {"code": 400, "error_code": "invalid_credentials",
+                                        "msg": "Invalid login credentials",
+                                        "error": "invalid_grant", "error_description": "Invalid login credentials"})
+            return self._send(200, self.app.new_session(body["email"]))
+        if route == "token" and params.get("grant_type") == "refresh_token":
+            claims = read_jwt((body or {}).get("refresh_token") or "")
+            email = claims and claims.get("typ") == "refresh" and claims.get("email")
+            if email not in self.app.users:
+                return self._send(400, {"code": 400, "error_code": "refresh_token_not_found",
+                                        "msg": "Invalid Refresh Token: Refresh Token Not Found"})
+            return self._send(200, self.app.new_session(email))
+        if route == "user":
+            token = (self.headers.get("Authorization") or "").removeprefix("Bearer ").strip()
+            claims = read_jwt(token)
+            if not claims or claims.get("email") not in self.app.users:
+                return self._send(401, {"code": 401, "error_code": "bad_jwt", "msg": "invalid JWT"})
+            return self._send(200, self.app.users[claims["email"]]["user"])
+        if route == "logout":
+            return self._send(204)
+        if route in ("settings", "health"):
+            return self._send(200, {"external": {"email": True}, "disable_signup": True})
+        self._send(404, {"code": 404, "msg": f"rota de auth desconhecida: {route}"})
+
+    # /storage/v1
+
+    def _storage(self, route):
+        parts = route.split("/")
+        if parts[:2] == ["object", "public"]:
+            key = "/".join(parts[2:])
+        elif parts[0] == "object":
+            key = "/".join(parts[1:])
+        else:
+            self._body()
+            return self._send(200, [])
+
+        if self.command in ("POST", "PUT"):
+            content_type = self.headers.get("Content-Type") or "application/octet-stream"
+            self.app.objects[key] = (content_type, self._body())
+            return self._send(200, {"Key": key, "Id": str(uuid.uuid4())})
+        if self.command == "DELETE":
+            prefixes = (self._json_body() or {}).get("prefixes") or []
+            removed = [self.app.objects.pop(f"{key}/{p}", None) and {"name": p} for p in prefixes]
+            return self._send(200, [r for r in removed if r])
+        if key in self.app.objects:
+            content_type, data = self.app.objects[key]
+            return self._send(200, raw=data, content_type=content_type)
+        self._send(404, {"statusCode": "404", "error": "not_found", "message": "Object not found"})
+
+    # /realtime/v1/websocket
+
+    def _realtime(self):
+        key = self.headers.get("Sec-WebSocket-Key")
+        if not key:
+            return self._error(400, "upgrade para websocket esperado")
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+        self.send_response(101)
+        self.send_header("Upgrade", "websocket")
+        self.send_header("Connection", "Upgrade")
+        self.send_header("Sec-WebSocket-Accept", accept)
+        self.end_headers()
+        self.wfile.flush()
+
+        socket = _RealtimeSocket(self)
+        with self.app.sockets_lock:
+            self.app.sockets.add(socket)
+        try:
+            while True:
+                opcode, data = _ws_read(self.rfile)
+                if opcode is None or opcode == 0x8:
+                    break
+                if opcode == 0x9:
+                    with socket.send_lock:
+                        _ws_write(self.wfile, 0xA, data)
+                elif opcode == 0x1:
+                    socket.handle(data.decode())
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            with self.app.sockets_lock:
+                self.app.sockets.discard(socket)
+            self.close_connection = True
@@ -0,0 +1,101 @@
+"""Sobe o stand-in do Supabase e o Vite apontando para ele."""
+import contextlib
+import os
+import shutil
+import socket
+import subprocess
+import time
+import urllib.parse
+
+from harness import config
+from harness.backend.seed import REPO_ROOT
+from harness.backend.server import LocalSupabase
+
+STARTUP_TIMEOUT_S = 60
+# O supabase-js só valida o formato; o stand-in não confere a anon key.
+LOCAL_ANON_KEY = "local-stand-in-anon-key"
+
+
+def isolate_cache():
+    """Usa ``.cache/local`` no lugar de ``.cache`` neste processo e nos workers.
+
+    A sessão do backend local fica em outra chave do localStorage
+    (``sb-127-auth-token``), então o storage state de admin não pode ser o
+    mesmo do Supabase remoto.
+    """
+    if config.CACHE_DIR.name != "local":
+        config.CACHE_DIR = config.CACHE_DIR / "local"
+        os.environ["TESTSPRITE_CACHE_DIR"] = str(config.CACHE_DIR)
+
+
+def wait_for_port(host, port, timeout=STARTUP_TIMEOUT_S):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with contextlib.suppress(OSError), socket.create_connection((host, port), timeout=0.5):
+            return
+        time.sleep(0.1)
+    raise TimeoutError(f"{host}:{port} não respondeu em {timeout}s")
+
+
+def build_app(env=None):
+    """``npm run build``: ``dist/`` de produção com o ``sw.js`` gerado (``python3 -m scripts.sw``)."""
+    npm = shutil.which("npm") or "npm"
+    subprocess.run([npm, "run", "build"], cwd=REPO_ROOT, env=env, check=True, stdout=subprocess.DEVNULL)
+
+
+def start_vite(backend_url=None, base_url=config.BASE_URL, preview=False):
+    """Inicia ``vite`` na porta do BASE_URL, com as variáveis do Supabase trocadas se houver ``backend_url``.
+
+    ``preview``: faz o build de produção e serve o ``dist/`` com ``vite
+    preview`` no lugar do servidor de desenvolvimento; é o que o service
+    worker precisa (o ``sw.js`` da raiz é só o modelo, com o precache vazio).
+    """
+    port = urllib.parse.urlsplit(base_url).port or 80
+    npx = shutil.which("npx") or "npx"
+    env = dict(os.environ)
+    if backend_url:
+        env.update(VITE_SUPABASE_URL=backend_url, VITE_SUPABASE_ANON_KEY=LOCAL_ANON_KEY)
+    command = [npx, "vite", "--port", str(port), "--strictPort"]
+    if preview:
+        build_app(env)
+        command = [npx, "vite", "preview", "--port", str(port), "--strictPort"]
+    process = subprocess.Popen(command, cwd=REPO_ROOT, env=env, stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port("127.0.0.1", port)
+    except TimeoutError:
+        process.terminate()
+        raise
+    return process
+
+
+def stop_vite(process):
+    process.terminate()
+    with contextlib.suppress(subprocess.TimeoutExpired):
+        process.wait(timeout=10)
+
+
+@contextlib.contextmanager
+def preview_server(backend_url=None, base_url=config.BASE_URL):
+    """Build de produção servido pelo ``vite preview`` durante o bloco."""
+    vite = start_vite(backend_url, base_url, preview=True)
+    try:
+        yield vite
+    finally:
+        stop_vite(vite)
+
+
+@contextlib.contextmanager
+def local_stack(port=config.BACKEND_PORT, with_vite=True, preview=False):
+    """Backend local + Vite (``preview``: build de produção) durante o bloco; ambos são encerrados na saída."""
+    isolate_cache()
+    backend = LocalSupabase(port=port).start()
+    vite = None
+    try:
+        if with_vite:
+            vite = start_vite(backend.url, preview=preview)
+        yield backend
+    finally:
+        if vite:
+            stop_vite(vite)
+        backend.stop()
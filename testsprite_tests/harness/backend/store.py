@@ -0,0 +1,124 @@
+"""Armazenamento em memória das tabelas do stand-in, com notificação de mudanças."""
+import copy
+import datetime
+import itertools
+import threading
+import uuid
+
+from harness.backend import seed
+
+
+def now_iso():
+    return datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+
+class Store:
+    """Tabelas como listas de dicts; toda operação passa pelo mesmo lock.
+
+    Tabelas que não existem no schema são criadas vazias no primeiro acesso
+    (o app consulta várias que não estão no export, como
+    ``agendamento_banhotosa``), em vez do 404 do PostgREST real.
+    """
+
+    def __init__(self, schemas=None, rows=None):
+        self.schemas = schemas or {}
+        self.tables = {name: [] for name in self.schemas}
+        for name, table_rows in (rows or {}).items():
+            self.tables.setdefault(name, []).extend(table_rows)
+        self.lock = threading.RLock()
+        self.listeners = []
+        self._sequences = {}
+
+    @classmethod
+    def from_seed(cls, with_rows=True):
+        schemas = seed.load_schemas()
+        return cls(schemas, seed.load_rows(schemas) if with_rows else None)
+
+    def table(self, name):
+        with self.lock:
+            return self.tables.setdefault(name, [])
+
+    def primary_key(self, name):
+        schema = self.schemas.get(name)
+        return schema.primary_key if schema else "id"
+
+    def _next_sequence(self, table, column):
+        key = (table, column)
+        if key not in self._sequences:
+            current = max((r.get(column) or 0 for r in self.table(table) if isinstance(r.get(column), int)), default=0)
+            self._sequences[key] = itertools.count(current + 1)
+        return next(self._sequences[key])
+
+    def _apply_defaults(self, table, row):
+        schema = self.schemas.get(table)
+        columns = schema.columns.values() if schema else ()
+        for column in columns:
+            if column.name in row:
+                continue
+            raw = column.default or ""
+            default = raw.lower()
+            if default.startswith("gen_random_uuid") or default.startswith("uuid_generate"):
+                row[column.name] = str(uuid.uuid4())
+            elif default.startswith("now()") or default.startswith("timezone("):
+                row[column.name] = now_iso()
+            elif default.startswith("nextval"):
+                row[column.name] = self._next_sequence(table, column.name)
+            elif default in ("true", "false"):
+                row[column.name] = default == "true"
+            elif default.startswith("'"):
+                literal = raw[1:raw.index("'", 1)]
+                row[column.name] = seed.coerce(column, literal)
+            elif default:
+                try:
+                    row[column.name] = float(default) if "." in default else int(default)
+                except ValueError:
+                    row[column.name] = None
+            else:
+                row[column.name] = None
+        pk = self.primary_key(table)
+        if row.get(pk) is None:
+            row[pk] = str(uuid.uuid4())
+        return row
+
+    def _notify(self, table, event, new, old):
+        for listener in list(self.listeners):
+            listener(table, event, copy.deepcopy(new), copy.deepcopy(old))
+
+    def insert(self, table, rows):
+        with self.lock:
+            created = [self._apply_defaults(table, dict(row)) for row in rows]
+            self.table(table).extend(created)
+        for row in created:
+            self._notify(table, "INSERT", row, {})
+        return copy.deepcopy(created)
+
+    def bulk_load(self, table, rows):
+        """Anexa linhas prontas sem defaults nem notificação (seed de benchmarks)."""
+        with self.lock:
+            self.table(table).extend(rows)
+
+    def select(self, table, predicate=None):
+        with self.lock:
+            # Cópia rasa basta: update() troca os valores em vez de mutá-los no lugar.
+            return [dict(r) for r in self.table(table) if predicate is None or predicate(r)]
+
+    def update(self, table, predicate, changes):
+        changed = []
+        with self.lock:
+            for row in self.table(table):
+                if predicate(row):
+                    old = copy.deepcopy(row)
+                    row.update(copy.deepcopy(changes))
+                    changed.append((copy.deepcopy(row), old))
+        for new, old in changed:
+            self._notify(table, "UPDATE", new, old)
+        return [new for new, _ in changed]
+
+    def delete(self, table, predicate):
+        with self.lock:
+            rows = self.table(table)
+            removed = [r for r in rows if predicate(r)]
+            rows[:] = [r for r in rows if not predicate(r)]
+        for row in removed:
+            self._notify(table, "DELETE", {}, row)
+        return removed
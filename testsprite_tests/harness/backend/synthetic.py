@@ -0,0 +1,124 @@
+"""Histórico sintético de atendimentos para os benchmarks do painel admin.
+
+Gera linhas com as colunas que ``FinancialDashboardView`` e
+``InsightsDashboard`` leem, espalhadas pelos últimos ``years`` anos, com a
+mesma mistura de serviços, pesos e status do uso real. A semente é fixa:
+dois benchmarks com o mesmo tamanho recebem exatamente os mesmos dados.
+"""
+import datetime
+import random
+import uuid
+
+# Fração do total por tabela, próxima da proporção do export de produção.
+TABLE_SHARES = {
+    "appointments": 0.35,
+    "agendamento_banhotosa": 0.35,
+    "pet_movel_appointments": 0.2,
+    "daycare_enrollments": 0.05,
+    "hotel_registrations": 0.05,
+}
+
+SHOP_SERVICES = ["Banho", "Banho & Tosa", "Só Tosa"]
+MOBILE_SERVICES = ["Banho (Pet Móvel)", "Banho & Tosa (Pet Móvel)", "Só Tosa (Pet Móvel)"]
+WEIGHTS = ["UP_TO_5", "KG_10", "KG_15", "KG_20", "KG_25", "KG_30", "OVER_30"]
+ADDONS = ["tosa_tesoura", "aparacao", "hidratacao", "tosa_higienica", "botinhas", "desembolo"]
+STATUSES = ["CONCLUÍDO"] * 6 + ["AGENDADO"] * 3 + ["CANCELADO"]
+PET_NAMES = ["Thor", "Mel", "Bob", "Luna", "Nina", "Pipoca", "Fred", "Mia", "Toby", "Belinha", "Max", "Amora"]
+BREEDS = ["SRD", "Shih Tzu", "Poodle", "Lhasa Apso", "Yorkshire", "Golden", "Spitz", "Pinscher"]
+OWNERS = ["Ana", "Bruno", "Carla", "Diego", "Elisa", "Fábio", "Gabi", "Heitor", "Iara", "João"]
+SHOP_HOURS = [9, 10, 11, 12, 14, 15, 16, 17]
+SP_OFFSET = datetime.timedelta(hours=3)
+
+
+def _slot(rng, start, days):
+    day = start + datetime.timedelta(days=rng.randrange(days))
+    local = datetime.datetime(day.year, day.month, day.day, rng.choice(SHOP_HOURS))
+    return (local + SP_OFFSET).replace(tzinfo=datetime.timezone.utc).isoformat()
+
+
+def _appointment(rng, when, services):
+    return {
+        "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+        "created_at": when,
+        "appointment_time": when,
+        "pet_name": rng.choice(PET_NAMES),
+        "pet_breed": rng.choice(BREEDS),
+        "owner_name": f"{rng.choice(OWNERS)} {rng.randrange(1000)}",
+        "owner_address": "Rua Sintética, 100",
+        "condominium": None,
+        "whatsapp": f"1199{rng.randrange(10_000_000):07d}",
+        "service": rng.choice(services),
+        "weight": rng.choice(WEIGHTS),
+        "addons": rng.sample(ADDONS, rng.randrange(3)),
+        "price": float(rng.choice([70, 80, 90, 100, 120, 160, 180, 250])),
+        "status": rng.choice(STATUSES),
+        "monthly_client_id": None,
+        "extra_services": {},
+    }
+
+
+def _daycare(rng, when):
+    return {
+        "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+        "created_at": when,
+        "pet_name": rng.choice(PET_NAMES),
+        "pet_breed": rng.choice(BREEDS),
+        "tutor_name": rng.choice(OWNERS),
+        "contracted_plan": rng.choice(["2x_semana", "3x_semana", "4x_semana", "5x_semana"]),
+        "total_price": float(rng.choice([450, 600, 750, 900])),
+        "payment_date": when[:10],
+        "status": rng.choice(["approved", "approved", "pending", "rejected"]),
+        "extra_services": {},
+    }
+
+
+def _hotel(rng, when):
+    check_in = datetime.date.fromisoformat(when[:10])
+    return {
+        "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+        "created_at": when,
+        "pet_name": rng.choice(PET_NAMES),
+        "pet_breed": rng.choice(BREEDS),
+        "tutor_name": rng.choice(OWNERS),
+        "registration_date": check_in.isoformat(),
+        "check_in_date": check_in.isoformat(),
+        "check_out_date": (check_in + datetime.timedelta(days=rng.randrange(1, 8))).isoformat(),
+        "service_daily_rate": True,
+        "total_services_price": float(rng.choice([120, 240, 360, 480])),
+        "status": rng.choice(["Ativo", "Concluído", "Concluído"]),
+        "approval_status": rng.choice(["aprovado", "aprovado", "pendente"]),
+        "extra_services": {},
+    }
+
+
+def generate(total, years=3, seed=7, today=None):
+    """``{tabela: linhas}`` somando ``total`` linhas nas tabelas do painel financeiro."""
+    rng = random.Random(seed)
+    today = today or datetime.date.today()
+    start = today - datetime.timedelta(days=365 * years)
+    days = (today - start).days + 60  # inclui agendamentos futuros
+    tables = {}
+    for table, share in TABLE_SHARES.items():
+        count = int(total * share)
+        if table == "daycare_enrollments":
+            rows = [_daycare(rng, _slot(rng, start, days)) for _ in range(count)]
+        elif table == "hotel_registrations":
+            rows = [_hotel(rng, _slot(rng, start, days)) for _ in range(count)]
+        else:
+            services = MOBILE_SERVICES if table == "pet_movel_appointments" else SHOP_SERVICES
+            rows = [_appointment(rng, _slot(rng, start, days), services) for _ in range(count)]
+        tables[table] = rows
+    return tables
+
+
+def booking(rng, table="appointments", when=None):
+    """Um agendamento avulso de ``table`` (ex.: inserido com o painel aberto, via realtime)."""
+    when = when or _slot(rng, datetime.date.today(), 30)
+    services = MOBILE_SERVICES if table == "pet_movel_appointments" else SHOP_SERVICES
+    return {**_appointment(rng, when, services), "status": "AGENDADO"}
+
+
+def seed_store(store, total, **kwargs):
+    for table, rows in generate(total, **kwargs).items():
+        store.bulk_load(table, rows)
+    return store
@@ -0,0 +1,106 @@
+"""Compara uma execução de telemetria (JSONL) com a baseline guardada.
+
+Uso (a partir da raiz do repositório):
+
+    python testsprite_tests/perf_compare.py .cache/telemetry/20261017T120000Z.jsonl
+    python testsprite_tests/perf_compare.py <execução>.jsonl --update
+
+Uma métrica regride quando passa da baseline em mais de ``--tolerance``
+(relativo) e também de um piso absoluto, para ruído de poucos milissegundos
+não reprovar a execução. ``unpaginated_selects`` não tem tolerância: um
+``select('*')`` novo sem paginação já é regressão.
+"""
+import argparse
+import shutil
+import statistics
+import sys
+
+from harness import config, telemetry
+
+BASELINE_PATH = config.SUITE_DIR / "perf_baseline.jsonl"
+
+# métrica -> piso absoluto da diferença para contar como regressão
+THRESHOLDS = {
+    "duration_ms": 500,
+    "supabase_requests": 2,
+    "supabase_ms": 100,
+    "unpaginated_selects": 0,
+    "fcp_ms": 100,
+    "lcp_ms": 150,
+    "long_task_ms": 100,
+    "js_heap_bytes": 2 * 1024 * 1024,
+}
+STRICT = {"unpaginated_selects"}
+
+
+def by_scenario(lines):
+    """Mediana de cada métrica por cenário (o arquivo pode juntar várias execuções)."""
+    grouped = {}
+    for line in lines:
+        summary = line.get("summary") or telemetry.summarize(line)
+        grouped.setdefault(line["scenario"], []).append(summary)
+    medians = {}
+    for scenario, summaries in grouped.items():
+        medians[scenario] = {}
+        for metric in THRESHOLDS:
+            values = [s[metric] for s in summaries if s.get(metric) is not None]
+            medians[scenario][metric] = statistics.median(values) if values else None
+    return medians
+
+
+def compare(current, baseline, tolerance=0.2):
+    """Lista de regressões ``(cenário, métrica, baseline, atual)``."""
+    regressions = []
+    for scenario, metrics in sorted(current.items()):
+        base = baseline.get(scenario)
+        if base is None:
+            continue
+        for metric, floor in THRESHOLDS.items():
+            now, before = metrics.get(metric), base.get(metric)
+            if now is None or before is None:
+                continue
+            delta = now - before
+            if metric in STRICT:
+                regressed = delta > 0
+            else:
+                regressed = delta > floor and now > before * (1 + tolerance)
+            if regressed:
+                regressions.append((scenario, metric, before, now))
+    return regressions
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Compara a telemetria de uma execução com a baseline.")
+    parser.add_argument("run", help="arquivo JSONL gravado pelo run_suite.py")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH), help="baseline (padrão: %(default)s)")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="folga relativa (padrão: 0.2 = 20%%)")
+    parser.add_argument("--update", action="store_true", help="substitui a baseline por esta execução")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.update:
+        shutil.copyfile(args.run, args.baseline)
+        print(f"Baseline atualizada: {args.baseline}")
+        return 0
+
+    try:
+        baseline = by_scenario(telemetry.read_run(args.baseline))
+    except FileNotFoundError:
+        print(f"Sem baseline em {args.baseline}; grave uma com --update.", file=sys.stderr)
+        return 2
+    current = by_scenario(telemetry.read_run(args.run))
+
+    regressions = compare(current, baseline, args.tolerance)
+    for scenario, metric, before, now in regressions:
+        print(f"REGRESSÃO {scenario}: {metric} {before:g} -> {now:g}")
+    missing = sorted(set(current) - set(baseline))
+    if missing:
+        print(f"{len(missing)} cenário(s) sem baseline: {', '.join(missing)}")
+    print(f"{len(regressions)} regressão(ões) em {len(current)} cenário(s).")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
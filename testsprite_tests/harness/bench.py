@@ -0,0 +1,73 @@
+"""Medição de custo de renderização de uma tela via CDP (só Chromium).
+
+``measure(page, action)`` executa ``action`` (ex.: clicar no item do menu),
+espera a tela ficar interativa e devolve:
+
+- ``tti_ms``: do início da ação até a rede do Supabase e o DOM ficarem
+  parados por ``quiet_ms`` (aproximação de time-to-interactive);
+- ``scripting_ms``/``layout_ms``/``task_ms``: deltas de ``ScriptDuration``,
+  ``LayoutDuration`` e ``TaskDuration`` do ``Performance.getMetrics``;
+- ``peak_heap_bytes``: maior ``JSHeapUsedSize`` amostrado durante a espera.
+"""
+import asyncio
+import contextlib
+import time
+
+from harness import steps
+
+SAMPLE_INTERVAL_S = 0.1
+SETTLE_QUIET_MS = 500
+SETTLE_TIMEOUT_MS = 120000
+
+
+async def cdp_metrics(cdp):
+    result = await cdp.send("Performance.getMetrics")
+    return {m["name"]: m["value"] for m in result["metrics"]}
+
+
+async def _sample_heap(cdp, peak):
+    while True:
+        metrics = await cdp_metrics(cdp)
+        peak[0] = max(peak[0], metrics.get("JSHeapUsedSize", 0))
+        await asyncio.sleep(SAMPLE_INTERVAL_S)
+
+
+async def throttle_cpu(page, rate):
+    """Desacelera a CPU da página ``rate`` vezes (1 = sem throttling)."""
+    cdp = await page.context.new_cdp_session(page)
+    await cdp.send("Emulation.setCPUThrottlingRate", {"rate": rate})
+    return cdp
+
+
+async def measure(page, action, elem=None, label=None, quiet_ms=SETTLE_QUIET_MS):
+    cdp = await page.context.new_cdp_session(page)
+    await cdp.send("Performance.enable")
+    before = await cdp_metrics(cdp)
+    peak = [before.get("JSHeapUsedSize", 0)]
+    sampler = asyncio.create_task(_sample_heap(cdp, peak))
+    try:
+        started = time.perf_counter()
+        await action()
+        await steps.ready(page, elem, label, quiet_ms=quiet_ms, timeout_ms=SETTLE_TIMEOUT_MS)
+        # ready() só termina depois de quiet_ms parado; isso não conta como carregamento.
+        tti_ms = (time.perf_counter() - started) * 1000 - quiet_ms
+    finally:
+        sampler.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await sampler
+    after = await cdp_metrics(cdp)
+    await cdp.detach()
+
+    def delta_ms(name):
+        return round((after.get(name, 0) - before.get(name, 0)) * 1000, 1)
+
+    return {
+        "tti_ms": round(tti_ms, 1),
+        "scripting_ms": delta_ms("ScriptDuration"),
+        "layout_ms": delta_ms("LayoutDuration"),
+        "task_ms": delta_ms("TaskDuration"),
+        "peak_heap_bytes": int(max(peak[0], after.get("JSHeapUsedSize", 0))),
+        "heap_after_bytes": int(after.get("JSHeapUsedSize", 0)),
+        "dom_nodes": int(after.get("Nodes", 0)),
+        "timed_out": steps.step_log(page.context)[-1]["timed_out"],
+    }
@@ -0,0 +1,15 @@
+"""Configuração comum da suíte: variáveis de ambiente com padrões para uso local."""
+import os
+from pathlib import Path
+
+SUITE_DIR = Path(__file__).resolve().parent.parent
+CACHE_DIR = Path(os.environ.get("TESTSPRITE_CACHE_DIR", SUITE_DIR / ".cache"))
+
+BASE_URL = os.environ.get("TESTSPRITE_BASE_URL", "http://localhost:5000")
+
+# Mesmas credenciais usadas pelos cenários gerados (ver screenshots.md).
+ADMIN_EMAIL = os.environ.get("TESTSPRITE_ADMIN_EMAIL", "login@sandypetshop.com")
+ADMIN_PASSWORD = os.environ.get("TESTSPRITE_ADMIN_PASSWORD", "1234")
+
+# Stand-in local do Supabase (ver harness.backend), usado com --local-backend.
+BACKEND_PORT = int(os.environ.get("TESTSPRITE_BACKEND_PORT", "54321"))
@@ -0,0 +1,69 @@
+"""Constantes de negócio lidas do ``constants.ts`` do app.
+
+Os cenários gerados (preço por peso, adicionais, horários) precisam dos
+mesmos valores que o front usa; ler o arquivo evita uma cópia em Python que
+envelhece a cada ajuste de preço. Só os literais simples do arquivo são
+suportados: objetos, arrays, strings, números e chaves ``[Enum.MEMBRO]``.
+"""
+import ast
+import functools
+import re
+
+from harness.config import SUITE_DIR
+
+CONSTANTS_FILE = SUITE_DIR.parent / "constants.ts"
+
+_DECL_RE = re.compile(r"export\s+const\s+(\w+)\s*(?::[^=]+)?=\s*")
+_COMMENT_RE = re.compile(r"//[^\n]*|/\*.*?\*/", re.S)
+_ENUM_KEY_RE = re.compile(r"\[\s*\w+\.(\w+)\s*\]")
+_ENUM_VALUE_RE = re.compile(r"(?<![\w'\"])(?:ServiceType|PetWeight)\.(\w+)")
+_BARE_KEY_RE = re.compile(r"([{,]\s*)([A-Za-z_]\w*)\s*:")
+
+
+def _literal_end(text, start):
+    """Posição logo após o literal que começa em ``start`` (respeita strings e aninhamento)."""
+    depth, quote, i = 0, None, start
+    while i < len(text):
+        ch = text[i]
+        if quote:
+            if ch == "\\":
+                i += 1
+            elif ch == quote:
+                quote = None
+        elif ch in "'\"`":
+            quote = ch
+        elif ch in "{[(":
+            depth += 1
+        elif ch in "}])":
+            depth -= 1
+        elif ch == ";" and depth == 0:
+            return i
+        i += 1
+    return i
+
+
+def _to_python(literal):
+    literal = _ENUM_KEY_RE.sub(r"'\1'", literal)
+    literal = _ENUM_VALUE_RE.sub(r"'\1'", literal)
+    literal = _BARE_KEY_RE.sub(r"\1'\2':", literal)
+    literal = re.sub(r"\btrue\b", "True", literal)
+    literal = re.sub(r"\bfalse\b", "False", literal)
+    return ast.literal_eval(literal)
+
+
+@functools.lru_cache(maxsize=None)
+def load(path=CONSTANTS_FILE):
+    """Todas as ``export const`` de literal simples, por nome."""
+    text = _COMMENT_RE.sub("", open(path, encoding="utf-8").read())
+    values = {}
+    for match in _DECL_RE.finditer(text):
+        start = match.end()
+        try:
+            values[match.group(1)] = _to_python(text[start:_literal_end(text, start)].strip())
+        except (ValueError, SyntaxError):
+            continue  # expressão calculada: não é lida aqui
+    return values
+
+
+def get(name):
+    return load()[name]
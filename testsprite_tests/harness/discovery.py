@@ -0,0 +1,44 @@
+"""Descoberta dos cenários TC*.py e divisão determinística em shards."""
+import importlib.util
+from pathlib import Path
+
+from harness.config import SUITE_DIR
+
+
+def discover(pattern="TC*.py", keyword=None, root=SUITE_DIR):
+    """Lista os arquivos de cenário em ordem alfabética (ordem estável entre máquinas)."""
+    paths = sorted(p for p in Path(root).glob(pattern) if p.is_file())
+    if keyword:
+        paths = [p for p in paths if keyword.lower() in p.stem.lower()]
+    return paths
+
+
+def parse_shard(spec):
+    """Converte ``"2/4"`` em ``(2, 4)``; o índice começa em 1."""
+    try:
+        index, total = (int(part) for part in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"shard inválido: {spec!r} (use o formato N/M, ex.: 2/4)")
+    if total < 1 or not 1 <= index <= total:
+        raise ValueError(f"shard fora do intervalo: {spec!r}")
+    return index, total
+
+
+def select_shard(paths, index, total):
+    """Round-robin sobre a lista ordenada: todo cenário cai em exatamente um shard."""
+    return list(paths)[index - 1::total]
+
+
+def partition(items, buckets):
+    """Distribui ``items`` entre ``buckets`` listas, descartando as vazias."""
+    items = list(items)
+    return [chunk for chunk in (items[i::buckets] for i in range(max(1, buckets))) if chunk]
+
+
+def load_scenario(path):
+    """Importa um TC*.py sem disparar o ``asyncio.run`` do bloco ``__main__``."""
+    path = Path(path)
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
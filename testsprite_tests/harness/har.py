@@ -0,0 +1,208 @@
+"""Gravação e replay (HAR) das chamadas REST, storage e auth do Supabase por cenário.
+
+Para rodar sem backend local: na primeira vez (``--har record``, ou
+``--har auto`` sem arquivo) o contexto grava em ``.cache/har/<cenário>.har``
+toda chamada a ``/rest/v1/``, ``/storage/v1/`` e ``/auth/v1/``; nas seguintes
+(``--har replay``) essas chamadas são respondidas do arquivo, sem ida ao
+servidor. O login de admin (``harness.auth``) tem o seu HAR, ``LOGIN``, para
+que um storage state vencido também seja refeito offline. No replay, o
+``expires_at`` das sessões do ``/auth/v1/token`` é recalculado para agora, senão
+o supabase-js trataria a sessão gravada como vencida.
+
+O replay é feito aqui e não com ``route_from_har(update=False)``: o
+Playwright só casa URL idêntica, e as consultas do app levam a data de hoje
+nos filtros (``appointment_time=gte.2026-10-17...``). A busca tenta a URL
+exata e depois a mesma URL com as datas trocadas por um marcador. O que não
+está no HAR é abortado, para a execução não depender do backend sem avisar.
+
+Mutações (insert/update/delete) não saem do HAR: a resposta gravada traz ids
+e horários de outra execução. Elas passam por ``OVERRIDES`` (por tabela e
+método) ou, sem override, por ``echo_mutation``, que devolve as linhas
+enviadas como se o PostgREST as tivesse gravado.
+"""
+import base64
+import datetime
+import hashlib
+import json
+import re
+import time
+import urllib.parse
+import uuid
+import weakref
+
+from harness import config
+
+MODES = ("record", "replay", "auto")
+SUPABASE_URL_RE = re.compile(r".*/(rest|storage|auth)/v1/.*")
+# HAR do login pelo AdminLogin, fora de qualquer cenário.
+LOGIN = "_admin_login"
+_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?)?")
+# Cabeçalhos que descrevem o corpo como veio da rede; o corpo do HAR já está decodificado.
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+_CORS = {"access-control-allow-origin": "*", "access-control-expose-headers": "Content-Range"}
+
+# (tabela ou "storage", método) -> async fn(route, request).
+OVERRIDES = {}
+MUTATIONS = ("POST", "PATCH", "PUT", "DELETE")
+
+_replays = weakref.WeakKeyDictionary()
+
+
+def har_path(scenario):
+    # Lido na hora: --local-backend troca o config.CACHE_DIR (ver stack.isolate_cache).
+    return config.CACHE_DIR / "har" / f"{scenario}.har"
+
+
+def override(table, method):
+    """Registra um handler de mutação: ``@har.override("appointments", "POST")``."""
+    def register(fn):
+        OVERRIDES[(table, method.upper())] = fn
+        return fn
+    return register
+
+
+def route_name(url):
+    """Tabela de uma URL ``/rest/v1/<tabela>``, ``"storage"`` para objetos; ``None`` para rpc."""
+    path = urllib.parse.urlsplit(url).path
+    if "/storage/v1/object/" in path:
+        return "storage"
+    match = re.search(r"/rest/v1/(?!rpc/)([^/?]+)", path)
+    return match.group(1) if match else None
+
+
+def request_key(method, url, body=None, normalize=False):
+    parts = urllib.parse.urlsplit(url)
+    query = sorted(urllib.parse.parse_qsl(parts.query, keep_blank_values=True))
+    if normalize:
+        query = [(k, _DATE_RE.sub("<data>", v)) for k, v in query]
+    # rpc é POST sem efeito colateral no app: o corpo faz parte da chave.
+    digest = hashlib.sha1(body).hexdigest() if body and "/rpc/" in parts.path else None
+    return method, parts.path, tuple(query), digest
+
+
+def _json_response(route, status, payload=None):
+    return route.fulfill(
+        status=status,
+        headers={**_CORS, "content-type": "application/json; charset=utf-8"},
+        body="" if payload is None else json.dumps(payload),
+    )
+
+
+async def echo_mutation(route, request):
+    """Resposta plausível do PostgREST para insert/update/delete, sem backend."""
+    method = request.method
+    prefer = request.headers.get("prefer", "")
+    single = "vnd.pgrst.object" in request.headers.get("accept", "")
+    if method == "DELETE":
+        return await _json_response(route, 200 if "return=representation" in prefer else 204,
+                                    [] if "return=representation" in prefer else None)
+    try:
+        payload = request.post_data_json
+    except ValueError:
+        payload = None
+    rows = payload if isinstance(payload, list) else [payload or {}]
+    if method == "POST":
+        now = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        rows = [{"id": str(uuid.uuid4()), "created_at": now, **row} for row in rows]
+    if "return=representation" not in prefer:
+        return await _json_response(route, 201 if method == "POST" else 204)
+    return await _json_response(route, 201 if method == "POST" else 200, rows[0] if single else rows)
+
+
+@override("storage", "POST")
+@override("storage", "PUT")
+async def _storage_upload(route, request):
+    key = urllib.parse.urlsplit(request.url).path.split("/storage/v1/object/", 1)[-1]
+    await _json_response(route, 200, {"Key": key, "Id": str(uuid.uuid4())})
+
+
+class Replay:
+    """Respostas de um HAR indexadas por requisição; chaves repetidas saem em ordem."""
+
+    def __init__(self, entries):
+        self.exact = {}
+        self.loose = {}
+        self.misses = []
+        for entry in entries:
+            request, response = entry["request"], entry["response"]
+            body = (request.get("postData") or {}).get("text", "").encode() or None
+            for index, normalize in ((self.exact, False), (self.loose, True)):
+                key = request_key(request["method"], request["url"], body, normalize)
+                index.setdefault(key, []).append(response)
+        self._served = {}
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f)["log"]["entries"])
+
+    def lookup(self, method, url, body=None):
+        for index, normalize in ((self.exact, False), (self.loose, True)):
+            key = request_key(method, url, body, normalize)
+            responses = index.get(key)
+            if responses:
+                # A mesma consulta feita de novo (refetch) recebe a próxima resposta gravada;
+                # depois da última, repete a última.
+                served = self._served.get((normalize, key), 0)
+                self._served[(normalize, key)] = served + 1
+                return responses[min(served, len(responses) - 1)]
+        return None
+
+    async def handle(self, route, request):
+        method = request.method
+        name = route_name(request.url)
+        if method in MUTATIONS and name:
+            return await OVERRIDES.get((name, method), echo_mutation)(route, request)
+        path = urllib.parse.urlsplit(request.url).path
+        if path.endswith("/auth/v1/logout"):
+            return await _json_response(route, 204)
+
+        response = self.lookup(method, request.url, request.post_data_buffer)
+        if response is None:
+            self.misses.append(f"{method} {request.url}")
+            return await route.abort("internetdisconnected")
+        content = response.get("content") or {}
+        text = content.get("text") or ""
+        body = base64.b64decode(text) if content.get("encoding") == "base64" else text.encode()
+        if path.endswith("/auth/v1/token") and response["status"] == 200:
+            body = _fresh_session(body)
+        headers = {h["name"].lower(): h["value"] for h in response.get("headers", [])
+                   if h["name"].lower() not in _DROP_HEADERS}
+        await route.fulfill(status=response["status"], headers={**_CORS, **headers}, body=body)
+
+
+def _fresh_session(body):
+    """Sessão gravada com ``expires_at`` a partir de agora."""
+    try:
+        session = json.loads(body)
+    except ValueError:
+        return body
+    if isinstance(session, dict) and session.get("expires_in"):
+        session["expires_at"] = int(time.time()) + int(session["expires_in"])
+        return json.dumps(session).encode()
+    return body
+
+
+async def attach(context, scenario, mode):
+    """Liga gravação ou replay no contexto; devolve o modo efetivo ("record"/"replay") ou ``None``."""
+    if mode is None:
+        return None
+    path = har_path(scenario)
+    if mode == "auto":
+        mode = "replay" if path.exists() else "record"
+    if mode == "record":
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # O Playwright grava o arquivo quando o contexto fecha.
+        await context.route_from_har(path, url=SUPABASE_URL_RE, update=True, update_content="embed")
+        return mode
+    if not path.exists():
+        raise FileNotFoundError(f"sem HAR para {scenario} em {path}; grave com --har record")
+    replay = _replays[context] = Replay.load(path)
+    await context.route(SUPABASE_URL_RE, replay.handle)
+    return mode
+
+
+def misses(context):
+    """Requisições do replay que não estavam no HAR (abortadas)."""
+    replay = _replays.get(context)
+    return list(replay.misses) if replay else []
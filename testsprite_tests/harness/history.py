@@ -0,0 +1,267 @@
+"""Histórico das execuções em SQLite: instabilidade e tendência de latência por passo.
+
+Cada ``run_suite.py`` grava em ``.cache/history.sqlite3`` o status de cada
+cenário (por tentativa, quando há ``--retries``) e a duração de cada passo
+medido por ``harness.steps``. A partir daí:
+
+- ``flaky()`` aponta cenários instáveis só com evidência a favor: os que
+  passaram ao repetir na mesma execução, ou, com pelo menos
+  ``MIN_RUNS_SAMPLE`` execuções, cujas falhas se alternam com sucessos
+  (``MIN_PASSES_AFTER_FAILURE`` sucessos depois da primeira falha e teste de
+  sequências de Wald–Wolfowitz sem agrupamento). Falhas que formam um bloco
+  só no fim do histórico (passa, passa, falha, falha) são regressão e nunca
+  entram na lista;
+- ``last_failed()`` dá os cenários que falharam na última execução do shard,
+  para ``run_suite.py --last-failed``;
+- ``step_trends()`` compara p50/p95 de cada passo nas execuções recentes com
+  as anteriores.
+
+    python testsprite_tests/history_report.py
+    python testsprite_tests/history_report.py --trends --runs 20
+"""
+import argparse
+import contextlib
+import datetime
+import math
+import sqlite3
+import sys
+from pathlib import Path
+
+from harness import config
+
+FLAKY_WINDOW = 50
+MIN_FAILURES = 2
+# z abaixo disto = falhas agrupadas demais para serem acaso (unicaudal, 5%).
+CLUSTERED_Z = -1.645
+# Amostra mínima do teste de sequências: com poucas execuções ele quase nunca rejeita o acaso.
+MIN_RUNS_SAMPLE = 10
+MIN_PASSES_AFTER_FAILURE = 2
+TREND_RUNS = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    git_commit TEXT,
+    shard TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id TEXT NOT NULL REFERENCES runs(run_id),
+    scenario TEXT NOT NULL,
+    attempt INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    duration_ms INTEGER NOT NULL,
+    error TEXT,
+    PRIMARY KEY (run_id, scenario, attempt)
+);
+CREATE TABLE IF NOT EXISTS steps (
+    run_id TEXT NOT NULL,
+    scenario TEXT NOT NULL,
+    attempt INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    label TEXT,
+    total_ms REAL,
+    network_ms REAL,
+    render_ms REAL,
+    timed_out INTEGER,
+    PRIMARY KEY (run_id, scenario, attempt, position)
+);
+CREATE INDEX IF NOT EXISTS results_scenario ON results(scenario, run_id);
+CREATE INDEX IF NOT EXISTS steps_label ON steps(scenario, label);
+"""
+
+
+def db_path():
+    # Lido na hora: --local-backend troca o config.CACHE_DIR (ver stack.isolate_cache).
+    return config.CACHE_DIR / "history.sqlite3"
+
+
+@contextlib.contextmanager
+def connect(path=None):
+    path = path or db_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        conn.executescript(SCHEMA)
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def new_run_id():
+    return datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%S.%fZ")
+
+
+def record(results, run_id, commit=None, shard="1/1", path=None):
+    """Grava todas as tentativas de uma execução."""
+    started = datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")
+    with connect(path) as conn:
+        conn.execute("INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?)", (run_id, started, commit, shard))
+        for r in results:
+            attempt = r.get("attempt", 1)
+            conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                (run_id, r["scenario"], attempt, r["status"], round(r["duration"] * 1000), r.get("error")),
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO steps VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, r["scenario"], attempt, i, s.get("label"), s.get("total_ms"), s.get("network_ms"),
+                  s.get("render_ms"), int(bool(s.get("timed_out")))) for i, s in enumerate(r.get("steps") or [])],
+            )
+
+
+def last_failed(shard="1/1", path=None):
+    """Cenários cujo resultado final na última execução deste shard não foi ``passed``."""
+    with connect(path) as conn:
+        row = conn.execute("SELECT run_id FROM runs WHERE shard = ? ORDER BY run_id DESC LIMIT 1", (shard,)).fetchone()
+        if row is None:
+            return set()
+        rows = conn.execute(
+            """SELECT scenario, status FROM results r
+               WHERE run_id = ? AND attempt = (SELECT MAX(attempt) FROM results
+                                               WHERE run_id = r.run_id AND scenario = r.scenario)""",
+            (row[0],),
+        ).fetchall()
+    return {scenario for scenario, status in rows if status != "passed"}
+
+
+def runs_z(outcomes):
+    """z do teste de sequências para uma série de 0/1; ``None`` se só há um valor."""
+    n1 = sum(outcomes)
+    n0 = len(outcomes) - n1
+    n = n0 + n1
+    if n0 == 0 or n1 == 0 or n < 3:
+        return None
+    runs = 1 + sum(1 for a, b in zip(outcomes, outcomes[1:]) if a != b)
+    mean = 2 * n0 * n1 / n + 1
+    var = 2 * n0 * n1 * (2 * n0 * n1 - n) / (n * n * (n - 1))
+    if var <= 0:
+        return None
+    return (runs - mean) / math.sqrt(var)
+
+
+def failing_tail(outcomes):
+    """Todas as falhas da série 0/1 formam um bloco só no fim (regressão, não instabilidade)."""
+    if not any(outcomes):
+        return False
+    first = outcomes.index(1)
+    return all(outcomes[first:])
+
+
+def flaky(window=FLAKY_WINDOW, min_failures=MIN_FAILURES, path=None):
+    """Cenários instáveis -> motivo, a partir das últimas ``window`` execuções de cada um."""
+    with connect(path) as conn:
+        rows = conn.execute(
+            "SELECT scenario, run_id, attempt, status FROM results ORDER BY scenario, run_id, attempt"
+        ).fetchall()
+    series = {}
+    for scenario, run_id, attempt, status in rows:
+        series.setdefault(scenario, {}).setdefault(run_id, []).append(status != "passed")
+
+    found = {}
+    for scenario, per_run in series.items():
+        run_ids = sorted(per_run)[-window:]
+        # Só a primeira tentativa: as repetições não são amostras independentes.
+        outcomes = [int(per_run[r][0]) for r in run_ids]
+        if failing_tail(outcomes):
+            continue
+        retried = [r for r in run_ids if per_run[r][0] and not per_run[r][-1]]
+        if retried:
+            found[scenario] = f"passou ao repetir em {len(retried)} de {len(run_ids)} execuções"
+            continue
+        if sum(outcomes) < min_failures or len(outcomes) < MIN_RUNS_SAMPLE:
+            continue
+        if outcomes[outcomes.index(1):].count(0) < MIN_PASSES_AFTER_FAILURE:
+            continue
+        z = runs_z(outcomes)
+        if z is not None and z > CLUSTERED_Z:
+            found[scenario] = (f"{sum(outcomes)} falhas em {len(outcomes)} execuções, "
+                               f"intercaladas com sucessos (z={z:.2f})")
+    return found
+
+
+def percentile(values, q):
+    """Percentil por posição mais próxima (sem interpolar; bom para poucos pontos)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def step_trends(runs=TREND_RUNS, path=None):
+    """p50/p95 de cada (cenário, passo) nas ``runs`` execuções recentes vs. nas ``runs`` anteriores."""
+    with connect(path) as conn:
+        run_ids = [r for (r,) in conn.execute("SELECT run_id FROM runs ORDER BY run_id DESC LIMIT ?", (2 * runs,))]
+        if not run_ids:
+            return []
+        recent = set(run_ids[:runs])
+        marks = ",".join("?" * len(run_ids))
+        rows = conn.execute(
+            f"SELECT run_id, scenario, label, total_ms FROM steps WHERE run_id IN ({marks}) AND total_ms IS NOT NULL",
+            run_ids,
+        ).fetchall()
+    grouped = {}
+    for run_id, scenario, label, total_ms in rows:
+        bucket = grouped.setdefault((scenario, label or "?"), ([], []))
+        bucket[0 if run_id in recent else 1].append(total_ms)
+
+    trends = []
+    for (scenario, label), (now, before) in grouped.items():
+        if not now:
+            continue  # passo que sumiu dos cenários
+        trends.append({
+            "scenario": scenario,
+            "label": label,
+            "samples": len(now),
+            "p50_ms": percentile(now, 50),
+            "p95_ms": percentile(now, 95),
+            "p50_before_ms": percentile(before, 50),
+            "p95_before_ms": percentile(before, 95),
+        })
+    # Quem mais piorou no p95 primeiro.
+    trends.sort(key=lambda t: -((t["p95_ms"] or 0) - (t["p95_before_ms"] or t["p95_ms"] or 0)))
+    return trends
+
+
+def _delta(now, before):
+    if now is None or before is None or before == 0:
+        return ""
+    return f"{(now - before) / before:+.0%}"
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Relatório do histórico de execuções da suíte.")
+    parser.add_argument("--flaky", action="store_true", help="só os cenários instáveis")
+    parser.add_argument("--trends", action="store_true", help="só a tendência de latência por passo")
+    parser.add_argument("--runs", type=int, default=TREND_RUNS,
+                        help="execuções na janela recente da tendência (padrão: %(default)s)")
+    parser.add_argument("--top", type=int, default=20, help="passos listados na tendência")
+    parser.add_argument("--db", help="arquivo SQLite (padrão: .cache/history.sqlite3)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    path = Path(args.db) if args.db else None
+    both = not (args.flaky or args.trends)
+
+    if args.flaky or both:
+        found = flaky(path=path)
+        print(f"{len(found)} cenário(s) instável(is):")
+        for scenario, reason in sorted(found.items()):
+            print(f"  {scenario}: {reason}")
+
+    if args.trends or both:
+        trends = step_trends(args.runs, path=path)
+        print(f"\nLatência por passo (últimas {args.runs} execuções vs. {args.runs} anteriores):")
+        print(f"  {'p50':>8} {'':>6} {'p95':>8} {'':>6}  passo")
+        for t in trends[:args.top]:
+            print(f"  {t['p50_ms']:>6.0f}ms {_delta(t['p50_ms'], t['p50_before_ms']):>6} "
+                  f"{t['p95_ms']:>6.0f}ms {_delta(t['p95_ms'], t['p95_before_ms']):>6}  "
+                  f"{t['scenario']}: {t['label']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
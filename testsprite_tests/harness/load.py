@@ -0,0 +1,312 @@
+"""Carga de agendamentos simultâneos: as chamadas dos formulários públicos, sem navegador.
+
+Cada cliente virtual refaz, pelo ``APIRequestContext`` do Playwright (HTTP
+puro, sem página), o que o formulário faz ao agendar:
+
+- Banho & Tosa / Pet Móvel (``Scheduler.handleSubmit``): lê ``disabled_dates``,
+  busca os agendamentos do dia nas três tabelas e os mensalistas inativos (o
+  ``Promise.all`` de ``fetchAppointmentsForDate``), confere a vaga contra
+  ``MAX_CAPACITY_PER_SLOT`` no cliente, insere em ``agendamento_banhotosa``
+  ou ``pet_movel_appointments`` e cadastra o tutor em ``clients`` se o
+  WhatsApp for novo;
+- Creche e Hotel: o insert em ``daycare_enrollments`` / ``hotel_registrations``.
+
+Os webhooks do n8n ficam de fora. A checagem de vaga acontece só no
+navegador, entre a leitura e o insert; com muitos clientes no mesmo horário
+(promoção), dois podem ler a vaga livre e gravar os dois. ``violations``
+procura esses horários depois da rodada.
+
+``browser_booking`` faz o mesmo agendamento pela interface, para uma amostra
+de clientes com navegador de verdade junto da carga HTTP.
+"""
+import asyncio
+import datetime
+import random
+import time
+
+from playwright import async_api
+
+from harness import constants, history, steps
+from harness.backend.synthetic import BREEDS, OWNERS, PET_NAMES, SP_OFFSET
+from harness.pages import SchedulerPage
+
+CALENDAR_FLOWS = {"banho_tosa": "agendamento_banhotosa", "pet_movel": "pet_movel_appointments"}
+ENROLLMENT_FLOWS = {"creche": "daycare_enrollments", "hotel": "hotel_registrations"}
+FLOWS = (*CALENDAR_FLOWS, *ENROLLMENT_FLOWS)
+SLOT_TABLES = ("appointments", "pet_movel_appointments", "agendamento_banhotosa")
+# Serviço gravado por fluxo (SERVICES[...].label) e peso do formulário.
+FLOW_SERVICES = {"banho_tosa": "BATH_AND_GROOMING", "pet_movel": "PET_MOBILE_BATH_AND_GROOMING"}
+WEIGHT = "KG_10"
+PET_MOVEL_CONDO = "Vitta Parque"
+PERCENTILES = (50, 90, 95, 99)
+
+
+def _mobile(row):
+    service = str(row.get("service") or "").lower()
+    return any(word in service for word in ("movel", "móvel", "mobile"))
+
+
+def _visit(row):
+    return "visita" in str(row.get("service") or "").lower()
+
+
+def calendar_of(table, row):
+    """Agenda que a linha ocupa ("loja" ou "movel"), como ``isMobileAppointment`` no app."""
+    return "movel" if table == "pet_movel_appointments" or _mobile(row) else "loja"
+
+
+def local_slot(appointment_time):
+    """(data, hora) em São Paulo de um ``appointment_time`` UTC."""
+    when = datetime.datetime.fromisoformat(str(appointment_time).replace("Z", "+00:00"))
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=datetime.timezone.utc)  # mesmo ajuste do app: sem offset = UTC
+    local = when.astimezone(datetime.timezone.utc) - SP_OFFSET
+    return local.date().isoformat(), local.hour
+
+
+def hot_slots(count, today=None):
+    """``count`` horários disputados: os de BATH_GROOMING_HOURS nos próximos dias de banho e tosa, em ordem."""
+    day = today or datetime.date.today()
+    hours = constants.get("BATH_GROOMING_HOURS")
+    slots = []
+    while len(slots) < count:
+        day += datetime.timedelta(days=1)
+        if 1 <= day.weekday() <= 4:  # terça a sexta, os dias da agenda fixa
+            slots.extend((day, hour) for hour in hours)
+    return slots[:count]
+
+
+def slot_utc(day, hour):
+    local = datetime.datetime(day.year, day.month, day.day, hour)
+    return (local + SP_OFFSET).replace(tzinfo=datetime.timezone.utc)
+
+
+class Recorder:
+    """Latência de cada chamada (por operação) e o desfecho de cada cliente."""
+
+    def __init__(self):
+        self.latencies = {}
+        self.bookings = []
+
+    async def call(self, op, request):
+        started = time.perf_counter()
+        try:
+            response = await request
+        finally:
+            self.latencies.setdefault(op, []).append((time.perf_counter() - started) * 1000)
+        if not response.ok:
+            raise RuntimeError(f"{op}: HTTP {response.status} {(await response.text())[:200]}")
+        return response
+
+    def report(self, elapsed_s):
+        outcomes = {}
+        for booking in self.bookings:
+            outcomes[booking["outcome"]] = outcomes.get(booking["outcome"], 0) + 1
+        totals = [b["ms"] for b in self.bookings if b["outcome"] == "booked"]
+        return {
+            "customers": len(self.bookings),
+            "elapsed_s": round(elapsed_s, 2),
+            "bookings_per_s": round(outcomes.get("booked", 0) / elapsed_s, 2) if elapsed_s else None,
+            "requests_per_s": round(sum(map(len, self.latencies.values())) / elapsed_s, 2) if elapsed_s else None,
+            "outcomes": outcomes,
+            "booking_ms": {f"p{q}": _round(history.percentile(totals, q)) for q in PERCENTILES},
+            "ops_ms": {op: {"n": len(values), **{f"p{q}": _round(history.percentile(values, q)) for q in PERCENTILES}}
+                       for op, values in sorted(self.latencies.items())},
+        }
+
+
+def _round(value):
+    return None if value is None else round(value, 1)
+
+
+def customer(rng, index):
+    phone = f"(11) 9{rng.randrange(10_000):04d}-{index % 10_000:04d}"
+    return {"pet_name": rng.choice(PET_NAMES), "pet_breed": rng.choice(BREEDS),
+            "owner_name": f"{rng.choice(OWNERS)} Carga {index}", "whatsapp": phone}
+
+
+def _booking_payload(flow, person, when):
+    services, weights = constants.get("SERVICES"), constants.get("PET_WEIGHT_OPTIONS")
+    service = FLOW_SERVICES[flow]
+    payload = {
+        **person,
+        "appointment_time": when.isoformat().replace("+00:00", "Z"),
+        "service": services[service]["label"],
+        "weight": weights[WEIGHT],
+        "addons": [],
+        "price": sum(constants.get("SERVICE_PRICES")[WEIGHT][part] for part in ("BATH", "GROOMING_ONLY")),
+        "status": "AGENDADO",
+        "extra_services": {},
+        "owner_address": "Rua da Carga, 1",
+        "observation": None,
+    }
+    if flow == "pet_movel":
+        payload["condominium"] = PET_MOVEL_CONDO
+    return payload
+
+
+def _enrollment_payload(flow, person, today):
+    if flow == "creche":
+        return {"pet_name": person["pet_name"], "pet_breed": person["pet_breed"], "tutor_name": person["owner_name"],
+                "tutor_phone": person["whatsapp"], "contracted_plan": "8x_month",
+                "total_price": constants.get("DAYCARE_PLAN_PRICES")["8x_month"], "status": "pending",
+                "extra_services": {}}
+    return {"pet_name": person["pet_name"], "pet_breed": person["pet_breed"], "tutor_name": person["owner_name"],
+            "tutor_phone": person["whatsapp"], "registration_date": today.isoformat(),
+            "check_in_date": today.isoformat(), "check_out_date": (today + datetime.timedelta(days=2)).isoformat(),
+            "service_daily_rate": True, "total_services_price": 0, "status": "Ativo", "extra_services": {}}
+
+
+async def http_booking(api, recorder, flow, person, slot):
+    """Um cliente agendando por HTTP; registra o desfecho em ``recorder.bookings``."""
+    started = time.perf_counter()
+    outcome, error = "booked", None
+    try:
+        if flow in ENROLLMENT_FLOWS:
+            await recorder.call("insert", api.post(f"/rest/v1/{ENROLLMENT_FLOWS[flow]}",
+                                                   data=_enrollment_payload(flow, person, datetime.date.today())))
+        else:
+            outcome = await _book_slot(api, recorder, flow, person, slot)
+    except (RuntimeError, async_api.Error) as exc:
+        outcome, error = "error", str(exc).splitlines()[0]
+    recorder.bookings.append({"flow": flow, "slot": slot and [slot[0].isoformat(), slot[1]], "outcome": outcome,
+                              "ms": (time.perf_counter() - started) * 1000, "error": error})
+
+
+async def _book_slot(api, recorder, flow, person, slot):
+    day, hour = slot
+    when = slot_utc(day, hour)
+    disabled = await (await recorder.call("disabled_dates", api.get("/rest/v1/disabled_dates?select=*"))).json()
+    calendar = "movel" if flow == "pet_movel" else "loja"
+    if any(str(d.get("date")) == day.isoformat() and _disabled_for(d, calendar) for d in disabled):
+        return "rejected_disabled"
+
+    # Mesma janela de fetchAppointmentsForDate: o dia local com 4 h de folga de cada lado.
+    start = slot_utc(day, 0) - datetime.timedelta(hours=4)
+    end = slot_utc(day, 23) + datetime.timedelta(hours=5)
+    window = f"appointment_time=gte.{start.isoformat()}&appointment_time=lte.{end.isoformat()}"
+    responses = await asyncio.gather(
+        *(recorder.call("day_appointments", api.get(f"/rest/v1/{table}?select=*&{window}")) for table in SLOT_TABLES),
+        recorder.call("inactive_clients", api.get("/rest/v1/monthly_clients?select=id&is_active=eq.false")),
+    )
+    taken = 0
+    for table, response in zip(SLOT_TABLES, responses):
+        for row in await response.json():
+            if str(row.get("status") or "").upper() == "CANCELADO" or _visit(row):
+                continue
+            if calendar_of(table, row) == calendar and local_slot(row["appointment_time"]) == (day.isoformat(), hour):
+                taken += 1
+    if taken >= constants.get("MAX_CAPACITY_PER_SLOT"):
+        return "rejected_full"  # o alert "este horário acabou de ser preenchido"
+
+    await recorder.call("insert", api.post(f"/rest/v1/{CALENDAR_FLOWS[flow]}", data=[_booking_payload(flow, person, when)],
+                                           headers={"Prefer": "return=representation"}))
+    existing = await (await recorder.call(
+        "client_lookup", api.get("/rest/v1/clients", params={"select": "id", "phone": f"eq.{person['whatsapp']}",
+                                                             "limit": "1"}))).json()
+    if not existing:
+        await recorder.call("client_insert", api.post("/rest/v1/clients",
+                                                      data={"name": person["owner_name"], "phone": person["whatsapp"]}))
+    return "booked"
+
+
+def _disabled_for(record, calendar):
+    service = str(record.get("service") or record.get("for_service") or "ALL").upper()
+    if service == "ALL":
+        return True
+    if calendar == "loja":
+        return "BATH" in service or "GROOM" in service
+    return any(word in service for word in ("PET", "MOVEL", "MÓVEL"))
+
+
+async def browser_booking(context, recorder, person, slot):
+    """O mesmo agendamento de Banho & Tosa pela interface (amostra com navegador)."""
+    started = time.perf_counter()
+    outcome, error = "booked", None
+    page = await context.new_page()
+    scheduler = SchedulerPage(page)
+    day, hour = slot
+    try:
+        await scheduler.open()
+        await scheduler.choose_service("Banho & Tosa")
+        await scheduler.fill_details(person["pet_name"], person["owner_name"], person["whatsapp"],
+                                     address="Rua da Carga, 1", breed=person["pet_breed"])
+        await scheduler.click(scheduler.service_option("Banho & Tosa"), "Serviço Banho & Tosa")
+        await scheduler.select(scheduler.pet_weight, WEIGHT, "Peso do Pet")
+        await scheduler.click(scheduler.submit, "Próximo")
+        await scheduler.click(scheduler.calendar_day(day.day), f"Dia {day.day}")
+        await scheduler.click(scheduler.time_slot(hour), f"{hour}:00")
+        await scheduler.click(scheduler.submit, "Agendar")
+        await steps.ready(page, scheduler.confirmed, "Confirmado!")
+        if not await scheduler.confirmed.is_visible():
+            outcome = "not_confirmed"  # alert de horário preenchido ou erro do insert
+    except async_api.Error as exc:
+        outcome, error = "error", str(exc).splitlines()[0]
+    finally:
+        await page.close()
+    recorder.bookings.append({"flow": "browser", "slot": [day.isoformat(), hour], "outcome": outcome,
+                              "ms": (time.perf_counter() - started) * 1000, "error": error})
+
+
+async def violations(api, slots, capacity=None):
+    """Horários disputados com mais agendamentos que ``MAX_CAPACITY_PER_SLOT``, por agenda."""
+    capacity = capacity or constants.get("MAX_CAPACITY_PER_SLOT")
+    wanted = {(day.isoformat(), hour) for day, hour in slots}
+    days = sorted({day for day, _ in slots})
+    start = slot_utc(days[0], 0) - datetime.timedelta(hours=4)
+    end = slot_utc(days[-1], 23) + datetime.timedelta(hours=5)
+    counts = {}
+    for table in SLOT_TABLES:
+        response = await api.get(f"/rest/v1/{table}?select=*&appointment_time=gte.{start.isoformat()}"
+                                 f"&appointment_time=lte.{end.isoformat()}")
+        for row in await response.json():
+            if str(row.get("status") or "").upper() == "CANCELADO" or _visit(row):
+                continue
+            slot = local_slot(row["appointment_time"])
+            if slot in wanted:
+                key = (calendar_of(table, row), *slot)
+                counts[key] = counts.get(key, 0) + 1
+    return [{"calendar": calendar, "date": day, "hour": hour, "bookings": count, "capacity": capacity}
+            for (calendar, day, hour), count in sorted(counts.items()) if count > capacity]
+
+
+def pick_flow(rng, mix):
+    flows, weights = zip(*mix.items())
+    return rng.choices(flows, weights)[0]
+
+
+async def run_load(api, customers, concurrency, slots, mix, rate=None, seed=0, browser_pool=None, browsers=0):
+    """Dispara ``customers`` clientes, no máximo ``concurrency`` de cada vez.
+
+    Sem ``rate`` chegam todos de uma vez (pico de promoção); com ``rate``, as
+    chegadas seguem um processo de Poisson com essa taxa por segundo.
+    """
+    rng = random.Random(seed)
+    recorder = Recorder()
+    limit = asyncio.Semaphore(concurrency)
+    browser_every = customers // browsers if browsers else 0
+
+    async def one(index, flow, slot, delay):
+        await asyncio.sleep(delay)
+        person = customer(rng, index)
+        async with limit:
+            if browser_every and index % browser_every == 0 and flow == "banho_tosa":
+                async with browser_pool.context() as context:
+                    await browser_booking(context, recorder, person, slot)
+            else:
+                await http_booking(api, recorder, flow, person, slot)
+
+    arrivals, at = [], 0.0
+    for index in range(customers):
+        flow = pick_flow(rng, mix)
+        slot = rng.choice(slots) if flow in CALENDAR_FLOWS else None
+        arrivals.append((index, flow, slot, at))
+        if rate:
+            at += rng.expovariate(rate)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(*arrival) for arrival in arrivals))
+    report = recorder.report(time.perf_counter() - started)
+    report["violations"] = await violations(api, slots)
+    report["bookings"] = recorder.bookings
+    return report
@@ -0,0 +1,443 @@
+"""Matriz de cenários gerada do ``testsprite_frontend_test_plan.json``.
+
+Vários TC*.py existem em duas versões que percorrem quase o mesmo fluxo
+(ex.: os dois TC001 de Banho & Tosa). A matriz troca esses arquivos por
+casos gerados: cada item do plano que fala de peso vira um caso por serviço
+× peso (``PET_WEIGHT_OPTIONS``) e, se fala de serviços extras, × conjunto
+de adicionais (``ADDON_SERVICES``), com o preço esperado calculado a partir
+das mesmas tabelas que o app usa.
+
+Os casos viram uma árvore de passos: casos com o mesmo começo (abrir o app,
+escolher o cartão, preencher tutor e pet) compartilham esses passos, que
+rodam uma vez só. Nos galhos:
+
+- ``replace``: o irmão seguinte sobrescreve o valor na mesma página (serviço,
+  peso);
+- ``toggle``: o passo é desfeito ao sair do galho, clicando de novo
+  (adicionais);
+- ``check``: só lê a página;
+- ``fork``: o irmão seguinte ganha um contexto próprio do pool, que refaz o
+  prefixo e roda em paralelo (cartões diferentes, ou depois de um erro que
+  deixou a página num estado desconhecido).
+
+O Playwright não clona o estado de uma página React viva; por isso o fork
+refaz o prefixo em vez de copiá-lo. Como quase toda a matriz está abaixo do
+passo de peso, o prefixo repetido é pequeno.
+
+Com ``--har`` cada fork grava/responde o seu HAR (``matrix-<hash do
+caminho>``): o caminho de passos é o mesmo de uma execução para outra.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+import traceback
+
+from harness import config, constants, har, steps
+from harness.pages import SchedulerPage
+
+PLAN_FILE = config.SUITE_DIR / "testsprite_frontend_test_plan.json"
+
+# Cartões da tela inicial com serviço cobrado por peso, e os serviços de cada um.
+SERVICE_CARDS = {
+    "Banho & Tosa": ("BATH", "BATH_AND_GROOMING"),
+    "Pet Móvel": ("PET_MOBILE_BATH", "PET_MOBILE_BATH_AND_GROOMING"),
+}
+# Rótulo do botão de cada serviço dentro do formulário.
+SERVICE_BUTTONS = {
+    "BATH": "Banho",
+    "BATH_AND_GROOMING": "Banho & Tosa",
+    "PET_MOBILE_BATH": "Banho",
+    "PET_MOBILE_BATH_AND_GROOMING": "Banho & Tosa",
+}
+# Colunas de preço (SERVICE_PRICES / service_prices) somadas por serviço.
+PRICE_PARTS = {
+    "BATH": ("BATH",),
+    "BATH_AND_GROOMING": ("BATH", "GROOMING_ONLY"),
+    "PET_MOBILE_BATH": ("BATH",),
+    "PET_MOBILE_BATH_AND_GROOMING": ("BATH", "GROOMING_ONLY"),
+}
+PET_MOVEL_CONDO = "Vitta Parque"
+# Adicionais que o formulário público não mostra.
+HIDDEN_ADDONS = {"tosa_higienica"}
+# Marcar um desmarca o outro (handleAddonToggle): nunca vão juntos num conjunto.
+EXCLUSIVE_ADDONS = {"patacure1": "patacure2", "patacure2": "patacure1"}
+
+DETAILS = {
+    "whatsapp": "(11) 91234-5678",
+    "owner_name": "Tutor Matriz",
+    "pet_name": "Rex",
+    "breed": "Golden Retriever",
+    "address": "Rua dos Pets, 123",
+}
+
+# Arquivos cujo fluxo a matriz cobre; com --matrix o runner não os executa.
+SUPERSEDES = (
+    "TC001_Schedule_Banho__Tosa_appointment_successfully",
+    "TC001_Schedule_appointment_successfully_for_Banho__Tosa_service",
+    "TC004_Enforce_pet_weight_constraints_on_scheduling",
+    "TC004_Pricing_calculation_based_on_pet_weight_and_extra_services",
+)
+
+
+class Step:
+    """Passo da árvore. Passos com a mesma ``key`` no mesmo ponto são o mesmo nó."""
+
+    def __init__(self, key, kind, label, action):
+        self.key = key
+        self.kind = kind
+        self.label = label
+        self.action = action
+
+    async def run(self, session):
+        await self.action(session)
+
+
+class Case:
+    def __init__(self, plan_id, case_id, service, steps_):
+        self.plan_id = plan_id
+        self.case_id = case_id
+        self.service = service
+        self.steps = steps_
+
+    @property
+    def name(self):
+        return f"{self.plan_id}[{self.case_id}]"
+
+
+# Passos -------------------------------------------------------------------
+
+def _open_step():
+    async def action(session):
+        await session.scheduler.open()
+    return Step(("open",), "fork", "Abrir o app", action)
+
+
+def _card_step(card):
+    async def action(session):
+        await session.scheduler.choose_service(card)
+    return Step(("card", card), "fork", f"Cartão {card}", action)
+
+
+def _details_step():
+    async def action(session):
+        scheduler = session.scheduler
+        await scheduler.fill_details(DETAILS["pet_name"], DETAILS["owner_name"], DETAILS["whatsapp"],
+                                     address=DETAILS["address"], breed=DETAILS["breed"])
+    return Step(("details",), "fork", "Dados do tutor e do pet", action)
+
+
+def _condo_step(condo):
+    async def action(session):
+        await session.scheduler.click(session.scheduler.condo(condo), f"Condomínio {condo}")
+    return Step(("condo", condo), "fork", f"Condomínio {condo}", action)
+
+
+def _service_step(service):
+    label = SERVICE_BUTTONS[service]
+
+    async def action(session):
+        await session.scheduler.click(session.scheduler.service_option(label), f"Serviço {label}")
+    return Step(("service", service), "replace", f"Serviço {service}", action)
+
+
+def _weight_step(weight):
+    async def action(session):
+        await session.scheduler.select(session.scheduler.pet_weight, weight, f"Peso {weight}")
+    return Step(("weight", weight), "replace", f"Peso {weight}", action)
+
+
+def _addons_step(addons, labels):
+    async def action(session):
+        # Chamado de novo ao sair do galho: clicar outra vez desmarca.
+        for addon in addons:
+            await session.scheduler.click(session.scheduler.addon(labels[addon]), f"Adicional {addon}")
+    return Step(("addons", addons), "toggle", "Adicionais " + (",".join(addons) or "nenhum"), action)
+
+
+def _price_check(service, weight, addons, addon_prices):
+    async def action(session):
+        expected = expected_price(service, weight, addons, addon_prices, session.prices)
+        await steps.ready(session.page, session.scheduler.total_price, "Conferir preço")
+        shown = await session.scheduler.read_total()
+        if shown is None or abs(shown - expected) > 0.005:
+            raise AssertionError(f"preço exibido {shown!r}, esperado {expected:.2f} "
+                                 f"({service}, {weight}, adicionais: {', '.join(addons) or 'nenhum'})")
+    return Step(("price", service, weight, addons), "check", "Conferir preço", action)
+
+
+def _weight_options_check(weights):
+    async def action(session):
+        await steps.ready(session.page, session.scheduler.pet_weight, "Opções de peso")
+        values = await session.scheduler.pet_weight.locator("option").evaluate_all(
+            "os => os.filter(o => o.value).map(o => o.value)")
+        if values != list(weights):
+            raise AssertionError(f"opções de peso {values}, esperado {list(weights)} (PET_WEIGHT_OPTIONS)")
+    return Step(("weight-options",), "check", "Conferir opções de peso", action)
+
+
+# Geração dos casos ------------------------------------------------------
+
+def load_plan(path=PLAN_FILE):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def plan_axes(entry):
+    """Eixos que um item do plano exercita, pelo texto dos passos: (cartões, peso, adicionais)."""
+    text = " ".join(step["description"] for step in entry["steps"]).lower()
+    named = [card for card in SERVICE_CARDS if card.lower() in text]
+    if "weight" not in text or not named:
+        return [], False, False
+    # Preço por peso vale igual para todos os serviços cobrados por peso:
+    # o cartão citado no plano vem primeiro, os demais ampliam a cobertura.
+    cards = named + [card for card in SERVICE_CARDS if card not in named]
+    return cards, True, "extra service" in text
+
+
+def available_addons(service, weight):
+    """Adicionais clicáveis para o serviço e peso (mesmas regras do ``isDisabled`` do formulário)."""
+    result = []
+    for addon in constants.get("ADDON_SERVICES"):
+        if addon["id"] in HIDDEN_ADDONS:
+            continue
+        if weight in addon.get("excludesWeight", ()):
+            continue
+        if addon.get("requiresWeight") and weight not in addon["requiresWeight"]:
+            continue
+        if addon.get("requiresService") and addon["requiresService"] != service:
+            continue
+        result.append(addon["id"])
+    return result
+
+
+def addon_sets(service, weight):
+    """Nenhum adicional, cada um sozinho e todos os compatíveis juntos."""
+    available = available_addons(service, weight)
+    sets = [()] + [(addon,) for addon in available]
+    together = []
+    for addon in available:
+        if EXCLUSIVE_ADDONS.get(addon) not in together:
+            together.append(addon)
+    if len(together) > 1:
+        sets.append(tuple(together))
+    return sets
+
+
+def expected_price(service, weight, addons, addon_prices, db_prices=None):
+    """Mesma conta do formulário: base por peso (banco ou SERVICE_PRICES) + adicionais."""
+    table = db_prices if db_prices and weight in db_prices else constants.get("SERVICE_PRICES")
+    base = sum(table[weight].get(part) or 0 for part in PRICE_PARTS[service])
+    return float(base + sum(addon_prices[a] for a in addons))
+
+
+def build_cases(plan=None, keyword=None):
+    plan = load_plan() if plan is None else plan
+    weights = tuple(constants.get("PET_WEIGHT_OPTIONS"))
+    addons = constants.get("ADDON_SERVICES")
+    labels = {a["id"]: a["label"] for a in addons}
+    prices = {a["id"]: a["price"] for a in addons}
+
+    cases = []
+    for entry in plan:
+        cards, _, with_addons = plan_axes(entry)
+        for card in cards:
+            prefix = [_open_step(), _card_step(card), _details_step()]
+            if card == "Pet Móvel":
+                prefix.append(_condo_step(PET_MOVEL_CONDO))
+            for service in SERVICE_CARDS[card]:
+                service_steps = [*prefix, _service_step(service)]
+                if not with_addons:
+                    cases.append(Case(entry["id"], f"{service}-opcoes-de-peso", service,
+                                      [*service_steps, _weight_options_check(weights)]))
+                for weight in weights:
+                    for chosen in (addon_sets(service, weight) if with_addons else [()]):
+                        case_id = "-".join([service, weight, *chosen])
+                        steps_ = [*service_steps, _weight_step(weight)]
+                        if chosen:
+                            steps_.append(_addons_step(chosen, labels))
+                        steps_.append(_price_check(service, weight, chosen, prices))
+                        cases.append(Case(entry["id"], case_id, service, steps_))
+    if keyword:
+        cases = [c for c in cases if keyword.lower() in c.name.lower()]
+    return cases
+
+
+def services(cases):
+    """Serviços presentes nos casos, em ordem estável: a unidade de divisão em shards."""
+    return sorted({case.service for case in cases})
+
+
+# Execução ---------------------------------------------------------------
+
+class _Node:
+    def __init__(self, step):
+        self.step = step
+        self.children = {}
+        self.cases = []
+        self.elapsed = 0.0
+        self.case_count = 0
+
+
+def build_tree(cases):
+    root = _Node(None)
+    for case in cases:
+        node = root
+        for step in case.steps:
+            node = node.children.setdefault(step.key, _Node(step))
+            node.case_count += 1
+        node.cases.append(case)
+    return root
+
+
+class _Session:
+    """Uma página em uso por um galho da árvore."""
+
+    def __init__(self, context, page):
+        self.context = context
+        self.page = page
+        self.scheduler = SchedulerPage(page)
+        self.prices = None
+        self.dirty = False
+        page.on("response", self._on_response)
+
+    async def _on_response(self, response):
+        # Mesma tabela que useServicePrices lê; sem ela vale o SERVICE_PRICES.
+        if "/rest/v1/service_prices" not in response.url or not response.ok:
+            return
+        try:
+            rows = await response.json()
+        except Exception:
+            return
+        self.prices = {
+            row["weight_category"]: {"BATH": float(row["bath_price"]), "GROOMING_ONLY": float(row["grooming_only_price"])}
+            for row in rows
+        }
+
+
+class MatrixRun:
+    def __init__(self, pool, cases, har_mode=None):
+        self.pool = pool
+        self.root = build_tree(cases)
+        self.outcomes = {}  # case.name -> (status, error)
+        self.cases = cases
+        self.har_mode = har_mode
+        self.har_misses = {}  # case.name -> requisições fora do HAR no fork que o executou
+        self._pending = set()
+
+    async def run(self):
+        self._spawn(self.root, [])
+        # Os forks não esperam uns pelos outros segurando contexto (com pool
+        # pequeno isso travaria): ficam em _pending e são aguardados aqui.
+        while self._pending:
+            await asyncio.gather(*list(self._pending))
+        return [self._result(case) for case in self.cases]
+
+    def _spawn(self, node, path):
+        task = asyncio.create_task(self._fork(node, path))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _fork(self, node, path):
+        """Novo contexto: refaz ``path`` e explora ``node`` a partir dele."""
+        async with self.pool.context() as context:
+            await har.attach(context, self._har_name(node, path), self.har_mode)
+            try:
+                await self._replay(node, context, path)
+            finally:
+                misses = har.misses(context)
+                if misses:
+                    for case in self._subtree_cases(node):
+                        self.har_misses.setdefault(case.name, []).extend(misses)
+
+    async def _replay(self, node, context, path):
+        context.set_default_timeout(5000)
+        session = _Session(context, await context.new_page())
+        for ancestor in path:
+            try:
+                await ancestor.step.run(session)
+            except Exception as exc:
+                self._fail(node, exc, f"{ancestor.step.label} (refazendo o prefixo)")
+                return
+        if node.step is None:
+            await self._explore(node, session, path)
+        else:
+            await self._enter(node, session, path)
+
+    @staticmethod
+    def _har_name(node, path):
+        keys = [repr(n.step.key) for n in [*path, node] if n.step is not None]
+        return "matrix-" + hashlib.sha1("/".join(keys).encode()).hexdigest()[:12]
+
+    @staticmethod
+    def _subtree_cases(node):
+        stack, cases = [node], []
+        while stack:
+            current = stack.pop()
+            cases.extend(current.cases)
+            stack.extend(current.children.values())
+        return cases
+
+    async def _enter(self, node, session, path):
+        started = time.perf_counter()
+        try:
+            await node.step.run(session)
+        except Exception as exc:
+            node.elapsed += time.perf_counter() - started
+            self._fail(node, exc, node.step.label)
+            if not isinstance(exc, AssertionError) or node.step.kind != "check":
+                session.dirty = True
+            return
+        node.elapsed += time.perf_counter() - started
+        await self._explore(node, session, [*path, node])
+        if node.step.kind == "toggle" and not session.dirty:
+            try:
+                await node.step.run(session)
+            except Exception:
+                session.dirty = True
+
+    async def _explore(self, node, session, path):
+        for case in node.cases:
+            self.outcomes.setdefault(case.name, ("passed", None))
+        for index, child in enumerate(node.children.values()):
+            if index > 0 and (child.step.kind == "fork" or session.dirty):
+                self._spawn(child, path)
+            else:
+                await self._enter(child, session, path)
+
+    def _fail(self, node, exc, label):
+        if isinstance(exc, AssertionError):
+            status, error = "failed", f"{label}: {exc}"
+        else:
+            status, error = "error", f"{label}: {traceback.format_exc()}"
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            for case in current.cases:
+                self.outcomes.setdefault(case.name, (status, error))
+            stack.extend(current.children.values())
+
+    def _result(self, case):
+        # Custo amortizado: cada passo compartilhado é dividido entre os casos que o usam.
+        duration, node = 0.0, self.root
+        for step in case.steps:
+            node = node.children[step.key]
+            duration += node.elapsed / node.case_count
+        status, error = self.outcomes.get(case.name, ("error", "caso não executado"))
+        return {
+            "scenario": case.name,
+            "status": status,
+            "duration": round(duration, 3),
+            "error": error,
+            "worker": os.getpid(),
+            "steps": [],
+            "tail": {},
+            "page": {},
+            "har_misses": self.har_misses.get(case.name, []),
+        }
+
+
+async def run(pool, cases, har_mode=None):
+    """Executa os casos no pool; devolve um resultado por caso, no formato do runner."""
+    return await MatrixRun(pool, cases, har_mode).run()
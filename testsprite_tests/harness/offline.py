@@ -0,0 +1,215 @@
+"""Carregamento do shell do app com o service worker (``sw.js``) em rede ruim ou sem rede.
+
+Os telefones da equipe usam o app em 3G e Wi-Fi que cai. Aqui cada perfil de
+``PROFILES`` roda num contexto novo (cache e service workers vazios):
+
+1. ``cold``: primeira visita, com a rede do perfil e sem service worker;
+2. ``prime``: registra ``/sw.js`` e espera a instalação, que baixa o
+   ``BUILD.precache`` do build;
+3. ``warm``: recarrega com o service worker no controle, ainda na rede do perfil;
+4. ``offline``: recarrega com o contexto desligado da rede.
+
+Para cada carregamento: ``shell_ms`` (até o logo aparecer), ``dcl_ms``/``load_ms``
+da Navigation Timing, quantos assets do shell o service worker respondeu dos
+caches de ``CACHE_NAMES`` (``cache_hit_ratio``), os bytes que saíram desses
+caches e os que vieram pela rede.
+
+Precisa do build de produção (``vite build`` + ``vite preview``, ver
+``stack.preview_server``): no ``vite`` de desenvolvimento o ``/sw.js`` é o
+modelo da raiz, com o precache vazio, e o ``index.tsx`` desregistra os
+service workers. Throttling e queda de rede são do CDP (só Chromium).
+"""
+import asyncio
+import contextlib
+import random
+import time
+
+from playwright import async_api
+
+from harness import config, steps
+from harness.pages import SchedulerPage
+
+# Caches do sw.js; o precache leva a versão do build no fim (sandypetshop-precache-<version>).
+CACHE_NAMES = ("sandypetshop-precache-", "sandypetshop-assets", "sandypetshop-images", "sandypetshop-cdn")
+SW_URL = "/sw.js"
+SHELL_TIMEOUT_MS = 60000
+INSTALL_TIMEOUT_MS = 120000
+
+# Taxas em bytes/s, como o Network.emulateNetworkConditions espera. Os dois 3G
+# são os presets do DevTools ("Fast 3G"/"Slow 3G").
+PROFILES = {
+    "3g": {"latency": 562.5, "downloadThroughput": 180_000, "uploadThroughput": 84_375},
+    "3g-lento": {"latency": 2000, "downloadThroughput": 50_000, "uploadThroughput": 50_000},
+    # Wi-Fi razoável que cai por 1–2 s a cada 3–8 s (ver _flap).
+    "wifi-instavel": {"latency": 80, "downloadThroughput": 625_000, "uploadThroughput": 125_000,
+                      "flap": ((3.0, 8.0), (1.0, 2.0))},
+    # Só o carregamento sem rede: cold e warm sem throttling.
+    "offline": None,
+}
+
+PRIME_JS = """
+async ([url, timeoutMs]) => {
+    const container = navigator.serviceWorker;
+    if (!container) return { state: 'unsupported' };
+    let registration;
+    try {
+        registration = await container.register(url);
+    } catch (error) {
+        return { state: 'register-failed', error: String(error) };
+    }
+    const deadline = performance.now() + timeoutMs;
+    while (performance.now() < deadline) {
+        const worker = registration.active || registration.waiting || registration.installing;
+        if (registration.active && registration.active.state === 'activated') return { state: 'activated' };
+        // Um URL do precache falhou no install: a instalação é descartada.
+        if (!worker || worker.state === 'redundant') return { state: 'install-failed' };
+        await new Promise(resolve => setTimeout(resolve, 50));
+    }
+    return { state: 'timeout' };
+}
+"""
+
+INVENTORY_JS = """
+async (prefixes) => {
+    if (!self.caches) return {};
+    const sizes = {};
+    for (const name of await caches.keys()) {
+        if (!prefixes.some(prefix => name.startsWith(prefix))) continue;
+        const cache = await caches.open(name);
+        for (const request of await cache.keys()) {
+            const response = await cache.match(request);
+            // Respostas opacas (no-cors) não expõem o corpo: tamanho 0.
+            sizes[request.url] = response ? (await response.clone().blob()).size : 0;
+        }
+    }
+    return sizes;
+}
+"""
+
+NAVIGATION_JS = """
+() => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    const resources = performance.getEntriesByType('resource');
+    return {
+        dcl_ms: nav ? nav.domContentLoadedEventEnd : null,
+        load_ms: nav && nav.loadEventEnd ? nav.loadEventEnd : null,
+        network_bytes: [nav, ...resources].reduce((sum, e) => sum + ((e && e.transferSize) || 0), 0),
+        controlled: !!(navigator.serviceWorker && navigator.serviceWorker.controller),
+    };
+}
+"""
+
+
+async def emulate(cdp, profile, offline=False):
+    conditions = PROFILES.get(profile) or {}
+    await cdp.send("Network.emulateNetworkConditions", {
+        "offline": offline,
+        "latency": conditions.get("latency", 0),
+        "downloadThroughput": conditions.get("downloadThroughput", -1),
+        "uploadThroughput": conditions.get("uploadThroughput", -1),
+    })
+
+
+async def _flap(cdp, profile, rng):
+    """Derruba a rede da página por instantes, enquanto a tarefa estiver viva."""
+    (up_min, up_max), (down_min, down_max) = PROFILES[profile]["flap"]
+    while True:
+        await asyncio.sleep(rng.uniform(up_min, up_max))
+        await emulate(cdp, profile, offline=True)
+        await asyncio.sleep(rng.uniform(down_min, down_max))
+        await emulate(cdp, profile)
+
+
+async def _stop(task):
+    if task:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+
+async def cache_inventory(page, names=CACHE_NAMES):
+    """URL -> bytes de cada entrada dos caches do service worker cujo nome começa por um de ``names``."""
+    return await page.evaluate(INVENTORY_JS, list(names))
+
+
+async def prime(page, url=SW_URL, timeout_ms=INSTALL_TIMEOUT_MS):
+    """Registra o service worker e espera ativar; devolve o estado ("activated", "install-failed"...)."""
+    return (await page.evaluate(PRIME_JS, [url, timeout_ms]))["state"]
+
+
+async def load_shell(page, navigate, inventory=None, timeout_ms=SHELL_TIMEOUT_MS):
+    """Executa ``navigate`` e mede o shell até o logo aparecer e a tela sossegar."""
+    inventory = inventory or {}
+    responses, failed = [], []
+    page.on("response", responses.append)
+    page.on("requestfailed", failed.append)
+    started = time.perf_counter()
+    error = shell_ms = None
+    try:
+        await navigate()
+        await SchedulerPage(page).logo.wait_for(state="visible", timeout=timeout_ms)
+        shell_ms = round((time.perf_counter() - started) * 1000, 1)
+        # Assets que chegam depois do logo (fontes, ícones) também contam.
+        await steps.ready(page, label="shell", timeout_ms=timeout_ms)
+    except async_api.Error as exc:
+        error = str(exc).splitlines()[0]
+    finally:
+        page.remove_listener("response", responses.append)
+        page.remove_listener("requestfailed", failed.append)
+
+    # Supabase não passa pelo cache do sw.js; a razão é só sobre os assets do shell.
+    assets = [r for r in responses if not steps.is_supabase_request(r.url)]
+    hits = [r for r in assets if r.from_service_worker and r.url in inventory]
+    failed_assets = [r for r in failed if not steps.is_supabase_request(r.url)]
+    requested = len(assets) + len(failed_assets)
+    try:
+        timing = await page.evaluate(NAVIGATION_JS)
+    except async_api.Error:
+        timing = {"dcl_ms": None, "load_ms": None, "network_bytes": 0, "controlled": False}
+    return {
+        "shell_ms": shell_ms,
+        "dcl_ms": timing["dcl_ms"] and round(timing["dcl_ms"], 1),
+        "load_ms": timing["load_ms"] and round(timing["load_ms"], 1),
+        "controlled": timing["controlled"],
+        "assets": requested,
+        "cache_hits": len(hits),
+        "cache_hit_ratio": round(len(hits) / requested, 3) if requested else None,
+        "cache_bytes": sum(inventory[r.url] for r in hits),
+        "network_bytes": int(timing["network_bytes"]),
+        "failed_assets": len(failed_assets),
+        "error": error,
+    }
+
+
+async def measure_profile(pool, profile, url=config.BASE_URL, seed=0):
+    """cold, prime, warm e offline de um perfil, num contexto novo."""
+    context = await pool.new_context()
+    flapper = None
+    try:
+        page = await context.new_page()
+        cdp = await context.new_cdp_session(page)
+        await cdp.send("Network.enable")
+        await emulate(cdp, profile)
+        if PROFILES.get(profile) and "flap" in PROFILES[profile]:
+            flapper = asyncio.create_task(_flap(cdp, profile, random.Random(seed)))
+
+        result = {"profile": profile}
+        result["cold"] = await load_shell(page, lambda: page.goto(url, wait_until="commit"))
+        result["sw_state"] = await prime(page)
+        inventory = await cache_inventory(page)
+        result["cached_entries"] = len(inventory)
+        result["cached_bytes"] = sum(inventory.values())
+        result["warm"] = await load_shell(page, lambda: page.reload(wait_until="commit"), inventory)
+
+        await _stop(flapper)
+        flapper = None
+        await emulate(cdp, profile)
+        await prime(page)
+        # Chunks guardados em cache-first durante o warm também servem offline.
+        inventory = await cache_inventory(page)
+        await context.set_offline(True)
+        result["offline"] = await load_shell(page, lambda: page.reload(wait_until="commit"), inventory)
+        return result
+    finally:
+        await _stop(flapper)
+        await context.close()
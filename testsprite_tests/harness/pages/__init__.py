@@ -0,0 +1,21 @@
+"""Page objects das telas usadas pelos cenários.
+
+Os elementos são achados por papel, rótulo, ``name`` ou texto visível, nunca
+por XPath absoluto: um refactor de layout (como o que o
+``replace_hotel_form.py`` aplica) não muda nenhum deles.
+"""
+from harness.pages.admin import AdminLoginPage, AdminSidebar
+from harness.pages.base import Element, PageObject
+from harness.pages.daycare import DaycareEnrollmentPage
+from harness.pages.hotel import HotelRegistrationPage
+from harness.pages.scheduler import SchedulerPage
+
+__all__ = [
+    "AdminLoginPage",
+    "AdminSidebar",
+    "DaycareEnrollmentPage",
+    "Element",
+    "HotelRegistrationPage",
+    "PageObject",
+    "SchedulerPage",
+]
@@ -0,0 +1,49 @@
+"""Login administrativo (``AdminLogin``) e navegação do painel admin."""
+import re
+
+from harness import config
+from harness.pages.base import Element, PageObject
+
+# Itens do menu lateral, na ordem de ``menuItems`` no App.tsx.
+SECTIONS = ("Resumo", "Pet Móvel", "Banho & Tosa", "Creche", "Hotel Pet", "Clientes", "Mensalistas")
+
+
+class AdminLoginPage(PageObject):
+    email = Element(lambda p: p.get_by_label("E-mail", exact=True))
+    password = Element(lambda p: p.get_by_label("Senha", exact=True))
+    submit = Element(lambda p: p.locator("form").filter(has=p.get_by_label("E-mail", exact=True))
+                     .get_by_role("button", name="Entrar"))
+    back = Element(lambda p: p.get_by_role("button", name="Voltar"))
+
+    async def open(self, url=config.BASE_URL):
+        await self.page.goto(url, wait_until="domcontentloaded")
+        await self.click(self.page.get_by_role("button", name="Acesso Administrativo").first, "Acesso Administrativo")
+        self.invalidate()
+
+    async def login(self, email=config.ADMIN_EMAIL, password=config.ADMIN_PASSWORD):
+        await self.fill(self.email, email, "E-mail")
+        await self.fill(self.password, password, "Senha")
+        await self.click(self.submit, "Entrar")
+
+
+class AdminSidebar(PageObject):
+    # Há dois menus iguais (gaveta do celular e barra lateral); vale o visível.
+    nav = Element(lambda p: p.locator("nav[aria-label='Navegação administrativa']:visible").first)
+    logout = Element(lambda p: p.locator("button:visible").filter(has_text=re.compile(r"^\s*Sair\s*$")).first)
+
+    def section(self, label):
+        """Item do menu lateral (ver ``SECTIONS``)."""
+        return self.locate(("section", label), lambda: self.nav.get_by_role("button").filter(
+            has_text=re.compile(rf"^\s*{re.escape(label)}\s*$")).first)
+
+    def settings_item(self, label):
+        """Itens de 'Ajustes' fora do menu principal: 'Financeiro', 'Notas Fiscais', 'Insights IA'..."""
+        return self.locate(("settings", label), lambda: self.page.locator("button:visible", has_text=label).first)
+
+    def header_button(self, text):
+        """Botões do topo: 'Definir Preços', 'Abrir Agenda'/'Fechar Agenda'."""
+        return self.locate(("header", text), lambda: self.page.locator("header button:visible", has_text=text).first)
+
+    async def open(self, label):
+        await self.click(self.section(label), f"Menu {label}")
+        self.invalidate()
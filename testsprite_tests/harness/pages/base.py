@@ -0,0 +1,70 @@
+"""Base dos page objects: locators declarados uma vez e guardados por estado da página.
+
+Um locator do Playwright é só a receita de busca; o elemento é procurado de
+novo a cada ação. Guardar o locator não arrisca apontar para um nó antigo,
+e evita remontar a cadeia de ``get_by_*`` a cada passo. O cache é limpo
+quando a página navega e quando uma ação troca de tela (``invalidate``).
+"""
+from harness import steps
+
+
+class Element:
+    """Locator declarado na classe do page object: ``pet_name = Element(lambda p: ...)``."""
+
+    def __init__(self, build):
+        self.build = build
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        return obj.locate(self.name, lambda: self.build(obj.page))
+
+
+class PageObject:
+    def __init__(self, page):
+        self.page = page
+        self._locators = {}
+        page.on("framenavigated", self._on_navigated)
+
+    def _on_navigated(self, frame):
+        if frame == self.page.main_frame:
+            self.invalidate()
+
+    def invalidate(self):
+        """Esquece os locators; chamado quando a tela muda sem navegação (SPA)."""
+        self._locators.clear()
+
+    def locate(self, key, build):
+        locator = self._locators.get(key)
+        if locator is None:
+            locator = self._locators[key] = build()
+        return locator
+
+    # Elementos genéricos, para telas ainda sem page object próprio.
+
+    def button(self, name, exact=False):
+        return self.locate(("button", name, exact), lambda: self.page.get_by_role("button", name=name, exact=exact).first)
+
+    def text(self, text):
+        return self.locate(("text", text), lambda: self.page.get_by_text(text).first)
+
+    def labeled(self, label, exact=True):
+        return self.locate(("label", label, exact), lambda: self.page.get_by_label(label, exact=exact).first)
+
+    # Ações: esperam a tela sossegar (steps.ready) e registram o passo.
+
+    async def click(self, locator, label=None):
+        await steps.ready(self.page, locator, label)
+        await locator.click()
+
+    async def fill(self, locator, value, label=None):
+        await steps.ready(self.page, locator, label)
+        await locator.fill(value)
+
+    async def select(self, locator, value, label=None):
+        await steps.ready(self.page, locator, label)
+        await locator.select_option(value)
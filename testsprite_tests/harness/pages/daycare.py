@@ -0,0 +1,27 @@
+"""Matrícula da creche (``DaycareRegistrationForm``).
+
+Como na ficha do hotel, os campos vêm do atributo ``name``; as opções em
+rádio (sexo, castrado) são clicadas pelo texto do ``<label>`` que as envolve.
+"""
+from harness.pages.base import Element, PageObject
+
+
+class DaycareEnrollmentPage(PageObject):
+    form = Element(lambda p: p.locator("form").filter(has=p.locator("[name=tutor_rg]")).first)
+    submit = Element(lambda p: p.get_by_role("button", name="Finalizar Matrícula"))
+    submitted = Element(lambda p: p.get_by_role("heading", name="Solicitação Enviada!"))
+
+    def field(self, name):
+        return self.locate(("field", name), lambda: self.form.locator(f"[name='{name}']").first)
+
+    def choice(self, name, label):
+        """Opção de rádio: ``choice('pet_sex', 'Macho')``."""
+        return self.locate(("choice", name, label), lambda: self.form.locator("label").filter(
+            has=self.page.locator(f"input[name='{name}']")).filter(has_text=label).first)
+
+    def section(self, title):
+        return self.locate(("section", title), lambda: self.page.get_by_role("heading", name=title))
+
+    async def fill_fields(self, **values):
+        for name, value in values.items():
+            await self.fill(self.field(name), value, name)
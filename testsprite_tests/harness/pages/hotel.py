@@ -0,0 +1,40 @@
+"""Ficha de hospedagem (``HotelRegistrationForm``).
+
+Os campos são achados pelo atributo ``name`` do input, o mesmo usado pelo
+``formData`` do componente, e não pela posição no layout.
+"""
+from harness.pages.base import Element, PageObject
+
+
+class HotelRegistrationPage(PageObject):
+    form = Element(lambda p: p.locator("form").filter(has=p.locator("[name=check_in_date]")).first)
+    signature_pad = Element(lambda p: p.locator("form canvas").first)
+    # O primeiro 'Solicitar Check-in' abre o aviso; o do aviso envia o formulário.
+    request_check_in = Element(lambda p: p.get_by_role("button", name="Solicitar Check-in").first)
+    confirm_check_in = Element(lambda p: p.get_by_role("button", name="Solicitar Check-in").last)
+    submitted = Element(lambda p: p.get_by_role("heading", name="Solicitação Enviada!"))
+
+    def field(self, name):
+        return self.locate(("field", name), lambda: self.form.locator(f"[name='{name}']").first)
+
+    async def fill_fields(self, **values):
+        for name, value in values.items():
+            locator = self.field(name)
+            if isinstance(value, bool):
+                # Checkboxes (banho, transporte, declarações): clica só se precisar mudar.
+                if value != await locator.is_checked():
+                    await self.click(locator, name)
+            else:
+                await self.fill(locator, value, name)
+
+    async def sign(self):
+        box = await self.signature_pad.bounding_box()
+        mouse = self.page.mouse
+        await mouse.move(box["x"] + 20, box["y"] + box["height"] / 2)
+        await mouse.down()
+        await mouse.move(box["x"] + box["width"] - 20, box["y"] + box["height"] / 3, steps=8)
+        await mouse.up()
+
+    async def submit(self):
+        await self.click(self.request_check_in, "Solicitar Check-in")
+        await self.click(self.confirm_check_in, "Confirmar check-in")
@@ -0,0 +1,93 @@
+"""Tela pública de agendamento (``Scheduler`` no App.tsx)."""
+import re
+
+from harness import config, steps
+from harness.pages.base import Element, PageObject
+
+
+class SchedulerPage(PageObject):
+    # Cartões da tela inicial e atalhos fora do formulário.
+    admin_access = Element(lambda p: p.get_by_role("button", name="Acesso Administrativo"))
+    back = Element(lambda p: p.get_by_title("Voltar").first)
+    logo = Element(lambda p: p.get_by_alt_text("Sandy's Pet Shop Logo").first)
+
+    # Informações do tutor e do pet.
+    whatsapp = Element(lambda p: p.get_by_label("WhatsApp", exact=True))
+    owner_name = Element(lambda p: p.get_by_label("Seu Nome", exact=True))
+    owner_cpf = Element(lambda p: p.get_by_label("CPF/CNPJ (Fiscal)", exact=True))
+    pet_name = Element(lambda p: p.get_by_label("Nome do Pet", exact=True))
+    # O <label> "Raça do Pet" aponta para um id que o <select> não usa.
+    pet_breed = Element(lambda p: p.locator("#petBreedSelect"))
+    # Só aparece com "Outra raça..." selecionado.
+    pet_breed_other = Element(lambda p: p.get_by_placeholder("Digite a raça do seu pet"))
+    owner_address = Element(lambda p: p.get_by_label("Seu Endereço", exact=True))
+    observation = Element(lambda p: p.get_by_label("Observações sobre o Pet", exact=True))
+    pet_weight = Element(lambda p: p.get_by_label("Peso do Pet"))
+
+    # "Preço Total:" e o valor ficam em <span>s irmãos.
+    total_price = Element(lambda p: p.get_by_text("Preço Total:", exact=True).locator(".."))
+    submit = Element(lambda p: p.locator("form button[type=submit]").first)
+    confirmed = Element(lambda p: p.get_by_role("heading", name="Confirmado!"))
+
+    async def open(self, url=config.BASE_URL):
+        await self.page.goto(url, wait_until="domcontentloaded")
+        self.invalidate()
+
+    def service_card(self, title):
+        """Cartão da tela inicial: 'Banho & Tosa', 'Pet Móvel', 'Creche Pet' ou 'Visita'."""
+        return self.locate(("card", title), lambda: self.page.get_by_role("button").filter(
+            has=self.page.get_by_role("heading", name=title, exact=True)).first)
+
+    def service_option(self, label):
+        """Serviço dentro do formulário: 'Banho', 'Banho & Tosa', 'Banho (Pet Móvel)'..."""
+        return self.locate(("service", label), lambda: self.page.locator("form").get_by_role("button").filter(
+            has=self.page.get_by_role("heading", name=label, exact=True)).first)
+
+    def visit_option(self, text):
+        """Opções depois de 'Visita' (ex.: 'Creche Pet', 'Hotel Pet')."""
+        return self.locate(("visit", text), lambda: self.page.get_by_role("button").filter(has_text=text).first)
+
+    def condo(self, name):
+        """Condomínio do Pet Móvel: 'Vitta Parque', 'Max Haus' ou 'Paseo'."""
+        return self.locate(("condo", name), lambda: self.page.locator("form").get_by_role("button").filter(
+            has_text=name).first)
+
+    def addon(self, label):
+        # O checkbox fica escondido; o clique vai no <label> que o envolve.
+        return self.locate(("addon", label), lambda: self.page.locator("label").filter(has_text=label).first)
+
+    def calendar_day(self, day):
+        return self.locate(("day", day), lambda: self.page.get_by_role("button", name=str(day), exact=True).first)
+
+    def time_slot(self, hour):
+        return self.locate(("slot", hour), lambda: self.page.get_by_role("button", name=f"{hour}:00", exact=True))
+
+    async def choose_service(self, title):
+        await self.click(self.service_card(title), f"Abrir {title}")
+        self.invalidate()
+
+    async def read_total(self):
+        """Preço total exibido, em reais; ``None`` enquanto o app não mostra o total."""
+        if not await self.total_price.count():
+            return None
+        match = re.search(r"R\$\s*([\d.]+,\d{2})", await self.total_price.inner_text())
+        return float(match.group(1).replace(".", "").replace(",", ".")) if match else None
+
+    async def fill_breed(self, breed, label="Raça do Pet"):
+        """Escolhe a raça na lista; se não estiver lá, usa "Outra raça..." e digita."""
+        await steps.ready(self.page, self.pet_breed, label)
+        options = await self.pet_breed.locator("option").evaluate_all("os => os.map(o => o.value)")
+        if breed in options:
+            await self.pet_breed.select_option(breed)
+            return
+        await self.pet_breed.select_option("Outra")
+        await self.fill(self.pet_breed_other, breed, label)
+
+    async def fill_details(self, pet_name, owner_name, whatsapp, address=None, breed=None):
+        await self.fill(self.whatsapp, whatsapp, "WhatsApp")
+        await self.fill(self.owner_name, owner_name, "Seu Nome")
+        await self.fill(self.pet_name, pet_name, "Nome do Pet")
+        if breed:
+            await self.fill_breed(breed)
+        if address:
+            await self.fill(self.owner_address, address, "Seu Endereço")
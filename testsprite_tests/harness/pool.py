@@ -0,0 +1,131 @@
+"""Pool de contextos pré-aquecidos sobre um único Chromium por worker.
+
+Abrir o Chromium custa segundos; abrir um contexto novo custa dezenas de
+milissegundos. O pool lança o navegador uma vez, mantém ``size`` contextos
+prontos numa fila e, quando um cenário devolve o seu, fecha-o e cria um
+substituto em segundo plano. Cada cenário recebe sempre um contexto limpo
+(cookies, localStorage e service workers isolados) sem pagar a criação no
+caminho crítico.
+"""
+import asyncio
+import contextlib
+import time
+
+from playwright import async_api
+
+from harness import auth, steps
+
+LAUNCH_ARGS = [
+    "--window-size=1280,720",   # Set the browser window size
+    "--disable-dev-shm-usage",  # Avoid using /dev/shm which can cause issues in containers
+    "--ipc=host",               # Use host-level IPC for better stability
+    # "--single-process" foi removido: vários contextos simultâneos no mesmo
+    # navegador ficam instáveis nesse modo.
+]
+
+
+async def launch_browser(pw):
+    return await pw.chromium.launch(headless=True, args=LAUNCH_ARGS)
+
+
+class BrowserPool:
+    def __init__(self, size=2, context_options=None, har_mode=None):
+        self.size = max(1, size)
+        self.context_options = dict(context_options or {})
+        self.har_mode = har_mode  # do login de admin (harness.har); os cenários ligam o seu
+        self.acquire_waits = []
+        self._pw = None
+        self._browser = None
+        self._idle = asyncio.Queue()
+        self._recycling = set()
+        self._closing = False
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    @property
+    def browser(self):
+        return self._browser
+
+    async def start(self):
+        self._pw = await async_api.async_playwright().start()
+        try:
+            self._browser = await launch_browser(self._pw)
+            await asyncio.gather(*(self._replenish() for _ in range(self.size)))
+        except BaseException:
+            await self.close()
+            raise
+        return self
+
+    async def new_context(self, **overrides):
+        """Contexto avulso, fora do estoque (ex.: opções específicas de um cenário)."""
+        context = await self._browser.new_context(**{**self.context_options, **overrides})
+        return await steps.instrument(context)
+
+    async def _replenish(self):
+        await self._idle.put(await self.new_context())
+
+    async def acquire(self):
+        started = time.perf_counter()
+        context = await self._idle.get()
+        self.acquire_waits.append(time.perf_counter() - started)
+        return context
+
+    def release(self, context):
+        """Devolve o contexto; o fechamento e a reposição correm em segundo plano."""
+        task = asyncio.create_task(self._recycle(context))
+        self._recycling.add(task)
+        task.add_done_callback(self._recycling.discard)
+
+    async def _recycle(self, context):
+        with contextlib.suppress(async_api.Error):
+            await context.close()
+        if not self._closing:
+            await self._replenish()
+
+    @contextlib.asynccontextmanager
+    async def context(self):
+        context = await self.acquire()
+        try:
+            yield context
+        finally:
+            self.release(context)
+
+    @contextlib.asynccontextmanager
+    async def admin_context(self):
+        """Contexto já autenticado como admin (storage state de ``harness.auth``).
+
+        O storage state precisa ser passado na criação, então o contexto não
+        sai pronto do estoque; mas ocupa a vaga de um: espera um contexto do
+        estoque, fecha-o e só então cria o autenticado. Assim os cenários de
+        admin também respeitam ``size`` (``--contexts``). Na saída a vaga é
+        reposta como num ``release``.
+        """
+        slot = await self.acquire()
+        context = None
+        try:
+            with contextlib.suppress(async_api.Error):
+                await slot.close()
+            state_path = await auth.admin_storage_state(self._browser, self.har_mode)
+            context = await self.new_context(storage_state=str(state_path))
+            yield context
+        finally:
+            if context:
+                with contextlib.suppress(async_api.Error):
+                    await context.close()
+            self.release(slot)
+
+    async def close(self):
+        self._closing = True
+        if self._recycling:
+            await asyncio.gather(*self._recycling, return_exceptions=True)
+        while not self._idle.empty():
+            with contextlib.suppress(async_api.Error):
+                await self._idle.get_nowait().close()
+        if self._browser:
+            await self._browser.close()
+        if self._pw:
+            await self._pw.stop()
@@ -0,0 +1,262 @@
+"""Runner paralelo e com shards para os cenários TC*.py.
+
+Uso (a partir da raiz do repositório):
+
+    python testsprite_tests/run_suite.py --workers 4 --contexts 3
+    python testsprite_tests/run_suite.py --shard 2/4 --report resultado.json
+    python testsprite_tests/run_suite.py --local-backend
+
+Cada processo worker abre um único Chromium (ver ``harness.pool``) e executa
+seus cenários em paralelo via asyncio, com no máximo ``--contexts`` contextos
+em uso ao mesmo tempo. O tempo total passa a ser limitado pelo cenário mais
+lento de cada worker, e não pela soma de todos.
+
+Com ``--local-backend`` o runner sobe o stand-in do Supabase
+(``harness.backend``) e o Vite apontando para ele antes dos cenários.
+
+Com ``--matrix`` os casos gerados do plano de testes (``harness.matrix``)
+rodam num worker próprio, no lugar dos TC*.py que eles cobrem.
+
+Toda execução vai para o histórico em SQLite (``harness.history``). Com
+``--retries`` só os cenários que falharam rodam de novo, com espera
+crescente entre as tentativas; cenários que o histórico aponta como
+instáveis ficam em quarentena: falham no relatório, mas não no código de
+saída. ``--last-failed`` roda só o que falhou na última execução do shard.
+
+Com ``--har`` as chamadas REST/storage/auth de cada cenário (e do login de
+admin e dos forks da matriz) são gravadas num HAR e, nas execuções
+seguintes, respondidas dele (``harness.har``).
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from harness import config, discovery, har, history, matrix, steps, telemetry
+from harness.backend import local_stack
+from harness.backend import stack as backend_stack
+from harness.pool import BrowserPool
+
+
+async def _run_one(pool, path, har_mode=None):
+    started = time.perf_counter()
+    step_timings, tail, page_metrics, har_misses = [], {}, {}, []
+    try:
+        module = discovery.load_scenario(path)
+        # Cenários com REQUIRES_ADMIN = True recebem um contexto já logado.
+        lease = pool.admin_context() if getattr(module, "REQUIRES_ADMIN", False) else pool.context()
+        async with lease as context:
+            await har.attach(context, Path(path).stem, har_mode)
+            started = time.perf_counter()
+            try:
+                await module.run_test(context)
+            finally:
+                step_timings = steps.step_log(context)
+                tail = steps.take_requests(context)
+                har_misses = har.misses(context)
+                if context.pages:
+                    page_metrics = await telemetry.page_metrics(context.pages[-1])
+        status, error = "passed", None
+    except AssertionError as exc:
+        status, error = "failed", str(exc)
+    except Exception:
+        status, error = "error", traceback.format_exc()
+    return {
+        "scenario": Path(path).stem,
+        "status": status,
+        "duration": round(time.perf_counter() - started, 3),
+        "error": error,
+        "worker": os.getpid(),
+        "steps": step_timings,
+        "tail": tail,
+        "page": page_metrics,
+        "har_misses": har_misses,
+    }
+
+
+async def _run_batch(paths, contexts, har_mode=None):
+    async with BrowserPool(size=contexts, har_mode=har_mode) as pool:
+        return await asyncio.gather(*(_run_one(pool, p, har_mode) for p in paths))
+
+
+def run_worker(paths, contexts, har_mode=None):
+    """Ponto de entrada de cada processo worker."""
+    return asyncio.run(_run_batch(paths, contexts, har_mode))
+
+
+async def _run_matrix(cases, contexts, har_mode=None):
+    async with BrowserPool(size=contexts, har_mode=har_mode) as pool:
+        return await matrix.run(pool, cases, har_mode)
+
+
+def run_matrix_worker(names, contexts, har_mode=None):
+    """Ponto de entrada do worker da matriz; os casos são gerados de novo no processo."""
+    names = set(names)
+    cases = [case for case in matrix.build_cases() if case.name in names]
+    return asyncio.run(_run_matrix(cases, contexts, har_mode))
+
+
+def run_suite(paths, workers, contexts, case_names=(), har_mode=None):
+    """Os casos da matriz (``case_names``) ocupam um dos ``workers``."""
+    batches = discovery.partition(paths, workers - 1 if case_names and workers > 1 else workers)
+    jobs = [(run_worker, ([str(p) for p in batch], contexts, har_mode)) for batch in batches]
+    if case_names:
+        jobs.append((run_matrix_worker, (list(case_names), contexts, har_mode)))
+    if len(jobs) <= 1:
+        return jobs[0][0](*jobs[0][1]) if jobs else []
+
+    results = []
+    # spawn: o Playwright mantém threads próprias, que não sobrevivem a um fork.
+    mp_context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=len(jobs), mp_context=mp_context) as pool:
+        futures = [pool.submit(fn, *args) for fn, args in jobs]
+        for future in futures:
+            results.extend(future.result())
+    return results
+
+
+def run_with_retries(paths, cases, args):
+    """Executa e repete só o que falhou; devolve todas as tentativas (campo ``attempt``)."""
+    workers, contexts = max(1, args.workers), max(1, args.contexts)
+    attempts = run_suite(paths, workers, contexts, [c.name for c in cases], args.har)
+    for r in attempts:
+        r["attempt"] = 1
+    latest = attempts
+    for attempt in range(2, args.retries + 2):
+        failed = {r["scenario"] for r in latest if r["status"] != "passed"}
+        if not failed:
+            break
+        delay = args.retry_backoff * 2 ** (attempt - 2)
+        print(f"Repetindo {len(failed)} cenário(s) em {delay:.0f}s (tentativa {attempt})")
+        time.sleep(delay)
+        latest = run_suite([p for p in paths if p.stem in failed], workers, contexts,
+                           [c.name for c in cases if c.name in failed], args.har)
+        for r in latest:
+            r["attempt"] = attempt
+        attempts.extend(latest)
+    return attempts
+
+
+def final_results(attempts):
+    """Última tentativa de cada cenário."""
+    final = {}
+    for r in attempts:
+        if r["attempt"] >= final.get(r["scenario"], {"attempt": 0})["attempt"]:
+            final[r["scenario"]] = r
+    return list(final.values())
+
+
+def _print_summary(results, elapsed, quarantined=()):
+    for r in sorted(results, key=lambda r: r["scenario"]):
+        notes = []
+        if r.get("attempt", 1) > 1 and r["status"] == "passed":
+            notes.append(f"passou na tentativa {r['attempt']}")
+        if r["scenario"] in quarantined and r["status"] != "passed":
+            notes.append("quarentena")
+        note = f"  ({', '.join(notes)})" if notes else ""
+        print(f"{r['status'].upper():7} {r['duration']:8.2f}s  {r['scenario']}{note}")
+        if r["error"]:
+            print("        " + r["error"].strip().splitlines()[-1])
+        if r.get("har_misses"):
+            print(f"        {len(r['har_misses'])} requisição(ões) fora do HAR, ex.: {r['har_misses'][0]}")
+    passed = sum(1 for r in results if r["status"] == "passed")
+    serial = sum(r["duration"] for r in results)
+    print(f"\n{passed}/{len(results)} cenários passaram em {elapsed:.1f}s "
+          f"(soma sequencial: {serial:.1f}s)")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Executa os cenários do testsprite_tests em paralelo.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="processos worker (padrão: número de CPUs)")
+    parser.add_argument("--contexts", type=int, default=2,
+                        help="contextos de navegador simultâneos por worker")
+    parser.add_argument("--shard", default="1/1",
+                        help="fatia determinística da suíte, ex.: 2/4")
+    parser.add_argument("--pattern", default="TC*.py", help="glob dos arquivos de cenário")
+    parser.add_argument("-k", "--keyword", help="filtra cenários pelo nome do arquivo")
+    parser.add_argument("--list", action="store_true", help="apenas lista os cenários selecionados")
+    parser.add_argument("--matrix", action="store_true",
+                        help="executa os casos gerados do plano de testes no lugar dos TC*.py que eles cobrem")
+    parser.add_argument("--retries", type=int, default=0,
+                        help="repetições dos cenários que falharem (padrão: %(default)s)")
+    parser.add_argument("--retry-backoff", type=float, default=2.0,
+                        help="espera antes da 1ª repetição, dobrando a cada uma (segundos, padrão: %(default)s)")
+    parser.add_argument("--last-failed", action="store_true",
+                        help="só os cenários que falharam na última execução deste shard")
+    parser.add_argument("--no-quarantine", action="store_true",
+                        help="cenários instáveis também reprovam a execução")
+    parser.add_argument("--har", choices=har.MODES,
+                        help="grava (record) ou responde de um HAR (replay) as chamadas REST/storage/auth; "
+                             "auto grava só o que ainda não tem HAR")
+    parser.add_argument("--report", help="grava os resultados em JSON neste caminho")
+    parser.add_argument("--telemetry", help="arquivo JSONL da telemetria (padrão: .cache/telemetry/<execução>.jsonl)")
+    parser.add_argument("--local-backend", action="store_true",
+                        help="sobe o stand-in local do Supabase e o Vite apontando para ele")
+    parser.add_argument("--backend-port", type=int, default=config.BACKEND_PORT,
+                        help="porta do stand-in local (padrão: %(default)s)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        index, total = discovery.parse_shard(args.shard)
+    except ValueError as exc:
+        build_parser().error(str(exc))
+
+    paths = discovery.select_shard(discovery.discover(args.pattern, args.keyword), index, total)
+    cases = []
+    if args.matrix:
+        paths = [p for p in paths if p.stem not in matrix.SUPERSEDES]
+        cases = matrix.build_cases(keyword=args.keyword)
+        # A matriz é dividida por serviço: cada shard fica com galhos inteiros da árvore.
+        services = discovery.select_shard(matrix.services(cases), index, total)
+        cases = [case for case in cases if case.service in services]
+
+    if args.local_backend:
+        # Histórico e login de admin do backend local ficam em .cache/local.
+        backend_stack.isolate_cache()
+    if args.last_failed:
+        failed = history.last_failed(args.shard)
+        paths = [p for p in paths if p.stem in failed]
+        cases = [c for c in cases if c.name in failed]
+    if args.list:
+        for path in paths:
+            print(path.stem)
+        for case in cases:
+            print(case.name)
+        return 0
+
+    stack = contextlib.nullcontext()
+    if args.local_backend:
+        stack = local_stack(port=args.backend_port)
+
+    quarantined = set() if args.no_quarantine else set(history.flaky())
+    with stack:
+        started = time.perf_counter()
+        attempts = run_with_retries(paths, cases, args)
+        elapsed = time.perf_counter() - started
+    history.record(attempts, history.new_run_id(), telemetry.git_commit(), args.shard)
+
+    results = final_results(attempts)
+    _print_summary(results, elapsed, quarantined)
+    print(f"Telemetria: {telemetry.write_run(results, args.telemetry)}")
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(attempts, f, ensure_ascii=False, indent=2)
+
+    blocking = [r for r in results if r["status"] != "passed" and r["scenario"] not in quarantined]
+    return 1 if blocking else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
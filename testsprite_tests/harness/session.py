@@ -0,0 +1,20 @@
+"""Contexto de navegador entregue a cada cenário."""
+import contextlib
+
+from harness.pool import BrowserPool
+
+
+@contextlib.asynccontextmanager
+async def scenario_context(context=None, admin=False):
+    """Entrega o contexto recebido do runner ou, sem ele, um pool próprio de tamanho 1.
+
+    O segundo caso mantém ``python TC0xx_....py`` funcionando isoladamente;
+    com ``admin=True`` o contexto já nasce logado no painel administrativo.
+    """
+    if context is not None:
+        yield context
+        return
+
+    async with BrowserPool(size=1) as pool:
+        async with (pool.admin_context() if admin else pool.context()) as context:
+            yield context
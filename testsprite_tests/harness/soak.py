@@ -0,0 +1,148 @@
+"""Sessão admin longa: amostras de heap, DOM e canais realtime, e o teste de crescimento.
+
+O painel fica aberto o dia todo na recepção. ``cycle`` percorre as seções
+de ``SOAK_SECTIONS`` e volta à primeira; ``sample`` é tirada sempre ali,
+depois de forçar a coleta de lixo (``HeapProfiler.collectGarbage``), então
+duas amostras medem a mesma tela e o que sobra é memória retida:
+
+- ``heap_bytes``: ``JSHeapUsedSize``;
+- ``dom_nodes`` e ``listeners``: ``Nodes`` e ``JSEventListeners``;
+- ``channels``: canais realtime abertos, contados pelos frames Phoenix do
+  WebSocket (``phx_join`` menos ``phx_leave``/``phx_close``), por tópico.
+  Um ``useEffect`` que não chama ``removeChannel`` aparece aqui como o mesmo
+  tópico aberto duas vezes.
+
+``check_growth`` compara a mediana das primeiras amostras depois do
+aquecimento com a das últimas.
+"""
+import json
+import statistics
+import time
+
+from harness import bench, steps
+from harness.pages import AdminSidebar
+
+SOAK_SECTIONS = ("Banho & Tosa", "Pet Móvel", "Creche", "Hotel Pet", "Clientes", "Mensalistas")
+REALTIME_TOPICS = ("admin_changes_realtime", "disabled_dates_changes")
+SETTLE_TIMEOUT_MS = 30000
+
+WARMUP_SAMPLES = 3
+WINDOW = 5
+# Crescimento relativo aceito entre a janela inicial e a final.
+THRESHOLDS = {"heap_bytes": 0.25, "dom_nodes": 0.10, "listeners": 0.10}
+
+
+class ChannelTracker:
+    """Canais Phoenix abertos nos WebSockets da página, por tópico."""
+
+    def __init__(self, page):
+        self.open = {}  # socket -> {tópico: joins em aberto}
+        page.on("websocket", self._attach)
+
+    def _attach(self, ws):
+        if "/realtime/" not in ws.url:
+            return
+        topics = self.open[ws] = {}
+        ws.on("framesent", lambda payload: self._frame(topics, payload, sent=True))
+        ws.on("framereceived", lambda payload: self._frame(topics, payload, sent=False))
+        ws.on("close", lambda _: self.open.pop(ws, None))
+
+    @staticmethod
+    def _frame(topics, payload, sent):
+        if isinstance(payload, bytes):
+            return  # broadcast binário: não abre nem fecha canal
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            return
+        if isinstance(message, list):
+            _, _, topic, event, _ = message
+        else:
+            topic, event = message.get("topic"), message.get("event")
+        if topic == "phoenix":
+            return  # heartbeat
+        if sent and event == "phx_join":
+            topics[topic] = topics.get(topic, 0) + 1
+        elif (sent and event == "phx_leave") or (not sent and event == "phx_close"):
+            if topics.get(topic, 0) > 0:
+                topics[topic] -= 1
+
+    def counts(self):
+        merged = {}
+        for topics in self.open.values():
+            for topic, count in topics.items():
+                if count:
+                    name = topic.split(":", 1)[-1]
+                    merged[name] = merged.get(name, 0) + count
+        return merged
+
+
+async def cycle(page, sections=SOAK_SECTIONS):
+    """Abre cada seção e volta à primeira; devolve quantos passos estouraram o tempo."""
+    sidebar = AdminSidebar(page)
+    timed_out = 0
+    for label in (*sections, sections[0]):
+        await sidebar.open(label)
+        await steps.ready(page, label=f"soak {label}", timeout_ms=SETTLE_TIMEOUT_MS)
+        timed_out += steps.step_log(page.context)[-1]["timed_out"]
+    return timed_out
+
+
+async def sample(cdp, channels):
+    await cdp.send("HeapProfiler.collectGarbage")
+    metrics = await bench.cdp_metrics(cdp)
+    counts = channels.counts()
+    return {
+        "at": time.time(),
+        "heap_bytes": int(metrics.get("JSHeapUsedSize", 0)),
+        "dom_nodes": int(metrics.get("Nodes", 0)),
+        "listeners": int(metrics.get("JSEventListeners", 0)),
+        "channels": sum(counts.values()),
+        "channel_topics": counts,
+    }
+
+
+async def open_session(page):
+    """CDP com Performance ligado para as amostras de ``sample``."""
+    cdp = await page.context.new_cdp_session(page)
+    await cdp.send("Performance.enable")
+    return cdp
+
+
+def check_growth(samples, thresholds=THRESHOLDS, warmup=WARMUP_SAMPLES, window=WINDOW):
+    """Lista de violações (vazia = sem vazamento) comparando as janelas inicial e final.
+
+    Canais não têm tolerância: mais canais abertos no fim que no começo já é
+    vazamento de assinatura.
+    """
+    measured = samples[warmup:]
+    if len(measured) < 2 * window:
+        raise ValueError(f"são necessárias {warmup + 2 * window} amostras; há {len(samples)}")
+    first, last = measured[:window], measured[-window:]
+    hours = max((last[-1]["at"] - first[0]["at"]) / 3600, 1e-9)
+    violations = []
+    for name, limit in thresholds.items():
+        before = statistics.median(s[name] for s in first)
+        after = statistics.median(s[name] for s in last)
+        growth = (after - before) / before if before else 0.0
+        if growth > limit:
+            violations.append(f"{name}: {before:.0f} -> {after:.0f} ({growth:+.0%}, limite {limit:.0%}; "
+                              f"{(after - before) / hours:+.0f}/h)")
+    before = max(s["channels"] for s in first)
+    after = min(s["channels"] for s in last)
+    if after > before:
+        violations.append(f"channels: {before} -> {after} abertos ({last[-1]['channel_topics']})")
+    return violations
+
+
+def summarize(samples):
+    first, last = samples[0], samples[-1]
+    return {
+        "samples": len(samples),
+        "hours": round((last["at"] - first["at"]) / 3600, 2),
+        **{f"{name}_first": first[name] for name in ("heap_bytes", "dom_nodes", "listeners", "channels")},
+        **{f"{name}_last": last[name] for name in ("heap_bytes", "dom_nodes", "listeners", "channels")},
+        # Tópico esperado que nunca abriu: o realtime não conectou e a contagem de canais não vale.
+        "missing_topics": [t for t in REALTIME_TOPICS if not any(t in s["channel_topics"] for s in samples)],
+    }
+
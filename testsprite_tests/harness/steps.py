@@ -0,0 +1,163 @@
+"""Esperas por condição para os passos dos cenários, no lugar de sleeps fixos.
+
+Antes de cada interação, ``ready(page, elem, label)`` espera, nesta ordem:
+
+1. uma janela sem requisições REST/auth/storage do Supabase em andamento;
+2. o DOM ficar sem mutações por ``QUIET_MS`` (sinal de que o React terminou
+   de renderizar);
+3. o elemento alvo ficar visível (o resto da actionability — habilitado,
+   estável, recebendo eventos — é verificado pelo próprio ``click``/``fill``).
+
+Cada espera tem teto e nunca falha o passo sozinha: se a tela não sossegar
+(ex.: carrossel animado), o passo segue e a medição registra ``timed_out``.
+As medições ficam em ``step_log(context)``, que o runner anexa ao resultado,
+junto com a telemetria do passo (ver ``harness.telemetry``).
+"""
+import asyncio
+import time
+import weakref
+
+from playwright import async_api
+
+from harness import telemetry
+
+SUPABASE_PATHS = ("/rest/v1/", "/auth/v1/", "/storage/v1/", "/functions/v1/")
+QUIET_MS = 150
+NETWORK_TIMEOUT_MS = 10000
+RENDER_TIMEOUT_MS = 3000
+ELEMENT_TIMEOUT_MS = 5000
+
+# Marca o instante da última mutação do DOM; lido por _wait_render().
+RENDER_PROBE = """
+(() => {
+    window.__tsLastMutation = performance.now();
+    new MutationObserver(() => { window.__tsLastMutation = performance.now(); })
+        .observe(document, { subtree: true, childList: true, attributes: true, characterData: true });
+})();
+"""
+
+_trackers = weakref.WeakKeyDictionary()
+
+
+def is_supabase_request(url):
+    return any(part in url for part in SUPABASE_PATHS)
+
+
+class _Tracker:
+    """Requisições Supabase em andamento e passos medidos de um contexto."""
+
+    def __init__(self):
+        self.inflight = 0
+        self.last_activity = time.perf_counter()
+        self.steps = []
+        self._pending = {}
+        self._window = []  # requisições concluídas desde o último passo
+
+    def started(self, request):
+        if is_supabase_request(request.url):
+            self.inflight += 1
+            self.last_activity = time.perf_counter()
+            self._pending[request] = self.last_activity
+
+    def finished(self, request):
+        if is_supabase_request(request.url):
+            self.inflight = max(0, self.inflight - 1)
+            self.last_activity = time.perf_counter()
+            begun = self._pending.pop(request, None)
+            if begun is not None:
+                self._window.append((self.last_activity - begun, telemetry.is_unpaginated_select(request)))
+
+    def take_requests(self):
+        """Resumo das requisições desde a última chamada, e zera a janela."""
+        window, self._window = self._window, []
+        latencies = [seconds * 1000 for seconds, _ in window]
+        return {
+            "supabase_requests": len(window),
+            "supabase_ms": round(sum(latencies), 1),
+            "supabase_max_ms": round(max(latencies, default=0), 1),
+            "unpaginated_selects": sum(1 for _, unpaginated in window if unpaginated),
+        }
+
+    async def wait_idle(self, quiet_ms, timeout_ms):
+        deadline = time.perf_counter() + timeout_ms / 1000
+        while True:
+            now = time.perf_counter()
+            if self.inflight == 0 and (now - self.last_activity) * 1000 >= quiet_ms:
+                return True
+            if now >= deadline:
+                return False
+            await asyncio.sleep(0.02)
+
+
+async def instrument(context):
+    """Prepara o contexto para ``ready``; chamado pelo pool ao criar cada contexto."""
+    tracker = _Tracker()
+    _trackers[context] = tracker
+    await context.add_init_script(RENDER_PROBE)
+    await context.add_init_script(telemetry.PERF_PROBE)
+    context.on("request", tracker.started)
+    context.on("requestfinished", tracker.finished)
+    context.on("requestfailed", tracker.finished)
+    return context
+
+
+def step_log(context):
+    """Passos medidos neste contexto, na ordem em que aconteceram."""
+    tracker = _trackers.get(context)
+    return list(tracker.steps) if tracker else []
+
+
+def take_requests(context):
+    """Requisições Supabase ainda não atribuídas a um passo (ex.: as das asserções finais)."""
+    tracker = _trackers.get(context)
+    return tracker.take_requests() if tracker else {}
+
+
+async def _wait_render(page, quiet_ms, timeout_ms):
+    try:
+        await page.wait_for_function(
+            "q => performance.now() - (window.__tsLastMutation || 0) >= q",
+            arg=quiet_ms, polling="raf", timeout=timeout_ms,
+        )
+        return True
+    except async_api.Error:
+        return False
+
+
+async def ready(page, elem=None, label=None, quiet_ms=QUIET_MS, timeout_ms=None):
+    """Espera rede e renderização sossegarem e ``elem`` ficar visível; registra o tempo gasto.
+
+    ``timeout_ms`` troca os tetos padrão de rede e renderização (benchmarks
+    com muitos dados precisam de mais que os 10 s/3 s dos cenários).
+    """
+    tracker = _trackers.get(page.context)
+    if tracker is None:
+        # Contexto criado fora do pool: instrumenta agora (a página atual não
+        # terá a sonda de renderização até a próxima navegação).
+        await instrument(page.context)
+        tracker = _trackers[page.context]
+
+    started = time.perf_counter()
+    network_ok = await tracker.wait_idle(quiet_ms, timeout_ms or NETWORK_TIMEOUT_MS)
+    network_done = time.perf_counter()
+    render_ok = await _wait_render(page, quiet_ms, timeout_ms or RENDER_TIMEOUT_MS)
+    render_done = time.perf_counter()
+    element_ok = True
+    if elem is not None:
+        try:
+            await elem.wait_for(state="visible", timeout=ELEMENT_TIMEOUT_MS)
+        except async_api.Error:
+            # Deixa o click/fill seguinte falhar com a mensagem original do Playwright.
+            element_ok = False
+    finished = time.perf_counter()
+
+    tracker.steps.append({
+        "label": label,
+        "network_ms": round((network_done - started) * 1000, 1),
+        "render_ms": round((render_done - network_done) * 1000, 1),
+        "element_ms": round((finished - render_done) * 1000, 1),
+        "total_ms": round((finished - started) * 1000, 1),
+        "timed_out": not (network_ok and render_ok and element_ok),
+        **tracker.take_requests(),
+        **await telemetry.sample(page),
+    })
@@ -0,0 +1,146 @@
+"""Telemetria de desempenho por cenário e por passo.
+
+Uma sonda injetada em cada página (``PERF_PROBE``) acumula FCP, LCP e long
+tasks via ``PerformanceObserver``. Em cada ``steps.ready`` o passo ganha uma
+amostra da página (heap JS, long tasks até ali, nós do DOM) e as requisições
+ao Supabase feitas desde o passo anterior (quantidade, latência e quantos
+``select`` sem paginação). No fim do cenário o runner anexa o navigation
+timing e as métricas de pintura.
+
+Cada execução grava um JSON por linha (um cenário por linha) em
+``.cache/telemetry/`` (``.cache/local/telemetry/`` com o backend local);
+``perf_compare.py`` compara com uma baseline.
+"""
+import datetime
+import json
+import subprocess
+import urllib.parse
+
+from playwright import async_api
+
+from harness import config
+
+
+def telemetry_dir():
+    # Lido na hora: --local-backend troca o config.CACHE_DIR (ver stack.isolate_cache).
+    return config.CACHE_DIR / "telemetry"
+
+
+PERF_PROBE = """
+(() => {
+    const perf = window.__tsPerf = { fcp: null, lcp: null, longTasks: 0, longTaskMs: 0 };
+    const observe = (type, fn) => {
+        try { new PerformanceObserver(list => list.getEntries().forEach(fn)).observe({ type, buffered: true }); }
+        catch (e) { /* tipo não suportado neste navegador */ }
+    };
+    observe('paint', e => { if (e.name === 'first-contentful-paint') perf.fcp = e.startTime; });
+    observe('largest-contentful-paint', e => { perf.lcp = e.startTime; });
+    observe('longtask', e => { perf.longTasks += 1; perf.longTaskMs += e.duration; });
+})();
+"""
+
+_SAMPLE_JS = """
+() => {
+    const perf = window.__tsPerf || {};
+    return {
+        js_heap_bytes: performance.memory ? performance.memory.usedJSHeapSize : null,
+        long_tasks: perf.longTasks || 0,
+        long_task_ms: Math.round(perf.longTaskMs || 0),
+        dom_nodes: document.getElementsByTagName('*').length,
+    };
+}
+"""
+
+_PAGE_JS = """
+() => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    const perf = window.__tsPerf || {};
+    const ms = v => (v === null || v === undefined) ? null : Math.round(v);
+    return {
+        url: location.pathname,
+        ttfb_ms: nav ? ms(nav.responseStart) : null,
+        dom_content_loaded_ms: nav ? ms(nav.domContentLoadedEventEnd) : null,
+        load_ms: nav ? ms(nav.loadEventEnd) : null,
+        transfer_bytes: nav ? nav.transferSize : null,
+        fcp_ms: ms(perf.fcp),
+        lcp_ms: ms(perf.lcp),
+    };
+}
+"""
+
+
+def is_unpaginated_select(request):
+    """GET no PostgREST com ``select=*`` (ou sem select) e sem ``limit``/``Range``."""
+    if request.method != "GET" or "/rest/v1/" not in request.url or "/rest/v1/rpc/" in request.url:
+        return False
+    params = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(request.url).query))
+    if "limit" in params or "range" in {k.lower() for k in request.headers}:
+        return False
+    # .single()/.maybeSingle() pedem um objeto: no máximo uma linha.
+    if "vnd.pgrst.object" in request.headers.get("accept", ""):
+        return False
+    return "*" in params.get("select", "*").split(",")[0]
+
+
+async def sample(page):
+    """Métricas baratas da página no momento do passo; vazio se a página já fechou."""
+    try:
+        return await page.evaluate(_SAMPLE_JS)
+    except async_api.Error:
+        return {}
+
+
+async def page_metrics(page):
+    """Navigation timing e FCP/LCP da página, para o resumo do cenário."""
+    try:
+        metrics = await page.evaluate(_PAGE_JS)
+    except async_api.Error:
+        return {}
+    metrics.update(await sample(page))
+    return metrics
+
+
+def summarize(result):
+    """Totais do cenário a partir dos passos e das métricas de página."""
+    # "tail": requisições depois do último passo (asserções finais).
+    windows = [*(result.get("steps") or []), result.get("tail") or {}]
+    page = result.get("page") or {}
+    return {
+        "duration_ms": round(result["duration"] * 1000),
+        "supabase_requests": sum(w.get("supabase_requests", 0) for w in windows),
+        "supabase_ms": round(sum(w.get("supabase_ms", 0) for w in windows), 1),
+        "unpaginated_selects": sum(w.get("unpaginated_selects", 0) for w in windows),
+        "fcp_ms": page.get("fcp_ms"),
+        "lcp_ms": page.get("lcp_ms"),
+        "long_task_ms": page.get("long_task_ms"),
+        "js_heap_bytes": page.get("js_heap_bytes"),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=config.SUITE_DIR,
+                              capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def write_run(results, path=None):
+    """Grava uma linha JSON por cenário; devolve o caminho do arquivo."""
+    started = datetime.datetime.now(datetime.timezone.utc)
+    run_id = started.strftime("%Y%m%dT%H%M%SZ")
+    if path is None:
+        directory = telemetry_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{run_id}.jsonl"
+    commit = git_commit()
+    with open(path, "w", encoding="utf-8") as f:
+        for result in sorted(results, key=lambda r: r["scenario"]):
+            line = {"run_id": run_id, "commit": commit, **result, "summary": summarize(result)}
+            f.write(json.dumps(line, ensure_ascii=False) + "\n")
+    return path
+
+
+def read_run(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
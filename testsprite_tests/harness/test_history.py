@@ -0,0 +1,53 @@
+"""Casos do ``history.flaky``: ``cd testsprite_tests && python -m unittest harness.test_history``."""
+import tempfile
+import unittest
+from pathlib import Path
+
+from harness import history
+
+
+class FlakyTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "history.sqlite3"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def record(self, *runs):
+        """Cada execução é a lista de status das tentativas do cenário ``TC001``."""
+        for i, attempts in enumerate(runs):
+            results = [{"scenario": "TC001", "attempt": n + 1, "status": status, "duration": 1.0}
+                       for n, status in enumerate(attempts)]
+            history.record(results, f"2026101{i // 10}T{i % 10:02d}", path=self.path)
+
+    def test_regression_at_the_end_is_not_flaky(self):
+        self.record(*[["passed"]] * 3, *[["failed"]] * 2)
+        self.assertEqual(history.flaky(path=self.path), {})
+
+    def test_short_alternating_history_is_not_flaky(self):
+        self.record(["passed"], ["failed"], ["passed"], ["failed"], ["passed"])
+        self.assertEqual(history.flaky(path=self.path), {})
+
+    def test_failures_at_the_end_after_retry_pass_are_not_flaky(self):
+        self.record(["passed"], ["failed", "passed"], ["failed"])
+        self.assertEqual(history.flaky(path=self.path), {})
+
+    def test_passed_on_retry_is_flaky(self):
+        self.record(["passed"], ["failed", "passed"], ["passed"])
+        self.assertIn("TC001", history.flaky(path=self.path))
+
+    def test_alternating_long_history_is_flaky(self):
+        statuses = ["passed", "failed", "passed", "passed", "failed", "passed", "passed", "failed", "passed",
+                    "passed", "passed", "failed", "passed"]
+        self.record(*[[status] for status in statuses])
+        self.assertIn("TC001", history.flaky(path=self.path))
+
+    def test_failing_tail_series(self):
+        self.assertTrue(history.failing_tail([0, 1, 1]))
+        self.assertFalse(history.failing_tail([1, 0, 1]))
+        self.assertFalse(history.failing_tail([0, 0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,7 @@
+"""Cenários instáveis e tendência de latência por passo: ``python testsprite_tests/history_report.py --help``."""
+import sys
+
+from harness.history import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,25 @@
+"""Sobe só o stand-in local do Supabase: ``python testsprite_tests/local_backend.py --help``.
+
+Útil para rodar o Vite à mão contra ele:
+
+    VITE_SUPABASE_URL=http://127.0.0.1:54321 VITE_SUPABASE_ANON_KEY=local npx vite --port 5000
+"""
+import argparse
+import threading
+
+from harness import config
+from harness.backend import LocalSupabase
+from harness.backend.store import Store
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stand-in local do Supabase para os testes E2E.")
+    parser.add_argument("--port", type=int, default=config.BACKEND_PORT)
+    parser.add_argument("--no-seed", action="store_true", help="começa com as tabelas vazias")
+    args = parser.parse_args()
+
+    with LocalSupabase(port=args.port, store=Store.from_seed(with_rows=not args.no_seed)) as backend:
+        print(f"Supabase local em {backend.url} (Ctrl+C para sair)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,7 @@
+"""Compara a telemetria de uma execução com a baseline: ``python testsprite_tests/perf_compare.py --help``."""
+import sys
+
+from harness.baseline import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,7 @@
+"""Executa a suíte testsprite_tests: ``python testsprite_tests/run_suite.py --help``."""
+import sys
+
+from harness.runner import main
+
+if __name__ == "__main__":
+    sys.exit(main())
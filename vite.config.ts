@@ -26,6 +26,10 @@ export default defineConfig(({ mode }) => {
       port: 4173,
       host: '0.0.0.0'
     },
+    build: {
+      // dist/.vite/manifest.json: scripts/sw gera o precache do dist/sw.js a partir dele.
+      manifest: true,
+    },
     plugins: [react()],
     define: {
       'process.env.API_KEY': JSON.stringify(env.GEMINI_API_KEY),